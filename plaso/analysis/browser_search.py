@@ -132,6 +132,9 @@ class BrowserSearchPlugin(interface.AnalysisPlugin):
   # Indicate that we do not want to run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = False
 
+  # Only events with an URL are examined.
+  ATTRIBUTE_NAMES = frozenset(['url'])
+
   # Here we define filters and callback methods for all hits on each filter.
   FILTERS = (
       (('url iregexp "(www.|encrypted.|/)google." and url contains "search"'),
@@ -18,6 +18,9 @@ class ChromeExtensionPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  # Only interested in filesystem events.
+  DATA_TYPES = frozenset(['fs:stat'])
+
   _TITLE_RE = re.compile('<title>([^<]+)</title>')
   _WEB_STORE_URL = u'https://chrome.google.com/webstore/detail/{xid}?hl=en-US'
 
@@ -14,6 +14,9 @@ class FileHashesPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  # Only events with a path specification are examined.
+  ATTRIBUTE_NAMES = frozenset(['pathspec'])
+
   def __init__(self, incoming_queue):
     """Initializes the unique hashes plugin.
 
@@ -44,6 +44,16 @@ class UniqueHashesTest(test_lib.AnalysisPluginTestCase):
         setattr(event_object, attrib, event_dict[attrib])
     return event_object
 
+  def testIsEventOfInterest(self):
+    """Tests the IsEventOfInterest function."""
+    analysis_plugin = file_hashes.FileHashesPlugin(None)
+
+    event_object = self._CreateTestEventObject(self.EVENTS[0])
+    self.assertTrue(analysis_plugin.IsEventOfInterest(event_object))
+
+    event_object = event.EventObject()
+    self.assertFalse(analysis_plugin.IsEventOfInterest(event_object))
+
   def testEvents(self):
     """Test the plugin against mock events."""
     event_queue = single_process.SingleProcessQueue()
@@ -29,6 +29,14 @@ class AnalysisPlugin(queue.EventObjectQueueConsumer):
   # should be able to run during the extraction phase.
   ENABLE_IN_EXTRACTION = False
 
+  # The event data types the plugin is interested in and the names of event
+  # attributes of which the plugin requires at least one to be set.
+  # The events are routed to the plugin before they are sent to the plugin
+  # process, hence events that do not match are never sent to the plugin.
+  # If both are empty the plugin is interested in every event.
+  DATA_TYPES = frozenset()
+  ATTRIBUTE_NAMES = frozenset()
+
   # All the possible report types.
   TYPE_ANOMALY = 1    # Plugin that is inspecting events for anomalies.
   TYPE_STATISTICS = 2   # Statistical calculations.
@@ -68,7 +76,8 @@ class AnalysisPlugin(queue.EventObjectQueueConsumer):
       analysis_mediator: The analysis mediator object (instance of
                          AnalysisMediator).
     """
-    self.ExamineEvent(analysis_mediator, event_object, **kwargs)
+    if self.IsEventOfInterest(event_object):
+      self.ExamineEvent(analysis_mediator, event_object, **kwargs)
 
   @property
   def plugin_name(self):
@@ -101,6 +110,28 @@ class AnalysisPlugin(queue.EventObjectQueueConsumer):
       event_object: An event object (instance of EventObject).
     """
 
+  def IsEventOfInterest(self, event_object):
+    """Determines if the plugin is interested in an event object.
+
+    Args:
+      event_object: An event object (instance of EventObject).
+
+    Returns:
+      A boolean value indicating the event object matches the data types
+      or has one of the attributes of the plugin.
+    """
+    if not self.DATA_TYPES and not self.ATTRIBUTE_NAMES:
+      return True
+
+    if getattr(event_object, u'data_type', None) in self.DATA_TYPES:
+      return True
+
+    for attribute_name in self.ATTRIBUTE_NAMES:
+      if getattr(event_object, attribute_name, None):
+        return True
+
+    return False
+
   def RunPlugin(self, analysis_mediator):
     """For each item in the queue send the read event to analysis.
 
@@ -168,6 +168,8 @@ class WindowsServicesPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  DATA_TYPES = frozenset(['windows:registry:service'])
+
   # TODO: move this into a CLI argument helper, however this could
   # be turned into a more generic analysis plugin setting in the process.
   ARGUMENTS = [
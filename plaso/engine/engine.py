@@ -30,6 +30,7 @@ class BaseEngine(object):
     """
     self._collection_queue = collection_queue
     self._enable_debug_output = False
+    self._enable_parse_cache = False
     self._enable_profiling = False
     self._event_queue_producer = queue.ItemQueueProducer(storage_queue)
     self._filter_object = None
@@ -162,6 +163,15 @@ class BaseEngine(object):
     """
     self._enable_debug_output = enable_debug_output
 
+  def SetEnableParseCache(self, enable_parse_cache):
+    """Enables or disables the parse cache of the extraction workers.
+
+    Args:
+      enable_parse_cache: boolean value to indicate if the parse cache
+                          should be enabled.
+    """
+    self._enable_parse_cache = enable_parse_cache
+
   def SetEnableProfiling(
       self, enable_profiling, profiling_sample_rate=1000,
       profiling_type=u'all'):
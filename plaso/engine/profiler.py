@@ -2,6 +2,7 @@
 """The profiler classes."""
 
 import abc
+import collections
 import os
 import time
 
@@ -58,6 +59,42 @@ class CPUTimeProfiler(object):
     self._sample_file = u'{0:s}-{1!s}.csv'.format(
         self._FILENAME_PREFIX, identifier)
 
+  def _GetColumnNames(self):
+    """Retrieves the names of the columns of the sample file.
+
+    Returns:
+      A list of column names.
+    """
+    return [
+        u'profile name', u'number of samples', u'total CPU time',
+        u'total system time']
+
+  def _GetColumnValues(self, profile_name):
+    """Retrieves the values of the columns of the sample file.
+
+    Args:
+      profile_name: the name of the profile.
+
+    Returns:
+      A list of column values.
+    """
+    profile_measurements = self._profile_measurements.get(profile_name, None)
+    if not profile_measurements:
+      profile_measurements = CPUTimeMeasurements()
+
+    return [
+        profile_name, profile_measurements.number_of_samples,
+        profile_measurements.total_cpu_time,
+        profile_measurements.total_system_time]
+
+  def _GetProfileNames(self):
+    """Retrieves the names of the profiles.
+
+    Returns:
+      A list of profile names.
+    """
+    return self._profile_measurements.keys()
+
   def StopTiming(self, profile_name):
     """Stops timing CPU time.
 
@@ -88,16 +125,14 @@ class CPUTimeProfiler(object):
       pass
 
     with open(self._sample_file, 'wb') as file_object:
-      line = (
-          u'profile name\tnumber of samples\ttotal CPU time\t'
-          u'total system time\n')
+      line = u'{0:s}\n'.format(u'\t'.join(self._GetColumnNames()))
       file_object.write(line.encode(u'utf-8'))
 
-      for name, profile_measurements in self._profile_measurements.iteritems():
-        line = u'{0:s}\t{1!s}\t{2!s}\t{3!s}\n'.format(
-            name, profile_measurements.number_of_samples,
-            profile_measurements.total_cpu_time,
-            profile_measurements.total_system_time)
+      for profile_name in self._GetProfileNames():
+        column_values = [
+            u'{0!s}'.format(value)
+            for value in self._GetColumnValues(profile_name)]
+        line = u'{0:s}\n'.format(u'\t'.join(column_values))
 
         file_object.write(line.encode(u'utf-8'))
 
@@ -180,10 +215,75 @@ class GuppyMemoryProfiler(BaseMemoryProfiler):
 
 
 class ParsersProfiler(CPUTimeProfiler):
-  """The parsers profiler."""
+  """The parsers profiler.
+
+  Besides the CPU time spent per parser the parsers profiler counts the number
+  of file entries a parser rejected and the number of file entries a parser
+  was skipped for, since it rejected a file entry with the same content before.
+  """
 
   _FILENAME_PREFIX = u'parsers'
 
+  def __init__(self, identifier):
+    """Initializes the parsers profiler object.
+
+    Args:
+      identifier: the profile identifier.
+    """
+    super(ParsersProfiler, self).__init__(identifier)
+    self._number_of_rejections = collections.Counter()
+    self._number_of_skips = collections.Counter()
+
+  def _GetColumnNames(self):
+    """Retrieves the names of the columns of the sample file.
+
+    Returns:
+      A list of column names.
+    """
+    column_names = super(ParsersProfiler, self)._GetColumnNames()
+    return column_names + [u'number of rejections', u'number of skips']
+
+  def _GetColumnValues(self, profile_name):
+    """Retrieves the values of the columns of the sample file.
+
+    Args:
+      profile_name: the name of the profile.
+
+    Returns:
+      A list of column values.
+    """
+    column_values = super(ParsersProfiler, self)._GetColumnValues(
+        profile_name)
+    return column_values + [
+        self._number_of_rejections[profile_name],
+        self._number_of_skips[profile_name]]
+
+  def _GetProfileNames(self):
+    """Retrieves the names of the profiles.
+
+    Returns:
+      A list of profile names.
+    """
+    profile_names = set(self._profile_measurements.keys())
+    profile_names.update(self._number_of_skips.keys())
+    return sorted(profile_names)
+
+  def AddRejection(self, profile_name):
+    """Counts a file entry rejected by a parser.
+
+    Args:
+      profile_name: the name of the parser.
+    """
+    self._number_of_rejections[profile_name] += 1
+
+  def AddSkip(self, profile_name):
+    """Counts a file entry a parser was skipped for.
+
+    Args:
+      profile_name: the name of the parser.
+    """
+    self._number_of_skips[profile_name] += 1
+
 
 class SerializersProfiler(CPUTimeProfiler):
   """The serializers profiler."""
@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 """Tests for the profiler classes."""
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from plaso.engine import profiler
@@ -18,5 +21,46 @@ class CPUTimeProfilerTest(unittest.TestCase):
   # TODO: add more tests.
 
 
+class ParsersProfilerTest(unittest.TestCase):
+  """Tests for the parsers profiler."""
+
+  def testWrite(self):
+    """Tests the Write function."""
+    test_profiler = profiler.ParsersProfiler(u'test')
+
+    test_profiler.StartTiming(u'syslog')
+    test_profiler.StopTiming(u'syslog')
+    test_profiler.AddRejection(u'syslog')
+    test_profiler.AddSkip(u'syslog')
+    test_profiler.AddSkip(u'syslog')
+    test_profiler.AddSkip(u'xchatlog')
+
+    temporary_directory = tempfile.mkdtemp()
+    try:
+      # pylint: disable=protected-access
+      test_profiler._sample_file = os.path.join(
+          temporary_directory, u'parsers-test.csv')
+      test_profiler.Write()
+
+      with open(test_profiler._sample_file, 'rb') as file_object:
+        lines = file_object.read().decode(u'utf-8').split(u'\n')
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
+    self.assertEqual(len(lines), 4)
+    self.assertEqual(lines[0].split(u'\t'), [
+        u'profile name', u'number of samples', u'total CPU time',
+        u'total system time', u'number of rejections', u'number of skips'])
+
+    column_values = lines[1].split(u'\t')
+    self.assertEqual(column_values[0], u'syslog')
+    self.assertEqual(column_values[1], u'1')
+    self.assertEqual(column_values[4:], [u'1', u'2'])
+
+    self.assertEqual(
+        lines[2].split(u'\t'), [u'xchatlog', u'0', u'0', u'0', u'0', u'1'])
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -10,6 +10,8 @@ scalability.
 """
 
 import abc
+import cPickle
+import time
 
 from plaso.lib import errors
 
@@ -18,9 +20,72 @@ class QueueEndOfInput(object):
   """Class that implements a queue end of input."""
 
 
+class QueueItemBatch(object):
+  """Class that implements a batch of queue items.
+
+  A batch is pushed onto the queue as a single item, which reduces
+  the per item overhead of the queue, such as serialization and locking.
+  """
+
+  def __init__(self, items):
+    """Initializes the queue item batch.
+
+    Args:
+      items: a list of item objects.
+    """
+    super(QueueItemBatch, self).__init__()
+    self.items = items
+
+
+class SerializedQueueItemBatch(object):
+  """Class that implements a serialized batch of queue items.
+
+  The items are serialized once by the producer, hence the same batch can
+  be pushed onto multiple queues without serializing the items per queue.
+  """
+
+  def __init__(self, serialized_items):
+    """Initializes the serialized queue item batch.
+
+    Args:
+      serialized_items: a binary string containing the pickled list of
+                        item objects.
+    """
+    super(SerializedQueueItemBatch, self).__init__()
+    self.serialized_items = serialized_items
+
+  @classmethod
+  def FromItems(cls, items):
+    """Serializes a list of items into a batch.
+
+    Args:
+      items: a list of item objects.
+
+    Returns:
+      The serialized queue item batch (instance of SerializedQueueItemBatch).
+    """
+    return cls(cPickle.dumps(items, cPickle.HIGHEST_PROTOCOL))
+
+  def GetQueueItemBatch(self):
+    """Deserializes the items.
+
+    Returns:
+      The queue item batch (instance of QueueItemBatch).
+    """
+    return QueueItemBatch(cPickle.loads(self.serialized_items))
+
+
 class Queue(object):
   """Class that implements the queue interface."""
 
+  @abc.abstractmethod
+  def GetNumberOfItems(self):
+    """Retrieves the number of items on the queue.
+
+    Returns:
+      The number of items or None if not supported by the queue.
+    """
+
   @abc.abstractmethod
   def IsEmpty(self):
     """Determines if the queue is empty."""
@@ -75,6 +140,14 @@ class QueueProducer(object):
     self._abort = False
     self._queue = queue_object
 
+  def Flush(self):
+    """Flushes the items buffered by the producer onto the queue."""
+    return
+
+  def FlushExpired(self):
+    """Flushes the buffered items if they were buffered for too long."""
+    return
+
   def SignalAbort(self):
     """Signals the producer to abort."""
     self._abort = True
@@ -123,8 +196,15 @@ class EventObjectQueueConsumer(QueueConsumer):
         self._queue.PushItem(item)
         item = next_item
 
+      if isinstance(item, SerializedQueueItemBatch):
+        item = item.GetQueueItemBatch()
+
+      if isinstance(item, QueueItemBatch):
+        for event_object in item.items:
+          self._ConsumeEventObject(event_object, **kwargs)
+
       # Ignore empty items this can happen when the call to PopItem times out.
-      if item:
+      elif item:
         self._ConsumeEventObject(item, **kwargs)
 
     self._abort = False
@@ -144,12 +224,21 @@ class ItemQueueConsumer(QueueConsumer):
       item: the item object.
     """
 
-  def ConsumeItems(self):
-    """Consumes the items that are pushed on the queue."""
+  def ConsumeItems(self, wait_for_end_of_input=False):
+    """Consumes the items that are pushed on the queue.
+
+    Args:
+      wait_for_end_of_input: optional boolean value to indicate the consumer
+                             should keep waiting for items when the queue is
+                             empty, until the end of input is signalled.
+                             The default is False.
+    """
     while not self._abort:
       try:
         item = self._queue.PopItem()
       except errors.QueueEmpty:
+        if wait_for_end_of_input:
+          continue
         break
 
       if isinstance(item, QueueEndOfInput):
@@ -166,8 +255,15 @@ class ItemQueueConsumer(QueueConsumer):
         self._queue.PushItem(item)
         item = next_item
 
+      if isinstance(item, SerializedQueueItemBatch):
+        item = item.GetQueueItemBatch()
+
+      if isinstance(item, QueueItemBatch):
+        for batch_item in item.items:
+          self._ConsumeItem(batch_item)
+
       # Ignore empty items this can happen when the call to PopItem times out.
-      if item:
+      elif item:
         self._ConsumeItem(item)
 
     self._abort = False
@@ -183,17 +279,26 @@ class ItemQueueProducer(QueueProducer):
     """Flushes the queue callback for the QueueFull exception."""
     return
 
-  def ProduceItem(self, item):
-    """Produces an item onto the queue.
+  def _PushItem(self, queue_object, item):
+    """Pushes an item onto a queue.
 
     Args:
+      queue_object: the queue object (instance of Queue).
       item: the item object.
     """
     try:
-      self._queue.PushItem(item)
+      queue_object.PushItem(item)
     except errors.QueueFull:
       self._FlushQueue()
 
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+    Args:
+      item: the item object.
+    """
+    self._PushItem(self._queue, item)
+
   def ProduceItems(self, items):
     """Produces items onto the queue.
 
@@ -202,3 +307,164 @@ class ItemQueueProducer(QueueProducer):
     """
     for item in items:
       self.ProduceItem(item)
+
+
+class BatchItemQueueProducer(ItemQueueProducer):
+  """Class that implements a batching item queue producer.
+
+     The producer buffers the items and pushes them onto the queue as batches
+     (instances of QueueItemBatch), bounded by the number of items and
+     the time since the first item of the batch was produced.
+  """
+
+  def __init__(
+      self, queue_object, maximum_batch_size=256, maximum_batch_time=1.0):
+    """Initializes the queue producer.
+
+    Args:
+      queue_object: the queue object (instance of Queue).
+      maximum_batch_size: optional maximum number of items in a batch.
+                          The default is 256.
+      maximum_batch_time: optional maximum number of seconds an item is
+                          buffered before the batch is pushed onto the queue,
+                          which is checked when an item is produced or
+                          the buffered items are flushed when expired.
+                          The default is 1.0.
+    """
+    super(BatchItemQueueProducer, self).__init__(queue_object)
+    self._batch = []
+    self._batch_start_time = None
+    self._maximum_batch_size = maximum_batch_size
+    self._maximum_batch_time = maximum_batch_time
+
+  def _PopBatch(self):
+    """Pops the items buffered by the producer.
+
+    Returns:
+      A list of the buffered item objects.
+    """
+    batch = self._batch
+    self._batch = []
+    self._batch_start_time = None
+    return batch
+
+  def Flush(self):
+    """Flushes the items buffered by the producer onto the queue."""
+    if not self._batch:
+      return
+
+    self._PushItem(self._queue, QueueItemBatch(self._PopBatch()))
+
+  def FlushExpired(self):
+    """Flushes the buffered items if they were buffered for too long."""
+    if (self._batch and
+        time.time() - self._batch_start_time >= self._maximum_batch_time):
+      self.Flush()
+
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+    Args:
+      item: the item object.
+    """
+    if not self._batch:
+      self._batch_start_time = time.time()
+
+    self._batch.append(item)
+
+    if len(self._batch) >= self._maximum_batch_size:
+      self.Flush()
+    else:
+      self.FlushExpired()
+
+  def SignalEndOfInput(self):
+    """Signals the queue no input remains."""
+    self.Flush()
+    super(BatchItemQueueProducer, self).SignalEndOfInput()
+
+
+class BroadcastItemQueueProducer(BatchItemQueueProducer):
+  """Class that implements a broadcasting item queue producer.
+
+     The producer buffers the items and pushes them onto multiple queues as
+     serialized batches (instances of SerializedQueueItemBatch). The items
+     can be routed by a filter per queue, before they are serialized. Queues
+     that receive the same items share a single serialized batch.
+  """
+
+  def __init__(
+      self, queue_objects, item_filters=None, maximum_batch_size=256,
+      maximum_batch_time=1.0):
+    """Initializes the queue producer.
+
+    Args:
+      queue_objects: a list of queue objects (instances of Queue).
+      item_filters: optional list of item filters, one per queue object.
+                    An item filter is a callable that takes an item and
+                    returns True if the item should be pushed onto the
+                    corresponding queue or None to push every item.
+                    The default is None, which represents every item is
+                    pushed onto every queue.
+      maximum_batch_size: optional maximum number of items in a batch.
+                          The default is 256.
+      maximum_batch_time: optional maximum number of seconds an item is
+                          buffered before the batch is pushed onto the queues,
+                          which is checked when an item is produced or
+                          the buffered items are flushed when expired.
+                          The default is 1.0.
+
+    Raises:
+      ValueError: if the number of item filters does not match the number
+                  of queue objects.
+    """
+    if item_filters is None:
+      item_filters = [None] * len(queue_objects)
+
+    if len(item_filters) != len(queue_objects):
+      raise ValueError(u'Number of item filters does not match queues.')
+
+    # The producer has no single queue, since the batches are pushed onto
+    # the queue objects by Flush.
+    super(BroadcastItemQueueProducer, self).__init__(
+        None, maximum_batch_size=maximum_batch_size,
+        maximum_batch_time=maximum_batch_time)
+    self._item_filters = item_filters
+    self._queue_objects = queue_objects
+
+  def Flush(self):
+    """Flushes the items buffered by the producer onto the queues."""
+    if not self._batch:
+      return
+
+    batch = self._PopBatch()
+
+    # Map the indexes of the routed items to the queues that receive them,
+    # so that every distinct selection of items is serialized only once.
+    queues_per_selection = {}
+    for queue_object, item_filter in zip(
+        self._queue_objects, self._item_filters):
+      if item_filter is None:
+        selection = None
+      else:
+        selection = tuple(
+            index for index, item in enumerate(batch) if item_filter(item))
+        if not selection:
+          continue
+
+      queues_per_selection.setdefault(selection, []).append(queue_object)
+
+    for selection, queue_objects in queues_per_selection.iteritems():
+      if selection is None:
+        items = batch
+      else:
+        items = [batch[index] for index in selection]
+
+      serialized_batch = SerializedQueueItemBatch.FromItems(items)
+      for queue_object in queue_objects:
+        self._PushItem(queue_object, serialized_batch)
+
+  def SignalEndOfInput(self):
+    """Signals the queues no input remains."""
+    self.Flush()
+    for queue_object in self._queue_objects:
+      queue_object.SignalEndOfInput()
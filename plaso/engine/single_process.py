@@ -154,6 +154,9 @@ class SingleProcessEngine(engine.BaseEngine):
 
     extraction_worker.SetEnableDebugOutput(self._enable_debug_output)
 
+    if self._enable_parse_cache:
+      extraction_worker.SetEnableParseCache(self._enable_parse_cache)
+
     extraction_worker.SetEnableProfiling(
         self._enable_profiling,
         profiling_sample_rate=self._profiling_sample_rate,
@@ -324,6 +327,14 @@ class SingleProcessQueue(queue.Queue):
     self._queue = collections.deque(
         maxlen=maximum_number_of_queued_items)
 
+  def GetNumberOfItems(self):
+    """Retrieves the number of items on the queue.
+
+    Returns:
+      The number of items.
+    """
+    return len(self._queue)
+
   def IsEmpty(self):
     """Determines if the queue is empty."""
     return len(self._queue) == 0
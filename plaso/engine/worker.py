@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
 """The event extraction worker."""
 
+import collections
+import cPickle
+import hashlib
 import logging
 import os
+import tempfile
+import time
+
+from multiprocessing import pool
 
 from dfvfs.analyzer import analyzer
 from dfvfs.lib import definitions as dfvfs_definitions
@@ -16,9 +23,59 @@ from plaso.engine import profiler
 from plaso.engine import queue
 from plaso.lib import errors
 from plaso.hashers import manager as hashers_manager
+from plaso.hashers import parallel
 from plaso.parsers import manager as parsers_manager
 
 
+class FileEntryClassification(object):
+  """Class that contains the classification of file entries.
+
+  The classification is shared by the file entries with the same fingerprint.
+
+  Attributes:
+    parser_names: the names of the parsers for which the content matches their
+                  known signatures or None if not determined.
+    rejected_parser_names: a set of the names of the parsers that rejected
+                           the content.
+  """
+
+  def __init__(self):
+    """Initializes the file entry classification object."""
+    super(FileEntryClassification, self).__init__()
+    self.parser_names = None
+    self.rejected_parser_names = set()
+
+
+class ParseCacheEntry(object):
+  """Class that contains the recorded parse results of a file entry.
+
+  Attributes:
+    digest: the hexadecimal SHA-256 of the content or None if not determined.
+    is_modified: boolean value to indicate the entry was modified since it
+                 was read from the parse cache directory.
+    key: a tuple containing the parse cache key of the file entry.
+    path_spec: the path specification of the file entry that was parsed.
+    parse_results: a dictionary containing a tuple of the parse result and
+                   the recorded events and parse errors per parser name.
+  """
+
+  def __init__(self, key, path_spec, digest=None):
+    """Initializes the parse cache entry object.
+
+    Args:
+      key: a tuple containing the parse cache key of the file entry.
+      path_spec: the path specification of the file entry that was parsed.
+      digest: optional hexadecimal SHA-256 of the content. The default is None,
+              which represents the SHA-256 is not determined.
+    """
+    super(ParseCacheEntry, self).__init__()
+    self.digest = digest
+    self.is_modified = False
+    self.key = key
+    self.parse_results = {}
+    self.path_spec = path_spec
+
+
 class BaseEventExtractionWorker(queue.ItemQueueConsumer):
   """Class that defines the event extraction worker base.
 
@@ -30,7 +87,27 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
   are pushed on a storage queue for further processing.
   """
 
-  DEFAULT_HASH_READ_SIZE = 4096
+  # The size of the reads of the file entry content, which is 1 MiB.
+  _CONTENT_READ_SIZE = 1024 * 1024
+
+  # The maximum size of the file entry content that is kept in memory
+  # for the parsers, which is 4 MiB.
+  _MAXIMUM_CACHED_CONTENT_SIZE = 4 * 1024 * 1024
+
+  _CONTENT_SCAN_RESULT = collections.namedtuple(
+      u'content_scan_result', u'content digests parser_names')
+
+  # The size of the blocks at the start and the end of the content that are
+  # part of the fingerprint, which is 64 KiB.
+  _FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+  # The maximum number of fingerprints kept in the classification cache.
+  _MAXIMUM_CLASSIFICATION_CACHE_SIZE = 65536
+
+  # The maximum number of file entries and recorded events kept in
+  # the parse cache.
+  _MAXIMUM_PARSE_CACHE_SIZE = 65536
+  _MAXIMUM_PARSE_CACHE_NUMBER_OF_EVENTS = 100000
 
   def __init__(
       self, identifier, process_queue, event_queue_producer,
@@ -50,7 +127,11 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
                         The default is None.
     """
     super(BaseEventExtractionWorker, self).__init__(process_queue)
+    self._cache_signature_matches = False
+    self._classification_cache = {}
+    self._current_file_content = None
     self._enable_debug_output = False
+    self._hashing_thread_pool = None
     self._identifier = identifier
     self._identifier_string = u'Worker_{0:d}'.format(identifier)
     self._file_scanner = None
@@ -59,18 +140,25 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._non_sigscan_parser_names = None
     self._open_files = False
     self._parser_mediator = parser_mediator
+    self._parse_cache = None
+    self._parse_cache_number_of_events = 0
+    self._parse_cache_path = None
     self._parser_objects = None
     self._process_archive_files = False
     self._resolver_context = resolver_context
     self._specification_store = None
+    self._status_callback = None
 
     self._event_queue_producer = event_queue_producer
     self._parse_error_queue_producer = parse_error_queue_producer
 
     # Attributes that contain the current status of the worker.
+    self._current_file_start_time = 0.0
+    self._current_parser_name = u''
     self._current_working_file = u''
     self._is_running = False
     self._number_of_file_entries = 0
+    self._processed_data_size = 0
 
     # Attributes for profiling.
     self._enable_profiling = False
@@ -93,28 +181,146 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
           path_spec.comparable))
       return
 
-    if self._hasher_names:
+    # The hash attributes of the previous file entry should not be added
+    # to the event objects of this file entry.
+    self._parser_mediator.ClearEventAttributes()
+
+    content_scan_result = None
+    if self._ShouldScanFileEntryContent(file_entry):
       try:
-        digests = self.HashFileEntry(file_entry)
-        if digests:
-          for hash_name, digest in digests.iteritems():
-            attribute_string = u'{0:s}_hash'.format(hash_name)
-            self._parser_mediator.AddEventAttribute(attribute_string, digest)
+        content_scan_result = self._ScanFileEntryContent(file_entry)
 
       except IOError as exception:
-        logging.warning(u'Unable to hash file: {0:s} with error: {1:s}'.format(
+        logging.warning(u'Unable to read file: {0:s} with error: {1:s}'.format(
             path_spec.comparable, exception))
 
+    if content_scan_result and self._hasher_names:
+      for hash_name in self._hasher_names:
+        digest = content_scan_result.digests.get(hash_name, None)
+        if digest:
+          attribute_string = u'{0:s}_hash'.format(hash_name)
+          self._parser_mediator.AddEventAttribute(attribute_string, digest)
+
     try:
-      self.ParseFileEntry(file_entry)
+      self.ParseFileEntry(file_entry, content_scan_result=content_scan_result)
     except IOError as exception:
       logging.warning(u'Unable to parse file: {0:s} with error: {1:s}'.format(
           path_spec.comparable, exception))
 
+    # The event objects are buffered across file entries and only flushed
+    # when the worker is about to wait for the next file entry, so they do
+    # not linger in the producer while the worker is idle, or when they
+    # were buffered for too long.
+    if self._queue.IsEmpty():
+      self._event_queue_producer.Flush()
+    else:
+      self._event_queue_producer.FlushExpired()
+
   def _DebugParseFileEntry(self):
     """Callback for debugging file entry parsing failures."""
     return
 
+  def _GetFileEntryClassification(self, file_entry, content=None):
+    """Retrieves the classification of a file entry from the cache.
+
+    Args:
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      content: optional binary string containing the content of the file
+               entry. The default is None, which represents the content is
+               read to determine the fingerprint.
+
+    Returns:
+      A file entry classification (instance of FileEntryClassification)
+      or None if the fingerprint cannot be determined.
+    """
+    fingerprint = self._GetFileEntryFingerprint(file_entry, content=content)
+    if not fingerprint:
+      return
+
+    classification = self._classification_cache.get(fingerprint, None)
+    if not classification:
+      classification = FileEntryClassification()
+
+      number_of_classifications = len(self._classification_cache)
+      if number_of_classifications < self._MAXIMUM_CLASSIFICATION_CACHE_SIZE:
+        self._classification_cache[fingerprint] = classification
+
+    return classification
+
+  def _GetFileEntryFingerprint(self, file_entry, content=None):
+    """Determines the fingerprint of a file entry.
+
+    The fingerprint consists of the name, the size and the MD5 of the blocks
+    at the start and the end of the content, which is cheap to determine but
+    also identifies file entries with different content in the middle.
+    The name is part of the fingerprint since parsers and their plugins can
+    reject file entries based on the name.
+
+    Args:
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      content: optional binary string containing the content of the file
+               entry. The default is None, which represents the content is
+               read to determine the fingerprint.
+
+    Returns:
+      A tuple containing the name, the size and the hexadecimal MD5 of
+      the blocks or None if the file entry cannot be read.
+    """
+    md5_context = hashlib.md5()
+
+    if content is not None:
+      data_size = len(content)
+      md5_context.update(content[:self._FINGERPRINT_BLOCK_SIZE])
+      if data_size > self._FINGERPRINT_BLOCK_SIZE:
+        end_block_offset = max(
+            data_size - self._FINGERPRINT_BLOCK_SIZE,
+            self._FINGERPRINT_BLOCK_SIZE)
+        md5_context.update(content[end_block_offset:])
+
+    else:
+      try:
+        file_object = file_entry.GetFileObject()
+        try:
+          data_size = file_object.get_size()
+          md5_context.update(file_object.read(self._FINGERPRINT_BLOCK_SIZE))
+          if data_size > self._FINGERPRINT_BLOCK_SIZE:
+            end_block_offset = max(
+                data_size - self._FINGERPRINT_BLOCK_SIZE,
+                self._FINGERPRINT_BLOCK_SIZE)
+            file_object.seek(end_block_offset, os.SEEK_SET)
+            md5_context.update(file_object.read(self._FINGERPRINT_BLOCK_SIZE))
+        finally:
+          file_object.close()
+
+      except IOError as exception:
+        logging.debug(
+            u'Unable to fingerprint file: {0:s} with error: {1:s}'.format(
+                file_entry.path_spec.comparable, exception))
+        return
+
+    return file_entry.name, data_size, md5_context.hexdigest()
+
+  def _GetParserNamesFromScanState(self, scan_state):
+    """Retrieves the parser names from the results of a signature scan.
+
+    Args:
+      scan_state: the scan state (instance of pysigscan.scan_state).
+
+    Returns:
+      A list of parser names for which the scanned data matches their
+      known signatures.
+    """
+    parser_name_list = []
+    for scan_result in scan_state.scan_results:
+      format_specification = (
+          self._specification_store.GetSpecificationBySignature(
+              scan_result.identifier))
+
+      if format_specification.identifier not in parser_name_list:
+        parser_name_list.append(format_specification.identifier)
+
+    return parser_name_list
+
   def _GetSignatureMatchParserNames(self, file_entry):
     """Determines if a file matches one of the known signatures.
 
@@ -125,7 +331,6 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
       A list of parser names for which the file entry matches their
       known signatures.
     """
-    parser_name_list = []
     scan_state = pysigscan.scan_state()
 
     file_object = file_entry.GetFileObject()
@@ -134,15 +339,193 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     finally:
       file_object.close()
 
-    for scan_result in scan_state.scan_results:
-      format_specification = (
-          self._specification_store.GetSpecificationBySignature(
-              scan_result.identifier))
+    return self._GetParserNamesFromScanState(scan_state)
 
-      if format_specification.identifier not in parser_name_list:
-        parser_name_list.append(format_specification.identifier)
+  def _GetContentDigest(self, file_entry, content_scan_result=None):
+    """Determines the SHA-256 of the content of a file entry.
 
-    return parser_name_list
+    Args:
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      content_scan_result: optional content scan result (instance of
+                           content_scan_result) that can contain the SHA-256
+                           of the content. The default is None, which
+                           represents the content is read to determine
+                           the SHA-256.
+
+    Returns:
+      The hexadecimal SHA-256 of the content or None if the file entry cannot
+      be read.
+    """
+    if content_scan_result:
+      digest = content_scan_result.digests.get(u'sha256', None)
+      if digest:
+        return digest
+
+    sha256_context = hashlib.sha256()
+
+    try:
+      file_object = file_entry.GetFileObject()
+      try:
+        data = file_object.read(self._CONTENT_READ_SIZE)
+        while data:
+          sha256_context.update(data)
+          data = file_object.read(self._CONTENT_READ_SIZE)
+      finally:
+        file_object.close()
+
+    except IOError as exception:
+      logging.debug(u'Unable to hash file: {0:s} with error: {1:s}'.format(
+          file_entry.path_spec.comparable, exception))
+      return
+
+    return sha256_context.hexdigest()
+
+  def _GetParseCacheEntry(self, file_entry, content_scan_result=None):
+    """Retrieves the parse cache entry of a file entry.
+
+    The parse cache is keyed by the location, the inode, the size and
+    the modification time of a file entry, which are the same for
+    an unchanged file in different VSS stores and are determined without
+    reading the content. Only when a file entry has the same key as a file
+    entry that was parsed before, the content of both is hashed to make sure
+    it is the same.
+
+    If the parse cache is shared with other worker processes, the entries are
+    read from the parse cache directory instead of kept in memory, so that
+    the file entries parsed by the other worker processes are reused as well.
+
+    Args:
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      content_scan_result: optional content scan result (instance of
+                           content_scan_result) that can contain the SHA-256
+                           of the content. The default is None.
+
+    Returns:
+      A parse cache entry (instance of ParseCacheEntry) or None if the parse
+      results of the file entry cannot be cached or reused.
+    """
+    location = getattr(file_entry.path_spec, u'location', None)
+    if not location:
+      return
+
+    stat_object = file_entry.GetStat()
+    data_size = getattr(stat_object, u'size', None)
+    modification_time = getattr(stat_object, u'mtime', None)
+    if data_size is None or modification_time is None:
+      return
+
+    parse_cache_key = (
+        location, getattr(stat_object, u'ino', None), data_size,
+        modification_time, getattr(stat_object, u'mtime_nano', None))
+
+    if self._parse_cache_path:
+      parse_cache_entry = self._ReadParseCacheEntry(parse_cache_key)
+    else:
+      parse_cache_entry = self._parse_cache.get(parse_cache_key, None)
+
+    if not parse_cache_entry:
+      if not self._parse_cache_path and (
+          len(self._parse_cache) >= self._MAXIMUM_PARSE_CACHE_SIZE or
+          self._parse_cache_number_of_events >=
+          self._MAXIMUM_PARSE_CACHE_NUMBER_OF_EVENTS):
+        return
+
+      digest = None
+      if content_scan_result:
+        digest = content_scan_result.digests.get(u'sha256', None)
+
+      parse_cache_entry = ParseCacheEntry(
+          parse_cache_key, file_entry.path_spec, digest=digest)
+      if not self._parse_cache_path:
+        self._parse_cache[parse_cache_key] = parse_cache_entry
+      return parse_cache_entry
+
+    # The same file entry does not need to be hashed.
+    path_spec = parse_cache_entry.path_spec
+    if file_entry.path_spec.comparable == path_spec.comparable:
+      return parse_cache_entry
+
+    if not parse_cache_entry.digest:
+      cached_file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+          path_spec, resolver_context=self._resolver_context)
+      if cached_file_entry:
+        parse_cache_entry.digest = self._GetContentDigest(cached_file_entry)
+        parse_cache_entry.is_modified = True
+
+    digest = self._GetContentDigest(
+        file_entry, content_scan_result=content_scan_result)
+    if not digest or digest != parse_cache_entry.digest:
+      return
+
+    return parse_cache_entry
+
+  def _GetParseCacheEntryPath(self, parse_cache_key):
+    """Retrieves the path of a parse cache entry in the parse cache directory.
+
+    Args:
+      parse_cache_key: a tuple containing the parse cache key.
+
+    Returns:
+      The path of the parse cache entry.
+    """
+    file_name = hashlib.sha256(repr(parse_cache_key)).hexdigest()
+    return os.path.join(self._parse_cache_path, file_name)
+
+  def _ParseFileEntryWithCachedParser(
+      self, parser_object, file_entry, parse_cache_entry):
+    """Parses a file entry with a specific parser using the parse cache.
+
+    If the file entry content was parsed before by the parser its recorded
+    events and parse errors are produced for the file entry instead of
+    parsing it again.
+
+    Args:
+      parser_object: A parser object (instance of BaseParser).
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      parse_cache_entry: The parse cache entry (instance of ParseCacheEntry)
+                         of the file entry.
+
+    Returns:
+      A boolean value indicating if the parser did not reject the file entry.
+
+    Raises:
+      QueueFull: If a queue is full.
+    """
+    parse_result = parse_cache_entry.parse_results.get(
+        parser_object.NAME, None)
+    if parse_result is not None:
+      logging.debug(u'[{0:s}] Reusing parse results for: {1:s}'.format(
+          parser_object.NAME, file_entry.path_spec.comparable))
+
+      result, recorded_events = parse_result
+      self._parser_mediator.SetFileEntry(file_entry)
+      try:
+        self._parser_mediator.ProduceRecordedEvents(recorded_events)
+      finally:
+        self._parser_mediator.ResetFileEntry()
+      return result
+
+    self._parser_mediator.StartEventRecording()
+    try:
+      result = self._ParseFileEntryWithParser(parser_object, file_entry)
+    finally:
+      recorded_events = self._parser_mediator.StopEventRecording()
+
+    # The recorded events of a parse cache that is shared with other worker
+    # processes are stored in the parse cache directory, hence only those
+    # of the current file entry are kept in memory.
+    number_of_events = len(recorded_events)
+    if not self._parse_cache_path:
+      number_of_events += self._parse_cache_number_of_events
+
+    if number_of_events <= self._MAXIMUM_PARSE_CACHE_NUMBER_OF_EVENTS:
+      parse_cache_entry.parse_results[parser_object.NAME] = (
+          result, recorded_events)
+      parse_cache_entry.is_modified = True
+      if not self._parse_cache_path:
+        self._parse_cache_number_of_events = number_of_events
+
+    return result
 
   def _ParseFileEntryWithParser(self, parser_object, file_entry):
     """Parses a file entry with a specific parser.
@@ -151,19 +534,28 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
       parser_object: A parser object (instance of BaseParser).
       file_entry: A file entry object (instance of dfvfs.FileEntry).
 
+    Returns:
+      A boolean value indicating if the parser did not reject the file entry,
+      where rejecting means raising UnableToParseFile.
+
     Raises:
       QueueFull: If a queue is full.
     """
     # We need to reset the parser mediator before each file, to clear out any
     # lingering data from the previous file parsed.
-    self._parser_mediator.SetFileEntry(file_entry)
+    self._parser_mediator.SetFileEntry(
+        file_entry, file_content=self._current_file_content)
 
     reference_count = self._resolver_context.GetFileObjectReferenceCount(
         file_entry.path_spec)
 
+    self._current_parser_name = parser_object.NAME
+    self._UpdateStatus()
+
     if self._parsers_profiler:
       self._parsers_profiler.StartTiming(parser_object.NAME)
 
+    result = True
     try:
       parser_object.UpdateChainAndParse(self._parser_mediator)
 
@@ -171,6 +563,10 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
       logging.debug(u'Not a {0:s} file ({1:s}) - {2:s}'.format(
           parser_object.NAME, file_entry.name, exception))
 
+      result = False
+      if self._parsers_profiler:
+        self._parsers_profiler.AddRejection(parser_object.NAME)
+
     except errors.QueueFull:
       raise
 
@@ -208,6 +604,8 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
             u'specification: {1:s}.').format(
                 parser_object.NAME, file_entry.path_spec.comparable))
 
+    return result
+
   def _ProcessArchiveFile(self, file_entry):
     """Processes an archive file (file that contains file entries).
 
@@ -342,60 +740,179 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     if self._parsers_profiler:
       self._parsers_profiler.Write()
 
-  def GetStatus(self):
-    """Returns a status dictionary."""
-    return {
-        u'current_file': self._current_working_file,
-        u'identifier': self._identifier_string,
-        u'is_running': self._is_running,
-        u'number_of_events': self._parser_mediator.number_of_events}
-
-  def HashFileEntry(self, file_entry):
-    """Produces a dictionary containing hash digests of the file entry content.
+  def _ReadParseCacheEntry(self, parse_cache_key):
+    """Reads a parse cache entry from the parse cache directory.
 
     Args:
-      file_entry: The file entry object to be hashed (instance of
-                  dfvfs.FileEntry)
+      parse_cache_key: a tuple containing the parse cache key.
 
     Returns:
-      A dictionary mapping hasher names to the digest calculated by that hasher,
-      or None if the file_entry is not a file, or no hashers are enabled.
+      A parse cache entry (instance of ParseCacheEntry) or None if not
+      available.
     """
-    logging.debug(u'[HashFileEntry] Hashing: {0:s}'.format(
-        file_entry.path_spec.comparable))
-    if not file_entry.IsFile() or not self._hasher_names:
+    parse_cache_entry_path = self._GetParseCacheEntryPath(parse_cache_key)
+    if not os.path.exists(parse_cache_entry_path):
+      return
+
+    try:
+      with open(parse_cache_entry_path, 'rb') as file_object:
+        parse_cache_entry = cPickle.load(file_object)
+
+    except (IOError, EOFError, cPickle.UnpicklingError) as exception:
+      logging.warning(
+          u'Unable to read parse cache entry: {0:s} with error: {1:s}'.format(
+              parse_cache_entry_path, exception))
+      return
+
+    if parse_cache_entry.key != parse_cache_key:
       return
 
+    parse_cache_entry.is_modified = False
+    return parse_cache_entry
+
+  def _ScanFileEntryContent(self, file_entry):
+    """Reads the content of a file entry once to hash and signature scan it.
+
+    The content is read in large blocks. Every block is passed to the hashers,
+    which are updated on the hashing thread pool while the next block is
+    read, and to the signature scanner. The content of a small file entry
+    is kept, so that its parsers do not have to read it again.
+
+    Args:
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+
+    Returns:
+      A content scan result (instance of content_scan_result) that contains
+      the content or None if the content is too large to keep, a dictionary
+      mapping hasher names to digests and the parser names for which
+      the content matches their known signatures or None if no signature
+      scanner is set.
+
+    Raises:
+      IOError: if the content cannot be read.
+    """
     hasher_objects = hashers_manager.HashersManager.GetHasherObjects(
-        self._hasher_names)
+        self._hasher_names or [])
+    parallel_hasher = parallel.ParallelHasher(
+        hasher_objects, thread_pool=self._hashing_thread_pool)
+
+    content_blocks = []
+    content_size = 0
+    scan_state = None
 
     file_object = file_entry.GetFileObject()
     try:
-      file_object.seek(0, os.SEEK_SET)
+      if self._file_scanner:
+        scan_state = pysigscan.scan_state()
+        scan_state.set_data_size(file_object.get_size())
+        self._file_scanner.scan_start(scan_state)
 
-      # We only do one read, then pass it to each of the hashers in turn.
-      data = file_object.read(self.DEFAULT_HASH_READ_SIZE)
+      data = file_object.read(self._CONTENT_READ_SIZE)
       while data:
-        for hasher in hasher_objects:
-          hasher.Update(data)
-        data = file_object.read(self.DEFAULT_HASH_READ_SIZE)
-
-      digests = {}
-      # Get the digest values for every active hasher.
-      for hasher in hasher_objects:
-        digests[hasher.NAME] = hasher.GetStringDigest()
-        logging.debug(
-            u'[HashFileEntry] Digest {0:s} calculated for {1:s}.'.format(
-                hasher.GetStringDigest(), file_entry.path_spec.comparable))
+        parallel_hasher.Update(data)
+
+        if scan_state:
+          self._file_scanner.scan_buffer(scan_state, data)
+
+        if content_blocks is not None:
+          content_size += len(data)
+          if content_size <= self._MAXIMUM_CACHED_CONTENT_SIZE:
+            content_blocks.append(data)
+          else:
+            content_blocks = None
+
+        data = file_object.read(self._CONTENT_READ_SIZE)
+
     finally:
       file_object.close()
 
+    parser_names = None
+    if scan_state:
+      self._file_scanner.scan_stop(scan_state)
+      parser_names = self._GetParserNamesFromScanState(scan_state)
+
+    content = None
+    if content_blocks is not None:
+      content = b''.join(content_blocks)
+
+    digests = parallel_hasher.GetStringDigests()
+
     if self._enable_profiling:
       self._ProfilingSampleMemory()
 
-    logging.debug(u'[HashFileEntry] Finished hashing: {0:s}'.format(
-        file_entry.path_spec.comparable))
-    return digests
+    return self._CONTENT_SCAN_RESULT(content, digests, parser_names)
+
+  def _ShouldScanFileEntryContent(self, file_entry):
+    """Determines if the content of a file entry should be read in advance.
+
+    Args:
+      file_entry: A file entry object (instance of dfvfs.FileEntry).
+
+    Returns:
+      A boolean value indicating the content should be read in advance, which
+      is the case for files that need to be hashed or are small enough to
+      keep their content.
+    """
+    if not file_entry.IsFile():
+      return False
+
+    if self._hasher_names:
+      return True
+
+    stat_object = file_entry.GetStat()
+    data_size = getattr(stat_object, u'size', None)
+    return (
+        data_size is not None and
+        data_size <= self._MAXIMUM_CACHED_CONTENT_SIZE)
+
+  def _UpdateStatus(self):
+    """Reports the status to the status callback, if set."""
+    if self._status_callback:
+      self._status_callback(self.GetStatus())
+
+  def _WriteParseCacheEntry(self, parse_cache_entry):
+    """Writes a parse cache entry to the parse cache directory.
+
+    The entry is written to a temporary file first, which is renamed
+    afterwards, so that the other worker processes never read a partially
+    written entry.
+
+    Args:
+      parse_cache_entry: the parse cache entry (instance of ParseCacheEntry).
+    """
+    parse_cache_entry_path = self._GetParseCacheEntryPath(
+        parse_cache_entry.key)
+
+    temporary_file = tempfile.NamedTemporaryFile(
+        dir=self._parse_cache_path, delete=False)
+    try:
+      with temporary_file:
+        cPickle.dump(
+            parse_cache_entry, temporary_file, cPickle.HIGHEST_PROTOCOL)
+
+      os.rename(temporary_file.name, parse_cache_entry_path)
+
+    except (IOError, OSError, TypeError, cPickle.PicklingError) as exception:
+      logging.warning(
+          u'Unable to write parse cache entry: {0:s} with error: {1:s}'.format(
+              parse_cache_entry_path, exception))
+
+      try:
+        os.remove(temporary_file.name)
+      except OSError:
+        pass
+
+  def GetStatus(self):
+    """Returns a status dictionary."""
+    return {
+        u'current_file': self._current_working_file,
+        u'current_file_start_time': self._current_file_start_time,
+        u'current_parser': self._current_parser_name,
+        u'identifier': self._identifier_string,
+        u'is_running': self._is_running,
+        u'number_of_events': self._parser_mediator.number_of_events,
+        u'number_of_file_entries': self._number_of_file_entries,
+        u'processed_data_size': self._processed_data_size}
 
   def InitializeParserObjects(self, parser_filter_string=None):
     """Initializes the parser objects.
@@ -418,16 +935,37 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._file_scanner = parsers_manager.ParsersManager.GetScanner(
         self._specification_store)
 
+    # The signature matches of a file entry can only be reused for file
+    # entries with the same fingerprint if every signature is bound to
+    # the blocks that are part of the fingerprint.
+    self._cache_signature_matches = True
+    for format_specification in self._specification_store.specifications:
+      for signature in format_specification.signatures:
+        if signature.offset is None:
+          self._cache_signature_matches = False
+          break
+
+        signature_end_offset = abs(signature.offset) + len(signature.pattern)
+        if signature_end_offset > self._FINGERPRINT_BLOCK_SIZE:
+          self._cache_signature_matches = False
+          break
+
+    self._classification_cache = {}
+
     self._parser_objects = parsers_manager.ParsersManager.GetParserObjects(
         parser_filter_string=parser_filter_string)
 
     self._filestat_parser_object = self._parser_objects.get(u'filestat', None)
 
-  def ParseFileEntry(self, file_entry):
+  def ParseFileEntry(self, file_entry, content_scan_result=None):
     """Parses a file entry.
 
     Args:
       file_entry: A file entry object (instance of dfvfs.FileEntry).
+      content_scan_result: optional content scan result (instance of
+                           content_scan_result) of the file entry. The default
+                           is None, which represents the content is read by
+                           the signature scanner and the parsers.
 
     Raises:
       RuntimeError: if the parser object is missing.
@@ -437,6 +975,9 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
     self._current_working_file = getattr(
         file_entry.path_spec, u'location', file_entry.name)
+    self._current_file_start_time = time.time()
+    self._current_parser_name = u''
+    self._UpdateStatus()
 
     reference_count = self._resolver_context.GetFileObjectReferenceCount(
         file_entry.path_spec)
@@ -451,19 +992,73 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
         is_archive = self._ProcessArchiveFile(file_entry)
 
     if is_file and not is_archive and not is_compressed_stream:
-      parser_name_list = self._GetSignatureMatchParserNames(file_entry)
+      content = None
+      if content_scan_result:
+        content = content_scan_result.content
+
+      classification = self._GetFileEntryClassification(
+          file_entry, content=content)
+
+      if content_scan_result and content_scan_result.parser_names is not None:
+        parser_name_list = content_scan_result.parser_names
+
+      elif classification and classification.parser_names is not None:
+        parser_name_list = classification.parser_names
+
+      else:
+        parser_name_list = self._GetSignatureMatchParserNames(file_entry)
+        if classification and self._cache_signature_matches:
+          classification.parser_names = parser_name_list
+
       if not parser_name_list:
         parser_name_list = self._non_sigscan_parser_names
 
-      for parser_name in parser_name_list:
-        parser_object = self._parser_objects.get(parser_name, None)
-        if not parser_object:
-          raise RuntimeError(u'No such parser: {0:s}'.format(parser_name))
+      parse_cache_entry = None
+      if self._parse_cache is not None:
+        parse_cache_entry = self._GetParseCacheEntry(
+            file_entry, content_scan_result=content_scan_result)
 
-        logging.debug(u'Trying to parse: {0:s} with parser: {1:s}'.format(
-            file_entry.name, parser_name))
+      if content_scan_result:
+        self._current_file_content = content_scan_result.content
 
-        self._ParseFileEntryWithParser(parser_object, file_entry)
+      try:
+        for parser_name in parser_name_list:
+          parser_object = self._parser_objects.get(parser_name, None)
+          if not parser_object:
+            raise RuntimeError(u'No such parser: {0:s}'.format(parser_name))
+
+          if (classification and
+              parser_name in classification.rejected_parser_names):
+            logging.debug((
+                u'Skipping parser: {0:s} for: {1:s} since it rejected '
+                u'the same content before.').format(
+                    parser_name, file_entry.name))
+
+            if self._parsers_profiler:
+              self._parsers_profiler.AddSkip(parser_name)
+            continue
+
+          logging.debug(u'Trying to parse: {0:s} with parser: {1:s}'.format(
+              file_entry.name, parser_name))
+
+          # The filestat parser is never cached since its events are derived
+          # from the file entry metadata instead of the content.
+          if (parse_cache_entry and
+              parser_object != self._filestat_parser_object):
+            result = self._ParseFileEntryWithCachedParser(
+                parser_object, file_entry, parse_cache_entry)
+          else:
+            result = self._ParseFileEntryWithParser(parser_object, file_entry)
+
+          if classification and not result:
+            classification.rejected_parser_names.add(parser_name)
+
+      finally:
+        self._current_file_content = None
+
+      if (self._parse_cache_path and parse_cache_entry and
+          parse_cache_entry.is_modified):
+        self._WriteParseCacheEntry(parse_cache_entry)
 
     elif self._filestat_parser_object:
       # TODO: for archive and compressed stream files is the desired behavior
@@ -480,7 +1075,13 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
     # We do not clear self._current_working_file here to allow the foreman
     # to see which file was previously processed.
+    self._current_parser_name = u''
     self._number_of_file_entries += 1
+    if is_file:
+      stat_object = file_entry.GetStat()
+      self._processed_data_size += getattr(stat_object, u'size', 0) or 0
+
+    self._UpdateStatus()
 
     logging.debug(u'[ParseFileEntry] Done parsing: {0:s}'.format(
         file_entry.path_spec.comparable))
@@ -495,20 +1096,34 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     if self._enable_profiling:
       self._ProfilingStart()
 
+    if self._hasher_names:
+      # The hashers are updated on threads since hashlib releases the GIL
+      # while hashing.
+      self._hashing_thread_pool = pool.ThreadPool(
+          processes=len(self._hasher_names))
+
     self._is_running = True
+    self._UpdateStatus()
 
     logging.info(
         u'Worker {0:d} (PID: {1:d}) started monitoring process queue.'.format(
             self._identifier, os.getpid()))
 
     self.ConsumeItems()
+    self._event_queue_producer.Flush()
 
     logging.info(
         u'Worker {0:d} (PID: {1:d}) stopped monitoring process queue.'.format(
             self._identifier, os.getpid()))
 
+    if self._hashing_thread_pool:
+      self._hashing_thread_pool.close()
+      self._hashing_thread_pool.join()
+      self._hashing_thread_pool = None
+
     self._current_working_file = u''
     self._is_running = False
+    self._UpdateStatus()
 
     if self._enable_profiling:
       self._ProfilingStop()
@@ -545,6 +1160,30 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
       if profiling_type in [u'all', u'parsers'] and not self._parsers_profiler:
         self._parsers_profiler = profiler.ParsersProfiler(self._identifier)
 
+  def SetEnableParseCache(self, enable_parse_cache, parse_cache_path=None):
+    """Enables or disables the parse cache.
+
+    The parse cache records the events produced for a file entry by
+    location and content digest, so that the same unchanged file in
+    another VSS store is not parsed again.
+
+    Args:
+      enable_parse_cache: boolean value to indicate if the parse cache
+                          should be enabled.
+      parse_cache_path: optional path of the parse cache directory, which is
+                        shared with other worker processes. The default is
+                        None, which represents the parse cache is kept in
+                        memory by the worker.
+    """
+    if enable_parse_cache:
+      if self._parse_cache is None:
+        self._parse_cache = {}
+      self._parse_cache_path = parse_cache_path
+    else:
+      self._parse_cache = None
+      self._parse_cache_number_of_events = 0
+      self._parse_cache_path = None
+
   def SetFilterObject(self, filter_object):
     """Sets the filter object.
 
@@ -582,6 +1221,23 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     self._process_archive_files = process_archive_files
 
+  def SetStatusCallback(self, status_callback):
+    """Sets the status callback.
+
+    The status callback is called with the status dictionary when
+    the worker starts and stops and when it starts processing a file entry
+    or parser, as well as periodically while events are produced.
+
+    Args:
+      status_callback: function to call with the status dictionary or None
+                       to not call a function.
+    """
+    self._status_callback = status_callback
+    if status_callback:
+      self._parser_mediator.SetStatusCallback(self._UpdateStatus)
+    else:
+      self._parser_mediator.SetStatusCallback(None)
+
   def SetTextPrepend(self, text_prepend):
     """Sets the text prepend.
 
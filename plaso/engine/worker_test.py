@@ -2,13 +2,19 @@
 # -*- coding: utf-8 -*-
 """Tests the worker."""
 
+import os
+import shutil
+import tarfile
+import tempfile
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import context
+from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.engine import knowledge_base
+from plaso.engine import profiler
 from plaso.engine import single_process
 from plaso.engine import test_lib
 from plaso.engine import worker
@@ -191,6 +197,303 @@ class BaseEventExtractionWorkerTest(test_lib.EngineTestCase):
 
     extraction_worker.InitializeParserObjects()
 
+    extraction_worker.SetHashers(hasher_names_string=u'md5,sha256')
+    extraction_worker.InitializeParserObjects(parser_filter_string=u'syslog')
+
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+
+    collection_queue.PushItem(path_spec)
+    extraction_worker.Run()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(storage_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.number_of_items, 13)
+
+    event_object = test_queue_consumer.items[0]
+    self.assertEqual(
+        event_object.md5_hash, u'86b1befdcb6f95424b7af56017ac2dd9')
+    self.assertEqual(
+        event_object.sha256_hash,
+        u'b9bee1add1b34d1e8200df89667d244914def9d260931c732dada15dfe172aec')
+
+  def testScanFileEntryContent(self):
+    """Tests the _ScanFileEntryContent function."""
+    collection_queue = single_process.SingleProcessQueue()
+    storage_queue = single_process.SingleProcessQueue()
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        storage_queue)
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, None, knowledge_base.KnowledgeBase())
+
+    resolver_context = context.Context()
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, collection_queue, event_queue_producer, None, parser_mediator,
+        resolver_context=resolver_context)
+    extraction_worker.InitializeParserObjects()
+    extraction_worker.SetHashers(hasher_names_string=u'md5')
+
+    # pylint: disable=protected-access
+    for filename in [u'syslog', u'WUAUCLT.EXE-830BCC14.pf', u'cookies.db']:
+      source_path = self._GetTestFilePath([filename])
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+      file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+          path_spec, resolver_context=resolver_context)
+
+      self.assertTrue(
+          extraction_worker._ShouldScanFileEntryContent(file_entry))
+
+      content_scan_result = extraction_worker._ScanFileEntryContent(file_entry)
+
+      with open(source_path, 'rb') as file_object:
+        self.assertEqual(content_scan_result.content, file_object.read())
+
+      self.assertEqual(content_scan_result.digests.keys(), [u'md5'])
+
+      expected_parser_names = extraction_worker._GetSignatureMatchParserNames(
+          file_entry)
+      self.assertEqual(
+          sorted(content_scan_result.parser_names),
+          sorted(expected_parser_names))
+
+  def testExtractionWorkerClassificationCache(self):
+    """Tests the extraction worker classification cache."""
+    collection_queue = single_process.SingleProcessQueue()
+    storage_queue = single_process.SingleProcessQueue()
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        storage_queue)
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, None, knowledge_base.KnowledgeBase())
+
+    resolver_context = context.Context()
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, collection_queue, event_queue_producer, None, parser_mediator,
+        resolver_context=resolver_context)
+    extraction_worker.InitializeParserObjects(
+        parser_filter_string=u'syslog,xchatlog')
+
+    # pylint: disable=protected-access
+    parsers_profiler = profiler.ParsersProfiler(u'test')
+    extraction_worker._parsers_profiler = parsers_profiler
+
+    source_path = self._GetTestFilePath([u'cookies.db'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+        path_spec, resolver_context=resolver_context)
+
+    extraction_worker.ParseFileEntry(file_entry)
+
+    self.assertEqual(len(extraction_worker._classification_cache), 1)
+    classification = extraction_worker._classification_cache.values()[0]
+    self.assertEqual(
+        classification.rejected_parser_names, set([u'syslog', u'xchatlog']))
+
+    self.assertEqual(parsers_profiler._number_of_rejections[u'syslog'], 1)
+    self.assertEqual(parsers_profiler._number_of_skips[u'syslog'], 0)
+
+    # The parsers are skipped for a file entry with the same fingerprint.
+    extraction_worker.ParseFileEntry(file_entry)
+
+    self.assertEqual(len(extraction_worker._classification_cache), 1)
+    self.assertEqual(parsers_profiler._number_of_rejections[u'syslog'], 1)
+    self.assertEqual(parsers_profiler._number_of_skips[u'syslog'], 1)
+    self.assertEqual(parsers_profiler._number_of_skips[u'xchatlog'], 1)
+
+    # The syslog parser does not reject a syslog file.
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+        path_spec, resolver_context=resolver_context)
+
+    extraction_worker.ParseFileEntry(file_entry)
+    extraction_worker.ParseFileEntry(file_entry)
+
+    self.assertEqual(len(extraction_worker._classification_cache), 2)
+    self.assertEqual(parsers_profiler._number_of_skips[u'syslog'], 1)
+    self.assertEqual(parsers_profiler._number_of_skips[u'xchatlog'], 2)
+
+    test_queue_consumer = test_lib.TestQueueConsumer(storage_queue)
+    test_queue_consumer.ConsumeItems()
+    self.assertEqual(test_queue_consumer.number_of_items, 26)
+
+  def testExtractionWorkerParseCache(self):
+    """Tests the extraction worker with the parse cache enabled."""
+    collection_queue = single_process.SingleProcessQueue()
+    storage_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        storage_queue)
+    parse_error_queue_producer = single_process.SingleProcessItemQueueProducer(
+        parse_error_queue)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, parse_error_queue_producer,
+        knowledge_base_object)
+
+    resolver_context = context.Context()
+
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, collection_queue, event_queue_producer, parse_error_queue_producer,
+        parser_mediator, resolver_context=resolver_context)
+
+    extraction_worker.InitializeParserObjects(parser_filter_string=u'syslog')
+    extraction_worker.SetEnableParseCache(True)
+
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+
+    collection_queue.PushItem(path_spec)
+    extraction_worker.Run()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(storage_queue)
+    test_queue_consumer.ConsumeItems()
+
+    # pylint: disable=protected-access
+    self.assertEqual(len(extraction_worker._parse_cache), 1)
+    self.assertEqual(extraction_worker._parse_cache_number_of_events, 13)
+
+    event_objects = test_queue_consumer.items
+    self.assertEqual(len(event_objects), 13)
+
+    # The same file is processed again which reuses the recorded events.
+    collection_queue.PushItem(path_spec)
+    extraction_worker.Run()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(storage_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(len(extraction_worker._parse_cache), 1)
+
+    cached_event_objects = test_queue_consumer.items
+    self.assertEqual(len(cached_event_objects), 13)
+
+    for event_object, cached_event_object in zip(
+        event_objects, cached_event_objects):
+      self.assertEqual(
+          event_object.EqualityString(), cached_event_object.EqualityString())
+      self.assertEqual(event_object.parser, cached_event_object.parser)
+      self.assertEqual(event_object.pathspec, cached_event_object.pathspec)
+      self.assertNotEqual(event_object.uuid, cached_event_object.uuid)
+
+  def testExtractionWorkerSharedParseCache(self):
+    """Tests extraction workers that share the parse cache directory."""
+    source_path = self._GetTestFilePath([u'cookies.db'])
+
+    temporary_directory = tempfile.mkdtemp()
+    try:
+      # Two copies of the same database stored inside different archives,
+      # like an unchanged database in different VSS stores.
+      path_specs = []
+      for archive_name in [u'first.tar', u'second.tar']:
+        archive_path = os.path.join(temporary_directory, archive_name)
+        with tarfile.open(archive_path, 'w') as tar_file:
+          tar_file.add(source_path, arcname=u'cookies.db')
+
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            dfvfs_definitions.TYPE_INDICATOR_OS, location=archive_path)
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            dfvfs_definitions.TYPE_INDICATOR_TAR, location=u'/cookies.db',
+            parent=path_spec)
+        path_specs.append(path_spec)
+
+      parse_cache_path = os.path.join(temporary_directory, u'cache')
+      os.mkdir(parse_cache_path)
+
+      numbers_of_event_objects = []
+      parsers_profilers = []
+      for worker_number, path_spec in enumerate(path_specs):
+        collection_queue = single_process.SingleProcessQueue()
+        storage_queue = single_process.SingleProcessQueue()
+        event_queue_producer = single_process.SingleProcessItemQueueProducer(
+            storage_queue)
+
+        parser_mediator = parsers_mediator.ParserMediator(
+            event_queue_producer, None, knowledge_base.KnowledgeBase())
+
+        extraction_worker = worker.BaseEventExtractionWorker(
+            worker_number, collection_queue, event_queue_producer, None,
+            parser_mediator, resolver_context=context.Context())
+        extraction_worker.InitializeParserObjects(
+            parser_filter_string=u'sqlite')
+        extraction_worker.SetEnableParseCache(
+            True, parse_cache_path=parse_cache_path)
+
+        # pylint: disable=protected-access
+        parsers_profiler = profiler.ParsersProfiler(u'test')
+        extraction_worker._parsers_profiler = parsers_profiler
+        parsers_profilers.append(parsers_profiler)
+
+        collection_queue.PushItem(path_spec)
+        extraction_worker.Run()
+
+        test_queue_consumer = test_lib.TestQueueConsumer(storage_queue)
+        test_queue_consumer.ConsumeItems()
+        numbers_of_event_objects.append(test_queue_consumer.number_of_items)
+
+      self.assertEqual(len(os.listdir(parse_cache_path)), 1)
+
+    finally:
+      shutil.rmtree(temporary_directory, ignore_errors=True)
+
+    self.assertNotEqual(numbers_of_event_objects[0], 0)
+    self.assertEqual(numbers_of_event_objects[0], numbers_of_event_objects[1])
+
+    # The second worker reuses the parse results of the first worker instead
+    # of copying and parsing the database again.
+    # pylint: disable=protected-access
+    self.assertIn(u'sqlite', parsers_profilers[0]._profile_measurements)
+    self.assertNotIn(u'sqlite', parsers_profilers[1]._profile_measurements)
+
+  def testSetStatusCallback(self):
+    """Tests the SetStatusCallback function."""
+    collection_queue = single_process.SingleProcessQueue()
+    storage_queue = single_process.SingleProcessQueue()
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        storage_queue)
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, None, knowledge_base.KnowledgeBase())
+
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, collection_queue, event_queue_producer, None, parser_mediator,
+        resolver_context=context.Context())
+    extraction_worker.InitializeParserObjects(parser_filter_string=u'syslog')
+
+    status_dicts = []
+    extraction_worker.SetStatusCallback(status_dicts.append)
+
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+
+    collection_queue.PushItem(path_spec)
+    extraction_worker.Run()
+
+    self.assertTrue(status_dicts[0][u'is_running'])
+    self.assertEqual(status_dicts[0][u'number_of_file_entries'], 0)
+
+    current_parsers = [
+        status_dict[u'current_parser'] for status_dict in status_dicts]
+    self.assertIn(u'syslog', current_parsers)
+
+    status_dict = status_dicts[-1]
+    self.assertFalse(status_dict[u'is_running'])
+    self.assertEqual(status_dict[u'number_of_events'], 13)
+    self.assertEqual(status_dict[u'number_of_file_entries'], 1)
+    self.assertEqual(
+        status_dict[u'processed_data_size'], os.path.getsize(source_path))
+
+
 
 if __name__ == '__main__':
   unittest.main()
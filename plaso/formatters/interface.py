@@ -149,6 +149,26 @@ class EventFormatter(object):
     return self._FormatMessages(
         self.FORMAT_STRING, self.FORMAT_STRING_SHORT, event_values)
 
+  def GetMessagesBatch(self, formatter_mediator, event_objects):
+    """Determines the formatted message strings for multiple event objects.
+
+    Args:
+      formatter_mediator: the formatter mediator object (instance of
+                          FormatterMediator).
+      event_objects: a list of event objects (instances of EventObject).
+
+    Returns:
+      A list of tuples containing the formatted message string and short
+      message string, in the same order as the event objects.
+
+    Raises:
+      WrongFormatter: if an event object cannot be formatted by the formatter.
+    """
+    get_messages = self.GetMessages
+    return [
+        get_messages(formatter_mediator, event_object)
+        for event_object in event_objects]
+
   def GetSources(self, event_object):
     """Determines the the short and long source for an event object.
 
@@ -179,6 +199,10 @@ class ConditionalEventFormatter(EventFormatter):
 
      FORMAT_STRING_SEPARATOR is used to control the string which the separate
      string pieces should be joined. It contains a space by default.
+
+     The format strings are assembled once per combination of attributes
+     that are present, which is represented as a bitmask of the format
+     string pieces, and cached.
   """
   # The format string pieces.
   FORMAT_STRING_PIECES = [u'']
@@ -197,6 +221,7 @@ class ConditionalEventFormatter(EventFormatter):
       RuntimeError: when an invalid format string piece is encountered.
     """
     super(ConditionalEventFormatter, self).__init__()
+    self._format_strings_cache = {}
 
     # The format string can be defined as:
     # {name}, {name:format}, {name!conversion}, {name!conversion:format}
@@ -239,39 +264,81 @@ class ConditionalEventFormatter(EventFormatter):
             u'Invalid short format string piece: [{0:s}] contains more '
             u'than 1 attribute name.').format(format_string_piece))
 
-  def _ConditionalFormatMessages(self, event_values):
-    """Determines the conditional formatted message strings.
+    # The bitmask value and attribute name of the format string pieces that
+    # contain an attribute name.
+    self._format_string_pieces_masks = [
+        (1 << map_index, attribute_name)
+        for map_index, attribute_name in enumerate(
+            self._format_string_pieces_map)
+        if attribute_name]
+
+    self._format_string_short_pieces_masks = [
+        (1 << map_index, attribute_name)
+        for map_index, attribute_name in enumerate(
+            self._format_string_short_pieces_map)
+        if attribute_name]
+
+  def _GetFormatStrings(self, mask, short_mask):
+    """Assembles the format strings of the format string pieces.
 
     Args:
-      event_values: a dictionary object containing the event (object) values.
+      mask: an integer containing the bitmask of the format string pieces
+            with an attribute name that are included.
+      short_mask: an integer containing the bitmask of the short format string
+                  pieces with an attribute name that are included.
 
     Returns:
-      A tuple containing the formatted message string and short message string.
+      A tuple containing the format string and short format string.
     """
-    # Using getattr here to make sure the attribute is not set to None.
-    # if A.b = None, hasattr(A, b) is True but getattr(A, b, None) is False.
     string_pieces = []
     for map_index, attribute_name in enumerate(self._format_string_pieces_map):
-      if not attribute_name or attribute_name in event_values:
-        if attribute_name:
-          attribute = event_values.get(attribute_name, None)
-          # If an attribute is an int, yet has zero value we want to include
-          # that in the format string, since that is still potentially valid
-          # information. Otherwise we would like to skip it.
-          # pylint: disable=unidiomatic-typecheck
-          if type(attribute) not in (bool, int, long, float) and not attribute:
-            continue
+      if not attribute_name or mask & (1 << map_index):
         string_pieces.append(self.FORMAT_STRING_PIECES[map_index])
     format_string = unicode(self.FORMAT_STRING_SEPARATOR.join(string_pieces))
 
     string_pieces = []
     for map_index, attribute_name in enumerate(
         self._format_string_short_pieces_map):
-      if not attribute_name or event_values.get(attribute_name, None):
+      if not attribute_name or short_mask & (1 << map_index):
         string_pieces.append(self.FORMAT_STRING_SHORT_PIECES[map_index])
     short_format_string = unicode(
         self.FORMAT_STRING_SEPARATOR.join(string_pieces))
 
+    return format_string, short_format_string
+
+  def _ConditionalFormatMessages(self, event_values):
+    """Determines the conditional formatted message strings.
+
+    Args:
+      event_values: a dictionary object containing the event (object) values.
+
+    Returns:
+      A tuple containing the formatted message string and short message string.
+    """
+    # Using getattr here to make sure the attribute is not set to None.
+    # if A.b = None, hasattr(A, b) is True but getattr(A, b, None) is False.
+    mask = 0
+    for piece_mask, attribute_name in self._format_string_pieces_masks:
+      if attribute_name in event_values:
+        attribute = event_values[attribute_name]
+        # If an attribute is an int, yet has zero value we want to include
+        # that in the format string, since that is still potentially valid
+        # information. Otherwise we would like to skip it.
+        # pylint: disable=unidiomatic-typecheck
+        if type(attribute) in (bool, int, long, float) or attribute:
+          mask |= piece_mask
+
+    short_mask = 0
+    for piece_mask, attribute_name in self._format_string_short_pieces_masks:
+      if event_values.get(attribute_name, None):
+        short_mask |= piece_mask
+
+    format_strings = self._format_strings_cache.get((mask, short_mask), None)
+    if not format_strings:
+      format_strings = self._GetFormatStrings(mask, short_mask)
+      self._format_strings_cache[(mask, short_mask)] = format_strings
+
+    format_string, short_format_string = format_strings
     return self._FormatMessages(
         format_string, short_format_string, event_values)
 
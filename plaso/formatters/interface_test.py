@@ -111,6 +111,36 @@ class ConditionalEventFormatterTest(unittest.TestCase):
         formatter_mediator, self._event_object)
     self.assertEqual(message, expected_message)
 
+  def testGetMessagesBatch(self):
+    """Tests the GetMessagesBatch function."""
+    formatter_mediator = mediator.FormatterMediator()
+    event_formatter = ConditionalTestEventFormatter()
+
+    event_objects = [
+        self._event_object,
+        ConditionalTestEvent(1335791207939596, {
+            u'numeric': 0, u'optional': u'', u'text': u'text'}),
+        ConditionalTestEvent(1335791207939596, {
+            u'description': u'other description', u'numeric': 1,
+            u'text': u'other text'})]
+
+    messages = event_formatter.GetMessagesBatch(
+        formatter_mediator, event_objects)
+
+    expected_messages = [
+        event_formatter.GetMessages(formatter_mediator, event_object)
+        for event_object in event_objects]
+    self.assertEqual(messages, expected_messages)
+
+    self.assertEqual(messages[1][0], u'Comment Value: 0x00 Text: text')
+    self.assertEqual(messages[2][0], (
+        u'Description: other description Comment Value: 0x01 '
+        u'Text: other text'))
+
+    # The first and last event object have the same attributes.
+    # pylint: disable=protected-access
+    self.assertEqual(len(event_formatter._format_strings_cache), 2)
+
   # TODO: add test for GetSources.
 
 
@@ -57,10 +57,13 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
     self._profiling_type = u'all'
     self._queue_size = self._DEFAULT_QUEUE_SIZE
+    self._queue_type = definitions.QUEUE_TYPE_MULTI_PROCESSING
+    self._serialize_in_workers = False
     self._single_process_mode = False
     self._show_worker_memory_information = False
     self._storage_file_path = None
     self._text_prepend = None
+    self._worker_timeout = None
 
   def _CheckStorageFile(self, storage_file_path):
     """Checks if the storage file path is valid.
@@ -155,7 +158,8 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
       The engine object (instance of Engine).
     """
     engine = multi_process.MultiProcessEngine(
-        maximum_number_of_queued_items=self._queue_size)
+        maximum_number_of_queued_items=self._queue_size,
+        queue_type=self._queue_type)
 
     engine.SetEnableDebugOutput(self._debug_mode)
     engine.SetEnableProfiling(
@@ -164,6 +168,10 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
         profiling_type=self._profiling_type)
     engine.SetProcessArchiveFiles(self._process_archive_files)
 
+    # Unchanged files in the VSS stores only need to be parsed once.
+    if self.vss_stores:
+      engine.SetEnableParseCache(True)
+
     if self._filter_object:
       engine.SetFilterObject(self._filter_object)
 
@@ -192,6 +200,10 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
         profiling_type=self._profiling_type)
     engine.SetProcessArchiveFiles(self._process_archive_files)
 
+    # Unchanged files in the VSS stores only need to be parsed once.
+    if self.vss_stores:
+      engine.SetEnableParseCache(True)
+
     if self._filter_object:
       engine.SetFilterObject(self._filter_object)
 
@@ -421,13 +433,25 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
           self._enable_profiling,
           profiling_type=self._profiling_type)
 
+      # The workers only serialize into protobufs, the storage file stores
+      # the serialized data as-is.
+      if self._serialize_in_workers:
+        if (storage_serializer_format ==
+            definitions.SERIALIZER_FORMAT_PROTOBUF):
+          self._engine.SetSerializeEventObjects(True)
+        else:
+          logging.warning(
+              u'Serializing event objects in the workers is only supported '
+              u'with the protobuf storage serializer format.')
+
     try:
       self._engine.ProcessSource(
           self._collector, storage_writer,
           parser_filter_string=parser_filter_string,
           hasher_names_string=hasher_names_string,
           number_of_extraction_workers=number_of_worker_processes,
-          show_memory_usage=self._show_worker_memory_information)
+          show_memory_usage=self._show_worker_memory_information,
+          worker_timeout=self._worker_timeout)
 
     except KeyboardInterrupt:
       self._CleanUpAfterAbort()
@@ -677,6 +701,34 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
 
     self._storage_serializer_format = storage_serializer_format
 
+  def SetQueueType(self, queue_type):
+    """Sets the type of queue used in multi process mode.
+
+    Args:
+      queue_type: string containing the type of queue, either
+                  "multiprocessing" or "shared_memory".
+
+    Raises:
+      BadConfigOption: if the queue type is not supported.
+    """
+    if queue_type not in definitions.QUEUE_TYPES:
+      raise errors.BadConfigOption(
+          u'Unsupported queue type: {0:s}.'.format(queue_type))
+
+    self._queue_type = queue_type
+
+  def SetSerializeInWorkers(self, serialize_in_workers):
+    """Sets a flag telling the workers to serialize the event objects.
+
+    Only applies to multi process mode with the protobuf storage serializer
+    format, where it moves the serialization out of the storage writer.
+
+    Args:
+      serialize_in_workers: boolean value to indicate if the extraction
+                            workers should serialize the event objects.
+    """
+    self._serialize_in_workers = serialize_in_workers
+
   def SetShowMemoryInformation(self, show_memory=True):
     """Sets a flag telling the worker monitor to show memory information.
 
@@ -686,3 +738,20 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
                    the worker monitoring.
     """
     self._show_worker_memory_information = show_memory
+
+  def SetWorkerTimeout(self, worker_timeout):
+    """Sets the worker timeout used in multi process mode.
+
+    Args:
+      worker_timeout: number of seconds a worker can run without making
+                      progress before it is considered hung or None to use
+                      the default of the foreman.
+
+    Raises:
+      BadConfigOption: if the worker timeout is not a positive number.
+    """
+    if worker_timeout is not None and worker_timeout <= 0:
+      raise errors.BadConfigOption(
+          u'Unsupported worker timeout: {0!s}.'.format(worker_timeout))
+
+    self._worker_timeout = worker_timeout
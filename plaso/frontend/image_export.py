@@ -3,12 +3,17 @@
 
 import abc
 import collections
+import errno
 import logging
+import multiprocessing
 import os
+import shutil
+import tempfile
 
 from dfvfs.helpers import file_system_searcher
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import context
 from dfvfs.resolver import resolver as path_spec_resolver
 
 import pysigscan
@@ -23,6 +28,7 @@ from plaso.frontend import utils as frontend_utils
 from plaso.hashers import manager as hashers_manager
 from plaso.lib import specification
 from plaso.lib import timelib
+from plaso.multi_processing import multi_process
 from plaso.preprocessors import interface as preprocess_interface
 from plaso.preprocessors import manager as preprocess_manager
 
@@ -419,7 +425,14 @@ class FileEntryFilterCollection(object):
 
 
 class FileSaver(object):
-  """Class that is used to save files."""
+  """Class that is used to save files.
+
+  The data of a file is hashed while it is copied, hence every file is only
+  read once. If the content store is used the data of every distinct file is
+  stored once, under its digest hash, and the exported files are linked to
+  the stored data. The content store is shared by processes that export
+  to the same destination.
+  """
 
   _BAD_CHARACTERS = frozenset([
       u'\x00', u'\x01', u'\x02', u'\x03', u'\x04', u'\x05', u'\x06', u'\x07',
@@ -429,47 +442,214 @@ class FileSaver(object):
       os.path.sep, u'!', u'$', u'%', u'&', u'*', u'+', u':', u';', u'<', u'>',
       u'?', u'@', u'|', u'~', u'\x7f'])
 
-  _READ_BUFFER_SIZE = 4096
+  # The name of the content store directory within the destination path.
+  CONTENT_STORE_DIRECTORY = u'.content'
+
+  _READ_BUFFER_SIZE = 1024 * 1024
 
-  def __init__(self, skip_duplicates=False):
+  def __init__(
+      self, skip_duplicates=False, use_content_store=False,
+      manifest_path=None):
     """Initializes the file saver object.
 
     Args:
       skip_duplicates: boolean value to indicate if duplicate file content
                        should be skipped. The default is False.
+      use_content_store: optional boolean value to indicate if the data of
+                         the files should be stored in the content store.
+                         The default is False.
+      manifest_path: optional path of the manifest file to which the digest
+                     hash and path of every exported file is appended.
+                     The default is None, which represents no manifest.
     """
     super(FileSaver, self).__init__()
     self._digest_hashes = {}
+    self._manifest_file_object = None
+    self._manifest_path = manifest_path
     self._skip_duplicates = skip_duplicates
+    self._use_content_store = use_content_store
 
-  def _CalculateHash(self, file_object):
-    """Calculates a MD5 hash of the contents of given file object.
+  def _AddManifestEntry(self, digest_hash, destination_path, target_path):
+    """Adds an entry to the manifest file.
+
+    Args:
+      digest_hash: the SHA-256 digest hash of the file data.
+      destination_path: the path where the extracted files are stored.
+      target_path: the path of the exported file.
+    """
+    if not self._manifest_path:
+      return
+
+    if not self._manifest_file_object:
+      self._manifest_file_object = open(self._manifest_path, 'ab')
+
+    relative_path = os.path.relpath(target_path, destination_path)
+    manifest_entry = u'{0:s}\t{1:s}\n'.format(digest_hash, relative_path)
+    self._manifest_file_object.write(manifest_entry.encode(u'utf-8'))
+
+  def _CopyFileObject(self, file_object, output_path):
+    """Copies the data of a file-like object and calculates its digest hash.
 
     Args:
       file_object: a file-like object.
+      output_path: the path of the output file.
 
     Returns:
-      A hexadecimal string of the MD5 hash.
+      A hexadecimal string of the SHA-256 digest hash of the data.
     """
     hasher_object = hashers_manager.HashersManager.GetHasherObject(u'sha256')
     file_object.seek(0, os.SEEK_SET)
 
-    data = file_object.read(self._READ_BUFFER_SIZE)
-    while data:
-      hasher_object.Update(data)
+    with open(output_path, 'wb') as output_file_object:
       data = file_object.read(self._READ_BUFFER_SIZE)
+      while data:
+        hasher_object.Update(data)
+        output_file_object.write(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
 
     return hasher_object.GetStringDigest()
 
-  def WriteFile(self, source_path_spec, destination_path, filename_prefix=u''):
+  def _IsDuplicate(self, file_entry, digest_hash, content_path=None):
+    """Determines if the data of a file entry was exported before.
+
+    Only the data of the same inode is considered a duplicate, such as
+    the same file in different Volume Shadow Snapshots.
+
+    If the content store is used the inode is recorded next to the data
+    in the content store, hence duplicates are also detected when they are
+    exported by another process.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+      digest_hash: the SHA-256 digest hash of the data.
+      content_path: optional path of the data in the content store.
+                    The default is None.
+
+    Returns:
+      A boolean value indicating the data is a duplicate.
+
+    Raises:
+      OSError: if the inode cannot be recorded in the content store.
+    """
+    stat = file_entry.GetStat()
+    inode = getattr(stat, u'ino', 0)
+
+    if content_path:
+      inode_path = u'{0:s}.{1:d}'.format(content_path, inode or 0)
+      try:
+        file_descriptor = os.open(
+            inode_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+      except OSError as exception:
+        if exception.errno != errno.EEXIST:
+          raise
+        return True
+
+      os.close(file_descriptor)
+      return False
+
+    digest_hashes = self._digest_hashes.setdefault(inode, [])
+    if digest_hash in digest_hashes:
+      return True
+
+    digest_hashes.append(digest_hash)
+    return False
+
+  def _LinkFile(self, source_path, target_path):
+    """Links a target path to the file in the content store.
+
+    A hard link is used where supported, otherwise a symbolic link or
+    a copy of the file.
+
+    Args:
+      source_path: the path of the file in the content store.
+      target_path: the path of the exported file.
+    """
+    if os.path.lexists(target_path):
+      os.remove(target_path)
+
+    if hasattr(os, u'link'):
+      try:
+        os.link(source_path, target_path)
+        return
+      except OSError:
+        pass
+
+    if hasattr(os, u'symlink'):
+      relative_path = os.path.relpath(
+          source_path, os.path.dirname(target_path))
+      os.symlink(relative_path, target_path)
+    else:
+      shutil.copyfile(source_path, target_path)
+
+  def _WriteFileToContentStore(self, file_object, content_store_path):
+    """Writes the data of a file-like object to the content store.
+
+    The data is first copied into a temporary file, which is then moved to
+    its digest hash in the content store. The move fails if another file
+    with the same data was stored before, also by another process.
+
+    Args:
+      file_object: a file-like object.
+      content_store_path: the path of the content store.
+
+    Returns:
+      A tuple containing the SHA-256 digest hash of the data and the path of
+      the data in the content store.
+
+    Raises:
+      IOError: if the data cannot be read or written.
+      OSError: if the data cannot be stored.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=content_store_path)
+    os.close(file_descriptor)
+
+    try:
+      digest_hash = self._CopyFileObject(file_object, temporary_path)
+
+      content_directory = os.path.join(content_store_path, digest_hash[:2])
+      try:
+        os.mkdir(content_directory)
+      except OSError:
+        if not os.path.isdir(content_directory):
+          raise
+
+      content_path = os.path.join(content_directory, digest_hash)
+      try:
+        if hasattr(os, u'link'):
+          os.link(temporary_path, content_path)
+        else:
+          os.rename(temporary_path, content_path)
+
+      except OSError:
+        if not os.path.exists(content_path):
+          raise
+
+    finally:
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
+    return digest_hash, content_path
+
+  def Close(self):
+    """Closes the manifest file."""
+    if self._manifest_file_object:
+      self._manifest_file_object.close()
+      self._manifest_file_object = None
+
+  def WriteFile(
+      self, source_path_spec, destination_path, filename_prefix=u'',
+      resolver_context=None):
     """Writes the contents of the source to the destination file.
 
     Args:
       source_path_spec: the path specification of the source file.
       destination_path: the path of the destination file.
       filename_prefix: optional filename prefix. The default is an empty string.
+      resolver_context: optional resolver context (instance of dfvfs.Context).
+                        The default is None.
     """
-    file_entry = path_spec_resolver.Resolver.OpenFileEntry(source_path_spec)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+        source_path_spec, resolver_context=resolver_context)
     if not file_entry.IsFile():
       return
 
@@ -495,46 +675,80 @@ class FileSaver(object):
       target_directory = destination_path
 
     elif not os.path.isdir(target_directory):
-      os.makedirs(target_directory)
-
-    if self._skip_duplicates and file_entry.IsFile():
       try:
-        file_object = file_entry.GetFileObject()
-        digest_hash = self._CalculateHash(file_object)
-      except IOError as exception:
-        logging.error((
-            u'[skipping] unable to calculate MD5 of file: {0:s} '
-            u'with error: {1:s}').format(path, exception))
-      finally:
-        file_object.close()
-
-      stat = file_entry.GetStat()
-      inode = getattr(stat, u'ino', 0)
-
-      if inode in self._digest_hashes:
-        if digest_hash in self._digest_hashes[inode]:
-          return
-        self._digest_hashes[inode].append(digest_hash)
-      else:
-        self._digest_hashes[inode] = [digest_hash]
+        os.makedirs(target_directory)
+      except OSError:
+        # The directory can be created by another process in the meantime.
+        if not os.path.isdir(target_directory):
+          raise
+
+    target_path = os.path.join(target_directory, target_filename)
 
     try:
       file_object = file_entry.GetFileObject()
-      frontend_utils.OutputWriter.WriteFile(
-          file_object, os.path.join(target_directory, target_filename))
     except IOError as exception:
       logging.error(
           u'[skipping] unable to export file: {0:s} with error: {1:s}'.format(
               path, exception))
+      return
+
+    try:
+      if self._use_content_store:
+        content_store_path = os.path.join(
+            destination_path, self.CONTENT_STORE_DIRECTORY)
+        digest_hash, content_path = self._WriteFileToContentStore(
+            file_object, content_store_path)
+
+        # Files with the same data at distinct paths are all linked to
+        # the content store.
+        if self._skip_duplicates and self._IsDuplicate(
+            file_entry, digest_hash, content_path=content_path):
+          return
+
+        self._LinkFile(content_path, target_path)
+
+      elif self._skip_duplicates:
+        # The data is copied to a temporary file first, since whether
+        # the file is a duplicate is only known once the data is hashed.
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=target_directory)
+        os.close(file_descriptor)
+
+        try:
+          digest_hash = self._CopyFileObject(file_object, temporary_path)
+          if self._IsDuplicate(file_entry, digest_hash):
+            return
+
+          if os.path.exists(target_path):
+            os.remove(target_path)
+          os.rename(temporary_path, target_path)
+
+        finally:
+          if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+      else:
+        digest_hash = self._CopyFileObject(file_object, target_path)
+
+    except (IOError, OSError) as exception:
+      logging.error(
+          u'[skipping] unable to export file: {0:s} with error: {1:s}'.format(
+              path, exception))
+      return
+
     finally:
       file_object.close()
 
+    # Only files that were exported are recorded in the manifest.
+    self._AddManifestEntry(digest_hash, destination_path, target_path)
+
 
 class ImageExtractorQueueConsumer(queue.ItemQueueConsumer):
   """Class that implements an image extractor queue consumer."""
 
   def __init__(
-      self, process_queue, file_saver, destination_path, filter_collection):
+      self, process_queue, file_saver, destination_path, filter_collection,
+      resolver_context=None):
     """Initializes the image extractor queue consumer.
 
     Args:
@@ -543,11 +757,15 @@ class ImageExtractorQueueConsumer(queue.ItemQueueConsumer):
       destination_path: the path where the extracted files should be stored.
       filter_collection: the file entry filter collection (instance of
                          FileEntryFilterCollection)
+      resolver_context: optional resolver context (instance of dfvfs.Context).
+                        The default is None. Note that every process must
+                        have its own resolver context.
     """
     super(ImageExtractorQueueConsumer, self).__init__(process_queue)
     self._destination_path = destination_path
     self._file_saver = file_saver
     self._filter_collection = filter_collection
+    self._resolver_context = resolver_context
 
   def _ConsumeItem(self, path_spec):
     """Consumes an item callback for ConsumeItems.
@@ -555,7 +773,8 @@ class ImageExtractorQueueConsumer(queue.ItemQueueConsumer):
     Args:
       path_spec: a path specification (instance of dfvfs.PathSpec).
     """
-    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+        path_spec, resolver_context=self._resolver_context)
     if not self._filter_collection.Matches(file_entry):
       return
 
@@ -566,12 +785,16 @@ class ImageExtractorQueueConsumer(queue.ItemQueueConsumer):
       filename_prefix = u''
 
     self._file_saver.WriteFile(
-        path_spec, self._destination_path, filename_prefix=filename_prefix)
+        path_spec, self._destination_path, filename_prefix=filename_prefix,
+        resolver_context=self._resolver_context)
 
 
 class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
   """Class that implements the image export front-end."""
 
+  # The name of the manifest file within the content store directory.
+  _MANIFEST_FILENAME = u'manifest.txt'
+
   def __init__(self):
     """Initializes the front-end object."""
     super(ImageExportFrontend, self).__init__()
@@ -580,7 +803,9 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
     self._source_path_spec = None
 
   # TODO: merge with collector and/or engine.
-  def _Extract(self, destination_path, remove_duplicates=True):
+  def _Extract(
+      self, destination_path, remove_duplicates=True, number_of_workers=1,
+      use_content_store=False):
     """Extracts files.
 
     Args:
@@ -588,49 +813,172 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
       remove_duplicates: optional boolean value to indicate if files with
                          duplicate content should be removed. The default
                          is True.
+      number_of_workers: optional number of worker processes that export
+                         the files. The default is 1.
+      use_content_store: optional boolean value to indicate if the data of
+                         the files should be stored in the content store.
+                         The default is False.
     """
     if not os.path.isdir(destination_path):
       os.makedirs(destination_path)
 
-    input_queue = single_process.SingleProcessQueue()
-
     # TODO: add support to handle multiple partitions.
     self._source_path_spec = self.GetSourcePathSpec()
 
-    image_collector = collector.Collector(
-        input_queue, self._source_path, self._source_path_spec)
+    def _CollectPathSpecs(path_spec_queue):
+      """Collects the path specifications onto a queue."""
+      image_collector = collector.Collector(
+          path_spec_queue, self._source_path, self._source_path_spec)
+      image_collector.Collect()
+
+    self._ExtractPathSpecs(
+        _CollectPathSpecs, destination_path,
+        remove_duplicates=remove_duplicates,
+        number_of_workers=number_of_workers,
+        use_content_store=use_content_store)
+
+  def _ExtractPathSpecs(
+      self, push_path_specs, destination_path, remove_duplicates=True,
+      number_of_workers=1, use_content_store=False):
+    """Extracts the files of the path specifications pushed onto a queue.
+
+    If multiple worker processes are used the content store is used, since
+    it allows the workers to detect duplicate file content of each other.
+    The worker processes are started before the path specifications are
+    pushed, so that they export the files while the source is enumerated.
+    The manifest of every worker is merged into the manifest of the content
+    store.
 
-    image_collector.Collect()
+    Args:
+      push_path_specs: a function that pushes the path specifications
+                       (instances of dfvfs.PathSpec) onto the queue
+                       (instance of Queue) it is passed, followed by
+                       the end of input.
+      destination_path: the path where the extracted files should be stored.
+      remove_duplicates: optional boolean value to indicate if files with
+                         duplicate content should be removed. The default
+                         is True.
+      number_of_workers: optional number of worker processes that export
+                         the files. The default is 1.
+      use_content_store: optional boolean value to indicate if the data of
+                         the files should be stored in the content store.
+                         The default is False.
 
-    file_saver = FileSaver(skip_duplicates=remove_duplicates)
-    input_queue_consumer = ImageExtractorQueueConsumer(
-        input_queue, file_saver, destination_path, self._filter_collection)
-    input_queue_consumer.ConsumeItems()
+    Raises:
+      RuntimeError: if a worker process failed.
+    """
+    if number_of_workers > 1:
+      use_content_store = True
+
+    manifest_path = None
+    if use_content_store:
+      content_store_path = os.path.join(
+          destination_path, FileSaver.CONTENT_STORE_DIRECTORY)
+      if not os.path.isdir(content_store_path):
+        os.makedirs(content_store_path)
+
+      manifest_path = os.path.join(
+          content_store_path, self._MANIFEST_FILENAME)
+      if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    if number_of_workers <= 1:
+      path_spec_queue = single_process.SingleProcessQueue()
+      push_path_specs(path_spec_queue)
+
+      self._ExtractPathSpecsFromQueue(
+          path_spec_queue, destination_path, remove_duplicates,
+          use_content_store, manifest_path)
+      return
+
+    path_spec_queue = multi_process.MultiProcessingQueue()
+
+    worker_manifest_paths = []
+    worker_processes = []
+    for worker_number in range(number_of_workers):
+      worker_manifest_path = u'{0:s}.{1:d}'.format(manifest_path, worker_number)
+      # The worker processes wait for the end of input, since the path
+      # specifications are pushed while the source is enumerated.
+      worker_process = multiprocessing.Process(
+          name=u'Export worker {0:d}'.format(worker_number),
+          target=self._ExtractPathSpecsFromQueue,
+          args=(path_spec_queue, destination_path, remove_duplicates, True,
+                worker_manifest_path),
+          kwargs={u'wait_for_end_of_input': True})
+      worker_process.daemon = True
+      worker_process.start()
+
+      worker_manifest_paths.append(worker_manifest_path)
+      worker_processes.append(worker_process)
+
+    path_specs_pushed = False
+    try:
+      push_path_specs(path_spec_queue)
+      path_specs_pushed = True
+
+    finally:
+      # Make sure the worker processes stop if pushing failed.
+      if not path_specs_pushed:
+        path_spec_queue.SignalEndOfInput()
+
+      failed_worker_names = []
+      for worker_process in worker_processes:
+        worker_process.join()
+        if worker_process.exitcode != 0:
+          failed_worker_names.append(worker_process.name)
+
+    with open(manifest_path, 'ab') as manifest_file_object:
+      for worker_manifest_path in worker_manifest_paths:
+        if not os.path.exists(worker_manifest_path):
+          continue
+
+        with open(worker_manifest_path, 'rb') as worker_manifest_file_object:
+          shutil.copyfileobj(worker_manifest_file_object, manifest_file_object)
+
+        os.remove(worker_manifest_path)
 
-  def _ExtractFile(self, file_saver, path_spec, destination_path):
-    """Extracts a file.
+    if failed_worker_names:
+      raise RuntimeError(u'Export workers: {0:s} failed.'.format(
+          u', '.join(failed_worker_names)))
+
+  def _ExtractPathSpecsFromQueue(
+      self, path_spec_queue, destination_path, remove_duplicates,
+      use_content_store, manifest_path, wait_for_end_of_input=False):
+    """Extracts the files of the path specifications consumed from a queue.
 
     Args:
-      file_saver: the file saver object (instance of FileSaver)
-      path_spec: a path specification (instance of dfvfs.PathSpec).
+      path_spec_queue: the queue (instance of Queue) that contains the path
+                       specifications (instances of dfvfs.PathSpec).
       destination_path: the path where the extracted files should be stored.
+      remove_duplicates: boolean value to indicate if files with duplicate
+                         content should be removed.
+      use_content_store: boolean value to indicate if the data of the files
+                         should be stored in the content store.
+      manifest_path: the path of the manifest file or None.
+      wait_for_end_of_input: optional boolean value to indicate to keep
+                             waiting for path specifications until the end
+                             of input is signalled. The default is False.
     """
-    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
-    if not self._filter_collection.Matches(file_entry):
-      return
+    # Every process must have its own resolver context.
+    resolver_context = context.Context()
 
-    vss_store_number = getattr(path_spec, u'vss_store_number', None)
-    if vss_store_number is not None:
-      filename_prefix = u'vss_{0:d}'.format(vss_store_number + 1)
-    else:
-      filename_prefix = u''
+    file_saver = FileSaver(
+        skip_duplicates=remove_duplicates, use_content_store=use_content_store,
+        manifest_path=manifest_path)
+    path_spec_queue_consumer = ImageExtractorQueueConsumer(
+        path_spec_queue, file_saver, destination_path, self._filter_collection,
+        resolver_context=resolver_context)
 
-    file_saver.WriteFile(
-        path_spec, destination_path, filename_prefix=filename_prefix)
+    try:
+      path_spec_queue_consumer.ConsumeItems(
+          wait_for_end_of_input=wait_for_end_of_input)
+    finally:
+      file_saver.Close()
 
   # TODO: merge with collector and/or engine.
   def _ExtractWithFilter(
-      self, destination_path, filter_file_path, remove_duplicates=True):
+      self, destination_path, filter_file_path, remove_duplicates=True,
+      number_of_workers=1, use_content_store=False):
     """Extracts files using a filter expression.
 
     This method runs the file extraction process on the image and
@@ -643,6 +991,11 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
       remove_duplicates: optional boolean value to indicate if files with
                          duplicate content should be removed. The default
                          is True.
+      number_of_workers: optional number of worker processes that export
+                         the files. The default is 1.
+      use_content_store: optional boolean value to indicate if the data of
+                         the files should be stored in the content store.
+                         The default is False.
     """
     # TODO: add support to handle multiple partitions.
     self._source_path_spec = self.GetSourcePathSpec()
@@ -659,11 +1012,35 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
     find_specs = engine_utils.BuildFindSpecsFromFile(
         filter_file_path, pre_obj=self._knowledge_base.pre_obj)
 
-    # Save the regular files.
-    file_saver = FileSaver(skip_duplicates=remove_duplicates)
+    def _FindPathSpecs(path_spec_queue):
+      """Finds the path specifications onto a queue."""
+      self._FindPathSpecsWithFilter(
+          path_spec_queue, file_system, searcher, find_specs)
+
+    self._ExtractPathSpecs(
+        _FindPathSpecs, destination_path, remove_duplicates=remove_duplicates,
+        number_of_workers=number_of_workers,
+        use_content_store=use_content_store)
 
+  def _FindPathSpecsWithFilter(
+      self, path_spec_queue, file_system, searcher, find_specs):
+    """Finds the path specifications of the files to extract.
+
+    The path specifications of the source and of the selected VSS stores are
+    pushed onto the queue, followed by the end of input.
+
+    Args:
+      path_spec_queue: the queue (instance of Queue) to push the path
+                       specifications (instances of dfvfs.PathSpec) onto.
+      file_system: the file system of the source (instance of
+                   dfvfs.FileSystem), which is closed after it was searched.
+      searcher: the file system searcher of the source (instance of
+                dfvfs.FileSystemSearcher).
+      find_specs: the find specifications (instances of dfvfs.FindSpec).
+    """
+    # Save the regular files.
     for path_spec in searcher.Find(find_specs=find_specs):
-      self._ExtractFile(file_saver, path_spec, destination_path)
+      path_spec_queue.PushItem(path_spec)
 
     file_system.Close()
 
@@ -700,10 +1077,12 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
             file_system, vss_path_spec)
 
         for path_spec in searcher.Find(find_specs=find_specs):
-          self._ExtractFile(file_saver, path_spec, destination_path)
+          path_spec_queue.PushItem(path_spec)
 
         file_system.Close()
 
+    path_spec_queue.SignalEndOfInput()
+
   # TODO: refactor, this is a duplicate of the function in engine.
   def _GetSourceFileSystemSearcher(self, resolver_context=None):
     """Retrieves the file system searcher of the source.
@@ -936,7 +1315,8 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
     self._filter_collection.Print(output_writer)
 
   def ProcessSource(
-      self, destination_path, filter_file=None, remove_duplicates=True):
+      self, destination_path, filter_file=None, remove_duplicates=True,
+      number_of_workers=1, use_content_store=False):
     """Processes the source.
 
     Args:
@@ -945,9 +1325,21 @@ class ImageExportFrontend(storage_media_frontend.StorageMediaFrontend):
       remove_duplicates: optional boolean value to indicate if files with
                          duplicate content should be removed. The default
                          is True.
+      number_of_workers: optional number of worker processes that export
+                         the files. The default is 1. Multiple worker
+                         processes imply the use of the content store.
+      use_content_store: optional boolean value to indicate if the data of
+                         the files should be stored once per digest hash in
+                         the content store, to which the exported files are
+                         linked. The default is False.
     """
     if filter_file:
       self._ExtractWithFilter(
-          destination_path, filter_file, remove_duplicates=remove_duplicates)
+          destination_path, filter_file, remove_duplicates=remove_duplicates,
+          number_of_workers=number_of_workers,
+          use_content_store=use_content_store)
     else:
-      self._Extract(destination_path, remove_duplicates=remove_duplicates)
+      self._Extract(
+          destination_path, remove_duplicates=remove_duplicates,
+          number_of_workers=number_of_workers,
+          use_content_store=use_content_store)
@@ -5,6 +5,7 @@
 import os
 import shutil
 import tempfile
+import time
 import unittest
 
 from dfvfs.lib import definitions
@@ -13,6 +14,7 @@ from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.frontend import image_export
 from plaso.frontend import test_lib
+from plaso.multi_processing import multi_process
 
 
 class DateTimeFileEntryFilter(test_lib.FrontendTestCase):
@@ -109,6 +111,166 @@ class DateTimeFileEntryFilter(test_lib.FrontendTestCase):
     self.assertEqual(len(date_filter._date_time_ranges), 3)
 
 
+class FileSaverTest(test_lib.FrontendTestCase):
+  """Tests for the file saver."""
+
+  _SYSLOG_SHA256 = (
+      u'b9bee1add1b34d1e8200df89667d2449'
+      u'14def9d260931c732dada15dfe172aec')
+
+  def _GetTargetPath(self, path, filename_prefix=u''):
+    """Retrieves the path of an exported file.
+
+    Args:
+      path: the path of the source file.
+      filename_prefix: optional filename prefix. The default is an empty string.
+
+    Returns:
+      The path of the exported file.
+    """
+    directory_name, filename = os.path.split(path)
+    if filename_prefix:
+      filename = u'{0:s}_{1:s}'.format(filename_prefix, filename)
+
+    path_segments = directory_name.split(os.path.sep)
+    path_segments.append(filename)
+    return os.path.join(self._temp_directory, *path_segments)
+
+  def setUp(self):
+    """Sets up the objects used by an individual test."""
+    self._temp_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the objects used an individual test."""
+    shutil.rmtree(self._temp_directory, True)
+    self._temp_directory = None
+
+  def testWriteFile(self):
+    """Tests the WriteFile function."""
+    file_saver = image_export.FileSaver(skip_duplicates=True)
+
+    test_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        definitions.TYPE_INDICATOR_OS, location=test_path)
+
+    file_saver.WriteFile(path_spec, self._temp_directory)
+
+    # The same file content of the same inode is skipped.
+    file_saver.WriteFile(
+        path_spec, self._temp_directory, filename_prefix=u'vss_1')
+    file_saver.Close()
+
+    target_path = self._GetTargetPath(test_path)
+    with open(target_path, 'rb') as file_object:
+      data = file_object.read()
+
+    with open(test_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    self.assertEqual(data, expected_data)
+
+    target_path = self._GetTargetPath(test_path, filename_prefix=u'vss_1')
+    self.assertFalse(os.path.exists(target_path))
+
+  def testWriteFileWithContentStore(self):
+    """Tests the WriteFile function with the content store."""
+    content_store_path = os.path.join(
+        self._temp_directory, image_export.FileSaver.CONTENT_STORE_DIRECTORY)
+    os.mkdir(content_store_path)
+    manifest_path = os.path.join(content_store_path, u'manifest.txt')
+
+    file_saver = image_export.FileSaver(
+        use_content_store=True, manifest_path=manifest_path)
+
+    test_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        definitions.TYPE_INDICATOR_OS, location=test_path)
+
+    file_saver.WriteFile(path_spec, self._temp_directory)
+    file_saver.WriteFile(
+        path_spec, self._temp_directory, filename_prefix=u'vss_1')
+    file_saver.Close()
+
+    content_path = os.path.join(
+        content_store_path, self._SYSLOG_SHA256[:2], self._SYSLOG_SHA256)
+    with open(content_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    # The exported files are linked to the data in the content store.
+    for filename_prefix in [u'', u'vss_1']:
+      target_path = self._GetTargetPath(
+          test_path, filename_prefix=filename_prefix)
+      with open(target_path, 'rb') as file_object:
+        data = file_object.read()
+      self.assertEqual(data, expected_data)
+
+    # The content store contains the data once.
+    self.assertEqual(len(os.listdir(content_store_path)), 2)
+
+    with open(manifest_path, 'rb') as file_object:
+      manifest_entries = [
+          line.split(b'\t') for line in file_object.read().splitlines()]
+
+    self.assertEqual(len(manifest_entries), 2)
+    self.assertEqual(manifest_entries[0][0], self._SYSLOG_SHA256)
+    self.assertEqual(manifest_entries[1][0], self._SYSLOG_SHA256)
+    self.assertTrue(manifest_entries[1][1].endswith(b'vss_1_syslog'))
+
+  def testWriteFileWithContentStoreAndSkipDuplicates(self):
+    """Tests the WriteFile function with the content store and duplicates."""
+    content_store_path = os.path.join(
+        self._temp_directory, image_export.FileSaver.CONTENT_STORE_DIRECTORY)
+    os.mkdir(content_store_path)
+    manifest_path = os.path.join(content_store_path, u'manifest.txt')
+
+    # Two distinct files with the same content.
+    source_path = os.path.join(self._temp_directory, u'source')
+    os.mkdir(source_path)
+
+    test_paths = []
+    for filename in [u'first', u'second']:
+      test_path = os.path.join(source_path, filename)
+      shutil.copyfile(self._GetTestFilePath([u'syslog']), test_path)
+      test_paths.append(test_path)
+
+    file_saver = image_export.FileSaver(
+        skip_duplicates=True, use_content_store=True,
+        manifest_path=manifest_path)
+
+    for test_path in test_paths:
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          definitions.TYPE_INDICATOR_OS, location=test_path)
+      file_saver.WriteFile(path_spec, self._temp_directory)
+
+    # The same file content of the same inode is skipped.
+    file_saver.WriteFile(
+        path_spec, self._temp_directory, filename_prefix=u'vss_1')
+    file_saver.Close()
+
+    content_path = os.path.join(
+        content_store_path, self._SYSLOG_SHA256[:2], self._SYSLOG_SHA256)
+    with open(content_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    # Distinct files with the same content are both linked.
+    for test_path in test_paths:
+      target_path = self._GetTargetPath(test_path)
+      with open(target_path, 'rb') as file_object:
+        data = file_object.read()
+      self.assertEqual(data, expected_data)
+
+    target_path = self._GetTargetPath(test_paths[1], filename_prefix=u'vss_1')
+    self.assertFalse(os.path.exists(target_path))
+
+    with open(manifest_path, 'rb') as file_object:
+      manifest_entries = [
+          line.split(b'\t') for line in file_object.read().splitlines()]
+
+    self.assertEqual(len(manifest_entries), 2)
+    self.assertTrue(manifest_entries[0][1].endswith(b'first'))
+    self.assertTrue(manifest_entries[1][1].endswith(b'second'))
+
+
 class ImageExportFrontendTest(test_lib.FrontendTestCase):
   """Tests for the image export front-end."""
 
@@ -144,6 +306,79 @@ class ImageExportFrontendTest(test_lib.FrontendTestCase):
     shutil.rmtree(self._temp_directory, True)
     self._temp_directory = None
 
+  def testExtractPathSpecsWithWorkers(self):
+    """Tests the _ExtractPathSpecs function with multiple workers."""
+    test_front_end = image_export.ImageExportFrontend()
+
+    # Two distinct files with the same content and another file.
+    source_path = os.path.join(self._temp_directory, u'source')
+    os.mkdir(source_path)
+
+    test_paths = []
+    for filename in [u'first', u'second']:
+      test_path = os.path.join(source_path, filename)
+      shutil.copyfile(self._GetTestFilePath([u'syslog']), test_path)
+      test_paths.append(test_path)
+
+    test_paths.append(self._GetTestFilePath([u'iis.log']))
+
+    def _PushPathSpecs(path_spec_queue):
+      """Pushes the path specifications slower than the queue wait timeout."""
+      for test_path in test_paths:
+        time.sleep(0.5)
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            definitions.TYPE_INDICATOR_OS, location=test_path)
+        path_spec_queue.PushItem(path_spec)
+      path_spec_queue.SignalEndOfInput()
+
+    # The worker processes are started before the path specifications are
+    # pushed and should not stop when the queue is empty for a while.
+    queue_wait_timeout = multi_process.MultiProcessingQueue._QUEUE_WAIT_TIMEOUT
+    multi_process.MultiProcessingQueue._QUEUE_WAIT_TIMEOUT = 0.1
+
+    destination_path = os.path.join(self._temp_directory, u'export')
+    try:
+      test_front_end._ExtractPathSpecs(
+          _PushPathSpecs, destination_path, number_of_workers=2)
+    finally:
+      multi_process.MultiProcessingQueue._QUEUE_WAIT_TIMEOUT = (
+          queue_wait_timeout)
+
+    for test_path in test_paths:
+      path_segments = test_path.split(os.path.sep)
+      target_path = os.path.join(destination_path, *path_segments)
+      with open(target_path, 'rb') as file_object:
+        data = file_object.read()
+
+      with open(test_path, 'rb') as file_object:
+        expected_data = file_object.read()
+
+      self.assertEqual(data, expected_data)
+
+    # The manifest of every worker is merged.
+    manifest_path = os.path.join(
+        destination_path, image_export.FileSaver.CONTENT_STORE_DIRECTORY,
+        u'manifest.txt')
+    with open(manifest_path, 'rb') as file_object:
+      manifest_entries = file_object.read().splitlines()
+
+    self.assertEqual(len(manifest_entries), 3)
+
+  def testExtractPathSpecsWithFailingWorkers(self):
+    """Tests the _ExtractPathSpecs function with failing workers."""
+    test_front_end = image_export.ImageExportFrontend()
+
+    def _PushPathSpecs(path_spec_queue):
+      """Pushes path specifications that cannot be exported."""
+      for _ in range(2):
+        path_spec_queue.PushItem(u'bogus')
+      path_spec_queue.SignalEndOfInput()
+
+    destination_path = os.path.join(self._temp_directory, u'export')
+    with self.assertRaises(RuntimeError):
+      test_front_end._ExtractPathSpecs(
+          _PushPathSpecs, destination_path, number_of_workers=2)
+
   def testProcessSourceExtractWithDateTimeFilter(self):
     """Tests extract with a date time filter."""
     test_front_end = image_export.ImageExportFrontend()
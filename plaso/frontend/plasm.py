@@ -292,7 +292,6 @@ class GroupingEngine(object):
       groups_in_tag = 0
       for location in locations:
         store_number, store_index = location
-        # TODO(ojensen): getting higher number event_objects seems to be slow.
         event_object = storage_file.GetEventObject(store_number, store_index)
         if not hasattr(event_object, 'timestamp'):
           continue
@@ -5,7 +5,10 @@ import collections
 import datetime
 import multiprocessing
 import logging
+import os
+import shutil
 import sys
+import tempfile
 
 from plaso import filters
 from plaso import formatters   # pylint: disable=unused-import
@@ -37,6 +40,11 @@ import pytz
 class PsortFrontend(analysis_frontend.AnalysisFrontend):
   """Class that implements the psort front-end."""
 
+  # The output formats that write every event object independently as text,
+  # of which the output of multiple workers can be concatenated.
+  _WORKER_OUTPUT_FORMATS = frozenset([
+      u'dynamic', u'l2tcsv', u'l2ttln', u'rawpy', u'tln'])
+
   def __init__(self):
     """Initializes the front-end object."""
     input_reader = frontend.StdinFrontendInputReader()
@@ -48,6 +56,7 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     self._filter_buffer = None
     self._filter_expression = None
     self._filter_object = None
+    self._number_of_workers = 1
     self._output_filename = None
     self._output_file_object = None
     self._output_format = None
@@ -60,7 +69,7 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     Args:
       event_object: an event object (instance of EventObject).
       output_buffer: the output buffer.
-      event_queues: a list of event queues that serve as input for
+      event_queues: a list of event queue producers that serve as input for
                     the analysis plugins.
     """
     output_buffer.Append(event_object)
@@ -80,6 +89,173 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     for event_queue in event_queues:
       event_queue.ProduceItem(event_object)
 
+  def _ProcessOutputWithWorkers(
+      self, storage_file, output_module, options, deduplicate_events=True):
+    """Processes the event objects in the storage using worker processes.
+
+    The time range of the storage is partitioned and every worker processes
+    the event objects of one partition into a temporary file. Since the
+    partitions are in chronological order concatenating the output of
+    the workers results in output that is sorted by time.
+
+    Args:
+      storage_file: The storage file object (instance of StorageFile).
+      output_module: The output module object (instance of OutputModule).
+      options: the command line arguments (instance of argparse.Namespace).
+      deduplicate_events: Optional boolean value to indicate if the event
+                          objects should be deduplicated. The default is True.
+
+    Returns:
+      A counter.
+
+    Raises:
+      RuntimeError: if a worker process failed.
+    """
+    time_ranges = storage_file.GetTimeRangePartitions(self._number_of_workers)
+
+    counter = collections.Counter()
+    counter_queue = multi_process.MultiProcessingQueue()
+    temporary_directory = tempfile.mkdtemp()
+
+    try:
+      output_paths = []
+      worker_processes = []
+      for worker_number, time_range in enumerate(time_ranges):
+        output_path = os.path.join(
+            temporary_directory, u'output.{0:06d}'.format(worker_number))
+        output_paths.append(output_path)
+
+        worker_process = multiprocessing.Process(
+            name=u'Output worker {0:d}'.format(worker_number),
+            target=self._ProcessTimeRange,
+            args=(options, time_range, output_path, deduplicate_events,
+                  counter_queue))
+        worker_processes.append(worker_process)
+
+        worker_process.start()
+        logging.debug(
+            u'Output worker: {0:d} started for time range: {1:d} - '
+            u'{2:d}.'.format(worker_number, time_range[0], time_range[1]))
+
+      # The counters are popped before the worker processes are joined,
+      # since a process that pushed data onto a queue does not exit before
+      # all the data was transferred.
+      number_of_counters = 0
+      while number_of_counters < len(worker_processes):
+        try:
+          counter.update(counter_queue.PopItem())
+          number_of_counters += 1
+
+        except errors.QueueEmpty:
+          # A worker process that failed does not push its counter.
+          for worker_number, worker_process in enumerate(worker_processes):
+            if worker_process.exitcode:
+              raise RuntimeError(
+                  u'Output worker: {0:d} failed with exit code: {1:d}.'.format(
+                      worker_number, worker_process.exitcode))
+
+      for worker_number, worker_process in enumerate(worker_processes):
+        worker_process.join()
+        if worker_process.exitcode != 0:
+          raise RuntimeError(
+              u'Output worker: {0:d} failed with exit code: {1:d}.'.format(
+                  worker_number, worker_process.exitcode))
+
+      output_module.Open()
+      output_module.WriteHeader()
+
+      for output_path in output_paths:
+        with open(output_path, 'rb') as file_object:
+          if self._output_file_object:
+            shutil.copyfileobj(file_object, self._output_file_object)
+          else:
+            for line in file_object:
+              self._output_writer.Write(line.decode(u'utf-8'))
+
+      output_module.WriteFooter()
+      output_module.Close()
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
+    return counter
+
+  def _ProcessTimeRange(
+      self, options, time_range, output_path, deduplicate_events,
+      counter_queue):
+    """Processes the event objects within a time range.
+
+    This method is the target of the output worker processes.
+
+    Args:
+      options: the command line arguments (instance of argparse.Namespace).
+      time_range: a tuple of the first and last timestamp of the time range.
+      output_path: the path of the file to write the output to.
+      deduplicate_events: boolean value to indicate if the event objects
+                          should be deduplicated.
+      counter_queue: the queue to push the counter onto (instance of Queue).
+    """
+    first_timestamp, last_timestamp = time_range
+
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+    pfilter.TimeRangeCache.SetLowerTimestamp(first_timestamp)
+    pfilter.TimeRangeCache.SetUpperTimestamp(last_timestamp)
+
+    storage_file = self.OpenStorageFile(read_only=True)
+    with storage_file:
+      storage_file.SetStoreLimit(self._filter_object)
+
+      formatter_mediator = self.GetFormatterMediator()
+      formatter_mediator.SetPreferredLanguageIdentifier(
+          self._preferred_language)
+
+      output_mediator_object = output_mediator.OutputMediator(
+          formatter_mediator, storage_file, config=options)
+
+      with open(output_path, 'wb') as file_object:
+        output_writer = cli_tools.FileObjectOutputWriter(file_object)
+        output_module = output_manager.OutputManager.NewOutputModule(
+            self._output_format, output_mediator_object,
+            output_writer=output_writer)
+
+        output_buffer = output_interface.EventBuffer(
+            output_module, deduplicate_events, write_header_and_footer=False)
+        with output_buffer:
+          counter = self.ProcessOutput(
+              storage_file, output_buffer, my_filter=self._filter_object)
+
+    counter_queue.PushItem(counter)
+
+  def _UseWorkers(self, analysis_plugins):
+    """Determines if the output can be processed by worker processes.
+
+    Args:
+      analysis_plugins: a string containing the names of the analysis plugins.
+
+    Returns:
+      A boolean value indicating the output can be processed by workers.
+    """
+    if self._number_of_workers <= 1:
+      return False
+
+    reason = None
+    if analysis_plugins:
+      reason = u'analysis plugins'
+    elif self._filter_buffer:
+      reason = u'the slicer'
+    elif getattr(self._filter_object, u'limit', 0):
+      reason = u'a filter limit'
+    elif self._output_format not in self._WORKER_OUTPUT_FORMATS:
+      reason = u'output format: {0:s}'.format(self._output_format)
+
+    if reason:
+      logging.warning(
+          u'Output workers are not supported in combination with {0:s}, '
+          u'falling back to a single process.'.format(reason))
+      return False
+
+    return True
+
   def AddAnalysisPluginOptions(self, argument_group, plugin_names):
     """Adds the analysis plugin options to the argument group
 
@@ -242,6 +418,11 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
 
     self._preferred_language = getattr(options, u'preferred_language', u'en-US')
 
+    self._number_of_workers = getattr(options, u'workers', 1)
+    if self._number_of_workers < 1:
+      raise errors.BadConfigOption(
+          u'Invalid number of workers: {0:d}.'.format(self._number_of_workers))
+
   def ProcessStorage(self, options):
     """Open a storage file and processes the events within.
 
@@ -369,7 +550,6 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
         # Start queues and load up plugins.
         # TODO: add upper queue limit.
         analysis_output_queue = multi_process.MultiProcessingQueue()
-        event_queue_producers = []
         event_queues = []
         analysis_plugins_list = [
             name.strip() for name in analysis_plugins.split(u',')]
@@ -378,13 +558,26 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
           # TODO: add upper queue limit.
           analysis_plugin_queue = multi_process.MultiProcessingQueue()
           event_queues.append(analysis_plugin_queue)
-          event_queue_producers.append(
-              queue.ItemQueueProducer(event_queues[-1]))
 
         knowledge_base_object = knowledge_base.KnowledgeBase()
 
-        analysis_plugins = analysis_manager.AnalysisPluginManager.LoadPlugins(
-            analysis_plugins_list, event_queues, options=options)
+        analysis_plugins = list(
+            analysis_manager.AnalysisPluginManager.LoadPlugins(
+                analysis_plugins_list, event_queues, options=options))
+
+        # The events are routed to the plugins that are interested in them
+        # and every batch of events is serialized once for all the plugins.
+        plugin_names_lower = [name.lower() for name in analysis_plugins_list]
+        broadcast_queues = []
+        item_filters = []
+        for analysis_plugin in analysis_plugins:
+          queue_index = plugin_names_lower.index(
+              analysis_plugin.plugin_name.lower())
+          broadcast_queues.append(event_queues[queue_index])
+          item_filters.append(analysis_plugin.IsEventOfInterest)
+
+        event_queue_producers = [queue.BroadcastItemQueueProducer(
+            broadcast_queues, item_filters=item_filters)]
 
         # Now we need to start all the plugins.
         for analysis_plugin in analysis_plugins:
@@ -407,13 +600,19 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
         event_queue_producers = []
 
       deduplicate_events = getattr(options, u'dedup', True)
-      output_buffer = output_interface.EventBuffer(
-          output_module, deduplicate_events)
-      with output_buffer:
-        counter = self.ProcessOutput(
-            storage_file, output_buffer, my_filter=self._filter_object,
-            filter_buffer=self._filter_buffer,
-            analysis_queues=event_queue_producers)
+      if self._UseWorkers(analysis_plugins):
+        counter = self._ProcessOutputWithWorkers(
+            storage_file, output_module, options,
+            deduplicate_events=deduplicate_events)
+
+      else:
+        output_buffer = output_interface.EventBuffer(
+            output_module, deduplicate_events)
+        with output_buffer:
+          counter = self.ProcessOutput(
+              storage_file, output_buffer, my_filter=self._filter_object,
+              filter_buffer=self._filter_buffer,
+              analysis_queues=event_queue_producers)
 
       for information in storage_file.GetStorageInformation():
         if hasattr(information, u'counter'):
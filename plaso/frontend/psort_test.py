@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the psort front-end."""
 
+import collections
 import os
 import unittest
 
@@ -9,6 +10,7 @@ from plaso.cli import test_lib as cli_test_lib
 from plaso.formatters import interface as formatters_interface
 from plaso.formatters import manager as formatters_manager
 from plaso.formatters import mediator as formatters_mediator
+from plaso.frontend import frontend
 from plaso.frontend import psort
 from plaso.frontend import test_lib
 from plaso.lib import event
@@ -87,6 +89,7 @@ class TestEventBuffer(output_interface.EventBuffer):
     """
     super(TestEventBuffer, self).__init__(
         output_module, check_dedups=check_dedups)
+    self._buffer_dict = {}
     self.record_count = 0
     self.store = store
 
@@ -131,7 +134,7 @@ class PsortFrontendTest(test_lib.FrontendTestCase):
       timestamp_list.append(event_object.timestamp)
       event_object = storage_file.GetSortedEntry()
 
-    self.assertEqual(len(timestamp_list), 8)
+    self.assertEqual(len(timestamp_list), 15)
     self.assertTrue(
         timestamp_list[0] >= self.first and timestamp_list[-1] <= self.last)
 
@@ -193,6 +196,72 @@ class PsortFrontendTest(test_lib.FrontendTestCase):
     formatters_manager.FormattersManager.DeregisterFormatter(
         PsortTestEventFormatter)
 
+  def testProcessStorageWithWorkers(self):
+    """Tests the ProcessStorage function with output workers."""
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+
+    with test_lib.TempDirectory() as dirname:
+      options = frontend.Options()
+      options.output_format = u'l2tcsv'
+      options.storage_file = self._test_file
+
+      outputs = []
+      for number_of_workers in [1, 3]:
+        options.workers = number_of_workers
+        options.write = os.path.join(
+            dirname, u'output.{0:d}'.format(number_of_workers))
+
+        self._front_end.ParseOptions(options)
+        counter = self._front_end.ProcessStorage(options)
+        self.assertEqual(counter[u'Events Included'], 15)
+
+        with open(options.write, 'rb') as file_object:
+          outputs.append(file_object.read())
+
+    self.assertEqual(outputs[0], outputs[1])
+
+    lines = outputs[1].split(b'\n')
+    self.assertTrue(lines[0].startswith(b'date,time,timezone,MACB,'))
+    self.assertEqual(len(lines), 17)
+
+  def testProcessStorageWithFailingWorkers(self):
+    """Tests the ProcessStorage function with large counters and failures."""
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+
+    def _ProcessTimeRangeWithLargeCounter(
+        unused_options, unused_time_range, output_path,
+        unused_deduplicate_events, counter_queue):
+      """Pushes a counter that does not fit in the pipe buffer."""
+      open(output_path, 'wb').close()
+      counter_queue.PushItem(collections.Counter(
+          u'key{0:d}'.format(index) for index in range(100000)))
+
+    def _ProcessTimeRangeWithFailure(
+        unused_options, unused_time_range, unused_output_path,
+        unused_deduplicate_events, unused_counter_queue):
+      """Fails without pushing a counter."""
+      os._exit(1)  # pylint: disable=protected-access
+
+    with test_lib.TempDirectory() as dirname:
+      options = frontend.Options()
+      options.output_format = u'l2tcsv'
+      options.storage_file = self._test_file
+      options.workers = 2
+      options.write = os.path.join(dirname, u'output')
+
+      self._front_end.ParseOptions(options)
+      self._front_end._ProcessTimeRange = _ProcessTimeRangeWithLargeCounter
+      try:
+        counter = self._front_end.ProcessStorage(options)
+        self.assertEqual(counter[u'key99999'], 2)
+
+        self._front_end._ProcessTimeRange = _ProcessTimeRangeWithFailure
+        with self.assertRaises(RuntimeError):
+          self._front_end.ProcessStorage(options)
+
+      finally:
+        del self._front_end._ProcessTimeRange
+
   # TODO: add bogus data location test.
 
 
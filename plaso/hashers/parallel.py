@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""This file contains a class to update multiple hashers in parallel."""
+
+
+class ParallelHasher(object):
+  """Class that updates multiple hashers in parallel.
+
+  The hashers are updated on a thread pool, since hashlib releases the GIL
+  while hashing larger blocks of data. An update is asynchronous, which
+  allows the caller to read the next block of data while the hashers are
+  updated with the current block.
+  """
+
+  def __init__(self, hasher_objects, thread_pool=None):
+    """Initializes the parallel hasher object.
+
+    Args:
+      hasher_objects: a list of hasher objects (instances of BaseHasher).
+      thread_pool: optional thread pool (instance of
+                   multiprocessing.pool.ThreadPool) to update the hashers on.
+                   The default is None, which represents the hashers are
+                   updated sequentially by the caller.
+    """
+    super(ParallelHasher, self).__init__()
+    self._hasher_objects = hasher_objects
+    self._pending_result = None
+    self._thread_pool = thread_pool
+
+  def _WaitForPendingUpdate(self):
+    """Waits for the pending update of the hashers to complete.
+
+    Raises:
+      Exception: if a hasher raised an exception during the update.
+    """
+    if self._pending_result:
+      pending_result = self._pending_result
+      self._pending_result = None
+      pending_result.get()
+
+  def GetStringDigests(self):
+    """Retrieves the digests of the hashers expressed as unicode strings.
+
+    Returns:
+      A dictionary mapping hasher names to the digests calculated by
+      the hashers.
+    """
+    self._WaitForPendingUpdate()
+
+    digests = {}
+    for hasher in self._hasher_objects:
+      digests[hasher.NAME] = hasher.GetStringDigest()
+    return digests
+
+  def Update(self, data):
+    """Updates the hashers with a new block of data.
+
+    The hashers are updated with the blocks of data in the order they were
+    passed to Update, the previous block is hashed before the current one.
+
+    Args:
+      data: a string of data with which to update the context of the hashers.
+    """
+    self._WaitForPendingUpdate()
+
+    if not self._thread_pool:
+      for hasher in self._hasher_objects:
+        hasher.Update(data)
+      return
+
+    self._pending_result = self._thread_pool.map_async(
+        lambda hasher: hasher.Update(data), self._hasher_objects, chunksize=1)
@@ -0,0 +1,63 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the parallel hasher."""
+
+import unittest
+
+from multiprocessing import pool
+
+from plaso.hashers import md5
+from plaso.hashers import parallel
+from plaso.hashers import sha256
+from plaso.hashers import test_lib
+
+
+class ParallelHasherTest(test_lib.HasherTestCase):
+  """Tests for the parallel hasher."""
+
+  def _HashTestFile(self, thread_pool=None):
+    """Hashes a test file with the parallel hasher.
+
+    Args:
+      thread_pool: optional thread pool (instance of
+                   multiprocessing.pool.ThreadPool).
+
+    Returns:
+      A dictionary mapping hasher names to digests.
+    """
+    parallel_hasher = parallel.ParallelHasher(
+        [md5.MD5Hasher(), sha256.SHA256Hasher()], thread_pool=thread_pool)
+
+    file_entry = self._GetTestFileEntry([u'syslog'])
+    file_object = file_entry.GetFileObject()
+    try:
+      data = file_object.read(self._DEFAULT_READ_SIZE)
+      while data:
+        parallel_hasher.Update(data)
+        data = file_object.read(self._DEFAULT_READ_SIZE)
+    finally:
+      file_object.close()
+
+    return parallel_hasher.GetStringDigests()
+
+  def testGetStringDigests(self):
+    """Tests the Update and GetStringDigests functions."""
+    expected_digests = {
+        u'md5': u'86b1befdcb6f95424b7af56017ac2dd9',
+        u'sha256': (
+            u'b9bee1add1b34d1e8200df89667d2449'
+            u'14def9d260931c732dada15dfe172aec')}
+
+    self.assertEqual(self._HashTestFile(), expected_digests)
+
+    thread_pool = pool.ThreadPool(processes=2)
+    try:
+      self.assertEqual(
+          self._HashTestFile(thread_pool=thread_pool), expected_digests)
+    finally:
+      thread_pool.close()
+      thread_pool.join()
+
+
+if __name__ == '__main__':
+  unittest.main()
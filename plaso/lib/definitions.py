@@ -33,6 +33,12 @@ RESERVED_VARIABLE_NAMES = frozenset([
     u'username',
     u'uuid'])
 
+QUEUE_TYPE_MULTI_PROCESSING = u'multiprocessing'
+QUEUE_TYPE_SHARED_MEMORY = u'shared_memory'
+
+QUEUE_TYPES = frozenset([
+    QUEUE_TYPE_MULTI_PROCESSING, QUEUE_TYPE_SHARED_MEMORY])
+
 OS_LINUX = u'Linux'
 OS_MACOSX = u'MacOSX'
 # TODO: keeping this compatible with the existing code for now.
@@ -172,6 +172,79 @@ class EventObject(object):
 
     return u'|'.join(map(unicode, identity))
 
+  def _GetHashableValue(self, value):
+    """Return a hashable representation of an attribute value.
+
+    The representation contains the type of the value, other than for
+    strings, so that values that are equal in Python but have a different
+    string representation, such as 1 and 1.0 or [1, 2] and (1, 2), are
+    represented differently.
+
+    Args:
+      value: the attribute value.
+
+    Returns:
+      A hashable representation of the value.
+    """
+    if isinstance(value, basestring):
+      return value
+
+    if isinstance(value, dict):
+      return dict, tuple(sorted(
+          (key, self._GetHashableValue(item)) for key, item in value.items()))
+
+    if isinstance(value, (list, tuple)):
+      return type(value), tuple(
+          self._GetHashableValue(item) for item in value)
+
+    if isinstance(value, (set, frozenset)):
+      return type(value), frozenset(
+          self._GetHashableValue(item) for item in value)
+
+    try:
+      hash(value)
+    except TypeError:
+      return type(value), unicode(value)
+    return type(value), value
+
+  def EqualityKey(self):
+    """Return a hashable key describing the EventObject in terms of equality.
+
+    This is a faster alternative to EqualityString that does not convert
+    the attribute values into strings. The key is meant to be used in a
+    dictionary, which only compares keys when their hashes are the same.
+
+    Returns:
+      A tuple that is equal to the key of another EventObject if their
+      comparable attributes have equal values of the same type. This is
+      stricter than EqualityString, which also matches values of different
+      types with the same string representation, such as 1 and 1L. String
+      values are compared regardless of their type.
+    """
+    attributes = self.GetAttributes().difference(self.COMPARE_EXCLUDE)
+
+    parser = getattr(self, 'parser', u'')
+    if parser == u'filestat':
+      # The timestamp description is not compared for filestat events,
+      # see EqualityString.
+      attributes.discard('timestamp_desc')
+
+    identity = [self.timestamp, self.data_type]
+    for attribute in sorted(attributes):
+      identity.append(attribute)
+      identity.append(self._GetHashableValue(getattr(self, attribute)))
+
+    if parser == u'filestat':
+      if hasattr(self, 'inode'):
+        inode = self.inode
+      else:
+        # A filestat event without an inode is never equal to another event.
+        inode = object()
+      identity.append('inode')
+      identity.append(inode)
+
+    return tuple(identity)
+
   def __eq__(self, event_object):
     """Return a boolean indicating if two EventObject are considered equal.
 
@@ -288,6 +361,33 @@ class EventObject(object):
     return part_1 + part_2
 
 
+class SerializedEventObject(object):
+  """Class that contains an event object that was serialized by a worker.
+
+  The storage writer only needs the timestamp, parser, plugin and data type
+  of the event object to update its counters, hence these are stored next to
+  the serialized event object data.
+  """
+
+  def __init__(self, timestamp, parser, data_type, data, plugin=None):
+    """Initializes the serialized event object.
+
+    Args:
+      timestamp: the timestamp of the event object.
+      parser: the name of the parser that produced the event object or None.
+      data_type: the data type of the event object.
+      data: a binary string containing the serialized event object.
+      plugin: optional name of the plugin that produced the event object.
+              The default is None.
+    """
+    super(SerializedEventObject, self).__init__()
+    self.data = data
+    self.data_type = data_type
+    self.parser = parser
+    self.plugin = plugin
+    self.timestamp = timestamp
+
+
 class EventTag(object):
   """A native Python object for the EventTagging protobuf.
 
@@ -242,6 +242,80 @@ class EventObjectTest(unittest.TestCase):
     self.assertNotEqual(event_c.EqualityString(), event_d.EqualityString())
     self.assertNotEqual(event_d.EqualityString(), event_f.EqualityString())
 
+  def testEqualityKey(self):
+    """Test the EventObject EqualityKey."""
+    event_a = event.EventObject()
+    event_b = event.EventObject()
+    event_c = event.EventObject()
+    event_d = event.EventObject()
+
+    event_a.timestamp = 123
+    event_a.timestamp_desc = u'LAST WRITTEN'
+    event_a.data_type = 'mock:nothing'
+    event_a.inode = 124
+    event_a.filename = u'c:/bull/skrytinmappa/skra.txt'
+    event_a.values = {u'key': [1, 2]}
+
+    event_b.timestamp = 123
+    event_b.timestamp_desc = u'LAST WRITTEN'
+    event_b.data_type = 'mock:nothing'
+    event_b.inode = 623423
+    event_b.filename = u'c:/afrit/öñṅûŗ₅ḱŖūα.txt'
+    event_b.values = {u'key': [1, 2]}
+
+    event_c.timestamp = 123
+    event_c.timestamp_desc = u'LAST UPDATED'
+    event_c.data_type = 'mock:nothing'
+    event_c.inode = 124
+    event_c.filename = u'c:/bull/skrytinmappa/skra.txt'
+    event_c.values = {u'key': [1, 2]}
+
+    event_d.timestamp = 123
+    event_d.timestamp_desc = u'LAST WRITTEN'
+    event_d.data_type = 'mock:nothing'
+    event_d.inode = 124
+    event_d.filename = u'c:/bull/skrytinmappa/skra.txt'
+    event_d.values = {u'key': [1, 3]}
+
+    self.assertEqual(event_a.EqualityKey(), event_b.EqualityKey())
+    self.assertNotEqual(event_a.EqualityKey(), event_c.EqualityKey())
+    self.assertNotEqual(event_a.EqualityKey(), event_d.EqualityKey())
+
+    # The timestamp description is not compared for filestat events.
+    event_a.parser = u'filestat'
+    event_c.parser = u'filestat'
+    self.assertEqual(event_a.EqualityKey(), event_c.EqualityKey())
+
+    del event_a.inode
+    del event_c.inode
+    self.assertNotEqual(event_a.EqualityKey(), event_c.EqualityKey())
+
+  def testEqualityKeyValueTypes(self):
+    """Test that the EventObject EqualityKey compares the value types."""
+    event_a = event.EventObject()
+    event_b = event.EventObject()
+
+    event_a.timestamp = 123
+    event_a.data_type = 'mock:nothing'
+    event_b.timestamp = 123
+    event_b.data_type = 'mock:nothing'
+
+    # Values that are equal in Python but of a different type.
+    for value_a, value_b in [
+        ([1, 2], (1, 2)), (1, 1.0), (1, True), ({1: 2}, [(1, 2)])]:
+      event_a.value = value_a
+      event_b.value = value_b
+      self.assertNotEqual(event_a.EqualityKey(), event_b.EqualityKey())
+
+    event_a.value = [1, {u'key': 2.0}]
+    event_b.value = [1, {u'key': 2.0}]
+    self.assertEqual(event_a.EqualityKey(), event_b.EqualityKey())
+
+    # String values are compared regardless of their type.
+    event_a.value = 'text'
+    event_b.value = u'text'
+    self.assertEqual(event_a.EqualityKey(), event_b.EqualityKey())
+
   def testEqualityFileStatParserMissingInode(self):
     """Test that FileStatParser files with missing inodes are distinct"""
     event_a = event.EventObject()
@@ -7,6 +7,8 @@ https://code.google.com/p/grr
 
 import logging
 import re
+import sre_constants
+import sre_parse
 
 
 class Token(object):
@@ -197,6 +199,201 @@ class SelfFeederMixIn(Lexer):
     return len(data)
 
 
+class BufferedSelfFeederMixIn(Lexer):
+  """This mixin is used to make a lexer which feeds itself in linear time.
+
+  Unlike the SelfFeederMixIn the tokens are matched against a large read
+  window using a position cursor, hence consumed data is not copied on every
+  token but dropped when the window is refilled. The tokens are grouped by
+  state the first time a state is encountered.
+
+  Note that self.file_object must be the file object we read from.
+  """
+
+  # The number of bytes read into the window at once.
+  _READ_SIZE = 64 * 1024
+
+  # The minimum number of unconsumed bytes in the window before a token is
+  # matched, which is the maximum size of data a single token can match.
+  _MINIMUM_WINDOW_SIZE = 8 * 1024
+
+  def __init__(self, file_object=None):
+    """Initializes the lexer feeder min object.
+
+    Args:
+      file_object: Optional file-like object. The default is None.
+    """
+    self._cursor = 0
+    self._state_tokens = {}
+    self._window = ''
+    super(BufferedSelfFeederMixIn, self).__init__()
+    self.file_object = file_object
+
+  @property
+  def buffer(self):
+    """The unconsumed data in the window."""
+    return self._window[self._cursor:]
+
+  @buffer.setter
+  def buffer(self, data):
+    """Replaces the window with the data."""
+    self._cursor = 0
+    self._window = data
+
+  def _ContainsStartAnchor(self, sub_pattern):
+    """Determines if a parsed regular expression contains a start anchor.
+
+    Args:
+      sub_pattern: the parsed regular expression (instance of
+                   sre_parse.SubPattern) or one of its arguments.
+
+    Returns:
+      A boolean value indicating the regular expression contains a ^ or \\A
+      anchor.
+    """
+    if isinstance(sub_pattern, sre_parse.SubPattern):
+      for operator, argument in sub_pattern:
+        if operator == sre_constants.AT and argument in (
+            sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING):
+          return True
+        if self._ContainsStartAnchor(argument):
+          return True
+
+    elif isinstance(sub_pattern, (list, tuple)):
+      for argument in sub_pattern:
+        if self._ContainsStartAnchor(argument):
+          return True
+
+    return False
+
+  def _GetStateTokens(self, state):
+    """Retrieves the tokens that apply to a state.
+
+    The start of the unconsumed data is considered the start of the buffer,
+    however a ^ or \\A anchor does not always match at the cursor. A leading
+    anchor is removed, since matching at the cursor is already anchored.
+    Tokens with other anchors, such as every alternative of ^a|^b, are matched
+    against a copy of the unconsumed data instead.
+
+    Args:
+      state: the state.
+
+    Returns:
+      A list of tuples containing the token, the compiled regular expression
+      and a boolean value indicating the regular expression is matched at the
+      cursor.
+    """
+    state_tokens = self._state_tokens.get(state, None)
+    if state_tokens is None:
+      state_tokens = []
+      for token in self.tokens:
+        if not token.state_regex.match(state):
+          continue
+
+        regex = token.regex
+        if token.re_str.startswith(u'^'):
+          regex = re.compile(token.re_str[1:], token.regex.flags)
+        elif token.re_str.startswith(u'\\A'):
+          regex = re.compile(token.re_str[2:], token.regex.flags)
+
+        sub_pattern = sre_parse.parse(regex.pattern, regex.flags)
+        if self._ContainsStartAnchor(sub_pattern):
+          state_tokens.append((token, token.regex, False))
+        else:
+          state_tokens.append((token, regex, True))
+
+      self._state_tokens[state] = state_tokens
+
+    return state_tokens
+
+  def Empty(self):
+    """Return a boolean indicating if the buffer is empty."""
+    return self._cursor >= len(self._window)
+
+  def Feed(self, size=None):
+    """Feed data into the buffer.
+
+    Args:
+      size: Optional number of bytes to read. The default is None, which
+            represents the read size of the lexer.
+
+    Returns:
+      The number of bytes read.
+    """
+    data = self.file_object.read(size or self._READ_SIZE)
+    if data:
+      self._window = b''.join([self._window[self._cursor:], data])
+      self._cursor = 0
+    return len(data)
+
+  def GetBufferSize(self):
+    """Retrieves the number of unconsumed bytes in the buffer."""
+    return len(self._window) - self._cursor
+
+  def NextToken(self):
+    """Fetch the next token by trying to match any of the regexes in order."""
+    if len(self._window) - self._cursor < self._MINIMUM_WINDOW_SIZE:
+      if self.Feed() == 0 and self.Empty():
+        return None
+
+    current_state = self.state
+    for token, regex, match_at_cursor in self._GetStateTokens(current_state):
+      if match_at_cursor:
+        match_offset = self._cursor
+        match = regex.match(self._window, self._cursor)
+      else:
+        match_offset = 0
+        match = regex.match(self._window[self._cursor:])
+
+      if not match:
+        continue
+
+      match_size = match.end() - match_offset
+
+      # The match consumes the data off the buffer (the handler can put it back
+      # if it likes)
+      self.processed += match_size
+      self._cursor += match_size
+
+      next_state = token.next_state
+      for action in token.actions:
+
+        # Is there a callback to handle this action?
+        callback = getattr(self, action, self.Default)
+
+        # Allow a callback to skip other callbacks.
+        try:
+          possible_next_state = callback(string=match.group(0), match=match)
+          if possible_next_state == self._CONTINUE_STATE:
+            continue
+          # Override the state from the Token
+          elif possible_next_state:
+            next_state = possible_next_state
+        except ParseError as exception:
+          self.Error(exception)
+
+      # Update the next state
+      if next_state:
+        self.state = next_state
+
+      return token
+
+    self.Error(u'Expected {0:s}'.format(self.state))
+    self._cursor += 1
+    self.processed += 1
+    return self._ERROR_TOKEN
+
+  def PushBack(self, string='', **_):
+    """Push the match back on the stream."""
+    start_offset = self._cursor - len(string)
+    if start_offset >= 0 and self._window[start_offset:self._cursor] == string:
+      self._cursor = start_offset
+    else:
+      self._window = b''.join([string, self._window[self._cursor:]])
+      self._cursor = 0
+    self.processed -= len(string)
+
+
 class Expression(object):
   """A class representing an expression."""
   attribute = None
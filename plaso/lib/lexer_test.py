@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the lexer."""
+
+import io
+import unittest
+
+from plaso.lib import lexer
+
+
+class TestBufferedSelfFeeder(lexer.BufferedSelfFeederMixIn):
+  """Class that implements a lexer that collects lines."""
+
+  # Small sizes are used to test the window being refilled.
+  _MINIMUM_WINDOW_SIZE = 8
+  _READ_SIZE = 16
+
+  tokens = [
+      lexer.Token('INITIAL', r'^([a-z]+)=', 'SetKey', 'VALUE'),
+      lexer.Token('VALUE', r'([^\n]+)', 'AppendValue', ''),
+      lexer.Token('VALUE', r'\n', 'AddLine', 'INITIAL')]
+
+  def __init__(self, file_object=None):
+    """Initializes the lexer object."""
+    super(TestBufferedSelfFeeder, self).__init__(file_object=file_object)
+    self.key = None
+    self.lines = []
+    self.value = u''
+
+  def AddLine(self, **unused_kwargs):
+    """Adds the current line."""
+    self.lines.append((self.key, self.value))
+    self.value = u''
+
+  def AppendValue(self, match=None, **unused_kwargs):
+    """Appends to the current value."""
+    self.value += match.group(1)
+
+  def SetKey(self, match=None, **unused_kwargs):
+    """Sets the current key."""
+    self.key = match.group(1)
+
+
+class BufferedSelfFeederMixInTest(unittest.TestCase):
+  """Tests for the lexer which feeds itself in linear time."""
+
+  def testNextToken(self):
+    """Tests the NextToken function."""
+    file_object = io.BytesIO(
+        b'first=a value that is longer than the read size\n'
+        b'!second=value\n'
+        b'third=\n')
+    test_lexer = TestBufferedSelfFeeder(file_object=file_object)
+
+    while test_lexer.NextToken():
+      self.assertLessEqual(test_lexer.GetBufferSize(), 32)
+
+    expected_lines = [
+        ('first', u'a value that is longer than the read size'),
+        ('second', u'value'),
+        ('third', u'')]
+    self.assertEqual(test_lexer.lines, expected_lines)
+    self.assertEqual(test_lexer.error, 1)
+    self.assertEqual(test_lexer.processed, 69)
+    self.assertTrue(test_lexer.Empty())
+
+  def testNextTokenWithAnchors(self):
+    """Tests the NextToken function with anchors in every alternative."""
+    test_lexer = TestBufferedSelfFeeder(file_object=io.BytesIO(
+        b'first=a\nsecond=b\n'))
+    test_lexer.tokens = [
+        lexer.Token('INITIAL', r'^#|^([a-z]+)=', 'SetKey', 'VALUE'),
+        lexer.Token('VALUE', r'^#|^([^\n]+)', 'AppendValue', ''),
+        lexer.Token('VALUE', r'\A\n|^\r\n', 'AddLine', 'INITIAL')]
+
+    while test_lexer.NextToken():
+      pass
+
+    expected_lines = [('first', u'a'), ('second', u'b')]
+    self.assertEqual(test_lexer.lines, expected_lines)
+    self.assertEqual(test_lexer.error, 0)
+    self.assertEqual(test_lexer.processed, 17)
+
+  def testPushBack(self):
+    """Tests the PushBack function."""
+    test_lexer = TestBufferedSelfFeeder(file_object=io.BytesIO(b'key=value'))
+    test_lexer.Feed()
+
+    self.assertEqual(test_lexer.NextToken().re_str, r'^([a-z]+)=')
+    test_lexer.PushBack(string=b'key=')
+    self.assertEqual(test_lexer.buffer, b'key=value')
+
+    test_lexer.PushBack(string=b'other')
+    self.assertEqual(test_lexer.buffer, b'otherkey=value')
+    self.assertEqual(test_lexer.GetBufferSize(), 14)
+
+
+if __name__ == '__main__':
+  unittest.main()
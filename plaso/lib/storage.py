@@ -83,9 +83,12 @@ import collections
 import construct
 import heapq
 import logging
+import os
+import shutil
 # TODO: replace all instances of struct by construct!
 import struct
 import sys
+import tempfile
 import zipfile
 
 from google.protobuf import message
@@ -108,85 +111,85 @@ from plaso.serializer import json_serializer
 from plaso.serializer import protobuf_serializer
 
 
-class _EventTagIndexValue(object):
-  """Class that defines the event tag index value."""
+class _EventTagStore(object):
+  """Class that defines the in-memory event tag store.
 
-  TAG_STORE_STRUCT = construct.Struct(
-      'tag_store',
-      construct.ULInt32('store_number'),
-      construct.ULInt32('store_index'))
-
-  TAG_UUID_STRUCT = construct.Struct(
-      'tag_uuid',
-      construct.PascalString('event_uuid'))
+  The event tags are indexed by the store number and index, and by the UUID
+  of the tagged event. An event tag that is added later supersedes an earlier
+  event tag of the same event.
+  """
 
-  TAG_INDEX_STRUCT = construct.Struct(
-      'tag_index',
-      construct.Byte('type'),
-      construct.ULInt32('offset'),
-      construct.IfThenElse(
-          'tag',
-          lambda ctx: ctx['type'] == 1,
-          TAG_STORE_STRUCT,
-          TAG_UUID_STRUCT))
+  def __init__(self):
+    """Initializes the event tag store."""
+    super(_EventTagStore, self).__init__()
+    self._event_tags_per_store = {}
+    self._event_tags_per_uuid = {}
 
-  TAG_TYPE_UNDEFINED = 0
-  TAG_TYPE_NUMERIC = 1
-  TAG_TYPE_UUID = 2
-
-  def __init__(self, identifier, store_number=0, store_offset=0):
-    """Initializes the tag index value.
+  def AddEventTag(self, event_tag):
+    """Adds an event tag.
 
     Args:
-      identifier: the identifier string.
-      store_number: optional store number. The default is 0.
-      store_offset: optional offset relative to the start of the store.
-                    The default 0.
+      event_tag: the event tag (instance of EventTag).
     """
-    super(_EventTagIndexValue, self).__init__()
-    self.identifier = identifier
-    self.store_number = store_number
-    self.store_offset = store_offset
+    store_number = getattr(event_tag, 'store_number', 0)
+    if store_number:
+      event_tags = self._event_tags_per_store.setdefault(store_number, {})
+      event_tags[getattr(event_tag, 'store_index', 0)] = event_tag
+
+    uuid = getattr(event_tag, 'event_uuid', None)
+    if uuid:
+      self._event_tags_per_uuid[uuid] = event_tag
 
-  @classmethod
-  def Read(cls, file_object, store_number):
-    """Reads a tag index value from the file-like object.
+  def GetEventTag(self, store_number, store_index, uuid):
+    """Retrieves the event tag of an event.
 
     Args:
-      file_object: the file-like object to read from.
       store_number: the store number.
+      store_index: the store index.
+      uuid: the UUID string.
 
     Returns:
-      The tag index value if successful or None.
+      The event tag (instance of EventTag) or None if the event
+      is not tagged.
     """
-    try:
-      tag_index_struct = cls.TAG_INDEX_STRUCT.parse_stream(file_object)
-    except (construct.FieldError, AttributeError):
-      return None
+    event_tag = None
 
-    tag_type = tag_index_struct.get('type', cls.TAG_TYPE_UNDEFINED)
-    if tag_type not in [cls.TAG_TYPE_NUMERIC, cls.TAG_TYPE_UUID]:
-      logging.warning('Unsupported tag type: {0:d}'.format(tag_type))
-      return None
+    # Try looking up event tag by numeric identifier.
+    event_tags = self._event_tags_per_store.get(store_number, None)
+    if event_tags:
+      event_tag = event_tags.get(store_index, None)
 
-    tag_entry = tag_index_struct.get('tag', {})
-    if tag_type == cls.TAG_TYPE_NUMERIC:
-      tag_identifier = '{}:{}'.format(
-          tag_entry.get('store_number', 0),
-          tag_entry.get('store_index', 0))
+    # Try looking up event tag by UUID.
+    if event_tag is None and uuid:
+      event_tag = self._event_tags_per_uuid.get(uuid, None)
 
-    else:
-      tag_identifier = tag_entry.get('event_uuid', '0')
+    return event_tag
 
-    store_offset = tag_index_struct.get('offset')
-    return _EventTagIndexValue(
-        tag_identifier, store_number=store_number, store_offset=store_offset)
+  def HasEventTags(self):
+    """Determines if the store contains event tags."""
+    return bool(self._event_tags_per_store or self._event_tags_per_uuid)
 
 
 class StorageFile(object):
   """Class that defines the storage file."""
 
-  _STREAM_DATA_SEGMENT_SIZE = 1024
+  _STREAM_DATA_SEGMENT_SIZE = 1024 * 1024
+
+  # The prefixes of the names of the streams that are rewritten, instead of
+  # copied, when the storage file is compacted.
+  _COMPACTED_STREAM_NAME_PREFIXES = (
+      'information.dump', 'plaso_grouping.', 'plaso_index.', 'plaso_meta.',
+      'plaso_proto.', 'plaso_tag_index.', 'plaso_tagging.',
+      'plaso_timestamps.', 'serializer.txt')
+
+  # The maximum number of timestamps sampled per store to partition
+  # the time range.
+  _MAXIMUM_NUMBER_OF_TIMESTAMP_SAMPLES = 1024
+
+  # The size of the proto stream blocks kept in the block cache and
+  # the maximum number of cached blocks, which is 16 MiB in total.
+  _PROTO_STREAM_BLOCK_SIZE = 32 * 1024
+  _MAXIMUM_NUMBER_OF_CACHED_BLOCKS = 512
 
   # Set the maximum buffer size to 196 MiB
   MAX_BUFFER_SIZE = 196 * 1024 * 1024
@@ -203,6 +206,20 @@ class StorageFile(object):
   # Define structs.
   INTEGER = construct.ULInt32('integer')
 
+  # The structs of the tag index entries, which consist of a type, the offset
+  # of the event tag in the tagging stream and the identifier of the event.
+  _TAG_INDEX_TYPE_NUMERIC = 1
+  _TAG_INDEX_TYPE_UUID = 2
+
+  _TAG_STORE_STRUCT = construct.Struct(
+      'tag_store',
+      construct.ULInt32('store_number'),
+      construct.ULInt32('store_index'))
+
+  _TAG_UUID_STRUCT = construct.Struct(
+      'tag_uuid',
+      construct.PascalString('event_uuid'))
+
   source_short_map = {}
   for value in plaso_storage_pb2.EventObject.DESCRIPTOR.enum_types_by_name[
       'SourceShort'].values:
@@ -238,15 +255,18 @@ class StorageFile(object):
     self._buffer_size = 0
     self._event_object_serializer = None
     self._event_serializer_format_string = u''
-    self._event_tag_index = None
+    self._event_tag_store = None
     self._file_open = False
     self._file_number = 1
     self._first_file_number = None
     self._max_buffer_size = buffer_size or self.MAX_BUFFER_SIZE
     self._output_file = output_file
     self._pre_obj = pre_obj
+    self._proto_block_cache = collections.OrderedDict()
+    self._proto_index_data = {}
     self._proto_streams = {}
     self._read_only = None
+    self._seekable_proto_streams = {}
     self._write_counter = 0
 
     self._analysis_report_serializer = (
@@ -362,119 +382,178 @@ class StorageFile(object):
     """Make usable with "with" statement."""
     self.Close()
 
-  def _BuildTagIndex(self):
-    """Builds the tag index that contains the offsets for each tag.
+  def _FlushBuffer(self):
+    """Flushes the buffered streams to disk."""
+    if not self._buffer_size:
+      return
+
+    sorted_buffer = []
+    for _ in range(len(self._buffer)):
+      sorted_buffer.append(heapq.heappop(self._buffer))
+
+    self._WriteStore(
+        self._file_number, sorted_buffer, self._buffer_first_timestamp,
+        self._buffer_last_timestamp, self._count_data_type, self._count_parser)
+
+    self._count_data_type = collections.Counter()
+    self._count_parser = collections.Counter()
+
+    self._file_number += 1
+    self._buffer_size = 0
+    self._buffer = []
+    self._buffer_first_timestamp = sys.maxint
+    self._buffer_last_timestamp = 0
+
+  def _GetEventTagStore(self):
+    """Retrieves the event tag store.
+
+    The event tag store is built on first use by reading every tagging
+    stream once.
+
+    Returns:
+      The event tag store (instance of _EventTagStore).
 
     Raises:
-      IOError: if the stream cannot be opened.
+      IOError: if a stream cannot be opened.
     """
-    self._event_tag_index = {}
+    if self._event_tag_store is None:
+      event_tag_store = _EventTagStore()
+      for event_tag in self.GetTagging():
+        event_tag_store.AddEventTag(event_tag)
 
-    for stream_name in self._GetStreamNames():
-      if not stream_name.startswith('plaso_tag_index.'):
-        continue
+      self._event_tag_store = event_tag_store
 
-      file_object = self._OpenStream(stream_name, 'r')
-      if file_object is None:
-        raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+    return self._event_tag_store
 
-      _, _, store_number = stream_name.rpartition('.')
-      # TODO: catch exception.
-      store_number = int(store_number, 10)
+  def _GetFirstEntryIndexByTimestamp(self, stream_number, timestamp):
+    """Retrieves the index of the first entry at or after a timestamp.
 
-      while True:
-        tag_index_value = _EventTagIndexValue.Read(
-            file_object, store_number)
-        if tag_index_value is None:
-          break
+    Since the entries within a store are sorted by time the timestamps
+    stream is read in a single pass and binary searched, without
+    deserializing any of the event objects.
 
-        self._event_tag_index[tag_index_value.identifier] = tag_index_value
+    Args:
+      stream_number: the number of the stream.
+      timestamp: the timestamp.
 
-  def _FlushBuffer(self):
-    """Flushes the buffered streams to disk."""
-    if not self._buffer_size:
+    Returns:
+      The entry index, which equals the number of entries if all entries
+      have a timestamp before the timestamp, or None if the timestamps stream
+      is not available.
+    """
+    stream_name = 'plaso_timestamps.{0:06d}'.format(stream_number)
+    if stream_name not in self._GetStreamNames():
       return
 
-    yaml_dict = {
-        'range': (self._buffer_first_timestamp, self._buffer_last_timestamp),
-        'version': self.STORAGE_VERSION,
-        'data_type': list(self._count_data_type.viewkeys()),
-        'parsers': list(self._count_parser.viewkeys()),
-        'count': len(self._buffer),
-        'type_count': self._count_data_type.most_common()}
-    self._count_data_type = collections.Counter()
-    self._count_parser = collections.Counter()
-
-    stream_name = 'plaso_meta.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, yaml.safe_dump(yaml_dict))
-
-    ofs = 0
-    proto_str = []
-    index_str = []
-    timestamp_str = []
-    for _ in range(len(self._buffer)):
-      timestamp, entry = heapq.heappop(self._buffer)
-      # TODO: Instead of appending to an array
-      # which is not optimal (loads up the entire max file
-      # size into memory) Zipfile should be extended to
-      # allow appending to files (implement lock).
-      try:
-        # Appending a timestamp to the timestamp index, this is used during
-        # time based filtering. If this is not done we would need to unserialize
-        # all events to get the timestamp value which is really slow.
-        timestamp_str.append(struct.pack('<q', timestamp))
-      except struct.error as exception:
-        # TODO: Instead of just logging the error unserialize the event
-        # and print out information from the event, eg. parser and path spec
-        # location. That way we can find the root cause and fix that instead of
-        # just catching the exception.
-        logging.error((
-            u'Unable to store event, not able to index timestamp value with '
-            u'error: {0:s} [timestamp: {1:d}]').format(exception, timestamp))
-        continue
-      index_str.append(struct.pack('<I', ofs))
-      packed = struct.pack('<I', len(entry)) + entry
-      ofs += len(packed)
-      proto_str.append(packed)
+    timestamp_data = self._ReadStream(stream_name)
 
-    stream_name = 'plaso_index.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, ''.join(index_str))
+    lower_index = 0
+    upper_index = len(timestamp_data) // 8
+    while lower_index < upper_index:
+      middle_index = (lower_index + upper_index) // 2
+      middle_timestamp = struct.unpack_from(
+          '<q', timestamp_data, middle_index * 8)[0]
 
-    stream_name = 'plaso_proto.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, ''.join(proto_str))
+      if middle_timestamp < timestamp:
+        lower_index = middle_index + 1
+      else:
+        upper_index = middle_index
 
-    stream_name = 'plaso_timestamps.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, ''.join(timestamp_str))
+    return lower_index
 
-    self._file_number += 1
-    self._buffer_size = 0
-    self._buffer = []
-    self._buffer_first_timestamp = sys.maxint
-    self._buffer_last_timestamp = 0
+  def _GetSerializedEventObjects(self, store_number):
+    """Retrieves the serialized event objects of a store.
 
-  def _GetEventTagIndexValue(self, store_number, store_index, uuid):
-    """Retrieves an event tag index value.
+    The timestamps are read from the timestamps stream, if available, so that
+    the event objects do not need to be deserialized.
 
     Args:
       store_number: the store number.
-      store_index: the store index.
-      uuid: the UUID string.
 
-    Returns:
-      An event tag index value (instance of _EventTagIndexValue).
+    Yields:
+      A tuple of the timestamp, the store number, the entry index and
+      the serialized event object.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+      WrongProtobufEntry: if the protobuf size is too large for storage.
     """
-    if self._event_tag_index is None:
-      self._BuildTagIndex()
+    timestamps = None
 
-    # Try looking up event tag by numeric identifier.
-    tag_identifier = '{0:d}:{1:d}'.format(store_number, store_index)
-    tag_index_value = self._event_tag_index.get(tag_identifier, None)
+    stream_name = 'plaso_timestamps.{0:06d}'.format(store_number)
+    if stream_name in self._GetStreamNames():
+      timestamp_data = self._ReadStream(stream_name)
+      number_of_timestamps = len(timestamp_data) // 8
+      timestamps = struct.unpack(
+          '<{0:d}q'.format(number_of_timestamps),
+          timestamp_data[:number_of_timestamps * 8])
 
-    # Try looking up event tag by UUID.
-    if tag_index_value is None:
-      tag_index_value = self._event_tag_index.get(uuid, None)
+    stream_name = 'plaso_proto.{0:06d}'.format(store_number)
+    file_object = self._OpenStream(stream_name, 'r')
+    if file_object is None:
+      raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
 
-    return tag_index_value
+    entry_index = 0
+    while True:
+      size_data = file_object.read(4)
+      if len(size_data) != 4:
+        break
+
+      proto_string_size = struct.unpack('<I', size_data)[0]
+
+      if proto_string_size > self.MAX_PROTO_STRING_SIZE:
+        raise errors.WrongProtobufEntry(
+            u'Protobuf string size value exceeds maximum: {0:d}'.format(
+                proto_string_size))
+
+      event_object_data = file_object.read(proto_string_size)
+
+      if timestamps is None:
+        event_object = self._event_object_serializer.ReadSerialized(
+            event_object_data)
+        timestamp = event_object.timestamp
+
+      elif entry_index < len(timestamps):
+        timestamp = timestamps[entry_index]
+
+      else:
+        logging.error((
+            u'Missing timestamp of entry: {0:d} in store: {1:d}').format(
+                entry_index, store_number))
+        break
+
+      yield timestamp, store_number, entry_index, event_object_data
+      entry_index += 1
+
+    file_object.close()
+
+  def _GetSerializedPreprocessObjects(self):
+    """Retrieves the serialized preprocessing objects.
+
+    Yields:
+      A byte string containing a serialized preprocessing object.
+
+    Raises:
+      WrongProtobufEntry: if the protobuf size is too large for storage.
+    """
+    file_object = self._OpenStream('information.dump', 'r')
+    if file_object is None:
+      return
+
+    while True:
+      unpacked = file_object.read(4)
+      if len(unpacked) != 4:
+        break
+
+      size = struct.unpack('<I', unpacked)[0]
+
+      if size > self.MAX_PROTO_STRING_SIZE:
+        raise errors.WrongProtobufEntry(
+            u'Protobuf size too large: {0:d}'.format(size))
+
+      yield file_object.read(size)
+
+    file_object.close()
 
   def _GetStreamNames(self):
     """Retrieves a generator of the storage stream names."""
@@ -517,7 +596,7 @@ class StorageFile(object):
           stream_number, entry_index, stream_offset)
 
     if (not last_entry_index and entry_index == -1 and
-        self._bound_first is not None):
+        self._bound_first is not None and self._bound_first > 0):
       # We only get here if the following conditions are met:
       #   1. last_entry_index is not set (so this is the first read
       #      from this file).
@@ -529,35 +608,23 @@ class StorageFile(object):
       #
       # The purpose: speed seeking into the storage file based on time. Instead
       # of spending precious time reading through the storage file and
-      # deserializing protobufs just to compare timestamps we read a much
-      # 'cheaper' file, one that only contains timestamps to find the proper
-      # entry into the storage file. That way we'll get to the right place in
-      # the file and can start reading protobufs from the right location.
-
-      stream_name = 'plaso_timestamps.{0:06d}'.format(stream_number)
-
-      if stream_name in self._GetStreamNames():
-        timestamp_file_object = self._OpenStream(stream_name, 'r')
-        if timestamp_file_object is None:
-          raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
-
-        index = 0
-        timestamp_compare = 0
-        encountered_error = False
-        while timestamp_compare < self._bound_first:
-          timestamp_raw = timestamp_file_object.read(8)
-          if len(timestamp_raw) != 8:
-            encountered_error = True
-            break
-
-          timestamp_compare = struct.unpack('<q', timestamp_raw)[0]
-          index += 1
-
-        if encountered_error:
+      # deserializing protobufs just to compare timestamps we binary search
+      # a much 'cheaper' file, one that only contains timestamps, to find
+      # the proper entry into the storage file. That way we'll get to the right
+      # place in the file and can start reading protobufs from the right
+      # location.
+      first_entry_index = self._GetFirstEntryIndexByTimestamp(
+          stream_number, self._bound_first)
+
+      if first_entry_index is not None:
+        stream_offset = self._GetProtoStreamOffset(
+            stream_number, first_entry_index)
+        if stream_offset is None:
+          # All the entries in the store are before the lower bound.
           return None, None
 
         return self._GetEventObjectProtobufString(
-            stream_number, entry_index=index)
+            stream_number, entry_index=first_entry_index)
 
     size_data = file_object.read(4)
 
@@ -576,6 +643,106 @@ class StorageFile(object):
 
     return event_object_data, last_entry_index
 
+  def _GetEventObjectProtobufStringByIndex(self, stream_number, entry_index):
+    """Retrieves a specific event object protobuf string.
+
+    Unlike _GetEventObjectProtobufString this does not change the position
+    of the proto stream used to read the next entry.
+
+    Args:
+      stream_number: the proto stream number.
+      entry_index: the entry index.
+
+    Returns:
+      The event object protobuf string or None if not available.
+
+    Raises:
+      errors.WrongProtobufEntry: If the probotuf size is too large for storage.
+      IOError: if the stream cannot be opened.
+    """
+    stream_offset = self._GetProtoStreamOffset(stream_number, entry_index)
+    if stream_offset is None:
+      logging.error((
+          u'Unable to read entry index: {0:d} from proto stream: '
+          u'{1:d}').format(entry_index, stream_number))
+      return
+
+    size_data = self._ReadProtoStreamData(stream_number, stream_offset, 4)
+    if len(size_data) != 4:
+      return
+
+    proto_string_size = struct.unpack('<I', size_data)[0]
+
+    if proto_string_size > self.MAX_PROTO_STRING_SIZE:
+      raise errors.WrongProtobufEntry(
+          u'Protobuf string size value exceeds maximum: {0:d}'.format(
+              proto_string_size))
+
+    return self._ReadProtoStreamData(
+        stream_number, stream_offset + 4, proto_string_size)
+
+  def _GetProtoStreamBlock(self, stream_number, block_number):
+    """Retrieves a block of a proto stream from the block cache.
+
+    Args:
+      stream_number: the number of the stream.
+      block_number: the number of the block.
+
+    Returns:
+      A byte string containing the block data, which is smaller than
+      the block size for the last block of the stream.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    lookup_key = (stream_number, block_number)
+    block_data = self._proto_block_cache.pop(lookup_key, None)
+
+    if block_data is None:
+      file_object = self._GetSeekableProtoStream(stream_number)
+      file_object.seek(
+          block_number * self._PROTO_STREAM_BLOCK_SIZE, os.SEEK_SET)
+      block_data = file_object.read(self._PROTO_STREAM_BLOCK_SIZE)
+
+      if len(self._proto_block_cache) >= self._MAXIMUM_NUMBER_OF_CACHED_BLOCKS:
+        # Remove the least recently used block.
+        self._proto_block_cache.popitem(last=False)
+
+    self._proto_block_cache[lookup_key] = block_data
+    return block_data
+
+  def _GetSeekableProtoStream(self, stream_number):
+    """Retrieves a seekable copy of a proto stream.
+
+    Since zipfile.ZipExtFile is not seekable the proto stream is decompressed
+    once into a temporary file.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      A seekable file-like object containing the proto stream data.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    file_object = self._seekable_proto_streams.get(stream_number, None)
+    if file_object is None:
+      stream_name = 'plaso_proto.{0:06d}'.format(stream_number)
+      stream_file_object = self._OpenStream(stream_name, 'r')
+      if stream_file_object is None:
+        raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+
+      file_object = tempfile.TemporaryFile()
+      try:
+        shutil.copyfileobj(stream_file_object, file_object)
+      finally:
+        stream_file_object.close()
+
+      self._seekable_proto_streams[stream_number] = file_object
+
+    return file_object
+
   def _GetEventGroupProto(self, file_object):
     """Return a single group entry."""
     unpacked = file_object.read(4)
@@ -636,10 +803,27 @@ class StorageFile(object):
     Raises:
       IOError: if the stream cannot be opened.
     """
-    # Since zipfile.ZipExtFile is not seekable we need to close the stream
-    # and reopen it to fake a seek.
     if stream_number in self._proto_streams:
-      previous_file_object, _ = self._proto_streams[stream_number]
+      previous_file_object, last_entry_index = self._proto_streams[
+          stream_number]
+
+      # If the stream offset lies beyond the current offset the stream can be
+      # read forward instead of re-opened.
+      current_offset = None
+      if last_entry_index <= entry_index:
+        current_offset = self._GetProtoStreamOffset(
+            stream_number, last_entry_index)
+
+      if current_offset is not None and current_offset <= stream_offset:
+        self._SkipStreamData(
+            previous_file_object, stream_offset - current_offset)
+        self._proto_streams[stream_number] = (
+            previous_file_object, entry_index)
+
+        return self._proto_streams[stream_number]
+
+      # Since zipfile.ZipExtFile is not seekable we need to close the stream
+      # and reopen it to fake a seek.
       del self._proto_streams[stream_number]
       previous_file_object.close()
 
@@ -650,7 +834,7 @@ class StorageFile(object):
 
     # Since zipfile.ZipExtFile is not seekable we need to read upto
     # the stream offset.
-    _ = file_object.read(stream_offset)
+    self._SkipStreamData(file_object, stream_offset)
 
     self._proto_streams[stream_number] = (file_object, entry_index)
 
@@ -670,29 +854,22 @@ class StorageFile(object):
     Raises:
       IOError: if the stream cannot be opened.
     """
-    # TODO: cache the index file object in the same way as the proto
-    # stream file objects.
-
-    # TODO: once cached use the last entry index to determine if the stream
-    # file object should be re-opened.
-
-    stream_name = 'plaso_index.{0:06d}'.format(stream_number)
-    index_file_object = self._OpenStream(stream_name, 'r')
-    if index_file_object is None:
-      raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
-
-    # Since zipfile.ZipExtFile is not seekable we need to read upto
-    # the stream offset.
-    _ = index_file_object.read(entry_index * 4)
-
-    index_data = index_file_object.read(4)
+    # The index stream is read in a single pass and cached, since its size
+    # is only 4 bytes per entry.
+    index_data = self._proto_index_data.get(stream_number, None)
+    if index_data is None:
+      stream_name = 'plaso_index.{0:06d}'.format(stream_number)
+      if stream_name not in self._GetStreamNames():
+        raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
 
-    index_file_object.close()
+      index_data = self._ReadStream(stream_name)
+      self._proto_index_data[stream_number] = index_data
 
-    if len(index_data) != 4:
+    index_data_offset = entry_index * 4
+    if index_data_offset + 4 > len(index_data):
       return None
 
-    return struct.unpack('<I', index_data)[0]
+    return struct.unpack_from('<I', index_data, index_data_offset)[0]
 
   def _OpenStream(self, stream_name, mode='r'):
     """Opens a stream.
@@ -743,34 +920,36 @@ class StorageFile(object):
 
     return event_tag
 
-  def _ReadEventTagByIdentifier(self, store_number, store_index, uuid):
-    """Reads an event tag by identifier.
+  def _ReadProtoStreamData(self, stream_number, stream_offset, size):
+    """Reads data from a proto stream using the block cache.
 
     Args:
-      store_number: the store number.
-      store_index: the store index.
-      uuid: the UUID string.
+      stream_number: the number of the stream.
+      stream_offset: the offset relative to the start of the stream.
+      size: the number of bytes to read.
 
     Returns:
-      The event tag (instance of EventTag).
+      A byte string containing the data, which is smaller than the requested
+      size if the end of the stream was reached.
 
     Raises:
       IOError: if the stream cannot be opened.
     """
-    tag_index_value = self._GetEventTagIndexValue(
-        store_number, store_index, uuid)
-    if tag_index_value is None:
-      return
+    data_segments = []
+    while size > 0:
+      block_number, block_offset = divmod(
+          stream_offset, self._PROTO_STREAM_BLOCK_SIZE)
+      block_data = self._GetProtoStreamBlock(stream_number, block_number)
 
-    stream_name = 'plaso_tagging.{0:06d}'.format(tag_index_value.store_number)
-    tag_file_object = self._OpenStream(stream_name, 'r')
-    if tag_file_object is None:
-      raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+      data_segment = block_data[block_offset:block_offset + size]
+      if not data_segment:
+        break
 
-    # Since zipfile.ZipExtFile is not seekable we need to read upto
-    # the store offset.
-    _ = tag_file_object.read(tag_index_value.store_offset)
-    return self._ReadEventTag(tag_file_object)
+      data_segments.append(data_segment)
+      stream_offset += len(data_segment)
+      size -= len(data_segment)
+
+    return b''.join(data_segments)
 
   def _ReadStream(self, stream_name):
     """Reads the data in a stream.
@@ -818,6 +997,63 @@ class StorageFile(object):
       raise ValueError(
           u'Unsupported serializer format: {0:s}'.format(serializer_format))
 
+  def _SkipStreamData(self, file_object, size):
+    """Skips data in a stream.
+
+    Since zipfile.ZipExtFile is not seekable the data is read in segments
+    to prevent reading large skips into memory at once.
+
+    Args:
+      file_object: the stream file-like object (instance of zipfile.ZipExtFile).
+      size: the number of bytes to skip.
+    """
+    while size > 0:
+      data = file_object.read(min(size, self._STREAM_DATA_SEGMENT_SIZE))
+      if not data:
+        break
+      size -= len(data)
+
+  def _WriteEventTagStreams(self, tag_number, event_tags):
+    """Writes the tagging and tag index streams.
+
+    Args:
+      tag_number: the number of the tagging and tag index streams.
+      event_tags: a list of event tags (instances of EventTag).
+    """
+    tag_packed = []
+    tag_index = []
+    size = 0
+    for tag in event_tags:
+      if self._serializers_profiler:
+        self._serializers_profiler.StartTiming(u'event_tag')
+
+      serialized_event_tag = self._event_tag_serializer.WriteSerialized(tag)
+
+      if self._serializers_profiler:
+        self._serializers_profiler.StopTiming(u'event_tag')
+
+      packed = (
+          struct.pack('<I', len(serialized_event_tag)) + serialized_event_tag)
+      ofs = struct.pack('<I', size)
+      if getattr(tag, 'store_number', 0):
+        struct_string = (
+            construct.Byte('type').build(self._TAG_INDEX_TYPE_NUMERIC) + ofs +
+            self._TAG_STORE_STRUCT.build(tag))
+      else:
+        struct_string = (
+            construct.Byte('type').build(self._TAG_INDEX_TYPE_UUID) + ofs +
+            self._TAG_UUID_STRUCT.build(tag))
+
+      tag_index.append(struct_string)
+      size += len(packed)
+      tag_packed.append(packed)
+
+    stream_name = 'plaso_tag_index.{0:06d}'.format(tag_number)
+    self._WriteStream(stream_name, ''.join(tag_index))
+
+    stream_name = 'plaso_tagging.{0:06d}'.format(tag_number)
+    self._WriteStream(stream_name, ''.join(tag_packed))
+
   def _WritePreprocessObject(self, pre_obj):
     """Writes a preprocess object to the storage file.
 
@@ -853,6 +1089,70 @@ class StorageFile(object):
 
     self._WriteStream('information.dump', stream_data)
 
+  def _WriteStore(
+      self, store_number, entries, first_timestamp, last_timestamp,
+      count_data_type, count_parser):
+    """Writes the streams that make up a store.
+
+    Args:
+      store_number: the store number.
+      entries: a list of tuples of the timestamp and the serialized event
+               object, sorted by timestamp.
+      first_timestamp: the first timestamp of the store.
+      last_timestamp: the last timestamp of the store.
+      count_data_type: a counter of the data types in the store (instance of
+                       collections.Counter).
+      count_parser: a counter of the parsers in the store (instance of
+                    collections.Counter).
+    """
+    yaml_dict = {
+        'range': (first_timestamp, last_timestamp),
+        'version': self.STORAGE_VERSION,
+        'data_type': list(count_data_type.viewkeys()),
+        'parsers': list(count_parser.viewkeys()),
+        'count': len(entries),
+        'type_count': count_data_type.most_common()}
+
+    stream_name = 'plaso_meta.{0:06d}'.format(store_number)
+    self._WriteStream(stream_name, yaml.safe_dump(yaml_dict))
+
+    ofs = 0
+    proto_str = []
+    index_str = []
+    timestamp_str = []
+    for timestamp, entry in entries:
+      # TODO: Instead of appending to an array
+      # which is not optimal (loads up the entire max file
+      # size into memory) Zipfile should be extended to
+      # allow appending to files (implement lock).
+      try:
+        # Appending a timestamp to the timestamp index, this is used during
+        # time based filtering. If this is not done we would need to unserialize
+        # all events to get the timestamp value which is really slow.
+        timestamp_str.append(struct.pack('<q', timestamp))
+      except struct.error as exception:
+        # TODO: Instead of just logging the error unserialize the event
+        # and print out information from the event, eg. parser and path spec
+        # location. That way we can find the root cause and fix that instead of
+        # just catching the exception.
+        logging.error((
+            u'Unable to store event, not able to index timestamp value with '
+            u'error: {0:s} [timestamp: {1:d}]').format(exception, timestamp))
+        continue
+      index_str.append(struct.pack('<I', ofs))
+      packed = struct.pack('<I', len(entry)) + entry
+      ofs += len(packed)
+      proto_str.append(packed)
+
+    stream_name = 'plaso_index.{0:06d}'.format(store_number)
+    self._WriteStream(stream_name, ''.join(index_str))
+
+    stream_name = 'plaso_proto.{0:06d}'.format(store_number)
+    self._WriteStream(stream_name, ''.join(proto_str))
+
+    stream_name = 'plaso_timestamps.{0:06d}'.format(store_number)
+    self._WriteStream(stream_name, ''.join(timestamp_str))
+
   def _WriteStream(self, stream_name, stream_data):
     """Write the data to a stream.
 
@@ -871,6 +1171,12 @@ class StorageFile(object):
       self._FlushBuffer()
       self._zipfile.close()
       self._file_open = False
+
+      for file_object in self._seekable_proto_streams.itervalues():
+        file_object.close()
+
+      self._proto_block_cache = collections.OrderedDict()
+      self._seekable_proto_streams = {}
       if not self._read_only:
         logging.info((
             u'[Storage] Closing the storage, number of events processed: '
@@ -878,6 +1184,200 @@ class StorageFile(object):
 
     self._ProfilingStop()
 
+  def Compact(self, output_file, buffer_size=0):
+    """Writes a compacted copy of the storage file.
+
+    The stores are merged into a small number of large stores that are fully
+    sorted by time, so that reading the event objects in sorted order no longer
+    requires a merge over all the stores. Only stores that belong to the same
+    preprocessing object are merged, which maintains the mapping of stores to
+    preprocessing information. The tagging and grouping information is
+    rewritten to refer to the new store numbers and indexes.
+
+    Args:
+      output_file: the name of the output file, which should not exist.
+      buffer_size: optional maximum size of a single compacted store.
+                   The default is 0, which indicates the maximum buffer size.
+
+    Returns:
+      The number of stores written to the output file.
+
+    Raises:
+      IOError: if the output file already exists or a stream cannot be opened.
+    """
+    if isinstance(output_file, basestring) and os.path.exists(output_file):
+      raise IOError(u'Output file: {0:s} already exists.'.format(output_file))
+
+    event_tags = collections.OrderedDict()
+    for event_tag in self.GetTagging():
+      # Tags that are stored in later tagging streams supersede earlier ones.
+      event_tags[event_tag.string_key] = event_tag
+
+    event_groups = list(self.GetGrouping())
+
+    referenced_events = set()
+    for event_tag in event_tags.itervalues():
+      if getattr(event_tag, 'store_number', 0):
+        referenced_events.add((event_tag.store_number, event_tag.store_index))
+
+    for event_group in event_groups:
+      for group_event in event_group.events:
+        referenced_events.add(
+            (group_event.store_number, group_event.store_index))
+
+    pre_obj_protos = []
+    for serialized_pre_obj in self._GetSerializedPreprocessObjects():
+      pre_obj_proto = plaso_storage_pb2.PreProcess()
+      pre_obj_proto.ParseFromString(serialized_pre_obj)
+      pre_obj_protos.append(pre_obj_proto)
+
+    # A store belongs to the last preprocessing object of which the store
+    # range starts at or before the store number.
+    stores_per_pre_obj = collections.OrderedDict()
+    for store_number in self.GetProtoNumbers():
+      owner_index = None
+      for pre_obj_index, pre_obj_proto in enumerate(pre_obj_protos):
+        if not pre_obj_proto.HasField('store_range'):
+          continue
+
+        range_values = pre_obj_proto.store_range.values
+        if range_values and range_values[0].integer <= store_number:
+          owner_index = pre_obj_index
+
+      stores_per_pre_obj.setdefault(owner_index, []).append(store_number)
+
+    max_buffer_size = buffer_size or self.MAX_BUFFER_SIZE
+    store_mappings = {}
+    store_ranges = {}
+
+    output_storage_file = StorageFile(
+        output_file, buffer_size=max_buffer_size,
+        serializer_format=self._event_serializer_format_string)
+
+    # The key None is used for stores that do not belong to a preprocessing
+    # object and these should be written first.
+    owner_indexes = sorted(
+        stores_per_pre_obj.iterkeys(), key=lambda index: index is not None)
+
+    output_store_number = 1
+    for owner_index in owner_indexes:
+      first_output_store_number = output_store_number
+
+      serialized_event_objects = [
+          self._GetSerializedEventObjects(store_number)
+          for store_number in stores_per_pre_obj[owner_index]]
+
+      entries = []
+      entries_size = 0
+      first_timestamp = sys.maxint
+      last_timestamp = 0
+      count_data_type = collections.Counter()
+      count_parser = collections.Counter()
+
+      for timestamp, store_number, store_index, event_object_data in (
+          heapq.merge(*serialized_event_objects)):
+        event_object = self._event_object_serializer.ReadSerialized(
+            event_object_data)
+        count_data_type[event_object.data_type] += 1
+        count_parser[getattr(event_object, 'parser', 'unknown_parser')] += 1
+
+        if (store_number, store_index) in referenced_events:
+          store_mappings[(store_number, store_index)] = (
+              output_store_number, len(entries))
+
+        if timestamp > last_timestamp:
+          last_timestamp = timestamp
+
+        # TODO: support negative timestamps.
+        if timestamp < first_timestamp and timestamp > 0:
+          first_timestamp = timestamp
+
+        entries.append((timestamp, event_object_data))
+        entries_size += len(event_object_data)
+
+        if entries_size > max_buffer_size:
+          output_storage_file._WriteStore(
+              output_store_number, entries, first_timestamp, last_timestamp,
+              count_data_type, count_parser)
+
+          output_store_number += 1
+          entries = []
+          entries_size = 0
+          first_timestamp = sys.maxint
+          last_timestamp = 0
+          count_data_type = collections.Counter()
+          count_parser = collections.Counter()
+
+      if entries:
+        output_storage_file._WriteStore(
+            output_store_number, entries, first_timestamp, last_timestamp,
+            count_data_type, count_parser)
+        output_store_number += 1
+
+      store_ranges[owner_index] = (
+          first_output_store_number, output_store_number)
+
+    if pre_obj_protos:
+      stream_data = []
+      for pre_obj_index, pre_obj_proto in enumerate(pre_obj_protos):
+        range_start, range_end = store_ranges.get(
+            pre_obj_index, (output_store_number, output_store_number))
+
+        pre_obj_proto.ClearField('store_range')
+        range_value = pre_obj_proto.store_range.values.add()
+        range_value.integer = range_start
+        range_value = pre_obj_proto.store_range.values.add()
+        range_value.integer = range_end
+
+        serialized_pre_obj = pre_obj_proto.SerializeToString()
+        stream_data.append(struct.pack('<I', len(serialized_pre_obj)))
+        stream_data.append(serialized_pre_obj)
+
+      output_storage_file._WriteStream('information.dump', ''.join(stream_data))
+
+    if event_tags:
+      output_event_tags = []
+      for event_tag in event_tags.itervalues():
+        if getattr(event_tag, 'store_number', 0):
+          location = (event_tag.store_number, event_tag.store_index)
+          if location not in store_mappings:
+            logging.warning(
+                u'Unable to find tagged event: {0:d}:{1:d}.'.format(*location))
+            continue
+
+          event_tag.store_number, event_tag.store_index = (
+              store_mappings[location])
+
+        output_event_tags.append(event_tag)
+
+      output_storage_file._WriteEventTagStreams(1, output_event_tags)
+
+    if event_groups:
+      group_packed = []
+      for event_group in event_groups:
+        for group_event in event_group.events:
+          location = (group_event.store_number, group_event.store_index)
+          if location in store_mappings:
+            group_event.store_number, group_event.store_index = (
+                store_mappings[location])
+
+        group_str = event_group.SerializeToString()
+        group_packed.append(struct.pack('<I', len(group_str)) + group_str)
+
+      output_storage_file._WriteStream(
+          'plaso_grouping.000001', ''.join(group_packed))
+
+    for stream_name in self._GetStreamNames():
+      if stream_name.startswith(self._COMPACTED_STREAM_NAME_PREFIXES):
+        continue
+
+      output_storage_file._WriteStream(
+          stream_name, self._ReadStream(stream_name))
+
+    output_storage_file.Close()
+
+    return output_store_number - 1
+
   def GetGrouping(self):
     """Return a generator that reads all grouping information from storage.
 
@@ -974,23 +1474,7 @@ class StorageFile(object):
     """
     information = []
 
-    file_object = self._OpenStream('information.dump', 'r')
-    if file_object is None:
-      return information
-
-    while True:
-      unpacked = file_object.read(4)
-      if len(unpacked) != 4:
-        break
-
-      size = struct.unpack('<I', unpacked)[0]
-
-      if size > self.MAX_PROTO_STRING_SIZE:
-        raise errors.WrongProtobufEntry(
-            u'Protobuf size too large: {0:d}'.format(size))
-
-      serialized_pre_obj = file_object.read(size)
-
+    for serialized_pre_obj in self._GetSerializedPreprocessObjects():
       if self._serializers_profiler:
         self._serializers_profiler.StartTiming(u'pre_obj')
 
@@ -1007,6 +1491,9 @@ class StorageFile(object):
 
       information.append(info)
 
+    if not information:
+      return information
+
     stores = list(self.GetProtoNumbers())
     information[-1].stores = {}
     information[-1].stores['Number'] = len(stores)
@@ -1042,6 +1529,58 @@ class StorageFile(object):
       else:
         logging.debug(u'Store [{0:d}] not used'.format(number))
 
+  def GetTimeRangePartitions(self, number_of_partitions):
+    """Partitions the time range of the store limit.
+
+    The partitions contain approximately the same number of event objects,
+    based on a sample of the timestamps streams of the stores. Event objects
+    with the same timestamp are always part of the same partition.
+
+    Args:
+      number_of_partitions: the maximum number of partitions.
+
+    Returns:
+      A list of tuples of the first and last timestamp of each partition,
+      in chronological order.
+    """
+    if self._bound_first is None:
+      self._bound_first, self._bound_last = (
+          pfilter.TimeRangeCache.GetTimeRange())
+
+    timestamps = []
+    number_range = getattr(self, 'store_range', list(self.GetProtoNumbers()))
+    for store_number in number_range:
+      stream_name = 'plaso_timestamps.{0:06d}'.format(store_number)
+      if stream_name not in self._GetStreamNames():
+        continue
+
+      timestamp_data = self._ReadStream(stream_name)
+      number_of_entries = len(timestamp_data) // 8
+      step_size = max(
+          1, number_of_entries // self._MAXIMUM_NUMBER_OF_TIMESTAMP_SAMPLES)
+
+      for entry_index in range(0, number_of_entries, step_size):
+        timestamp = struct.unpack_from('<q', timestamp_data, entry_index * 8)[0]
+        if self._bound_first <= timestamp <= self._bound_last:
+          timestamps.append(timestamp)
+
+    if not timestamps:
+      return [(self._bound_first, self._bound_last)]
+
+    timestamps.sort()
+
+    partitions = []
+    first_timestamp = self._bound_first
+    for partition_index in range(1, number_of_partitions):
+      timestamp = timestamps[
+          partition_index * len(timestamps) // number_of_partitions]
+      if timestamp > first_timestamp:
+        partitions.append((first_timestamp, timestamp - 1))
+        first_timestamp = timestamp
+
+    partitions.append((first_timestamp, self._bound_last))
+    return partitions
+
   def GetSortedEntry(self):
     """Return a sorted entry from the storage file.
 
@@ -1087,8 +1626,12 @@ class StorageFile(object):
           self._merge_buffer,
           (new_event_object.timestamp, store_number, new_event_object))
 
-    event_read.tag = self._ReadEventTagByIdentifier(
-        event_read.store_number, event_read.store_index, event_read.uuid)
+    event_tag_store = self._GetEventTagStore()
+    if event_tag_store.HasEventTags():
+      event_read.tag = event_tag_store.GetEventTag(
+          event_read.store_number, event_read.store_index, event_read.uuid)
+    else:
+      event_read.tag = None
 
     return event_read
 
@@ -1107,8 +1650,13 @@ class StorageFile(object):
       An event object (instance of EventObject) entry read from the file or
       None if not able to read in a new event.
     """
-    event_object_data, entry_index = self._GetEventObjectProtobufString(
-        stream_number, entry_index=entry_index)
+    if entry_index >= 0:
+      event_object_data = self._GetEventObjectProtobufStringByIndex(
+          stream_number, entry_index)
+    else:
+      event_object_data, entry_index = self._GetEventObjectProtobufString(
+          stream_number)
+
     if not event_object_data:
       return
 
@@ -1207,38 +1755,55 @@ class StorageFile(object):
     """Return the current file number of the storage."""
     return self._file_number
 
-  def AddEventObject(self, event_object):
-    """Adds an event object to the storage.
+  def _AddSerializedEventObjectData(
+      self, timestamp, parser, data_type, event_object_data, plugin=None):
+    """Adds serialized event object data to the buffer.
 
     Args:
-      event_object: an event object (instance of EventObject).
-
-    Raises:
-      IOError: When trying to write to a closed storage file.
+      timestamp: the timestamp of the event object.
+      parser: the name of the parser that produced the event object or None.
+      data_type: the data type of the event object.
+      event_object_data: a binary string containing the serialized event
+                         object.
+      plugin: optional name of the plugin that produced the event object.
+              The default is None.
     """
-    if not self._file_open:
-      raise IOError(u'Trying to add an entry to a closed storage file.')
-
-    if event_object.timestamp > self._buffer_last_timestamp:
-      self._buffer_last_timestamp = event_object.timestamp
+    if timestamp > self._buffer_last_timestamp:
+      self._buffer_last_timestamp = timestamp
 
     # TODO: support negative timestamps.
-    if (event_object.timestamp < self._buffer_first_timestamp and
-        event_object.timestamp > 0):
-      self._buffer_first_timestamp = event_object.timestamp
+    if timestamp < self._buffer_first_timestamp and timestamp > 0:
+      self._buffer_first_timestamp = timestamp
 
-    attributes = event_object.GetValues()
     # Add values to counters.
     if self._pre_obj:
       self._pre_obj.counter['total'] += 1
-      self._pre_obj.counter[attributes.get('parser', 'N/A')] += 1
-      if 'plugin' in attributes:
-        self._pre_obj.plugin_counter[attributes.get('plugin', 'N/A')] += 1
+      self._pre_obj.counter[parser or 'N/A'] += 1
+      if plugin is not None:
+        self._pre_obj.plugin_counter[plugin] += 1
 
     # Add to temporary counter.
-    self._count_data_type[event_object.data_type] += 1
-    parser = attributes.get('parser', 'unknown_parser')
-    self._count_parser[parser] += 1
+    self._count_data_type[data_type] += 1
+    self._count_parser[parser or 'unknown_parser'] += 1
+
+    heapq.heappush(self._buffer, (timestamp, event_object_data))
+    self._buffer_size += len(event_object_data)
+    self._write_counter += 1
+
+    if self._buffer_size > self._max_buffer_size:
+      self._FlushBuffer()
+
+  def AddEventObject(self, event_object):
+    """Adds an event object to the storage.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Raises:
+      IOError: When trying to write to a closed storage file.
+    """
+    if not self._file_open:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
 
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(u'event_object')
@@ -1254,13 +1819,32 @@ class StorageFile(object):
     if event_object_data is None:
       return
 
-    heapq.heappush(
-        self._buffer, (event_object.timestamp, event_object_data))
-    self._buffer_size += len(event_object_data)
-    self._write_counter += 1
+    attributes = event_object.GetValues()
+    self._AddSerializedEventObjectData(
+        event_object.timestamp, attributes.get('parser', None),
+        event_object.data_type, event_object_data,
+        plugin=attributes.get('plugin', None))
 
-    if self._buffer_size > self._max_buffer_size:
-      self._FlushBuffer()
+  def AddSerializedEventObject(self, serialized_event_object):
+    """Adds an event object that was serialized by an extraction worker.
+
+    The serialized data is stored as-is, hence it must have been serialized
+    with the event object serializer of the storage file.
+
+    Args:
+      serialized_event_object: a serialized event object (instance of
+                               SerializedEventObject).
+
+    Raises:
+      IOError: When trying to write to a closed storage file.
+    """
+    if not self._file_open:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
+
+    self._AddSerializedEventObjectData(
+        serialized_event_object.timestamp, serialized_event_object.parser,
+        serialized_event_object.data_type, serialized_event_object.data,
+        plugin=serialized_event_object.plugin)
 
   def AddEventObjects(self, event_objects):
     """Adds an event objects to the storage.
@@ -1462,43 +2046,30 @@ class StorageFile(object):
         _, number = name.split('.')
         if int(number) >= tag_number:
           tag_number = int(number) + 1
-        if self._event_tag_index is None:
-          self._BuildTagIndex()
 
-    tag_packed = []
-    tag_index = []
-    size = 0
+    event_tag_store = self._GetEventTagStore()
+
+    event_tags = []
     for tag in tags:
       self._pre_obj.counter['Total Tags'] += 1
       if hasattr(tag, 'tags'):
         for tag_entry in tag.tags:
           self._pre_obj.counter[tag_entry] += 1
 
-      if self._event_tag_index is not None:
-        tag_index_value = self._event_tag_index.get(tag.string_key, None)
-      else:
-        tag_index_value = None
+      old_tag = event_tag_store.GetEventTag(
+          getattr(tag, 'store_number', 0), getattr(tag, 'store_index', 0),
+          getattr(tag, 'event_uuid', None))
 
       # This particular event has already been tagged on a previous occasion,
       # we need to make sure we are appending to that particular tag.
-      if tag_index_value is not None:
-        stream_name = 'plaso_tagging.{0:06d}'.format(
-            tag_index_value.store_number)
-
-        tag_file_object = self._OpenStream(stream_name, 'r')
-        if tag_file_object is None:
-          raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
-
-        # Since zipfile.ZipExtFile is not seekable we need to read upto
-        # the store offset.
-        _ = tag_file_object.read(tag_index_value.store_offset)
-
-        old_tag = self._ReadEventTag(tag_file_object)
-
+      if old_tag is not None:
         # TODO: move the append functionality into EventTag.
         # Maybe name the function extend or update?
         if hasattr(old_tag, 'tags'):
-          tag.tags.extend(old_tag.tags)
+          if hasattr(tag, 'tags'):
+            tag.tags.extend(old_tag.tags)
+          else:
+            tag.tags = list(old_tag.tags)
 
         if hasattr(old_tag, 'comment'):
           if hasattr(tag, 'comment'):
@@ -1509,44 +2080,12 @@ class StorageFile(object):
         if hasattr(old_tag, 'color') and not hasattr(tag, 'color'):
           tag.color = old_tag.color
 
-      if self._serializers_profiler:
-        self._serializers_profiler.StartTiming(u'event_tag')
-
-      serialized_event_tag = self._event_tag_serializer.WriteSerialized(tag)
-
-      if self._serializers_profiler:
-        self._serializers_profiler.StopTiming(u'event_tag')
-
-      # TODO: move to write class function of _EventTagIndexValue.
-      packed = (
-          struct.pack('<I', len(serialized_event_tag)) + serialized_event_tag)
-      ofs = struct.pack('<I', size)
-      if getattr(tag, 'store_number', 0):
-        struct_string = (
-            construct.Byte('type').build(1) + ofs +
-            _EventTagIndexValue.TAG_STORE_STRUCT.build(tag))
-      else:
-        struct_string = (
-            construct.Byte('type').build(2) + ofs +
-            _EventTagIndexValue.TAG_UUID_STRUCT.build(tag))
-
-      tag_index.append(struct_string)
-      size += len(packed)
-      tag_packed.append(packed)
-
-    stream_name = 'plaso_tag_index.{0:06d}'.format(tag_number)
-    self._WriteStream(stream_name, ''.join(tag_index))
+      # The merged event tag supersedes the previous event tag, which keeps
+      # the event tag store up to date with the tagging streams.
+      event_tag_store.AddEventTag(tag)
+      event_tags.append(tag)
 
-    stream_name = 'plaso_tagging.{0:06d}'.format(tag_number)
-    self._WriteStream(stream_name, ''.join(tag_packed))
-
-    # TODO: Update the tags that have changed in the index instead
-    # of flushing the index.
-
-    # If we already built a list of tag in memory we need to clear that
-    # since the tags have changed.
-    if self._event_tag_index is not None:
-      del self._event_tag_index
+    self._WriteEventTagStreams(tag_number, event_tags)
 
 
 class StorageFileWriter(queue.EventObjectQueueConsumer):
@@ -1578,7 +2117,10 @@ class StorageFileWriter(queue.EventObjectQueueConsumer):
 
   def _ConsumeEventObject(self, event_object, **unused_kwargs):
     """Consumes an event object callback for ConsumeEventObjects."""
-    self._storage_file.AddEventObject(event_object)
+    if isinstance(event_object, event.SerializedEventObject):
+      self._storage_file.AddSerializedEventObject(event_object)
+    else:
+      self._storage_file.AddEventObject(event_object)
 
   def SetEnableProfiling(self, enable_profiling, profiling_type=u'all'):
     """Enables or disables profiling.
@@ -15,6 +15,7 @@ from plaso.formatters import manager as formatters_manager
 from plaso.formatters import mediator as formatters_mediator
 from plaso.lib import event
 from plaso.lib import eventdata
+from plaso.lib import limit
 from plaso.lib import pfilter
 from plaso.lib import storage
 from plaso.lib import timelib
@@ -144,6 +145,38 @@ class StorageFileTest(unittest.TestCase):
       self.assertEqual(len(z_filename_list), 5)
       self.assertEqual(z_filename_list, expected_z_filename_list)
 
+  def testStorageWriterWithSerializedEventObjects(self):
+    """Test the storage writer with serialized event objects."""
+    test_queue = multi_process.MultiProcessingQueue()
+    test_queue_producer = queue.ItemQueueProducer(test_queue)
+
+    serializer = protobuf_serializer.ProtobufEventObjectSerializer
+    for event_object in self._event_objects:
+      serialized_event_object = event.SerializedEventObject(
+          event_object.timestamp, event_object.parser, event_object.data_type,
+          serializer.WriteSerialized(event_object))
+      test_queue_producer.ProduceItem(serialized_event_object)
+
+    test_queue_producer.SignalEndOfInput()
+
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      storage_writer = storage.StorageFileWriter(test_queue, temp_file)
+      storage_writer.WriteEventObjects()
+
+      with storage.StorageFile(temp_file, read_only=True) as storage_file:
+        metadata = storage_file.ReadMeta(1)
+        self.assertEqual(metadata[u'count'], 4)
+        self.assertEqual(metadata[u'parsers'], [u'UNKNOWN'])
+
+        timestamps = [
+            event_object.timestamp
+            for event_object in storage_file.GetEntries(1)]
+
+    expected_timestamps = sorted([
+        event_object.timestamp for event_object in self._event_objects])
+    self.assertEqual(timestamps, expected_timestamps)
+
   def testStorage(self):
     """Test the storage object."""
     event_objects = []
@@ -286,6 +319,113 @@ class StorageFileTest(unittest.TestCase):
 
     self.assertEqual(same_events, proto_group_events)
 
+  def testStoreTagging(self):
+    """Tests the StoreTagging function with repeated tagging."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file)
+      store.AddEventObjects(self._event_objects)
+
+      tag_1 = event.EventTag()
+      tag_1.store_number = 1
+      tag_1.store_index = 1
+      tag_1.tags = ['Malware']
+      store.StoreTagging([tag_1])
+
+      # Tag the same event twice in the second round.
+      tag_2 = event.EventTag()
+      tag_2.store_number = 1
+      tag_2.store_index = 1
+      tag_2.tags = ['Interesting']
+
+      tag_3 = event.EventTag()
+      tag_3.store_number = 1
+      tag_3.store_index = 1
+      tag_3.comment = 'Reviewed'
+      store.StoreTagging([tag_2, tag_3])
+      store.Close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+
+      tagged_events = []
+      event_object = read_store.GetSortedEntry()
+      while event_object:
+        if event_object.tag:
+          tagged_events.append(event_object)
+        event_object = read_store.GetSortedEntry()
+
+      read_store.Close()
+
+    self.assertEqual(len(tagged_events), 1)
+    self.assertEqual(tagged_events[0].store_index, 1)
+    self.assertEqual(
+        tagged_events[0].tag.tags, ['Interesting', 'Malware'])
+    self.assertEqual(tagged_events[0].tag.comment, 'Reviewed')
+
+  def testCompact(self):
+    """Test the compaction of the storage file."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      # A buffer size of 1 forces every event object in a separate store.
+      store = storage.StorageFile(temp_file, buffer_size=1)
+      store.AddEventObjects(self._event_objects)
+
+      tag_1 = event.EventTag()
+      tag_1.store_number = 2
+      tag_1.store_index = 0
+      tag_1.tags = ['Malware']
+      store.StoreTagging([tag_1])
+
+      group_mock = GroupMock()
+      group_mock.AddGroup('Malicious', [(1, 0), (4, 0)])
+      store.StoreGrouping(group_mock)
+      store.Close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      self.assertEqual(list(read_store.GetProtoNumbers()), [1, 2, 3, 4])
+
+      compacted_file = os.path.join(dirname, 'compacted.db')
+      number_of_stores = read_store.Compact(compacted_file)
+      self.assertEqual(number_of_stores, 1)
+
+      with self.assertRaises(IOError):
+        read_store.Compact(compacted_file)
+
+      read_store.Close()
+
+      compacted_store = storage.StorageFile(compacted_file, read_only=True)
+      self.assertEqual(list(compacted_store.GetProtoNumbers()), [1])
+
+      timestamps = [
+          event_object.timestamp
+          for event_object in compacted_store.GetEntries(1)]
+      expected_timestamps = [
+          1238934459000000, 1334940286000000, 1334961526929596,
+          1335966206929596]
+      self.assertEqual(timestamps, expected_timestamps)
+
+      metadata = compacted_store.ReadMeta(1)
+      self.assertEqual(metadata['count'], 4)
+      self.assertEqual(
+          metadata['range'], [1238934459000000, 1335966206929596])
+
+      tags = list(compacted_store.GetTagging())
+      self.assertEqual(len(tags), 1)
+      self.assertEqual(tags[0].store_number, 1)
+      self.assertEqual(tags[0].store_index, 3)
+
+      event_object = compacted_store.GetTaggedEvent(tags[0])
+      self.assertEqual(event_object.timestamp, 1335966206929596)
+      self.assertEqual(event_object.tag.tags, ['Malware'])
+
+      groups = list(compacted_store.GetGrouping())
+      self.assertEqual(len(groups), 1)
+      group_events = list(compacted_store.GetEventsFromGroup(groups[0]))
+      timestamps = [event_object.timestamp for event_object in group_events]
+      self.assertEqual(timestamps, [1334961526929596, 1238934459000000])
+
+      compacted_store.Close()
+
 
 class StoreStorageTest(unittest.TestCase):
   """Test sorting storage file,"""
@@ -323,10 +463,94 @@ class StoreStorageTest(unittest.TestCase):
       event_object = store.GetSortedEntry()
 
     expected_timestamps = [
-        1344270407000000, 1392438730000000, 1427151678000000, 1451584472000000]
+        1343166324000000, 1344270407000000, 1392438730000000, 1418925272000000,
+        1427151678000000, 1427151678000123, 1451584472000000]
 
     self.assertEqual(read_list, expected_timestamps)
 
+  def testGetEventObject(self):
+    """Tests the GetEventObject function with an entry index."""
+    with storage.StorageFile(self.test_file, read_only=True) as store:
+      expected_event_objects = list(store.GetEntries(1))
+
+    with storage.StorageFile(self.test_file, read_only=True) as store:
+      # Use a small block size so entries span multiple blocks.
+      # pylint: disable=protected-access
+      store._PROTO_STREAM_BLOCK_SIZE = 64
+      store._MAXIMUM_NUMBER_OF_CACHED_BLOCKS = 4
+
+      number_of_event_objects = len(expected_event_objects)
+      for entry_index in reversed(range(0, number_of_event_objects)):
+        event_object = store.GetEventObject(1, entry_index=entry_index)
+        expected_event_object = expected_event_objects[entry_index]
+
+        self.assertEqual(event_object.store_index, entry_index)
+        self.assertEqual(
+            event_object.EqualityString(),
+            expected_event_object.EqualityString())
+
+      self.assertLessEqual(len(store._proto_block_cache), 4)
+
+      event_object = store.GetEventObject(
+          1, entry_index=number_of_event_objects)
+      self.assertEqual(event_object, None)
+
+      # Reading an entry by index does not affect reading the next entry.
+      event_object = store.GetEventObject(1)
+      self.assertEqual(event_object.store_index, 0)
+
+  def testGetFirstEntryIndexByTimestamp(self):
+    """Tests the _GetFirstEntryIndexByTimestamp function."""
+    store = storage.StorageFile(self.test_file, read_only=True)
+
+    # pylint: disable=protected-access
+    entry_index = store._GetFirstEntryIndexByTimestamp(1, 0)
+    self.assertEqual(entry_index, 0)
+
+    entry_index = store._GetFirstEntryIndexByTimestamp(1, 1344270407000000)
+    self.assertEqual(entry_index, 1)
+
+    entry_index = store._GetFirstEntryIndexByTimestamp(1, 1344270407000001)
+    self.assertEqual(entry_index, 2)
+
+    entry_index = store._GetFirstEntryIndexByTimestamp(1, 1500000000000000)
+    self.assertEqual(entry_index, 3)
+
+    store.Close()
+
+  def testGetTimeRangePartitions(self):
+    """Tests the GetTimeRangePartitions function."""
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+
+    store = storage.StorageFile(self.test_file, read_only=True)
+    store.SetStoreLimit()
+
+    partitions = store.GetTimeRangePartitions(1)
+    self.assertEqual(partitions, [(0, limit.MAX_INT64)])
+
+    partitions = store.GetTimeRangePartitions(4)
+    self.assertEqual(len(partitions), 4)
+    self.assertEqual(partitions[0][0], 0)
+    self.assertEqual(partitions[-1][1], limit.MAX_INT64)
+
+    for partition_index in range(1, len(partitions)):
+      self.assertEqual(
+          partitions[partition_index][0],
+          partitions[partition_index - 1][1] + 1)
+
+    timestamps = []
+    for store_number in store.GetProtoNumbers():
+      for event_object in store.GetEntries(store_number):
+        timestamps.append(event_object.timestamp)
+
+    for first_timestamp, last_timestamp in partitions:
+      number_of_events = len([
+          timestamp for timestamp in timestamps
+          if first_timestamp <= timestamp <= last_timestamp])
+      self.assertTrue(number_of_events > 0)
+
+    store.Close()
+
 
 if __name__ == '__main__':
   unittest.main()
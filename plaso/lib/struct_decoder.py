@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""The struct decoder for fixed-layout construct structures.
+
+Parsing a record with construct is slow, since every field is parsed by
+a separate construct object. A structure that only consists of fixed-size
+fields can be decoded by a single struct.Struct instead, with the same
+result as the construct structure.
+"""
+
+import collections
+import os
+import struct
+
+import construct
+
+
+class StructDecoder(object):
+  """Class that decodes records defined by a fixed-layout construct structure.
+
+  The construct structure is compiled into a struct.Struct and the decoded
+  records are named tuples, which provide the same attribute access as
+  the construct containers.
+
+  Supported are structures that consist of integer fields, such as
+  construct.ULInt32, binary string fields with a fixed size and without
+  padding character or encoding, such as construct.String and construct.Bytes,
+  construct.Padding, arrays of integer fields with a fixed number of elements
+  and nested structures that consist of these fields. An array is decoded
+  into a list and a nested structure into a nested named tuple.
+  """
+
+  # The default size of the buffer used to read multiple records,
+  # which is 1 MiB.
+  _DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+  def __init__(self, construct_struct):
+    """Initializes the struct decoder object.
+
+    Args:
+      construct_struct: the construct structure (instance of
+                        construct.Struct).
+
+    Raises:
+      ValueError: if the construct structure contains a construct that is
+                  not supported or fields of different byte orders.
+    """
+    super(StructDecoder, self).__init__()
+    self._byte_order = None
+    self._field_formats = []
+    self._layout = self._CompileStruct(construct_struct)
+    self._is_nested = any(
+        field_layout is not None for field_layout in self._layout[1])
+    self._record = self._layout[0]
+    self._struct = struct.Struct(u'{0:s}{1:s}'.format(
+        self._byte_order or u'<', u''.join(self._field_formats)))
+
+  def _CompileStruct(self, construct_struct):
+    """Compiles a construct structure.
+
+    The formats of the fields are appended to the field formats of
+    the decoder.
+
+    Args:
+      construct_struct: the construct structure (instance of
+                        construct.Struct).
+
+    Returns:
+      A tuple containing the record type (subclass of collections.namedtuple)
+      and a list of the layouts of the fields, where the layout is None for
+      a field that is decoded from a single value, the number of elements
+      for an array or a tuple in the same format for a nested structure.
+
+    Raises:
+      ValueError: if the construct structure contains a construct that is
+                  not supported or fields of different byte orders.
+    """
+    field_layouts = []
+    field_names = []
+
+    for subcon in construct_struct.subcons:
+      # Note that construct.Sequence is a subclass of construct.Struct.
+      if type(subcon) is construct.Struct:
+        field_layouts.append(self._CompileStruct(subcon))
+        field_names.append(subcon.name)
+        continue
+
+      field_layout = None
+      if isinstance(subcon, construct.FormatField):
+        field_format = self._GetIntegerFieldFormat(
+            subcon, construct_struct.name)
+
+      # pylint: disable=protected-access
+      elif (isinstance(subcon, construct.MetaArray) and
+            not subcon._is_flag(subcon.FLAG_DYNAMIC) and
+            isinstance(subcon.subcon, construct.FormatField)):
+        field_layout = subcon.countfunc(None)
+        field_format = u'{0:d}{1:s}'.format(
+            field_layout, self._GetIntegerFieldFormat(
+                subcon.subcon, construct_struct.name))
+
+      elif isinstance(subcon, construct.PaddingAdapter):
+        field_format = u'{0:d}x'.format(subcon.subcon.length)
+
+      elif (isinstance(subcon, construct.StringAdapter) and
+            not subcon.encoding and
+            isinstance(subcon.subcon, construct.StaticField)):
+        field_format = u'{0:d}s'.format(subcon.subcon.length)
+
+      elif (type(subcon) is construct.StaticField and
+            isinstance(subcon.length, int)):
+        field_format = u'{0:d}s'.format(subcon.length)
+
+      else:
+        raise ValueError(u'Unsupported construct: {0:s} in: {1:s}.'.format(
+            type(subcon).__name__, construct_struct.name))
+
+      self._field_formats.append(field_format)
+      if subcon.name is not None:
+        field_layouts.append(field_layout)
+        field_names.append(subcon.name)
+      elif not field_format.endswith(u'x'):
+        raise ValueError(u'Unsupported unnamed field in: {0:s}.'.format(
+            construct_struct.name))
+
+    record_type = collections.namedtuple(construct_struct.name, field_names)
+    return record_type, field_layouts
+
+  def _GetIntegerFieldFormat(self, subcon, struct_name):
+    """Retrieves the format of an integer field without the byte order.
+
+    The byte order of the field becomes the byte order of the decoder.
+
+    Args:
+      subcon: the integer field (instance of construct.FormatField).
+      struct_name: the name of the construct structure that contains
+                   the field.
+
+    Returns:
+      A string containing the struct format of the field.
+
+    Raises:
+      ValueError: if the byte order of the field differs from that of
+                  the other fields.
+    """
+    field_byte_order = subcon.packer.format[0]
+    # The byte order of a single byte field is irrelevant.
+    if subcon.packer.size > 1:
+      if self._byte_order is None:
+        self._byte_order = field_byte_order
+      elif field_byte_order != self._byte_order:
+        raise ValueError(
+            u'Unsupported fields of different byte orders in: {0:s}.'.format(
+                struct_name))
+
+    return subcon.packer.format[1:]
+
+  def _MakeNestedRecord(self, layout, values, value_index):
+    """Makes a record that contains nested records or arrays.
+
+    Args:
+      layout: a tuple containing the record type and the layouts of
+              the fields, as returned by _CompileStruct.
+      values: a tuple containing the decoded values.
+      value_index: the index of the first value of the record.
+
+    Returns:
+      A tuple containing the record (instance of collections.namedtuple)
+      and the index of the value that follows the record.
+    """
+    record_type, field_layouts = layout
+    field_values = []
+    for field_layout in field_layouts:
+      if field_layout is None:
+        field_values.append(values[value_index])
+        value_index += 1
+      elif isinstance(field_layout, int):
+        field_values.append(
+            list(values[value_index:value_index + field_layout]))
+        value_index += field_layout
+      else:
+        field_value, value_index = self._MakeNestedRecord(
+            field_layout, values, value_index)
+        field_values.append(field_value)
+
+    return record_type._make(field_values), value_index
+
+  def _MakeRecord(self, values):
+    """Makes a record.
+
+    Args:
+      values: a tuple containing the decoded values.
+
+    Returns:
+      The record (instance of collections.namedtuple).
+    """
+    if not self._is_nested:
+      return self._record._make(values)
+
+    record, _ = self._MakeNestedRecord(self._layout, values, 0)
+    return record
+
+  @property
+  def size(self):
+    """The size of a record."""
+    return self._struct.size
+
+  def Decode(self, data, offset=0):
+    """Decodes a record.
+
+    Args:
+      data: a binary string containing the record.
+      offset: optional offset of the record in the data. The default is 0.
+
+    Returns:
+      The record (instance of collections.namedtuple).
+
+    Raises:
+      ValueError: if the data is too small to contain the record.
+    """
+    try:
+      return self._MakeRecord(self._struct.unpack_from(data, offset))
+    except struct.error as exception:
+      raise ValueError(u'Unable to decode record with error: {0:s}'.format(
+          exception))
+
+  def ReadRecord(self, file_object):
+    """Reads a record at the current offset of a file-like object.
+
+    Args:
+      file_object: the file-like object.
+
+    Returns:
+      The record (instance of collections.namedtuple).
+
+    Raises:
+      ValueError: if the record cannot be read.
+    """
+    data = file_object.read(self._struct.size)
+    return self.Decode(data)
+
+  def ReadRecords(self, file_object, buffer_size=None):
+    """Reads consecutive records from the current offset of a file-like object.
+
+    The records are read in large blocks instead of per record. Reading stops
+    at the end of the data, a trailing incomplete record is ignored. The offset
+    of the file-like object is restored before every block is read, hence
+    the file-like object can be used while the records are read.
+
+    Args:
+      file_object: the file-like object.
+      buffer_size: optional size of the blocks that are read. The default is
+                   None, which represents 1 MiB.
+
+    Yields:
+      A tuple containing the offset of the record and the record (instance of
+      collections.namedtuple).
+    """
+    record_size = self._struct.size
+    if not buffer_size:
+      buffer_size = self._DEFAULT_BUFFER_SIZE
+
+    # Read a multiple of the record size, so that the blocks end on a record
+    # boundary.
+    buffer_size = max(buffer_size // record_size, 1) * record_size
+
+    offset = file_object.tell()
+    data = file_object.read(buffer_size)
+    while len(data) >= record_size:
+      number_of_records = len(data) // record_size
+      for data_offset in range(0, number_of_records * record_size, record_size):
+        yield offset + data_offset, self._MakeRecord(
+            self._struct.unpack_from(data, data_offset))
+
+      offset += number_of_records * record_size
+      file_object.seek(offset, os.SEEK_SET)
+      data = file_object.read(buffer_size)
@@ -0,0 +1,124 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the struct decoder."""
+
+import io
+import unittest
+
+import construct
+
+from plaso.lib import struct_decoder
+
+
+class StructDecoderTest(unittest.TestCase):
+  """Tests for the struct decoder."""
+
+  _TEST_STRUCT = construct.Struct(
+      'test_struct',
+      construct.ULInt16('type'),
+      construct.Padding(2),
+      construct.ULInt32('pid'),
+      construct.String('name', 8),
+      construct.Bytes('data', 4),
+      construct.SLInt64('timestamp'))
+
+  _TEST_DATA = (
+      b'\x07\x00\xff\xff\x39\x30\x00\x00test\x00\x00\x00\x00\x01\x02\x03\x04'
+      b'\xff\xff\xff\xff\xff\xff\xff\xff')
+
+  def testInitialize(self):
+    """Tests the initialization."""
+    decoder = struct_decoder.StructDecoder(self._TEST_STRUCT)
+    self.assertEqual(decoder.size, self._TEST_STRUCT.sizeof())
+
+    test_struct = construct.Struct(
+        'test_struct',
+        construct.ULInt16('type'),
+        construct.UBInt32('pid'))
+    with self.assertRaises(ValueError):
+      struct_decoder.StructDecoder(test_struct)
+
+    test_struct = construct.Struct(
+        'test_struct',
+        construct.ULInt16('type'),
+        construct.PascalString('name'))
+    with self.assertRaises(ValueError):
+      struct_decoder.StructDecoder(test_struct)
+
+  def testDecode(self):
+    """Tests the Decode function."""
+    decoder = struct_decoder.StructDecoder(self._TEST_STRUCT)
+
+    expected_record = self._TEST_STRUCT.parse(self._TEST_DATA)
+    record = decoder.Decode(self._TEST_DATA)
+    self.assertEqual(record.type, expected_record.type)
+    self.assertEqual(record.pid, expected_record.pid)
+    self.assertEqual(record.name, expected_record.name)
+    self.assertEqual(record.data, expected_record.data)
+    self.assertEqual(record.timestamp, expected_record.timestamp)
+
+    record = decoder.Decode(b'\x00' + self._TEST_DATA, offset=1)
+    self.assertEqual(record.pid, 12345)
+
+    with self.assertRaises(ValueError):
+      decoder.Decode(self._TEST_DATA[:-1])
+
+  def testDecodeNested(self):
+    """Tests the Decode function on a nested structure with arrays."""
+    test_struct = construct.Struct(
+        'test_struct',
+        construct.Struct(
+            'header',
+            construct.UBInt32('length'),
+            construct.UBInt8('version')),
+        construct.UBInt16('type'),
+        construct.Struct(
+            'address',
+            construct.UBInt64('high'),
+            construct.UBInt64('low')),
+        construct.Array(2, construct.UBInt16('ports')),
+        construct.Array(4, construct.ULInt8('key')))
+    test_data = (
+        b'\x00\x00\x00\x20\x0b\x00\x07\x00\x00\x00\x00\x00\x00\x00\x01'
+        b'\x00\x00\x00\x00\x00\x00\x00\x02\x00\x50\x01\xbb'
+        b'test')
+
+    decoder = struct_decoder.StructDecoder(test_struct)
+    self.assertEqual(decoder.size, test_struct.sizeof())
+
+    expected_record = test_struct.parse(test_data)
+    record = decoder.Decode(test_data)
+    self.assertEqual(record.header.length, expected_record.header.length)
+    self.assertEqual(record.header.version, expected_record.header.version)
+    self.assertEqual(record.type, expected_record.type)
+    self.assertEqual(record.address.high, expected_record.address.high)
+    self.assertEqual(record.address.low, expected_record.address.low)
+    self.assertEqual(record.ports, expected_record.ports)
+    self.assertEqual(record.key, expected_record.key)
+
+    test_struct = construct.Struct(
+        'test_struct',
+        construct.UBInt8('count'),
+        construct.Array(
+            lambda context: context.count, construct.UBInt16('ports')))
+    with self.assertRaises(ValueError):
+      struct_decoder.StructDecoder(test_struct)
+
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    decoder = struct_decoder.StructDecoder(self._TEST_STRUCT)
+
+    # Five records followed by a trailing incomplete record.
+    file_object = io.BytesIO(self._TEST_DATA * 5 + self._TEST_DATA[:-1])
+
+    offsets = []
+    for offset, record in decoder.ReadRecords(file_object, buffer_size=64):
+      offsets.append(offset)
+      self.assertEqual(record.pid, 12345)
+
+    expected_offsets = range(0, 5 * decoder.size, decoder.size)
+    self.assertEqual(offsets, expected_offsets)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -9,6 +9,7 @@ The file can also contain common functions to change the default timestamp into
 a more human readable one.
 """
 
+import bisect
 import calendar
 import datetime
 import dateutil.parser
@@ -726,6 +727,309 @@ class Timestamp(object):
     return int(scrubbed + rounded * cls.MICRO_SECONDS_PER_SECOND)
 
 
+class TimestampConverter(object):
+  """Class that converts timestamps to date and time values in a timezone.
+
+  The conversion is equivalent to Timestamp.CopyToDatetime but the UTC offset
+  is looked up in a table of the transitions of the timezone, where the
+  offset of the last transition interval is cached, and the date and time
+  values are calculated with integer arithmetic instead of datetime objects.
+  """
+
+  # The number of days between 0000-03-01 and 1970-01-01.
+  _DAYS_FROM_0000_03_01_TO_1970_01_01 = 719468
+
+  # The number of days in a 400 year era.
+  _DAYS_PER_ERA = 146097
+
+  # The range of the number of days since 1970-01-01 and POSIX times
+  # supported by datetime, which are 0001-01-01 and 9999-12-31.
+  _MINIMUM_DAY_NUMBER = -719162
+  _MAXIMUM_DAY_NUMBER = 2932896
+
+  _MINIMUM_POSIX_TIME = _MINIMUM_DAY_NUMBER * 24 * 60 * 60
+  _MAXIMUM_POSIX_TIME = ((_MAXIMUM_DAY_NUMBER + 1) * 24 * 60 * 60) - 1
+
+  # The date and time values that are returned when a timestamp is out
+  # of bounds, similar to Timestamp.CopyToDatetime.
+  _EPOCH_DATE_TIME_VALUES = (1970, 1, 1, 0, 0, 0, 0)
+
+  def __init__(self, timezone=pytz.UTC):
+    """Initializes the timestamp converter object.
+
+    Args:
+      timezone: Optional timezone (instance of pytz.timezone).
+                The default is UTC.
+    """
+    super(TimestampConverter, self).__init__()
+    self._date_cache_day_number = None
+    self._date_cache_values = None
+    self._interval_end = None
+    self._interval_offset = None
+    self._interval_start = None
+    self._iso_format_cache_key = None
+    self._iso_format_cache_strings = None
+    self._transition_offsets = []
+    self._transition_times = []
+    self.timezone = timezone
+
+    utc_transition_times = getattr(timezone, u'_utc_transition_times', None)
+    transition_info = getattr(timezone, u'_transition_info', None)
+    if utc_transition_times and transition_info:
+      for utc_transition_time, (utc_offset, _, _) in zip(
+          utc_transition_times, transition_info):
+        self._transition_times.append(
+            calendar.timegm(utc_transition_time.utctimetuple()))
+        self._transition_offsets.append(self._GetSeconds(utc_offset))
+
+    else:
+      utc_offset = timezone.utcoffset(datetime.datetime(1970, 1, 1))
+      self._transition_times.append(0)
+      self._transition_offsets.append(self._GetSeconds(utc_offset))
+
+  def _GetSeconds(self, time_delta):
+    """Retrieves the number of seconds of a time delta.
+
+    Args:
+      time_delta: the time delta (instance of datetime.timedelta) or None.
+
+    Returns:
+      An integer containing the number of seconds.
+    """
+    if not time_delta:
+      return 0
+    return (time_delta.days * Timestamp.SECONDS_PER_DAY) + time_delta.seconds
+
+  def _GetDateValues(self, day_number):
+    """Determines the date values from the number of days since 1970-01-01.
+
+    Args:
+      day_number: an integer containing the number of days since 1970-01-01.
+
+    Returns:
+      A tuple containing the year, month and day of month.
+    """
+    if day_number == self._date_cache_day_number:
+      return self._date_cache_values
+
+    # The calculation uses years that start on March 1 so the leap day is
+    # the last day of the year.
+    days = day_number + self._DAYS_FROM_0000_03_01_TO_1970_01_01
+    era = days // self._DAYS_PER_ERA
+    day_of_era = days - (era * self._DAYS_PER_ERA)
+    year_of_era = (
+        day_of_era - (day_of_era // 1460) + (day_of_era // 36524) -
+        (day_of_era // 146096)) // 365
+    day_of_year = day_of_era - (
+        (365 * year_of_era) + (year_of_era // 4) - (year_of_era // 100))
+    month_of_year = ((5 * day_of_year) + 2) // 153
+
+    day_of_month = day_of_year - (((153 * month_of_year) + 2) // 5) + 1
+    if month_of_year < 10:
+      month = month_of_year + 3
+    else:
+      month = month_of_year - 9
+
+    year = year_of_era + (era * 400)
+    if month <= 2:
+      year += 1
+
+    self._date_cache_day_number = day_number
+    self._date_cache_values = (year, month, day_of_month)
+    return self._date_cache_values
+
+  def _GetUTCOffset(self, posix_time):
+    """Determines the UTC offset of the timezone at a specific time.
+
+    The transition interval that contains the time is cached.
+
+    Args:
+      posix_time: an integer containing the POSIX time in UTC.
+
+    Returns:
+      An integer containing the UTC offset in seconds.
+    """
+    index = max(0, bisect.bisect_right(self._transition_times, posix_time) - 1)
+
+    self._interval_start = None
+    if index > 0:
+      self._interval_start = self._transition_times[index]
+
+    self._interval_end = None
+    if index + 1 < len(self._transition_times):
+      self._interval_end = self._transition_times[index + 1]
+
+    self._interval_offset = self._transition_offsets[index]
+    return self._interval_offset
+
+  def _CopyToDateTimeValuesAndOffset(self, timestamp):
+    """Copies the timestamp to date and time values and the UTC offset.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+
+    Returns:
+      A tuple containing the date and time values and the UTC offset in
+      seconds.
+
+    Raises:
+      OverflowError: if the timestamp is out of bounds.
+    """
+    posix_time, micro_seconds = divmod(
+        timestamp, Timestamp.MICRO_SECONDS_PER_SECOND)
+
+    # The date in UTC needs to be within bounds as well.
+    if (posix_time < self._MINIMUM_POSIX_TIME or
+        posix_time > self._MAXIMUM_POSIX_TIME):
+      raise OverflowError(u'date value out of range')
+
+    utc_offset = self._interval_offset
+    if (utc_offset is None or
+        (self._interval_start is not None and
+         posix_time < self._interval_start) or
+        (self._interval_end is not None and posix_time >= self._interval_end)):
+      utc_offset = self._GetUTCOffset(posix_time)
+
+    day_number, seconds = divmod(
+        posix_time + utc_offset, Timestamp.SECONDS_PER_DAY)
+    if (day_number < self._MINIMUM_DAY_NUMBER or
+        day_number > self._MAXIMUM_DAY_NUMBER):
+      raise OverflowError(u'date value out of range')
+
+    year, month, day_of_month = self._GetDateValues(day_number)
+
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+
+    return (
+        year, month, day_of_month, hours, minutes, seconds,
+        micro_seconds), utc_offset
+
+  def CopyToDateTimeValues(self, timestamp, raise_error=False):
+    """Copies the timestamp to date and time values.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A tuple containing the year, month, day of month, hours, minutes,
+      seconds and micro seconds.
+
+    Raises:
+      OverflowError: If raises_error is set to True and an OverflowError error
+                     occurs. Otherwise the error is absorbed and the values of
+                     the beginning of UNIX Epoch are returned.
+    """
+    try:
+      date_time_values, _ = self._CopyToDateTimeValuesAndOffset(timestamp)
+      return date_time_values
+
+    except OverflowError as exception:
+      if raise_error:
+        raise
+      logging.error((
+          u'Unable to copy {0:d} to date and time values with error: '
+          u'{1:s}').format(timestamp, exception))
+
+    return self._EPOCH_DATE_TIME_VALUES
+
+  def CopyToDateTimeValuesList(self, timestamps, raise_error=False):
+    """Copies timestamps to date and time values.
+
+    Args:
+      timestamps: A list of integers containing the timestamps. The conversion
+                  is fastest if the timestamps are sorted.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if a timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A list of tuples containing the year, month, day of month, hours,
+      minutes, seconds and micro seconds.
+    """
+    return [
+        self.CopyToDateTimeValues(timestamp, raise_error=raise_error)
+        for timestamp in timestamps]
+
+  def CopyToIsoFormat(self, timestamp, raise_error=False):
+    """Copies the timestamp to an ISO 8601 formatted string.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A string containing an ISO 8601 formatted date and time, which is
+      the same as datetime.isoformat().
+    """
+    try:
+      date_time_values, utc_offset = self._CopyToDateTimeValuesAndOffset(
+          timestamp)
+
+    except OverflowError as exception:
+      if raise_error:
+        raise
+      logging.error((
+          u'Unable to copy {0:d} to an ISO 8601 formatted string with error: '
+          u'{1:s}').format(timestamp, exception))
+
+      date_time_values = self._EPOCH_DATE_TIME_VALUES
+      utc_offset = 0
+
+    year, month, day_of_month, hours, minutes, seconds, micro_seconds = (
+        date_time_values)
+
+    # The date and UTC offset strings are cached since they rarely change
+    # between consecutive timestamps.
+    iso_format_cache_key = (year, month, day_of_month, utc_offset)
+    if iso_format_cache_key != self._iso_format_cache_key:
+      if utc_offset < 0:
+        utc_offset_sign = u'-'
+      else:
+        utc_offset_sign = u'+'
+
+      utc_offset_hours, utc_offset_minutes = divmod(abs(utc_offset) // 60, 60)
+
+      self._iso_format_cache_key = iso_format_cache_key
+      self._iso_format_cache_strings = (
+          u'{0:04d}-{1:02d}-{2:02d}T'.format(year, month, day_of_month),
+          u'{0:s}{1:02d}:{2:02d}'.format(
+              utc_offset_sign, utc_offset_hours, utc_offset_minutes))
+
+    date_string, utc_offset_string = self._iso_format_cache_strings
+
+    # String interpolation is used since it is faster than format.
+    if micro_seconds:
+      return u'%s%02d:%02d:%02d.%06d%s' % (
+          date_string, hours, minutes, seconds, micro_seconds,
+          utc_offset_string)
+
+    return u'%s%02d:%02d:%02d%s' % (
+        date_string, hours, minutes, seconds, utc_offset_string)
+
+  def CopyToIsoFormatList(self, timestamps, raise_error=False):
+    """Copies timestamps to ISO 8601 formatted strings.
+
+    Args:
+      timestamps: A list of integers containing the timestamps. The conversion
+                  is fastest if the timestamps are sorted.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if a timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A list of strings containing ISO 8601 formatted dates and times.
+    """
+    return [
+        self.CopyToIsoFormat(timestamp, raise_error=raise_error)
+        for timestamp in timestamps]
+
+
 # TODO: deprecate in favor of CopyFromString, which will remove the
 # dependency on dateutil.parser.
 def StringToDatetime(
@@ -511,5 +511,74 @@ class TimeLibTest(unittest.TestCase):
         471964380, '12-15-1984 05:13:00', timezone=pytz.timezone('US/Pacific'))
 
 
+class TimestampConverterTest(unittest.TestCase):
+  """Tests for the timestamp converter."""
+
+  def testCopyToDateTimeValues(self):
+    """Tests the CopyToDateTimeValues function."""
+    converter = timelib.TimestampConverter(timezone=pytz.timezone('CET'))
+
+    timestamp = timelib.Timestamp.CopyFromString(u'2013-03-14 20:20:08.850041')
+    date_time_values = converter.CopyToDateTimeValues(timestamp)
+    self.assertEqual(date_time_values, (2013, 3, 14, 21, 20, 8, 850041))
+
+    # Daylight saving time.
+    timestamp = timelib.Timestamp.CopyFromString(u'2013-07-01 22:00:00')
+    date_time_values = converter.CopyToDateTimeValues(timestamp)
+    self.assertEqual(date_time_values, (2013, 7, 2, 0, 0, 0, 0))
+
+    converter = timelib.TimestampConverter()
+
+    timestamp = timelib.Timestamp.CopyFromString(u'1600-02-29 23:59:59')
+    date_time_values = converter.CopyToDateTimeValues(timestamp)
+    self.assertEqual(date_time_values, (1600, 2, 29, 23, 59, 59, 0))
+
+    timestamp = timelib.Timestamp.TIMESTAMP_MAX_MICRO_SECONDS
+    with self.assertRaises(OverflowError):
+      converter.CopyToDateTimeValues(timestamp, raise_error=True)
+
+    date_time_values = converter.CopyToDateTimeValues(timestamp)
+    self.assertEqual(date_time_values, (1970, 1, 1, 0, 0, 0, 0))
+
+  def testCopyToDateTimeValuesList(self):
+    """Tests the CopyToDateTimeValuesList function."""
+    timezone = pytz.timezone('America/New_York')
+    converter = timelib.TimestampConverter(timezone=timezone)
+
+    timestamps = range(
+        -2208988800000000, 2208988800000000, 7 * 3600 * 1000000 + 123457)
+    date_time_values_list = converter.CopyToDateTimeValuesList(timestamps)
+    self.assertEqual(len(date_time_values_list), len(timestamps))
+
+    for timestamp, date_time_values in zip(timestamps, date_time_values_list):
+      datetime_object = timelib.Timestamp.CopyToDatetime(timestamp, timezone)
+      expected_date_time_values = (
+          datetime_object.year, datetime_object.month, datetime_object.day,
+          datetime_object.hour, datetime_object.minute,
+          datetime_object.second, datetime_object.microsecond)
+      self.assertEqual(date_time_values, expected_date_time_values)
+
+  def testCopyToIsoFormat(self):
+    """Tests the CopyToIsoFormat function."""
+    converter = timelib.TimestampConverter()
+
+    timestamp = timelib.Timestamp.CopyFromString(u'2013-03-14 20:20:08.850041')
+    iso_format_string = converter.CopyToIsoFormat(timestamp)
+    self.assertEqual(iso_format_string, u'2013-03-14T20:20:08.850041+00:00')
+
+    timezone = pytz.timezone('America/St_Johns')
+    converter = timelib.TimestampConverter(timezone=timezone)
+
+    timestamps = [
+        timelib.Timestamp.CopyFromString(u'2013-01-01 00:00:00'),
+        timelib.Timestamp.CopyFromString(u'2013-07-01 00:00:00.000001')]
+    iso_format_strings = converter.CopyToIsoFormatList(timestamps)
+    expected_iso_format_strings = [
+        timelib.Timestamp.CopyToIsoFormat(timestamp, timezone=timezone)
+        for timestamp in timestamps]
+    self.assertEqual(iso_format_strings, expected_iso_format_strings)
+    self.assertEqual(iso_format_strings[0], u'2012-12-31T20:30:00-03:30')
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -3,6 +3,7 @@
 
 import collections
 import logging
+import time
 
 from plaso.multi_processing import process_info
 from plaso.multi_processing import rpc
@@ -20,17 +21,25 @@ class Foreman(object):
   * an indicator whether the worker is alive or not;
   * the memory consumption of the worker.
 
-  This information is gathered using both RPC calls to the worker
-  itself as well as data provided by the psutil library.
+  This information is gathered using either the shared memory status table
+  or RPC calls to the worker itself, as well as data provided by the psutil
+  library.
 
-  In the future the Foreman should be able to actively monitor
-  the health of the processes and terminate and restart processes
-  that are stuck.
+  The Foreman also monitors the health of the worker processes. A worker
+  that is no longer functioning or that has not made progress within
+  the worker timeout is terminated and marked as failed, so that it can
+  be replaced by the engine.
   """
 
   PROCESS_LABEL = collections.namedtuple(u'process_label', u'label pid process')
 
-  def __init__(self, event_queue_producer, show_memory_usage=False):
+  # The default number of seconds a worker can run without making progress,
+  # such as extracting events, before it is considered hung.
+  _DEFAULT_WORKER_TIMEOUT = 30 * 60
+
+  def __init__(
+      self, event_queue_producer, show_memory_usage=False, status_table=None,
+      worker_timeout=None):
     """Initialize the foreman process.
 
     Args:
@@ -38,16 +47,59 @@ class Foreman(object):
                             ItemQueueProducer).
       show_memory_usage: Optional boolean value to indicate memory information
                          should be included in logging. The default is false.
+      status_table: Optional process status table (instance of
+                    ProcessStatusTable) the workers write their status into.
+                    The default is None, which represents the status is
+                    retrieved via RPC.
+      worker_timeout: Optional number of seconds a worker can run without
+                      making progress before it is considered hung. The
+                      default is None, which represents 30 minutes.
     """
     super(Foreman, self).__init__()
     self._completed_process_labels = {}
     self._event_queue_producer = event_queue_producer
+    self._failed_process_labels = {}
+    self._last_progress_per_pid = {}
     self._last_status_dict = {}
     self._monitored_process_labels = {}
     self._processing_completed = False
     self._rpc_clients_per_pid = {}
     self._show_memory_usage = show_memory_usage
     self._signalled_end_of_input = False
+    self._status_table = status_table
+    self._status_table_index_per_pid = {}
+    self._worker_timeout = worker_timeout or self._DEFAULT_WORKER_TIMEOUT
+
+  def _CheckProgress(self, process_label, status_dict):
+    """Checks if a running process has made progress.
+
+    The progress of a process is determined by the number of file entries
+    it processed, the number of events it extracted and its current file.
+
+    Args:
+      process_label: A process label (instance of PROCESS_LABEL).
+      status_dict: The status dictionary of the process or None if the status
+                   could not be retrieved.
+
+    Returns:
+      A boolean indicating the process made progress within the worker
+      timeout.
+    """
+    timestamp = time.time()
+    last_progress, last_progress_time = self._last_progress_per_pid.get(
+        process_label.pid, (None, timestamp))
+
+    if status_dict is not None:
+      progress = (
+          status_dict.get(u'number_of_file_entries', 0),
+          status_dict.get(u'number_of_events', 0),
+          status_dict.get(u'current_file', u''))
+
+      if progress != last_progress:
+        self._last_progress_per_pid[process_label.pid] = (progress, timestamp)
+        return True
+
+    return timestamp - last_progress_time < self._worker_timeout
 
   def _CheckStatus(self, process_label):
     """Check status for a single process from the monitoring list.
@@ -60,9 +112,9 @@ class Foreman(object):
     or terminating a process that is alive and hanging, or not alive while
     it should be alive.
 
-    In the future this function will also be responsible for restarting
-    a worker, or signalling the engine that it needs to spin up a new worker
-    in the case of a worker dying or being in an effective zombie state.
+    A worker that is terminated is marked as failed, which signals the engine
+    that it needs to spin up a new worker in the case of a worker dying or
+    being in an effective zombie state.
 
     Args:
       process_label: A process label (instance of PROCESS_LABEL).
@@ -85,14 +137,36 @@ class Foreman(object):
       logging.info(u'Process {0:s} (PID: {1:d}) is not alive.'.format(
           process_label.label, process_label.pid))
 
+      # The status in the status table remains available after the process
+      # exited, hence a process that completed its processing before its
+      # status was checked is not considered as failed.
+      status_dict = self._GetStatusFromStatusTable(process_label)
+      if status_dict and not status_dict.get(u'is_running', False):
+        worker_is_running = False
+        logging.info((
+            u'Process {0:s} (PID: {1:d}) has completed its processing. '
+            u'Total of {2:d} events extracted').format(
+                process_label.label, process_label.pid,
+                status_dict.get(u'number_of_events', 0)))
+
     else:
-      rpc_client = self._rpc_clients_per_pid.get(process_label.pid, None)
-      status_dict = rpc_client.CallFunction()
+      if process_label.pid in self._status_table_index_per_pid:
+        status_dict = self._GetStatusFromStatusTable(process_label)
+
+      else:
+        rpc_client = self._rpc_clients_per_pid.get(process_label.pid, None)
+        status_dict = rpc_client.CallFunction()
+        if not isinstance(status_dict, dict):
+          logging.warning((
+              u'Unable to retrieve status of process: {0:s} via RPC socket: '
+              u'http://localhost:{1:d}').format(
+                  process_label.label, process_label.pid))
+
       if not isinstance(status_dict, dict):
-        logging.warning((
-            u'Unable to retrieve status of process: {0:s} via RPC socket: '
-            u'http://localhost:{1:d}').format(
-                process_label.label, process_label.pid))
+        # The process might have just been started and not have reported its
+        # status yet, hence the process is given until the worker timeout.
+        if self._CheckProgress(process_label, None):
+          return False
 
       else:
         self._last_status_dict[process_label.pid] = status_dict
@@ -101,39 +175,72 @@ class Foreman(object):
           self._LogWorkerInformation(process_label, status_dict)
           if self._show_memory_usage:
             self._LogMemoryUsage(process_label)
-          return False
 
-        logging.info((
-            u'Process {0:s} (PID: {1:d}) has completed its processing. '
-            u'Total of {2:d} events extracted').format(
-                process_label.label, process_label.pid,
-                status_dict.get(u'number_of_events', 0)))
+          if self._CheckProgress(process_label, status_dict):
+            return False
+
+          logging.error((
+              u'Process {0:s} (PID: {1:d}) has not made progress in {2!s} '
+              u'seconds while processing: {3:s}.').format(
+                  process_label.label, process_label.pid,
+                  self._worker_timeout,
+                  status_dict.get(u'current_file', u'')))
+
+        else:
+          logging.info((
+              u'Process {0:s} (PID: {1:d}) has completed its processing. '
+              u'Total of {2:d} events extracted').format(
+                  process_label.label, process_label.pid,
+                  status_dict.get(u'number_of_events', 0)))
 
     if worker_is_running and not self._processing_completed:
-      # We need to terminate the process.
-      # TODO: Add a function to start a new instance of a worker instead of
-      # just removing and killing it.
+      # We need to terminate the process and have the engine replace it.
       logging.error((
           u'Process {0:s} (PID: {1:d}) is not functioning when it should be. '
-          u'Terminating it and removing from list.').format(
+          u'Terminating it and marking it as failed.').format(
               process_label.label, process_label.pid))
 
       self._TerminateProcess(process_label)
+      if self.IsMonitored(process_label):
+        self.StopMonitoring(process_label)
+
+      self._failed_process_labels[process_label.pid] = process_label
+      self._RemoveStatusSource(process_label)
       return False
 
     # This process exited properly and should have. Let's remove it from our
     # list of labels.
     self.StopMonitoring(process_label)
 
-    # Add the process label to the completed list and remove the RPC client.
+    # Add the process label to the completed list and remove the source
+    # of its status.
     self._completed_process_labels[process_label.pid] = process_label
-    rpc_client = self._rpc_clients_per_pid.get(process_label.pid, None)
-    if rpc_client:
-      rpc_client.Close()
-      del self._rpc_clients_per_pid[process_label.pid]
+    self._RemoveStatusSource(process_label)
 
     return True
 
+  def _GetStatusFromStatusTable(self, process_label):
+    """Retrieves the status of a process from the status table.
+
+    Args:
+      process_label: A process label (instance of PROCESS_LABEL).
+
+    Returns:
+      A status dictionary or None if not available.
+    """
+    status_table_index = self._status_table_index_per_pid.get(
+        process_label.pid, None)
+    if status_table_index is None:
+      return
+
+    status_dict = self._status_table.GetStatus(status_table_index)
+
+    # The slot could have been reused by another process.
+    if not status_dict or status_dict.get(u'pid', None) != process_label.pid:
+      return
+
+    return status_dict
+
   def _LogMemoryUsage(self, process_label):
     """Logs memory information gathered from a process.
 
@@ -168,6 +275,32 @@ class Foreman(object):
               status.get(u'current_file', u''),
               status.get(u'is_running', False), process_label.process.status))
 
+      current_parser = status.get(u'current_parser', None)
+      if current_parser:
+        logging.debug((
+            u'{0:s} (PID: {1:d}) - file entries: {2:d} - data processed: '
+            u'{3:d} bytes - parser: {4:s}').format(
+                process_label.label, process_label.pid,
+                status.get(u'number_of_file_entries', 0),
+                status.get(u'processed_data_size', 0), current_parser))
+
+  def _RemoveStatusSource(self, process_label):
+    """Removes the RPC client or status table index of a process.
+
+    Args:
+      process_label: A process label (instance of PROCESS_LABEL).
+    """
+    rpc_client = self._rpc_clients_per_pid.get(process_label.pid, None)
+    if rpc_client:
+      rpc_client.Close()
+      del self._rpc_clients_per_pid[process_label.pid]
+
+    if process_label.pid in self._status_table_index_per_pid:
+      del self._status_table_index_per_pid[process_label.pid]
+
+    if process_label.pid in self._last_progress_per_pid:
+      del self._last_progress_per_pid[process_label.pid]
+
   def _TerminateProcess(self, process_label):
     """Terminate a process in the monitoring list.
 
@@ -232,6 +365,27 @@ class Foreman(object):
       logging.info(u'Processing completed.')
     return processing_complete
 
+  def GetAverageCPUPercent(self):
+    """Retrieves the average CPU usage of the monitored processes.
+
+    The CPU usage of a process is determined over the time since the previous
+    call, or since the process started to be monitored.
+
+    Returns:
+      A floating point value containing the average CPU usage percentage
+      or None if no CPU usage is available.
+    """
+    cpu_percentages = []
+    for process_label in self._monitored_process_labels.itervalues():
+      cpu_percent = process_label.process.cpu_percent
+      if cpu_percent is not None:
+        cpu_percentages.append(cpu_percent)
+
+    if not cpu_percentages:
+      return
+
+    return sum(cpu_percentages) / len(cpu_percentages)
+
   def GetLabelByPid(self, pid):
     """Retrieves a proces label for a specific PID.
 
@@ -262,7 +416,8 @@ class Foreman(object):
     """
     return process_label.pid in self._monitored_process_labels
 
-  def MonitorWorker(self, label=None, pid=None, name=None):
+  def MonitorWorker(
+      self, label=None, pid=None, name=None, status_table_index=None):
     """Starts monitoring a worker by adding it to the monitor list.
 
     This function requires either a label to be set or a PID and a process
@@ -281,6 +436,10 @@ class Foreman(object):
       name: The name of the worker process, only required if label is not
             provided. Defaults to None, only used if label is set to None,
             in which case it has to be set.
+      status_table_index: Optional index of the slot in the status table
+                          the worker writes its status into. The default
+                          is None, which represents the status is retrieved
+                          via RPC. This is only used if label is set to None.
 
     Raises:
       IOError: if the RPC client cannot connect to the server.
@@ -294,24 +453,45 @@ class Foreman(object):
         raise RuntimeError(
             u'RPC client (PID: {0:d}) already exists'.format(pid))
 
-      rpc_client = xmlrpc.XMLProcessStatusRPCClient()
+      if self._status_table and status_table_index is not None:
+        self._status_table_index_per_pid[pid] = status_table_index
 
-      hostname = u'localhost'
-      port = rpc.GetProxyPortNumberFromPID(pid)
-      if not rpc_client.Open(hostname, port):
-        raise IOError((
-            u'RPC client (PID: {0:d}) unable to connect to server: '
-            u'{1:s}:{2:d}').format(pid, hostname, port))
+      else:
+        rpc_client = xmlrpc.XMLProcessStatusRPCClient()
 
-      self._rpc_clients_per_pid[pid] = rpc_client
+        hostname = u'localhost'
+        port = rpc.GetProxyPortNumberFromPID(pid)
+        if not rpc_client.Open(hostname, port):
+          raise IOError((
+              u'RPC client (PID: {0:d}) unable to connect to server: '
+              u'{1:s}:{2:d}').format(pid, hostname, port))
+
+        self._rpc_clients_per_pid[pid] = rpc_client
 
       process_information = process_info.ProcessInfo(pid)
       label = self.PROCESS_LABEL(name, pid, process_information)
 
+      # The first call to determine the CPU usage returns 0.0, subsequent
+      # calls the usage since the previous call.
+      _ = process_information.cpu_percent
+
     if label.pid not in self._monitored_process_labels:
       if label.pid in self._completed_process_labels:
         del self._completed_process_labels[label.pid]
       self._monitored_process_labels[label.pid] = label
+      self._last_progress_per_pid[label.pid] = (None, time.time())
+
+  def PopFailedProcessLabels(self):
+    """Pops the labels of the processes that failed since the previous call.
+
+    Returns:
+      A list of process labels (instances of PROCESS_LABEL).
+    """
+    process_labels = [
+        process_label for _, process_label in sorted(
+            self._failed_process_labels.items())]
+    self._failed_process_labels = {}
+    return process_labels
 
   def SignalEndOfProcessing(self):
     """Signals that the processing is completed."""
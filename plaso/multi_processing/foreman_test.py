@@ -2,9 +2,58 @@
 # -*- coding: utf-8 -*-
 """Tests the foreman class for monitoring workers."""
 
+import time
 import unittest
 
 from plaso.multi_processing import foreman
+from plaso.multi_processing import status_table
+
+
+class TestProcessInformation(object):
+  """Class that implements process information for testing."""
+
+  def __init__(self, cpu_percent=None, is_alive=True):
+    """Initializes the process information object.
+
+    Args:
+      cpu_percent: optional CPU usage percentage.
+      is_alive: optional boolean value to indicate the process is alive.
+    """
+    super(TestProcessInformation, self).__init__()
+    self.cpu_percent = cpu_percent
+    self.is_alive = is_alive
+    self.status = u'running'
+    self.terminated = False
+
+  def IsAlive(self):
+    """Return a boolean value indicating if the process is alive or not."""
+    return self.is_alive
+
+  def TerminateProcess(self):
+    """Terminate the process."""
+    self.terminated = True
+    self.is_alive = False
+
+
+class TestRPCClient(object):
+  """Class that implements a RPC client for testing."""
+
+  def __init__(self, status_dict):
+    """Initializes the RPC client object.
+
+    Args:
+      status_dict: the status dictionary returned by the RPC client.
+    """
+    super(TestRPCClient, self).__init__()
+    self.status_dict = status_dict
+
+  def CallFunction(self):
+    """Calls the function via RPC."""
+    return self.status_dict
+
+  def Close(self):
+    """Closes the RPC communication channel to the server."""
+    return
 
 
 class ForemanTest(unittest.TestCase):
@@ -16,7 +65,86 @@ class ForemanTest(unittest.TestCase):
     foreman_object = foreman.Foreman(None)
     self.assertNotEqual(foreman_object, None)
 
-  # TODO: add more tests.
+  def _CreateProcessLabel(self, foreman_object, pid, status_dict, **kwargs):
+    """Creates a monitored process label with a RPC client for testing.
+
+    Args:
+      foreman_object: the foreman object (instance of Foreman).
+      pid: the process ID (PID).
+      status_dict: the status dictionary returned by the RPC client.
+      kwargs: keyword arguments to pass to TestProcessInformation.
+
+    Returns:
+      A process label (instance of PROCESS_LABEL).
+    """
+    process_label = foreman_object.PROCESS_LABEL(
+        u'Worker_{0:d}'.format(pid), pid, TestProcessInformation(**kwargs))
+    foreman_object.MonitorWorker(label=process_label)
+
+    # pylint: disable=protected-access
+    foreman_object._rpc_clients_per_pid[pid] = TestRPCClient(status_dict)
+    return process_label
+
+  def testCheckStatus(self):
+    """Tests the CheckStatus function with a hung worker."""
+    foreman_object = foreman.Foreman(None, worker_timeout=0.01)
+
+    status_dict = {
+        u'current_file': u'/tmp/test.txt',
+        u'is_running': True,
+        u'number_of_events': 1,
+        u'number_of_file_entries': 1}
+    process_label = self._CreateProcessLabel(foreman_object, 1, status_dict)
+
+    # The worker made progress since it started to be monitored.
+    self.assertFalse(foreman_object.CheckStatus(process_label=process_label))
+    self.assertEqual(foreman_object.PopFailedProcessLabels(), [])
+
+    time.sleep(0.05)
+    self.assertFalse(foreman_object.CheckStatus(process_label=process_label))
+    self.assertTrue(process_label.process.terminated)
+    self.assertFalse(foreman_object.IsMonitored(process_label))
+
+    self.assertEqual(foreman_object.PopFailedProcessLabels(), [process_label])
+    self.assertEqual(foreman_object.PopFailedProcessLabels(), [])
+
+  def testCheckStatusWithStatusTable(self):
+    """Tests the CheckStatus function with the status table."""
+    test_status_table = status_table.ProcessStatusTable(1)
+    foreman_object = foreman.Foreman(None, status_table=test_status_table)
+
+    # pylint: disable=protected-access
+    process_label = foreman_object.PROCESS_LABEL(
+        u'Worker_1', 1, TestProcessInformation(is_alive=False))
+    foreman_object.MonitorWorker(label=process_label)
+    foreman_object._status_table_index_per_pid[1] = 0
+
+    # A process that completed before its status was checked.
+    test_status_table.UpdateStatus(0, 1, {u'is_running': False})
+
+    self.assertTrue(foreman_object.CheckStatus(process_label=process_label))
+    self.assertFalse(foreman_object.IsMonitored(process_label))
+    self.assertEqual(foreman_object.PopFailedProcessLabels(), [])
+
+    # A process that exited while the slot is used by another process.
+    process_label = foreman_object.PROCESS_LABEL(
+        u'Worker_2', 2, TestProcessInformation(is_alive=False))
+    foreman_object.MonitorWorker(label=process_label)
+    foreman_object._status_table_index_per_pid[2] = 0
+
+    self.assertFalse(foreman_object.CheckStatus(process_label=process_label))
+    self.assertEqual(foreman_object.PopFailedProcessLabels(), [process_label])
+
+  def testGetAverageCPUPercent(self):
+    """Tests the GetAverageCPUPercent function."""
+    foreman_object = foreman.Foreman(None)
+    self.assertIsNone(foreman_object.GetAverageCPUPercent())
+
+    self._CreateProcessLabel(foreman_object, 1, {}, cpu_percent=20.0)
+    self._CreateProcessLabel(foreman_object, 2, {}, cpu_percent=60.0)
+    self._CreateProcessLabel(foreman_object, 3, {})
+
+    self.assertEqual(foreman_object.GetAverageCPUPercent(), 40.0)
 
 
 if __name__ == '__main__':
@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 """The multi-process processing engine."""
 
+import cPickle
 import ctypes
 import logging
 import multiprocessing
 import os
 import Queue
+import shutil
 import signal
 import sys
+import tempfile
 import time
 
 from dfvfs.resolver import context
@@ -16,11 +19,15 @@ from plaso.engine import collector
 from plaso.engine import engine
 from plaso.engine import queue
 from plaso.engine import worker
+from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.multi_processing import foreman
 from plaso.multi_processing import rpc
+from plaso.multi_processing import shared_memory_queue
+from plaso.multi_processing import status_table
 from plaso.multi_processing import xmlrpc
 from plaso.parsers import mediator as parsers_mediator
+from plaso.serializer import protobuf_serializer
 
 
 def SigKill(pid):
@@ -50,37 +57,95 @@ class MultiProcessEngine(engine.BaseEngine):
 
   _FOREMAN_CHECK_SLEEP = 1.5
 
+  # The maximum number of times a path specification is re-queued after
+  # the worker processing it failed.
+  _PATH_SPEC_MAXIMUM_NUMBER_OF_RETRIES = 1
+
   _PROCESS_ABORT_TIMEOUT = 2
   _PROCESS_JOIN_TIMEOUT = 5
   _PROCESS_TERMINATION_SLEEP = 0.5
 
+  # The size of the buffer of the retry queue, which is 1 MiB.
+  _RETRY_QUEUE_BUFFER_SIZE = 1024 * 1024
+
   _WORKER_PROCESSES_MINIMUM = 2
   _WORKER_PROCESSES_MAXIMUM = 15
 
-  def __init__(self, maximum_number_of_queued_items=0):
+  # The number of seconds between two worker scaling decisions.
+  _WORKER_PROCESSES_SCALING_INTERVAL = 30.0
+
+  # A worker is stopped when the average CPU usage of the workers is below
+  # the scale down percentage. A worker is started when the average CPU
+  # usage is above the scale up percentage and there are more queued
+  # path specifications per worker than the scale up number of queued items.
+  _WORKER_PROCESSES_SCALE_DOWN_CPU_PERCENT = 25.0
+  _WORKER_PROCESSES_SCALE_UP_CPU_PERCENT = 75.0
+  _WORKER_PROCESSES_SCALE_UP_QUEUED_ITEMS = 100
+
+  def __init__(
+      self, maximum_number_of_queued_items=0,
+      queue_type=definitions.QUEUE_TYPE_MULTI_PROCESSING):
     """Initialize the multi-process engine object.
 
     Args:
       maximum_number_of_queued_items: The maximum number of queued items.
                                       The default is 0, which represents
                                       no limit.
+      queue_type: Optional string containing the type of queue used to
+                  transfer items between the processes, either
+                  "multiprocessing" or "shared_memory". The default is
+                  "multiprocessing".
+
+    Raises:
+      ValueError: if the queue type is not supported.
     """
-    collection_queue = MultiProcessingQueue(
+    if queue_type == definitions.QUEUE_TYPE_MULTI_PROCESSING:
+      queue_class = MultiProcessingQueue
+    elif queue_type == definitions.QUEUE_TYPE_SHARED_MEMORY:
+      queue_class = shared_memory_queue.SharedMemoryQueue
+    else:
+      raise ValueError(u'Unsupported queue type: {0:s}.'.format(queue_type))
+
+    collection_queue = queue_class(
         maximum_number_of_queued_items=maximum_number_of_queued_items)
-    storage_queue = MultiProcessingQueue(
+    storage_queue = queue_class(
         maximum_number_of_queued_items=maximum_number_of_queued_items)
-    parse_error_queue = MultiProcessingQueue(
+    parse_error_queue = queue_class(
         maximum_number_of_queued_items=maximum_number_of_queued_items)
 
     super(MultiProcessEngine, self).__init__(
         collection_queue, storage_queue, parse_error_queue)
 
+    # The event objects are transferred to the storage writer in batches
+    # to reduce the per event object overhead of the queue.
+    self._event_queue_producer = queue.BatchItemQueueProducer(storage_queue)
+
     self._collection_process = None
     self._foreman_object = None
+    self._parse_cache_path = None
+    # The items of failed workers are re-queued on a separate queue, that is
+    # drained first, so that they are not queued after the end of input.
+    # The shared memory queue is used since it keeps the number of items in
+    # shared memory, hence it is not reported empty while an item is still
+    # being transferred.
+    self._retry_queue = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=self._RETRY_QUEUE_BUFFER_SIZE)
+    self._serialize_event_objects = False
     self._storage_writer_completed = False
     self._storage_writer_process = None
 
-    # TODO: turn into a process pool.
+    # Attributes for managing the worker processes.
+    self._enable_worker_scaling = False
+    self._hasher_names_string = None
+    self._last_worker_number = -1
+    self._last_worker_scaling_time = 0
+    self._maximum_number_of_worker_processes = self._WORKER_PROCESSES_MAXIMUM
+    self._parser_filter_string = None
+    self._path_spec_retries = {}
+    self._status_table = None
+    self._status_table_indexes = {}
+    self._stopping_worker_names = set()
+    self._worker_process_queues = {}
     self._worker_processes = {}
 
     # Attributes for the storage writer status RPC server.
@@ -176,6 +241,158 @@ class MultiProcessEngine(engine.BaseEngine):
           self._storage_writer_process.pid))
       self._storage_writer_process.terminate()
 
+  def _AllocateStatusTableIndex(self):
+    """Allocates a slot in the status table for a worker process.
+
+    Slots of worker processes that are no longer alive are reused when no
+    free slot is available.
+
+    Returns:
+      The index of the slot or None if no slot is available.
+    """
+    if not self._status_table:
+      return
+
+    allocated_indexes = set(self._status_table_indexes.values())
+    if len(allocated_indexes) >= self._status_table.number_of_slots:
+      for worker_name, status_table_index in list(
+          self._status_table_indexes.items()):
+        worker_process = self._worker_processes.get(worker_name, None)
+        if not worker_process or not worker_process.is_alive():
+          del self._status_table_indexes[worker_name]
+          allocated_indexes.remove(status_table_index)
+
+    for status_table_index in range(0, self._status_table.number_of_slots):
+      if status_table_index not in allocated_indexes:
+        self._status_table.ClearSlot(status_table_index)
+        return status_table_index
+
+  def _RemoveParseCache(self):
+    """Removes the parse cache directory shared by the worker processes."""
+    if self._parse_cache_path:
+      shutil.rmtree(self._parse_cache_path, ignore_errors=True)
+      self._parse_cache_path = None
+
+  def _ReplaceFailedWorkerProcesses(self):
+    """Replaces the worker processes that the foreman marked as failed.
+
+    The path specifications a failed worker was processing, or of which not
+    all event objects were stored, are re-queued, unless they already caused
+    the maximum number of failures.
+    """
+    for process_label in self._foreman_object.PopFailedProcessLabels():
+      worker_name = process_label.label
+      worker_process = self._worker_processes.get(worker_name, None)
+      if not worker_process:
+        continue
+
+      if worker_process.is_alive():
+        self._TerminateWorkerProcess(worker_name, worker_process)
+      worker_process.join(timeout=self._PROCESS_JOIN_TIMEOUT)
+
+      # A worker that exited normally before the foreman retrieved its status
+      # is left to be cleaned up when the processes are stopped.
+      if worker_process.exitcode == 0:
+        continue
+
+      del self._worker_processes[worker_name]
+      process_queue = self._worker_process_queues.pop(worker_name)
+      self._status_table_indexes.pop(worker_name, None)
+
+      number_of_requeued_path_specs = 0
+      for retry_item in process_queue.GetInFlightItems():
+        if self._RequeuePathSpec(
+            retry_item.item,
+            number_of_skipped_events=retry_item.number_of_skipped_events):
+          number_of_requeued_path_specs += 1
+
+      # A worker that was stopping is only replaced to process the re-queued
+      # path specifications, since the other workers could have stopped.
+      if worker_name in self._stopping_worker_names:
+        self._stopping_worker_names.remove(worker_name)
+        if not number_of_requeued_path_specs:
+          continue
+
+      new_worker_name = self._StartWorkerProcess()
+      logging.warning(u'Replaced failed worker: {0:s} with: {1:s}'.format(
+          worker_name, new_worker_name))
+
+  def _RequeuePathSpec(self, path_spec, number_of_skipped_events=0):
+    """Re-queues a path specification of a failed worker.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec).
+      number_of_skipped_events: optional number of event objects of the path
+                                specification that were already pushed onto
+                                the storage queue. The default is 0.
+
+    Returns:
+      A boolean value indicating the path specification was re-queued.
+    """
+    comparable = path_spec.comparable
+    number_of_retries = self._path_spec_retries.get(comparable, 0)
+    if number_of_retries >= self._PATH_SPEC_MAXIMUM_NUMBER_OF_RETRIES:
+      logging.error((
+          u'Skipping path specification that failed {0:d} times:\n'
+          u'{1:s}').format(number_of_retries + 1, comparable))
+      return False
+
+    self._path_spec_retries[comparable] = number_of_retries + 1
+
+    logging.warning(u'Re-queueing path specification:\n{0:s}'.format(
+        comparable))
+    self._retry_queue.PushItem(MultiProcessingRetryItem(
+        path_spec, number_of_skipped_events=number_of_skipped_events))
+    return True
+
+  def _ScaleWorkerProcesses(self):
+    """Scales the number of worker processes.
+
+    The decision is based on the number of queued path specifications and
+    the average CPU usage of the worker processes since the previous decision.
+    A worker that is stopped first finishes the path specification it is
+    processing.
+    """
+    timestamp = time.time()
+    if (timestamp - self._last_worker_scaling_time <
+        self._WORKER_PROCESSES_SCALING_INTERVAL):
+      return
+
+    self._last_worker_scaling_time = timestamp
+
+    number_of_queued_items = self._collection_queue.GetNumberOfItems()
+    cpu_percent = self._foreman_object.GetAverageCPUPercent()
+    if number_of_queued_items is None or cpu_percent is None:
+      return
+
+    worker_names = sorted([
+        worker_name
+        for worker_name, worker_process in self._worker_processes.iteritems()
+        if worker_name not in self._stopping_worker_names and
+        worker_process.is_alive()])
+    number_of_workers = len(worker_names)
+
+    if (cpu_percent >= self._WORKER_PROCESSES_SCALE_UP_CPU_PERCENT and
+        number_of_queued_items > (
+            number_of_workers *
+            self._WORKER_PROCESSES_SCALE_UP_QUEUED_ITEMS) and
+        number_of_workers < self._maximum_number_of_worker_processes):
+      worker_name = self._StartWorkerProcess()
+      logging.info((
+          u'Started worker: {0:s} with {1:d} queued items and average CPU '
+          u'usage: {2:.1f}%').format(
+              worker_name, number_of_queued_items, cpu_percent))
+
+    elif (cpu_percent < self._WORKER_PROCESSES_SCALE_DOWN_CPU_PERCENT and
+          number_of_workers > self._WORKER_PROCESSES_MINIMUM):
+      worker_name = worker_names[-1]
+      self._worker_process_queues[worker_name].SignalStop()
+      self._stopping_worker_names.add(worker_name)
+      logging.info((
+          u'Stopping worker: {0:s} with {1:d} queued items and average CPU '
+          u'usage: {2:.1f}%').format(
+              worker_name, number_of_queued_items, cpu_percent))
+
   def _SignalEndOfInput(self):
     """Signals the engine the storage writer received an end of input signal."""
     self._foreman_object.SignalEndOfProcessing()
@@ -202,6 +419,52 @@ class MultiProcessEngine(engine.BaseEngine):
 
     self._storage_writer_status_rpc_port_number = port
 
+  def _StartWorkerProcess(self):
+    """Starts a worker process.
+
+    Returns:
+      The name of the worker process.
+    """
+    self._last_worker_number += 1
+    worker_number = self._last_worker_number
+
+    # Every worker pops path specifications from the collection queue
+    # through its own worker queue, which keeps track of the path
+    # specifications of which the worker did not push all event objects.
+    event_queue_producer = MultiProcessingWorkerEventQueueProducer(
+        self.storage_queue)
+    process_queue = MultiProcessingWorkerQueue(
+        self._collection_queue, retry_queue=self._retry_queue,
+        event_queue_producer=event_queue_producer)
+    extraction_worker = self.CreateExtractionWorker(
+        worker_number, event_queue_producer=event_queue_producer,
+        process_queue=process_queue)
+
+    worker_name = u'Worker_{0:d}'.format(worker_number)
+
+    # A worker without a slot in the status table reports its status via RPC.
+    status_table_index = self._AllocateStatusTableIndex()
+    if self._status_table and status_table_index is None:
+      logging.warning(
+          u'No status table slot available for worker: {0:s}'.format(
+              worker_name))
+
+    worker_process = MultiProcessEventExtractionWorkerProcess(
+        extraction_worker, self._parser_filter_string,
+        self._hasher_names_string, status_table=self._status_table,
+        status_table_index=status_table_index, name=worker_name)
+    worker_process.start()
+
+    self._foreman_object.MonitorWorker(
+        pid=worker_process.pid, name=worker_name,
+        status_table_index=status_table_index)
+    if status_table_index is not None:
+      self._status_table_indexes[worker_name] = status_table_index
+    self._worker_process_queues[worker_name] = process_queue
+    self._worker_processes[worker_name] = worker_process
+
+    return worker_name
+
   def _StopStorageWriterStatusRPCServer(self):
     """Stops the storage writer status RPC server."""
     if self._storage_writer_status_rpc_server:
@@ -253,30 +516,51 @@ class MultiProcessEngine(engine.BaseEngine):
 
     return collector_object
 
-  def CreateExtractionWorker(self, worker_number):
+  def CreateExtractionWorker(
+      self, worker_number, event_queue_producer=None, process_queue=None):
     """Creates an extraction worker object.
 
     Args:
       worker_number: A number that identifies the worker.
+      event_queue_producer: Optional event object queue producer (instance of
+                            ItemQueueProducer) of the worker. The default is
+                            None, which represents the producer of the engine.
+      process_queue: Optional process queue (instance of Queue) the worker
+                     pops the path specifications from. The default is None,
+                     which represents the collection queue.
 
     Returns:
       An extraction worker (instance of worker.ExtractionWorker).
     """
+    if event_queue_producer is None:
+      event_queue_producer = self._event_queue_producer
+
     parser_mediator = parsers_mediator.ParserMediator(
-        self._event_queue_producer, self._parse_error_queue_producer,
+        event_queue_producer, self._parse_error_queue_producer,
         self.knowledge_base)
 
+    if self._serialize_event_objects:
+      parser_mediator.SetEventObjectSerializer(
+          protobuf_serializer.ProtobufEventObjectSerializer)
+
     # We need a resolver context per process to prevent multi processing
     # issues with file objects stored in images.
     resolver_context = context.Context()
 
+    if process_queue is None:
+      process_queue = self._collection_queue
+
     extraction_worker = worker.BaseEventExtractionWorker(
-        worker_number, self._collection_queue, self._event_queue_producer,
+        worker_number, process_queue, event_queue_producer,
         self._parse_error_queue_producer, parser_mediator,
         resolver_context=resolver_context)
 
     extraction_worker.SetEnableDebugOutput(self._enable_debug_output)
 
+    if self._enable_parse_cache:
+      extraction_worker.SetEnableParseCache(
+          self._enable_parse_cache, parse_cache_path=self._parse_cache_path)
+
     extraction_worker.SetEnableProfiling(
         self._enable_profiling,
         profiling_sample_rate=self._profiling_sample_rate,
@@ -299,7 +583,7 @@ class MultiProcessEngine(engine.BaseEngine):
   def ProcessSource(
       self, collector_object, storage_writer, parser_filter_string=None,
       hasher_names_string=None, number_of_extraction_workers=0,
-      show_memory_usage=False):
+      show_memory_usage=False, worker_timeout=None):
     """Processes the source and extracts event objects.
 
     Args:
@@ -314,7 +598,12 @@ class MultiProcessEngine(engine.BaseEngine):
                                     number.
       show_memory_usage: Optional boolean value to indicate memory information
                          should be included in logging. The default is False.
+      worker_timeout: Optional number of seconds a worker can run without
+                      making progress before it is considered hung. The
+                      default is None, which represents the default of
+                      the foreman.
     """
+    self._enable_worker_scaling = False
     if number_of_extraction_workers < 1:
       # One worker for each "available" CPU (minus other processes).
       # The number here is derived from the fact that the engine starts up:
@@ -334,8 +623,30 @@ class MultiProcessEngine(engine.BaseEngine):
 
       number_of_extraction_workers = cpu_count
 
+      # The number of workers is only scaled if it was determined
+      # automatically, where the initial number is the maximum.
+      self._enable_worker_scaling = True
+      self._maximum_number_of_worker_processes = cpu_count
+
+    self._hasher_names_string = hasher_names_string
+    self._parser_filter_string = parser_filter_string
+
+    # The worker processes share the parse cache through a directory, so that
+    # an unchanged file in another VSS store is not parsed again, regardless
+    # of which worker process parsed it.
+    if self._enable_parse_cache:
+      self._parse_cache_path = tempfile.mkdtemp(prefix=u'plaso-parse-cache-')
+
+    # The status table has additional slots for the workers that are
+    # started while replaced or stopped workers did not exit yet.
+    number_of_slots = 2 * max(
+        number_of_extraction_workers, self._maximum_number_of_worker_processes)
+    self._status_table = status_table.ProcessStatusTable(number_of_slots)
+    self._status_table_indexes = {}
+
     self._foreman_object = foreman.Foreman(
-        self._event_queue_producer, show_memory_usage=show_memory_usage)
+        self._event_queue_producer, show_memory_usage=show_memory_usage,
+        status_table=self._status_table, worker_timeout=worker_timeout)
     self._StartStorageWriterStatusRPCServer()
 
     logging.info(u'Starting processes.')
@@ -344,20 +655,8 @@ class MultiProcessEngine(engine.BaseEngine):
         name='StorageWriter')
     self._storage_writer_process.start()
 
-    for worker_number in range(number_of_extraction_workers):
-      extraction_worker = self.CreateExtractionWorker(worker_number)
-
-      worker_name = u'Worker_{0:d}'.format(worker_number)
-
-      # TODO: Test to see if a process pool can be a better choice.
-      worker_process = MultiProcessEventExtractionWorkerProcess(
-          extraction_worker, parser_filter_string, hasher_names_string,
-          name=worker_name)
-      worker_process.start()
-
-      self._foreman_object.MonitorWorker(
-          pid=worker_process.pid, name=worker_name)
-      self._worker_processes[worker_name] = worker_process
+    for _ in range(number_of_extraction_workers):
+      self._StartWorkerProcess()
 
     self._collection_process = MultiProcessCollectionProcess(
         collector_object, name='Collector')
@@ -365,13 +664,20 @@ class MultiProcessEngine(engine.BaseEngine):
 
     logging.debug(u'Processing started.')
 
+    self._last_worker_scaling_time = time.time()
+
     time.sleep(self._FOREMAN_CHECK_SLEEP)
     while not self._foreman_object.CheckStatus():
+      self._ReplaceFailedWorkerProcesses()
+      if self._enable_worker_scaling:
+        self._ScaleWorkerProcesses()
+
       time.sleep(self._FOREMAN_CHECK_SLEEP)
 
     logging.info(u'Processing stopped.')
 
     self._StopProcesses()
+    self._RemoveParseCache()
 
   def _CheckWorkerProcess(self, worker_name, worker_process):
     """Checks the worker process and terminates it if necessary.
@@ -426,15 +732,7 @@ class MultiProcessEngine(engine.BaseEngine):
             u'{2:d}.').format(
                 worker_name, worker_process.pid, worker_process.exitcode))
 
-      logging.warning(u'Terminating worker process: {0:s} (PID: {1:d})'.format(
-          worker_name, worker_process.pid))
-      worker_process.terminate()
-      time.sleep(self._PROCESS_TERMINATION_SLEEP)
-
-      if worker_process.is_alive():
-        logging.warning(u'Killing worker process: {0:s} (PID: {1:d})'.format(
-            worker_name, worker_process.pid))
-        SigKill(worker_process.pid)
+      self._TerminateWorkerProcess(worker_name, worker_process)
 
     else:
       logging.info(u'Worker: {0:s} (PID: {1:d}) has completed.'.format(
@@ -442,6 +740,28 @@ class MultiProcessEngine(engine.BaseEngine):
 
     # Remove the worker process from the list of active workers.
     del self._worker_processes[worker_name]
+    if worker_name in self._worker_process_queues:
+      del self._worker_process_queues[worker_name]
+    if worker_name in self._status_table_indexes:
+      del self._status_table_indexes[worker_name]
+
+  def _TerminateWorkerProcess(self, worker_name, worker_process):
+    """Terminates a worker process and kills it if necessary.
+
+    Args:
+      worker_name: the string identifying the worker process.
+      worker_process: the worker process object (instance of
+                      EventExtractionWorkerProcess).
+    """
+    logging.warning(u'Terminating worker process: {0:s} (PID: {1:d})'.format(
+        worker_name, worker_process.pid))
+    worker_process.terminate()
+    time.sleep(self._PROCESS_TERMINATION_SLEEP)
+
+    if worker_process.is_alive():
+      logging.warning(u'Killing worker process: {0:s} (PID: {1:d})'.format(
+          worker_name, worker_process.pid))
+      SigKill(worker_process.pid)
 
   def _StopProcesses(self):
     """Stops the processes."""
@@ -485,6 +805,17 @@ class MultiProcessEngine(engine.BaseEngine):
 
     self._StopStorageWriterStatusRPCServer()
 
+  def SetSerializeEventObjects(self, serialize_event_objects):
+    """Sets the serialize event objects mode.
+
+    Args:
+      serialize_event_objects: boolean value to indicate if the extraction
+                               workers should serialize the event objects
+                               into protobufs before they are produced onto
+                               the storage queue.
+    """
+    self._serialize_event_objects = serialize_event_objects
+
   def SignalAbort(self):
     """Signals the engine to abort."""
     super(MultiProcessEngine, self).SignalAbort()
@@ -495,6 +826,8 @@ class MultiProcessEngine(engine.BaseEngine):
     except KeyboardInterrupt:
       self._AbortKill()
 
+    self._RemoveParseCache()
+
     # TODO: remove the need for this.
     # Sometimes the main process will be unresponsive.
     SigKill(os.getpid())
@@ -536,7 +869,8 @@ class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
   """Class that defines a multi-processing event extraction worker process."""
 
   def __init__(self, extraction_worker, parser_filter_string,
-               hasher_names_string, **kwargs):
+               hasher_names_string, status_table=None,
+               status_table_index=None, **kwargs):
     """Initializes the process object.
 
     Args:
@@ -545,6 +879,12 @@ class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
       parser_filter_string: The parser filter string.
       hasher_names_string: Optional comma separated string of names of
                            hashers to enable enable. The default is None.
+      status_table: Optional process status table (instance of
+                    ProcessStatusTable). The default is None.
+      status_table_index: Optional index of the slot in the status table
+                          the worker writes its status into. The default
+                          is None, which represents the status is reported
+                          via a RPC server.
     """
     super(MultiProcessEventExtractionWorkerProcess, self).__init__(**kwargs)
     self._extraction_worker = extraction_worker
@@ -556,6 +896,13 @@ class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
 
     self._rpc_server = None
     self._status_is_running = False
+    self._status_pid = None
+    self._status_table = None
+    self._status_table_index = None
+
+    if status_table and status_table_index is not None:
+      self._status_table = status_table
+      self._status_table_index = status_table_index
 
   def _GetStatus(self):
     """Returns a status dictionary."""
@@ -563,6 +910,15 @@ class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
     self._status_is_running = status.get(u'is_running', False)
     return status
 
+  def _UpdateStatus(self, status_dict):
+    """Writes the status into the status table.
+
+    Args:
+      status_dict: the status dictionary of the extraction worker.
+    """
+    self._status_table.UpdateStatus(
+        self._status_table_index, self._status_pid, status_dict)
+
   def _StartProcessStatusRPCServer(self):
     """Starts the process status RPC server."""
     if self._rpc_server:
@@ -626,7 +982,14 @@ class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
       self._extraction_worker.SetHashers(self._hasher_names_string)
 
     logging.debug(u'Worker process: {0!s} started'.format(self._name))
-    self._StartProcessStatusRPCServer()
+
+    # The status table is updated by the worker itself, which is cheaper
+    # than a RPC server thread that is polled by the foreman.
+    if self._status_table:
+      self._status_pid = os.getpid()
+      self._extraction_worker.SetStatusCallback(self._UpdateStatus)
+    else:
+      self._StartProcessStatusRPCServer()
 
     # We need to set this explictily to True if the workers complete
     # before the foreman is able to determine the status of the worker
@@ -730,6 +1093,18 @@ class MultiProcessingQueue(queue.Queue):
     # This queue appears not to be FIFO.
     self._queue = multiprocessing.Queue(maxsize=maximum_number_of_queued_items)
 
+  def GetNumberOfItems(self):
+    """Retrieves the number of items on the queue.
+
+    Returns:
+      The approximate number of items or None if not supported by
+      the platform.
+    """
+    try:
+      return self._queue.qsize()
+    except NotImplementedError:
+      return
+
   def IsEmpty(self):
     """Determines if the queue is empty."""
     return self._queue.empty()
@@ -749,3 +1124,310 @@ class MultiProcessingQueue(queue.Queue):
       return self._queue.get(timeout=self._QUEUE_WAIT_TIMEOUT)
     except (KeyboardInterrupt, Queue.Empty):
       raise errors.QueueEmpty
+
+
+class MultiProcessingRetryItem(object):
+  """Class that defines an item that is re-queued after its worker failed.
+
+  Attributes:
+    item: the item object.
+    number_of_skipped_events: the number of event objects of the item that
+                              were already pushed onto the storage queue and
+                              are skipped when the item is processed again.
+  """
+
+  def __init__(self, item, number_of_skipped_events=0):
+    """Initializes the retry item object.
+
+    Args:
+      item: the item object.
+      number_of_skipped_events: optional number of event objects of the item
+                                that were already pushed onto the storage
+                                queue. The default is 0.
+    """
+    super(MultiProcessingRetryItem, self).__init__()
+    self.item = item
+    self.number_of_skipped_events = number_of_skipped_events
+
+
+class MultiProcessingWorkerEventQueueProducer(queue.BatchItemQueueProducer):
+  """Class that defines the event queue producer of a single worker process.
+
+  The producer keeps the number of items it pushed onto the queue in shared
+  memory, which allows the engine to determine which event objects of
+  a failed worker process were stored. Note that the multiprocessing queue
+  sends the items from a feeder thread, hence items that were not sent yet
+  when the worker process crashed are lost.
+  """
+
+  def __init__(self, queue_object):
+    """Initializes the queue producer.
+
+    Args:
+      queue_object: the queue object (instance of Queue).
+    """
+    super(MultiProcessingWorkerEventQueueProducer, self).__init__(queue_object)
+    self._number_of_items_to_skip = 0
+    self._number_of_pushed_items = multiprocessing.RawValue(ctypes.c_uint64, 0)
+
+  @property
+  def number_of_produced_items(self):
+    """The number of items produced, excluding the skipped items."""
+    return self._number_of_pushed_items.value + len(self._batch)
+
+  @property
+  def number_of_pushed_items(self):
+    """The number of items pushed onto the queue."""
+    return self._number_of_pushed_items.value
+
+  def Flush(self):
+    """Flushes the items buffered by the producer onto the queue."""
+    number_of_items = len(self._batch)
+    super(MultiProcessingWorkerEventQueueProducer, self).Flush()
+
+    # The number is updated after the items were pushed so that a worker
+    # process that is terminated in between stores the items twice instead
+    # of not at all.
+    self._number_of_pushed_items.value += number_of_items
+
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+    Args:
+      item: the item object.
+    """
+    if self._number_of_items_to_skip:
+      self._number_of_items_to_skip -= 1
+      return
+
+    super(MultiProcessingWorkerEventQueueProducer, self).ProduceItem(item)
+
+  def SkipItems(self, number_of_items):
+    """Skips the next items that are produced.
+
+    Args:
+      number_of_items: the number of items to skip.
+    """
+    self._number_of_items_to_skip = number_of_items
+
+
+class MultiProcessingWorkerQueue(queue.Queue):
+  """Class that defines the queue of a single worker process.
+
+  The worker queue wraps the collection queue and keeps track of the items
+  the worker process popped of which not all event objects were pushed onto
+  the storage queue, in shared memory. This allows the engine to re-queue
+  these items, with the number of event objects to skip, if the worker
+  process fails. Re-queued items are popped from the retry queue before
+  the items of the collection queue. The engine can also signal the worker
+  process to stop after it has processed its current item.
+  """
+
+  # The maximum size of the pickled items that can be kept track of.
+  _MAXIMUM_ITEM_DATA_SIZE = 64 * 1024
+
+  def __init__(self, queue_object, retry_queue=None, event_queue_producer=None):
+    """Initializes the worker queue object.
+
+    Args:
+      queue_object: the queue object (instance of Queue) that is wrapped.
+      retry_queue: optional queue object (instance of Queue) that contains
+                   the re-queued items (instances of MultiProcessingRetryItem).
+                   The default is None.
+      event_queue_producer: optional event queue producer of the worker process
+                            (instance of
+                            MultiProcessingWorkerEventQueueProducer). The
+                            default is None, which represents an item is
+                            processed when the next item is popped.
+    """
+    super(MultiProcessingWorkerQueue, self).__init__()
+    self._event_queue_producer = event_queue_producer
+    self._in_flight_items = []
+    self._item_data = multiprocessing.RawArray(
+        ctypes.c_char, self._MAXIMUM_ITEM_DATA_SIZE)
+    self._item_data_size = multiprocessing.RawValue(ctypes.c_uint32, 0)
+    self._queue = queue_object
+    self._retry_queue = retry_queue
+    self._stop = multiprocessing.RawValue(ctypes.c_bool, False)
+
+  def _GetEventNumbers(self):
+    """Retrieves the event numbers of the event queue producer.
+
+    Returns:
+      A tuple of the number of event objects produced and the number of
+      event objects pushed onto the storage queue.
+    """
+    if not self._event_queue_producer:
+      return 0, 0
+
+    return (
+        self._event_queue_producer.number_of_produced_items,
+        self._event_queue_producer.number_of_pushed_items)
+
+  def _PopRetryItem(self):
+    """Pops a re-queued item off the retry queue.
+
+    Returns:
+      A retry item (instance of MultiProcessingRetryItem) or None if
+      the retry queue is empty.
+    """
+    if not self._retry_queue or self._retry_queue.IsEmpty():
+      return
+
+    try:
+      return self._retry_queue.PopItem()
+    except errors.QueueEmpty:
+      # Another worker process popped the item first.
+      return
+
+  def _SetInFlightItems(self, in_flight_items):
+    """Sets the items of which not all event objects were pushed.
+
+    Args:
+      in_flight_items: a list of tuples of the item object, the number of
+                       event objects produced before the item and the number
+                       of event objects of the item that are skipped.
+
+    Returns:
+      A boolean value indicating the items were set.
+    """
+    # The size is set last so that a worker process that is terminated
+    # while writing does not leave partial items.
+    self._item_data_size.value = 0
+
+    item_data = cPickle.dumps(in_flight_items, cPickle.HIGHEST_PROTOCOL)
+    item_data_size = len(item_data)
+    if item_data_size > self._MAXIMUM_ITEM_DATA_SIZE:
+      return False
+
+    ctypes.memmove(self._item_data, item_data, item_data_size)
+    self._item_data_size.value = item_data_size
+    return True
+
+  def _UpdateInFlightItems(self, item, number_of_skipped_events):
+    """Updates the items of which not all event objects were pushed.
+
+    Args:
+      item: the item object that was popped.
+      number_of_skipped_events: the number of event objects of the item
+                                that are skipped.
+    """
+    number_of_produced_events, number_of_pushed_events = (
+        self._GetEventNumbers())
+
+    # The items popped before are processed and are only kept track of
+    # while some of their event objects were not pushed.
+    end_event_numbers = [
+        first_event_number
+        for _, first_event_number, _ in self._in_flight_items[1:]]
+    end_event_numbers.append(number_of_produced_events)
+
+    in_flight_items = [
+        in_flight_item
+        for in_flight_item, end_event_number in zip(
+            self._in_flight_items, end_event_numbers)
+        if end_event_number > max(in_flight_item[1], number_of_pushed_events)]
+    in_flight_items.append(
+        (item, number_of_produced_events, number_of_skipped_events))
+
+    if not self._SetInFlightItems(in_flight_items):
+      # Push the event objects of the previous items so that only the popped
+      # item needs to be kept track of.
+      if self._event_queue_producer:
+        self._event_queue_producer.Flush()
+      in_flight_items = in_flight_items[-1:]
+
+      if not self._SetInFlightItems(in_flight_items):
+        logging.warning(u'Unable to keep track of item.')
+
+    self._in_flight_items = in_flight_items
+
+  def GetInFlightItems(self):
+    """Retrieves the items of which not all event objects were pushed.
+
+    Returns:
+      A list of retry items (instances of MultiProcessingRetryItem) that
+      contain the items the worker process is processing, or of which it
+      buffered event objects, in the order they were popped.
+    """
+    item_data_size = self._item_data_size.value
+    if not item_data_size:
+      return []
+
+    item_data = ctypes.string_at(self._item_data, item_data_size)
+    in_flight_items = cPickle.loads(item_data)
+
+    _, number_of_pushed_events = self._GetEventNumbers()
+
+    retry_items = []
+    for index, in_flight_item in enumerate(in_flight_items):
+      item, first_event_number, number_of_skipped_events = in_flight_item
+      if index + 1 < len(in_flight_items):
+        end_event_number = in_flight_items[index + 1][1]
+        if end_event_number <= max(first_event_number, number_of_pushed_events):
+          continue
+
+      number_of_skipped_events += max(
+          0, number_of_pushed_events - first_event_number)
+      retry_items.append(MultiProcessingRetryItem(
+          item, number_of_skipped_events=number_of_skipped_events))
+
+    return retry_items
+
+  def GetNumberOfItems(self):
+    """Retrieves the number of items on the queue.
+
+    Returns:
+      The number of items or None if not supported by the queue.
+    """
+    number_of_items = self._queue.GetNumberOfItems()
+    if number_of_items is not None and self._retry_queue:
+      number_of_retry_items = self._retry_queue.GetNumberOfItems()
+      if number_of_retry_items is not None:
+        number_of_items += number_of_retry_items
+    return number_of_items
+
+  def IsEmpty(self):
+    """Determines if the queue is empty."""
+    if self._retry_queue and not self._retry_queue.IsEmpty():
+      return False
+    return self._queue.IsEmpty()
+
+  def PopItem(self):
+    """Pops an item off the queue.
+
+    The items that were previously popped are considered processed.
+
+    Raises:
+      QueueEmpty: when the queue is empty or the worker process was
+                  signalled to stop.
+    """
+    if self._stop.value:
+      raise errors.QueueEmpty
+
+    number_of_skipped_events = 0
+    item = self._PopRetryItem()
+    if item:
+      number_of_skipped_events = item.number_of_skipped_events
+      item = item.item
+    else:
+      item = self._queue.PopItem()
+
+    if isinstance(item, queue.QueueEndOfInput):
+      return item
+
+    # The event objects of the item that were already pushed onto the storage
+    # queue by a failed worker process are not produced again.
+    if self._event_queue_producer:
+      self._event_queue_producer.SkipItems(number_of_skipped_events)
+
+    self._UpdateInFlightItems(item, number_of_skipped_events)
+    return item
+
+  def PushItem(self, item):
+    """Pushes an item onto the queue."""
+    self._queue.PushItem(item)
+
+  def SignalStop(self):
+    """Signals the worker process to stop after processing its current item."""
+    self._stop.value = True
@@ -2,10 +2,175 @@
 # -*- coding: utf-8 -*-
 """Tests the multi-process processing engine."""
 
+import cPickle
+import multiprocessing
+import os
+import tempfile
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.engine import queue
+from plaso.engine import single_process
 from plaso.engine import test_lib
+from plaso.lib import definitions
+from plaso.lib import errors
 from plaso.multi_processing import multi_process
+from plaso.multi_processing import shared_memory_queue
+
+
+class TestPathSpec(object):
+  """Class that implements a path specification for testing."""
+
+  def __init__(self, location):
+    """Initializes the path specification object.
+
+    Args:
+      location: the location of the file.
+    """
+    super(TestPathSpec, self).__init__()
+    self.comparable = u'location: {0:s}\n'.format(location)
+
+  def __eq__(self, other):
+    """Determines if the path specification is equal to the other."""
+    return self.comparable == getattr(other, u'comparable', None)
+
+
+def _ExtractEventObjects(test_engine, worker_number, path_spec, result_queue):
+  """Extracts the event objects of a file entry with an extraction worker.
+
+  Args:
+    test_engine: the multi-process engine (instance of MultiProcessEngine).
+    worker_number: a number that identifies the worker.
+    path_spec: the path specification of the file entry.
+    result_queue: the queue (instance of Queue) to push the number of
+                  extracted event objects onto.
+  """
+  process_queue = single_process.SingleProcessQueue()
+  process_queue.PushItem(path_spec)
+  process_queue.SignalEndOfInput()
+
+  storage_queue = single_process.SingleProcessQueue()
+  event_queue_producer = single_process.SingleProcessItemQueueProducer(
+      storage_queue)
+
+  extraction_worker = test_engine.CreateExtractionWorker(
+      worker_number, event_queue_producer=event_queue_producer,
+      process_queue=process_queue)
+  extraction_worker.InitializeParserObjects(parser_filter_string=u'syslog')
+  extraction_worker.Run()
+
+  result_queue.PushItem(storage_queue.GetNumberOfItems())
+
+
+class MultiProcessEngineTest(test_lib.EngineTestCase):
+  """Tests the multi-process engine."""
+
+  def _RunExtractionWorkerProcess(self, test_engine, worker_number, path_spec):
+    """Extracts the event objects of a file entry in a worker process.
+
+    Args:
+      test_engine: the multi-process engine (instance of MultiProcessEngine).
+      worker_number: a number that identifies the worker.
+      path_spec: the path specification of the file entry.
+
+    Returns:
+      The number of extracted event objects.
+    """
+    result_queue = multi_process.MultiProcessingQueue()
+    worker_process = multiprocessing.Process(
+        target=_ExtractEventObjects,
+        args=(test_engine, worker_number, path_spec, result_queue))
+    worker_process.start()
+    number_of_event_objects = result_queue.PopItem()
+    worker_process.join()
+
+    self.assertEqual(worker_process.exitcode, 0)
+    return number_of_event_objects
+
+  def testInitialize(self):
+    """Tests the initialization with the different queue types."""
+    test_engine = multi_process.MultiProcessEngine(
+        queue_type=definitions.QUEUE_TYPE_SHARED_MEMORY)
+    self.assertIsInstance(
+        test_engine.storage_queue, shared_memory_queue.SharedMemoryQueue)
+
+    test_engine = multi_process.MultiProcessEngine()
+    self.assertIsInstance(
+        test_engine.storage_queue, multi_process.MultiProcessingQueue)
+
+    with self.assertRaises(ValueError):
+      multi_process.MultiProcessEngine(queue_type=u'bogus')
+
+  def testParseCache(self):
+    """Tests the parse cache shared by the worker processes."""
+    test_engine = multi_process.MultiProcessEngine()
+    test_engine.SetEnableParseCache(True)
+
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+
+    # pylint: disable=protected-access
+    test_engine._parse_cache_path = tempfile.mkdtemp()
+    try:
+      number_of_event_objects = self._RunExtractionWorkerProcess(
+          test_engine, 0, path_spec)
+      self.assertEqual(number_of_event_objects, 13)
+
+      parse_cache_entry_names = os.listdir(test_engine._parse_cache_path)
+      self.assertEqual(len(parse_cache_entry_names), 1)
+
+      # Only keep part of the recorded events in the parse cache entry to
+      # show that the other worker process reuses them instead of parsing
+      # the file entry again.
+      parse_cache_entry_path = os.path.join(
+          test_engine._parse_cache_path, parse_cache_entry_names[0])
+      with open(parse_cache_entry_path, 'rb') as file_object:
+        parse_cache_entry = cPickle.load(file_object)
+
+      result, recorded_events = parse_cache_entry.parse_results[u'syslog']
+      parse_cache_entry.parse_results[u'syslog'] = (
+          result, recorded_events[:5])
+
+      with open(parse_cache_entry_path, 'wb') as file_object:
+        cPickle.dump(parse_cache_entry, file_object)
+
+      number_of_event_objects = self._RunExtractionWorkerProcess(
+          test_engine, 1, path_spec)
+      self.assertEqual(number_of_event_objects, 5)
+
+    finally:
+      test_engine._RemoveParseCache()
+
+    self.assertIsNone(test_engine._parse_cache_path)
+
+  def testRequeuePathSpec(self):
+    """Tests the _RequeuePathSpec function."""
+    test_engine = multi_process.MultiProcessEngine()
+    path_spec = TestPathSpec(u'/tmp/test.txt')
+
+    # pylint: disable=protected-access
+    test_engine._collection_queue.SignalEndOfInput()
+    self.assertTrue(test_engine._RequeuePathSpec(
+        path_spec, number_of_skipped_events=5))
+
+    # The path specification is popped before the end of input.
+    test_worker_queue = multi_process.MultiProcessingWorkerQueue(
+        test_engine._collection_queue, retry_queue=test_engine._retry_queue)
+    self.assertEqual(test_worker_queue.PopItem(), path_spec)
+
+    retry_items = test_worker_queue.GetInFlightItems()
+    self.assertEqual(len(retry_items), 1)
+    self.assertEqual(retry_items[0].number_of_skipped_events, 5)
+
+    item = test_worker_queue.PopItem()
+    self.assertIsInstance(item, queue.QueueEndOfInput)
+
+    # The path specification is skipped once it failed too many times.
+    self.assertFalse(test_engine._RequeuePathSpec(path_spec))
+    self.assertTrue(test_engine._retry_queue.IsEmpty())
 
 
 class MultiProcessingQueueTest(unittest.TestCase):
@@ -26,6 +191,186 @@ class MultiProcessingQueueTest(unittest.TestCase):
 
     self.assertEqual(test_queue_consumer.number_of_items, len(self._ITEMS))
 
+  def testProduceBatches(self):
+    """Tests producing and consuming batches of items."""
+    test_queue = multi_process.MultiProcessingQueue()
+    test_queue_producer = queue.BatchItemQueueProducer(
+        test_queue, maximum_batch_size=3)
+
+    test_queue_producer.ProduceItems(sorted(self._ITEMS))
+
+    # Only the first batch of 3 items is pushed onto the queue.
+    batch = test_queue.PopItem()
+    self.assertIsInstance(batch, queue.QueueItemBatch)
+    self.assertEqual(batch.items, [u'item1', u'item2', u'item3'])
+    self.assertTrue(test_queue.IsEmpty())
+
+    test_queue_producer.ProduceItem(u'item5')
+    test_queue_producer.SignalEndOfInput()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.items, [u'item4', u'item5'])
+
+  def testFlushExpired(self):
+    """Tests the FlushExpired function."""
+    test_queue = multi_process.MultiProcessingQueue()
+    test_queue_producer = queue.BatchItemQueueProducer(
+        test_queue, maximum_batch_time=60.0)
+
+    test_queue_producer.ProduceItem(u'item1')
+    test_queue_producer.FlushExpired()
+    self.assertTrue(test_queue.IsEmpty())
+
+    # Make the batch appear to have been buffered for longer than allowed.
+    test_queue_producer._batch_start_time -= 120.0
+    test_queue_producer.FlushExpired()
+
+    batch = test_queue.PopItem()
+    self.assertIsInstance(batch, queue.QueueItemBatch)
+    self.assertEqual(batch.items, [u'item1'])
+
+  def testProduceBroadcastBatches(self):
+    """Tests producing and consuming broadcast batches of items."""
+    test_queues = [
+        multi_process.MultiProcessingQueue(),
+        multi_process.MultiProcessingQueue(),
+        multi_process.MultiProcessingQueue()]
+    item_filters = [None, None, lambda item: item.endswith(u'2')]
+    test_queue_producer = queue.BroadcastItemQueueProducer(
+        test_queues, item_filters=item_filters, maximum_batch_size=3)
+
+    test_queue_producer.ProduceItems(sorted(self._ITEMS))
+
+    # The queues that receive the same items share the serialized batch.
+    first_batch = test_queues[0].PopItem()
+    second_batch = test_queues[1].PopItem()
+    self.assertIsInstance(first_batch, queue.SerializedQueueItemBatch)
+    self.assertEqual(
+        first_batch.serialized_items, second_batch.serialized_items)
+
+    batch = first_batch.GetQueueItemBatch()
+    self.assertEqual(batch.items, [u'item1', u'item2', u'item3'])
+
+    batch = test_queues[2].PopItem().GetQueueItemBatch()
+    self.assertEqual(batch.items, [u'item2'])
+
+    test_queue_producer.SignalEndOfInput()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queues[1])
+    test_queue_consumer.ConsumeItems()
+    self.assertEqual(test_queue_consumer.items, [u'item4'])
+
+    # Batches without items of interest are not pushed onto the queue.
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queues[2])
+    test_queue_consumer.ConsumeItems()
+    self.assertEqual(test_queue_consumer.items, [])
+
+
+class MultiProcessingWorkerQueueTest(unittest.TestCase):
+  """Tests the multi-processing worker queue."""
+
+  def _GetInFlightItems(self, worker_queue):
+    """Retrieves the in-flight items of a worker queue.
+
+    Args:
+      worker_queue: the worker queue (instance of MultiProcessingWorkerQueue).
+
+    Returns:
+      A list of tuples of the item and the number of skipped events.
+    """
+    return [
+        (retry_item.item, retry_item.number_of_skipped_events)
+        for retry_item in worker_queue.GetInFlightItems()]
+
+  def testPopItem(self):
+    """Tests the PopItem and GetInFlightItems functions."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue.PushItem(u'item1')
+    test_queue.PushItem(u'item2')
+    test_queue.SignalEndOfInput()
+
+    test_worker_queue = multi_process.MultiProcessingWorkerQueue(test_queue)
+    self.assertEqual(test_worker_queue.GetInFlightItems(), [])
+    self.assertEqual(test_worker_queue.GetNumberOfItems(), 3)
+
+    self.assertEqual(test_worker_queue.PopItem(), u'item1')
+    self.assertEqual(
+        self._GetInFlightItems(test_worker_queue), [(u'item1', 0)])
+
+    # The previous item is considered processed when the next one is popped.
+    self.assertEqual(test_worker_queue.PopItem(), u'item2')
+    self.assertEqual(
+        self._GetInFlightItems(test_worker_queue), [(u'item2', 0)])
+
+    item = test_worker_queue.PopItem()
+    self.assertIsInstance(item, queue.QueueEndOfInput)
+
+  def testPopItemWithEventQueueProducer(self):
+    """Tests the PopItem and GetInFlightItems functions with events."""
+    test_queue = single_process.SingleProcessQueue()
+    for item in [u'item1', u'item2', u'item3']:
+      test_queue.PushItem(item)
+
+    storage_queue = single_process.SingleProcessQueue()
+    event_queue_producer = (
+        multi_process.MultiProcessingWorkerEventQueueProducer(storage_queue))
+    test_worker_queue = multi_process.MultiProcessingWorkerQueue(
+        test_queue, event_queue_producer=event_queue_producer)
+
+    # The events of the first item are buffered by the producer.
+    self.assertEqual(test_worker_queue.PopItem(), u'item1')
+    event_queue_producer.ProduceItems([u'event1', u'event2'])
+
+    self.assertEqual(test_worker_queue.PopItem(), u'item2')
+    self.assertEqual(
+        self._GetInFlightItems(test_worker_queue),
+        [(u'item1', 0), (u'item2', 0)])
+
+    event_queue_producer.ProduceItem(u'event3')
+    event_queue_producer.Flush()
+    event_queue_producer.ProduceItem(u'event4')
+
+    # Only the last event of the second item was not pushed.
+    self.assertEqual(
+        self._GetInFlightItems(test_worker_queue), [(u'item2', 1)])
+
+    # The events that were already pushed are skipped when an item is
+    # processed again.
+    retry_queue = single_process.SingleProcessQueue()
+    retry_queue.PushItem(multi_process.MultiProcessingRetryItem(
+        u'item2', number_of_skipped_events=1))
+
+    storage_queue = single_process.SingleProcessQueue()
+    event_queue_producer = (
+        multi_process.MultiProcessingWorkerEventQueueProducer(storage_queue))
+    test_worker_queue = multi_process.MultiProcessingWorkerQueue(
+        test_queue, retry_queue=retry_queue,
+        event_queue_producer=event_queue_producer)
+
+    self.assertEqual(test_worker_queue.GetNumberOfItems(), 2)
+    self.assertEqual(test_worker_queue.PopItem(), u'item2')
+    event_queue_producer.ProduceItems([u'event3', u'event4'])
+    event_queue_producer.Flush()
+
+    self.assertEqual(storage_queue.PopItem().items, [u'event4'])
+    self.assertEqual(test_worker_queue.PopItem(), u'item3')
+
+  def testSignalStop(self):
+    """Tests the SignalStop function."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue.PushItem(u'item1')
+
+    test_worker_queue = multi_process.MultiProcessingWorkerQueue(test_queue)
+    test_worker_queue.SignalStop()
+
+    with self.assertRaises(errors.QueueEmpty):
+      test_worker_queue.PopItem()
+
+    # The items remain queued for the other workers.
+    self.assertFalse(test_queue.IsEmpty())
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -81,9 +81,16 @@ class ProcessInfo(object):
 
   @property
   def cpu_percent(self):
-    """Return back the percent of CPU processing this process consumes."""
+    """Return back the percent of CPU processing this process consumes.
+
+    The percentage is determined over the time since the previous call,
+    hence the first call returns 0.0.
+    """
     try:
-      return self._process.get_cpu_percent()
+      if self._psutil_pre_v2:
+        return self._process.get_cpu_percent(interval=None)
+      else:
+        return self._process.cpu_percent(interval=None)
     except psutil.NoSuchProcess:
       return
 
@@ -222,7 +229,13 @@ class ProcessInfo(object):
 
   def IsAlive(self):
     """Return a boolean value indicating if the process is alive or not."""
-    return self._process.is_running()
+    if not self._process.is_running():
+      return False
+
+    # A process that exited but was not yet reaped by its parent is still
+    # "running" according to psutil.
+    return self.status not in (
+        self.STATUS_DEAD, self.STATUS_EXITED, self.STATUS_ZOMBIE)
 
   def TerminateProcess(self):
     """Terminate the process."""
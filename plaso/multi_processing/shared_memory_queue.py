@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""The shared memory ring buffer queue.
+
+The queue stores the items as length prefixed pickled records in a ring
+buffer in shared memory. Contrary to the multiprocessing.Queue no feeder
+thread and pipe are involved, a producer copies the record into the shared
+memory and a consumer copies it out, which preserves the FIFO order of
+the items.
+"""
+
+import cPickle
+import itertools
+import logging
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+
+from plaso.engine import queue
+from plaso.lib import errors
+
+
+class SharedMemoryQueue(queue.Queue):
+  """Class that defines the shared memory ring buffer queue.
+
+  The queue can be used by multiple producer and consumer processes that are
+  started after the queue was created. The shared memory is an anonymous
+  mmap that is inherited by the processes on fork or on Windows reopened
+  by its tag name.
+
+  The shared memory starts with the state of the queue, followed by the
+  ring buffer. The state contains the read and write offsets, which are
+  the total number of bytes read from and written to the ring buffer,
+  the number of items in the queue and the number of processes waiting
+  on the queue.
+  """
+
+  # The default buffer size, which is 32 MiB.
+  _DEFAULT_BUFFER_SIZE = 32 * 1024 * 1024
+
+  _QUEUE_WAIT_TIMEOUT = 5
+
+  _RECORD_HEADER = struct.Struct(u'<I')
+
+  _STATE = struct.Struct(u'<QQQQQ')
+
+  # The indexes of the number of waiting processes in the state.
+  _STATE_WAITING_CONSUMERS = 3
+  _STATE_WAITING_PRODUCERS = 4
+
+  _TAG_NAME_COUNTER = itertools.count()
+
+  def __init__(self, buffer_size=None, maximum_number_of_queued_items=0):
+    """Initializes the shared memory queue object.
+
+    Args:
+      buffer_size: optional size of the ring buffer in bytes. The default
+                   is None, which represents 32 MiB.
+      maximum_number_of_queued_items: optional maximum number of queued items.
+                                      The default is 0, which represents
+                                      no limit other than the buffer size.
+
+    Raises:
+      ValueError: if the buffer size is too small.
+    """
+    super(SharedMemoryQueue, self).__init__()
+    if buffer_size is None:
+      buffer_size = self._DEFAULT_BUFFER_SIZE
+
+    if buffer_size <= self._RECORD_HEADER.size:
+      raise ValueError(u'Unsupported buffer size: {0:d}.'.format(buffer_size))
+
+    self._buffer_size = buffer_size
+    self._maximum_number_of_queued_items = maximum_number_of_queued_items
+
+    self._tag_name = None
+    if sys.platform.startswith(u'win'):
+      self._tag_name = u'plaso-queue-{0:d}-{1:d}'.format(
+          os.getpid(), next(self._TAG_NAME_COUNTER))
+
+    self._shared_memory = self._OpenSharedMemory()
+
+    # A single lock serializes the producers and consumers, which makes
+    # the queue FIFO and safe for multiple producers.
+    self._lock = multiprocessing.Lock()
+
+    # The semaphores wake up waiting consumers and producers. They are only
+    # released when a process is registered as waiting, hence no additional
+    # system calls are made while the queue is neither empty nor full.
+    # Note that a multiprocessing.Condition is not used since its notify
+    # blocks until the waiting process has woken up.
+    self._items_available = multiprocessing.Semaphore(0)
+    self._space_available = multiprocessing.Semaphore(0)
+
+  def __getstate__(self):
+    """Retrieves the state of the object for pickling.
+
+    The queue is pickled when it is passed to a process that is spawned
+    instead of forked, which is the case on Windows.
+
+    Returns:
+      A dictionary containing the attributes of the object, without the
+      shared memory.
+    """
+    if not self._tag_name:
+      raise RuntimeError(
+          u'Shared memory queue can only be shared by inheritance.')
+
+    state = dict(self.__dict__)
+    del state[u'_shared_memory']
+    return state
+
+  def __setstate__(self, state):
+    """Restores the state of the object after unpickling.
+
+    Args:
+      state: a dictionary containing the attributes of the object.
+    """
+    self.__dict__.update(state)
+    self._shared_memory = self._OpenSharedMemory()
+
+  def _OpenSharedMemory(self):
+    """Opens the shared memory.
+
+    Returns:
+      The shared memory (instance of mmap.mmap).
+    """
+    size = self._STATE.size + self._buffer_size
+    if self._tag_name:
+      return mmap.mmap(-1, size, tagname=self._tag_name)
+    return mmap.mmap(-1, size)
+
+  def _ReadBytes(self, offset, size):
+    """Reads bytes from the ring buffer.
+
+    Args:
+      offset: the offset of the data relative to the start of the queue.
+      size: the number of bytes to read.
+
+    Returns:
+      A binary string containing the data.
+    """
+    position = self._STATE.size + offset % self._buffer_size
+    end_position = position + size
+    maximum_position = self._STATE.size + self._buffer_size
+    if end_position <= maximum_position:
+      return self._shared_memory[position:end_position]
+
+    # The data wraps around the end of the buffer.
+    return b''.join([
+        self._shared_memory[position:maximum_position],
+        self._shared_memory[
+            self._STATE.size:self._STATE.size + end_position -
+            maximum_position]])
+
+  def _WriteBytes(self, offset, data):
+    """Writes bytes to the ring buffer.
+
+    Args:
+      offset: the offset of the data relative to the start of the queue.
+      data: a binary string containing the data.
+    """
+    position = self._STATE.size + offset % self._buffer_size
+    end_position = position + len(data)
+    maximum_position = self._STATE.size + self._buffer_size
+    if end_position <= maximum_position:
+      self._shared_memory[position:end_position] = data
+      return
+
+    # The data wraps around the end of the buffer.
+    first_size = maximum_position - position
+    self._shared_memory[position:maximum_position] = data[:first_size]
+    self._shared_memory[
+        self._STATE.size:self._STATE.size + len(data) - first_size] = (
+            data[first_size:])
+
+  def _Wait(self, semaphore, waiting_index, timeout):
+    """Waits to be woken up by another process.
+
+    Note that the lock must be held by the caller, it is released while
+    waiting and acquired again before returning.
+
+    Args:
+      semaphore: the semaphore to wait on.
+      waiting_index: the index of the number of waiting processes in
+                     the state.
+      timeout: the number of seconds to wait.
+    """
+    state = list(self._STATE.unpack_from(self._shared_memory, 0))
+    state[waiting_index] += 1
+    self._STATE.pack_into(self._shared_memory, 0, *state)
+
+    self._lock.release()
+    woken_up = False
+    try:
+      woken_up = semaphore.acquire(True, timeout)
+    finally:
+      self._lock.acquire()
+
+      # The process that wakes up a waiting process removes it from the
+      # number of waiting processes. If the wait timed out a wake up can
+      # have been issued before the lock was acquired.
+      if not woken_up and not semaphore.acquire(False):
+        state = list(self._STATE.unpack_from(self._shared_memory, 0))
+        state[waiting_index] -= 1
+        self._STATE.pack_into(self._shared_memory, 0, *state)
+
+  def GetNumberOfItems(self):
+    """Retrieves the number of items on the queue.
+
+    Returns:
+      The number of items.
+    """
+    self._lock.acquire()
+    try:
+      _, _, number_of_items, _, _ = self._STATE.unpack_from(
+          self._shared_memory, 0)
+    finally:
+      self._lock.release()
+
+    return number_of_items
+
+  def IsEmpty(self):
+    """Determines if the queue is empty."""
+    return self.GetNumberOfItems() == 0
+
+  def PopItem(self):
+    """Pops an item off the queue.
+
+    Returns:
+      The item object.
+
+    Raises:
+      QueueEmpty: when the queue is empty.
+    """
+    return self.PopItems(maximum_number_of_items=1)[0]
+
+  def PopItems(self, maximum_number_of_items=256):
+    """Pops multiple items off the queue with a single lock acquisition.
+
+    Args:
+      maximum_number_of_items: optional maximum number of items to pop.
+                               The default is 256.
+
+    Returns:
+      A list of the item objects in the order they were pushed.
+
+    Raises:
+      QueueEmpty: when the queue is empty.
+    """
+    records = []
+    try:
+      self._lock.acquire()
+      try:
+        # Wait with a timeout otherwise the queue will block if empty.
+        deadline = None
+        while True:
+          (read_offset, write_offset, number_of_items, waiting_consumers,
+           waiting_producers) = self._STATE.unpack_from(self._shared_memory, 0)
+          if number_of_items:
+            break
+
+          if deadline is None:
+            deadline = time.time() + self._QUEUE_WAIT_TIMEOUT
+          timeout = deadline - time.time()
+          if timeout <= 0:
+            raise errors.QueueEmpty
+
+          self._Wait(
+              self._items_available, self._STATE_WAITING_CONSUMERS, timeout)
+
+        number_of_records = min(maximum_number_of_items, number_of_items)
+        for _ in range(0, number_of_records):
+          header_data = self._ReadBytes(read_offset, self._RECORD_HEADER.size)
+          read_offset += self._RECORD_HEADER.size
+
+          record_size = self._RECORD_HEADER.unpack(header_data)[0]
+          records.append(self._ReadBytes(read_offset, record_size))
+          read_offset += record_size
+
+        # All waiting producers are woken up since the space that was freed
+        # can fit the records of multiple producers.
+        self._STATE.pack_into(
+            self._shared_memory, 0, read_offset, write_offset,
+            number_of_items - number_of_records, waiting_consumers, 0)
+
+        for _ in range(0, waiting_producers):
+          self._space_available.release()
+
+      finally:
+        self._lock.release()
+
+    except KeyboardInterrupt:
+      raise errors.QueueEmpty
+
+    return [cPickle.loads(record) for record in records]
+
+  def PushItem(self, item):
+    """Pushes an item onto the queue.
+
+    Blocks while the queue is full until a consumer has made space.
+
+    Args:
+      item: the item object.
+
+    Raises:
+      QueueFull: when the item is larger than the buffer.
+    """
+    data = cPickle.dumps(item, cPickle.HIGHEST_PROTOCOL)
+    record_size = self._RECORD_HEADER.size + len(data)
+    if record_size > self._buffer_size:
+      logging.error((
+          u'Unable to push item of size: {0:d} onto queue with buffer size: '
+          u'{1:d}.').format(record_size, self._buffer_size))
+      raise errors.QueueFull
+
+    record = b''.join([self._RECORD_HEADER.pack(len(data)), data])
+
+    self._lock.acquire()
+    try:
+      while True:
+        (read_offset, write_offset, number_of_items, waiting_consumers,
+         waiting_producers) = self._STATE.unpack_from(self._shared_memory, 0)
+
+        is_full = (
+            write_offset - read_offset + record_size > self._buffer_size or (
+                self._maximum_number_of_queued_items and
+                number_of_items >= self._maximum_number_of_queued_items))
+        if not is_full:
+          break
+
+        self._Wait(
+            self._space_available, self._STATE_WAITING_PRODUCERS,
+            self._QUEUE_WAIT_TIMEOUT)
+
+      self._WriteBytes(write_offset, record)
+
+      # A single waiting consumer is woken up to pop the record.
+      if waiting_consumers:
+        waiting_consumers -= 1
+        self._items_available.release()
+
+      self._STATE.pack_into(
+          self._shared_memory, 0, read_offset, write_offset + record_size,
+          number_of_items + 1, waiting_consumers, waiting_producers)
+
+    finally:
+      self._lock.release()
@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests the shared memory ring buffer queue."""
+
+import multiprocessing
+import unittest
+
+from plaso.engine import queue
+from plaso.engine import test_lib
+from plaso.lib import errors
+from plaso.multi_processing import shared_memory_queue
+
+
+def _ProduceItems(test_queue, producer_number, number_of_items):
+  """Pushes items onto the queue, used as the target of a producer process.
+
+  Args:
+    test_queue: the queue object (instance of SharedMemoryQueue).
+    producer_number: the number that identifies the producer.
+    number_of_items: the number of items to push.
+  """
+  for index in range(0, number_of_items):
+    test_queue.PushItem((producer_number, index, u'data' * index))
+
+
+class SharedMemoryQueueTest(unittest.TestCase):
+  """Tests the shared memory ring buffer queue."""
+
+  _ITEMS = [u'item1', u'item2', u'item3', u'item4']
+
+  def testPushPopItem(self):
+    """Tests the PushItem and PopItem functions."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(buffer_size=1024)
+    self.assertTrue(test_queue.IsEmpty())
+
+    for item in self._ITEMS:
+      test_queue.PushItem(item)
+
+    self.assertFalse(test_queue.IsEmpty())
+
+    # The items are popped in the order they were pushed.
+    self.assertEqual(test_queue.PopItem(), u'item1')
+
+    test_queue.SignalEndOfInput()
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.items, self._ITEMS[1:])
+
+  def testPopItems(self):
+    """Tests the PopItems function."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(buffer_size=1024)
+
+    for item in self._ITEMS:
+      test_queue.PushItem(item)
+
+    self.assertEqual(
+        test_queue.PopItems(maximum_number_of_items=3), self._ITEMS[:3])
+    self.assertEqual(test_queue.PopItems(), self._ITEMS[3:])
+    self.assertTrue(test_queue.IsEmpty())
+
+  def testPushItem(self):
+    """Tests the PushItem function with an item larger than the buffer."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(buffer_size=64)
+
+    with self.assertRaises(errors.QueueFull):
+      test_queue.PushItem(u'A' * 64)
+
+  def testWrapAround(self):
+    """Tests records that wrap around the end of the buffer."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(buffer_size=100)
+
+    items = []
+    for index in range(0, 50):
+      item = (index, u'X' * (index % 7))
+      items.append(item)
+      test_queue.PushItem(item)
+      self.assertEqual(test_queue.PopItem(), item)
+
+    self.assertTrue(test_queue.IsEmpty())
+
+  def testMultipleProducers(self):
+    """Tests multiple producer processes with back-pressure."""
+    number_of_items = 200
+    number_of_producers = 3
+
+    # The buffer only fits a few items, hence the producers have to wait
+    # for the consumer.
+    test_queue = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=2048, maximum_number_of_queued_items=16)
+
+    producers = []
+    for producer_number in range(0, number_of_producers):
+      producer = multiprocessing.Process(
+          target=_ProduceItems,
+          args=(test_queue, producer_number, number_of_items))
+      producer.start()
+      producers.append(producer)
+
+    items = []
+    while len(items) < number_of_items * number_of_producers:
+      items.extend(test_queue.PopItems(maximum_number_of_items=10))
+
+    for producer in producers:
+      producer.join()
+      self.assertEqual(producer.exitcode, 0)
+
+    # The items of every producer are popped in the order they were pushed.
+    for producer_number in range(0, number_of_producers):
+      indexes = [
+          index for number, index, _ in items if number == producer_number]
+      self.assertEqual(indexes, range(0, number_of_items))
+
+    self.assertTrue(test_queue.IsEmpty())
+
+  def testProduceBatches(self):
+    """Tests producing and consuming batches of items."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(buffer_size=1024)
+    test_queue_producer = queue.BatchItemQueueProducer(
+        test_queue, maximum_batch_size=3)
+
+    test_queue_producer.ProduceItems(self._ITEMS)
+    test_queue_producer.SignalEndOfInput()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.items, self._ITEMS)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""The shared memory process status table.
+
+The status table contains a fixed-size slot per process in shared memory.
+A process writes its status into its slot and the foreman reads it, without
+locks, system calls or a RPC round-trip per process.
+"""
+
+import ctypes
+import multiprocessing
+import struct
+import time
+
+
+class ProcessStatusTable(object):
+  """Class that defines the shared memory process status table.
+
+  Every slot is written by a single process and can be read by any process.
+  A slot starts with a sequence number that the writer increments before
+  and after writing the status, hence the sequence number is odd while
+  the status is being written. A reader retries when the sequence number
+  is odd or changed while reading, which makes the status consistent without
+  a lock.
+
+  The status table is created before the processes are started and passed
+  to them, since the shared memory cannot be resized afterwards.
+  """
+
+  _MAXIMUM_CURRENT_FILE_SIZE = 1024
+  _MAXIMUM_CURRENT_PARSER_SIZE = 64
+
+  _MAXIMUM_NUMBER_OF_READ_ATTEMPTS = 100
+
+  _SEQUENCE_NUMBER = struct.Struct(u'<Q')
+
+  # The status contains: the PID, the is running flag, the number of file
+  # entries, the number of events, the processed data size, the start time
+  # of the current file, the heartbeat time, the current file and the current
+  # parser.
+  _STATUS = struct.Struct(u'<I?3xQQQdd{0:d}s{1:d}s'.format(
+      _MAXIMUM_CURRENT_FILE_SIZE, _MAXIMUM_CURRENT_PARSER_SIZE))
+
+  _SLOT_SIZE = _SEQUENCE_NUMBER.size + _STATUS.size
+
+  def __init__(self, number_of_slots):
+    """Initializes the status table object.
+
+    Args:
+      number_of_slots: the number of slots.
+
+    Raises:
+      ValueError: if the number of slots is invalid.
+    """
+    if number_of_slots < 1:
+      raise ValueError(u'Unsupported number of slots: {0:d}.'.format(
+          number_of_slots))
+
+    super(ProcessStatusTable, self).__init__()
+    self._number_of_slots = number_of_slots
+    self._shared_memory = multiprocessing.RawArray(
+        ctypes.c_char, number_of_slots * self._SLOT_SIZE)
+
+  @property
+  def number_of_slots(self):
+    """The number of slots."""
+    return self._number_of_slots
+
+  def _EncodeString(self, string, maximum_size):
+    """Encodes a string to fit in a slot.
+
+    Args:
+      string: the string.
+      maximum_size: the maximum size of the encoded string.
+
+    Returns:
+      A binary string containing the UTF-8 encoded string. If the string is
+      too large its start is truncated, since the end of a path is the most
+      distinctive part.
+    """
+    if not string:
+      return b''
+
+    if isinstance(string, unicode):
+      string = string.encode(u'utf-8')
+
+    if len(string) > maximum_size:
+      string = string[-maximum_size:]
+    return string
+
+  def _GetSlotOffset(self, index):
+    """Retrieves the offset of a slot.
+
+    Args:
+      index: the index of the slot.
+
+    Returns:
+      The offset of the slot in the shared memory.
+
+    Raises:
+      IndexError: if the index is out of bounds.
+    """
+    if index < 0 or index >= self._number_of_slots:
+      raise IndexError(u'Slot index: {0:d} out of bounds.'.format(index))
+
+    return index * self._SLOT_SIZE
+
+  def ClearSlot(self, index):
+    """Clears a slot, for reuse by another process.
+
+    The slot must not be written by a process while it is cleared.
+
+    Args:
+      index: the index of the slot.
+    """
+    slot_offset = self._GetSlotOffset(index)
+    ctypes.memset(
+        ctypes.byref(self._shared_memory, slot_offset), 0, self._SLOT_SIZE)
+
+  def GetStatus(self, index):
+    """Retrieves the status of a slot.
+
+    Args:
+      index: the index of the slot.
+
+    Returns:
+      A status dictionary or None if the status was not written yet or
+      if no consistent status could be read.
+    """
+    slot_offset = self._GetSlotOffset(index)
+    status_offset = slot_offset + self._SEQUENCE_NUMBER.size
+
+    for _ in range(0, self._MAXIMUM_NUMBER_OF_READ_ATTEMPTS):
+      sequence_number = self._SEQUENCE_NUMBER.unpack_from(
+          self._shared_memory, slot_offset)[0]
+      if sequence_number % 2:
+        continue
+
+      status_values = self._STATUS.unpack_from(
+          self._shared_memory, status_offset)
+
+      if sequence_number == self._SEQUENCE_NUMBER.unpack_from(
+          self._shared_memory, slot_offset)[0]:
+        break
+
+    else:
+      return
+
+    if not sequence_number:
+      return
+
+    (pid, is_running, number_of_file_entries, number_of_events,
+     processed_data_size, current_file_start_time, heartbeat_time,
+     current_file, current_parser) = status_values
+
+    # Note that struct pads the strings with 0-byte values and that
+    # the start of a truncated string can be a partial UTF-8 sequence.
+    return {
+        u'current_file': current_file.rstrip(b'\x00').decode(
+            u'utf-8', u'ignore'),
+        u'current_file_start_time': current_file_start_time,
+        u'current_parser': current_parser.rstrip(b'\x00').decode(
+            u'utf-8', u'ignore'),
+        u'heartbeat_time': heartbeat_time,
+        u'is_running': is_running,
+        u'number_of_events': number_of_events,
+        u'number_of_file_entries': number_of_file_entries,
+        u'pid': pid,
+        u'processed_data_size': processed_data_size}
+
+  def UpdateStatus(self, index, pid, status_dict):
+    """Updates the status of a slot.
+
+    Only a single process should update a specific slot. The time of
+    the update is stored as the heartbeat time.
+
+    Args:
+      index: the index of the slot.
+      pid: the process ID (PID) of the process that updates the slot.
+      status_dict: the status dictionary of the process.
+    """
+    slot_offset = self._GetSlotOffset(index)
+
+    current_file = self._EncodeString(
+        status_dict.get(u'current_file', None),
+        self._MAXIMUM_CURRENT_FILE_SIZE)
+    current_parser = self._EncodeString(
+        status_dict.get(u'current_parser', None),
+        self._MAXIMUM_CURRENT_PARSER_SIZE)
+
+    sequence_number = self._SEQUENCE_NUMBER.unpack_from(
+        self._shared_memory, slot_offset)[0]
+
+    self._SEQUENCE_NUMBER.pack_into(
+        self._shared_memory, slot_offset, sequence_number + 1)
+
+    self._STATUS.pack_into(
+        self._shared_memory, slot_offset + self._SEQUENCE_NUMBER.size, pid,
+        status_dict.get(u'is_running', False),
+        status_dict.get(u'number_of_file_entries', 0),
+        status_dict.get(u'number_of_events', 0),
+        status_dict.get(u'processed_data_size', 0),
+        status_dict.get(u'current_file_start_time', 0.0),
+        time.time(), current_file, current_parser)
+
+    self._SEQUENCE_NUMBER.pack_into(
+        self._shared_memory, slot_offset, sequence_number + 2)
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests the shared memory process status table."""
+
+import multiprocessing
+import os
+import unittest
+
+from plaso.multi_processing import status_table
+
+
+def _UpdateStatus(test_status_table, index, number_of_updates):
+  """Updates the status of a slot, used as the target of a process.
+
+  Args:
+    test_status_table: the status table (instance of ProcessStatusTable).
+    index: the index of the slot.
+    number_of_updates: the number of times the status is updated.
+  """
+  pid = os.getpid()
+  for number_of_events in range(1, number_of_updates + 1):
+    test_status_table.UpdateStatus(index, pid, {
+        u'current_file': u'/tmp/{0:d}'.format(number_of_events),
+        u'is_running': number_of_events < number_of_updates,
+        u'number_of_events': number_of_events})
+
+
+class ProcessStatusTableTest(unittest.TestCase):
+  """Tests the shared memory process status table."""
+
+  def testInitialize(self):
+    """Tests the initialization."""
+    test_status_table = status_table.ProcessStatusTable(4)
+    self.assertEqual(test_status_table.number_of_slots, 4)
+
+    with self.assertRaises(ValueError):
+      status_table.ProcessStatusTable(0)
+
+  def testUpdateStatus(self):
+    """Tests the UpdateStatus and GetStatus functions."""
+    test_status_table = status_table.ProcessStatusTable(2)
+    self.assertIsNone(test_status_table.GetStatus(0))
+
+    test_status_table.UpdateStatus(1, 1234, {
+        u'current_file': u'/tmp/t\xe9st.txt',
+        u'current_file_start_time': 1.5,
+        u'current_parser': u'syslog',
+        u'is_running': True,
+        u'number_of_events': 13,
+        u'number_of_file_entries': 2,
+        u'processed_data_size': 1024})
+
+    self.assertIsNone(test_status_table.GetStatus(0))
+
+    status_dict = test_status_table.GetStatus(1)
+    self.assertEqual(status_dict[u'current_file'], u'/tmp/t\xe9st.txt')
+    self.assertEqual(status_dict[u'current_file_start_time'], 1.5)
+    self.assertEqual(status_dict[u'current_parser'], u'syslog')
+    self.assertGreater(status_dict[u'heartbeat_time'], 0.0)
+    self.assertTrue(status_dict[u'is_running'])
+    self.assertEqual(status_dict[u'number_of_events'], 13)
+    self.assertEqual(status_dict[u'number_of_file_entries'], 2)
+    self.assertEqual(status_dict[u'pid'], 1234)
+    self.assertEqual(status_dict[u'processed_data_size'], 1024)
+
+    # The start of a current file that is too large is truncated.
+    test_status_table.UpdateStatus(1, 1234, {
+        u'current_file': u'/{0:s}/end.txt'.format(u'a' * 2048)})
+
+    status_dict = test_status_table.GetStatus(1)
+    self.assertEqual(len(status_dict[u'current_file']), 1024)
+    self.assertTrue(status_dict[u'current_file'].endswith(u'/end.txt'))
+    self.assertFalse(status_dict[u'is_running'])
+
+    test_status_table.ClearSlot(1)
+    self.assertIsNone(test_status_table.GetStatus(1))
+
+    with self.assertRaises(IndexError):
+      test_status_table.GetStatus(2)
+
+  def testUpdateStatusProcess(self):
+    """Tests updating the status from another process."""
+    test_status_table = status_table.ProcessStatusTable(2)
+
+    process = multiprocessing.Process(
+        target=_UpdateStatus, args=(test_status_table, 1, 1000))
+    process.start()
+
+    # The status read while the process is writing is consistent.
+    while process.is_alive():
+      status_dict = test_status_table.GetStatus(1)
+      if status_dict:
+        self.assertEqual(
+            status_dict[u'current_file'],
+            u'/tmp/{0:d}'.format(status_dict[u'number_of_events']))
+
+    process.join()
+
+    status_dict = test_status_table.GetStatus(1)
+    self.assertEqual(status_dict[u'pid'], process.pid)
+    self.assertEqual(status_dict[u'number_of_events'], 1000)
+    self.assertFalse(status_dict[u'is_running'])
+
+
+if __name__ == '__main__':
+  unittest.main()
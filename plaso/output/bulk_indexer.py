@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""A pipelined bulk indexer for ElasticSearch."""
+
+import httplib
+import json
+import logging
+import Queue
+import socket
+import threading
+import time
+
+
+class ElasticSearchBulkIndexer(object):
+  """Class that indexes documents in ElasticSearch using bulk requests.
+
+  The documents are collected into batches that are indexed by several
+  threads, hence multiple bulk requests can be in-flight while the caller
+  is building the next batch of documents.
+  """
+
+  # The HTTP status codes that indicate ElasticSearch rejected the request
+  # due to load, which can be resolved by retrying.
+  _RETRY_STATUS_CODES = frozenset([429, 503])
+
+  def __init__(
+      self, host, port, index_name, document_type, maximum_batch_size=5000,
+      maximum_batch_bytes=10 * 1024 * 1024, number_of_requests=4,
+      maximum_number_of_retries=5, retry_delay=1.0, timeout=60):
+    """Initializes the bulk indexer object.
+
+    Args:
+      host: the hostname or IP address of the ElasticSearch server.
+      port: the port number of the ElasticSearch server.
+      index_name: the name of the index.
+      document_type: the name of the document type.
+      maximum_batch_size: optional maximum number of documents in a single
+                          bulk request. The default is 5000.
+      maximum_batch_bytes: optional maximum number of bytes in a single
+                           bulk request. The default is 10 MiB.
+      number_of_requests: optional maximum number of concurrent in-flight
+                          bulk requests. The default is 4.
+      maximum_number_of_retries: optional maximum number of times a rejected
+                                 bulk request is retried. The default is 5.
+      retry_delay: optional number of seconds to wait before the first retry,
+                   the delay doubles on every subsequent retry. The default
+                   is 1.0.
+      timeout: optional number of seconds to wait for the response of a bulk
+               request. The default is 60.
+    """
+    super(ElasticSearchBulkIndexer, self).__init__()
+    self._batch = []
+    self._batch_bytes = 0
+    # The batch queue is bounded so the caller is blocked when all requests
+    # are in-flight instead of buffering an unbounded number of batches.
+    self._batch_queue = Queue.Queue(maxsize=number_of_requests)
+    self._error_message = None
+    self._host = host
+    self._lock = threading.Lock()
+    self._maximum_batch_bytes = maximum_batch_bytes
+    self._maximum_batch_size = maximum_batch_size
+    self._maximum_number_of_retries = maximum_number_of_retries
+    self._number_of_requests = number_of_requests
+    self._port = port
+    # httplib combines the request line and headers with the body, hence
+    # these are byte strings to prevent the body being decoded.
+    self._request_path = u'/{0:s}/{1:s}/_bulk'.format(
+        index_name, document_type).encode(u'utf-8')
+    self._retry_delay = retry_delay
+    self._threads = []
+    self._timeout = timeout
+
+    self.number_of_bytes_indexed = 0
+    self.number_of_documents_indexed = 0
+    self.number_of_failed_documents = 0
+    self.number_of_retries = 0
+
+  def _EncodeJSONValue(self, value):
+    """Encodes a value that is not natively supported by the JSON encoder.
+
+    Args:
+      value: the value.
+
+    Returns:
+      A JSON serializable representation of the value.
+    """
+    if isinstance(value, (set, frozenset)):
+      return list(value)
+    return u'{0!s}'.format(value)
+
+  def _GetItemStatus(self, item):
+    """Retrieves the HTTP status code of an item of a bulk response.
+
+    Args:
+      item: a dictionary containing the bulk response item.
+
+    Returns:
+      An integer containing the HTTP status code.
+    """
+    for action_result in item.itervalues():
+      return action_result.get(u'status', 500)
+    return 500
+
+  def _IndexBatch(self, connection, batch):
+    """Indexes a batch of documents, retrying the rejected documents.
+
+    Args:
+      connection: the HTTP connection (instance of httplib.HTTPConnection).
+      batch: a list of strings containing the bulk action and document.
+    """
+    for attempt in range(0, self._maximum_number_of_retries + 1):
+      if attempt:
+        with self._lock:
+          self.number_of_retries += 1
+        time.sleep(self._retry_delay * (2 ** (attempt - 1)))
+
+      try:
+        status, response_data = self._PostBulkRequest(connection, batch)
+      except (httplib.HTTPException, socket.error) as exception:
+        logging.warning(
+            u'Unable to send bulk request with error: {0!s}'.format(exception))
+        connection.close()
+        continue
+
+      if status in self._RETRY_STATUS_CODES:
+        continue
+
+      if status != 200:
+        logging.error(u'Bulk request failed with status: {0:d}'.format(status))
+        break
+
+      try:
+        items = json.loads(response_data).get(u'items', [])
+      except ValueError:
+        logging.error(u'Unable to parse bulk response.')
+        break
+
+      rejected_batch = []
+      number_of_bytes = 0
+      number_of_documents = 0
+      number_of_failed_documents = 0
+      for entry, item in zip(batch, items):
+        item_status = self._GetItemStatus(item)
+        if item_status in self._RETRY_STATUS_CODES:
+          rejected_batch.append(entry)
+        elif item_status >= 300:
+          number_of_failed_documents += 1
+        else:
+          number_of_bytes += len(entry)
+          number_of_documents += 1
+
+      with self._lock:
+        self.number_of_bytes_indexed += number_of_bytes
+        self.number_of_documents_indexed += number_of_documents
+        self.number_of_failed_documents += number_of_failed_documents
+
+      if number_of_failed_documents:
+        logging.warning(u'Unable to index {0:d} documents.'.format(
+            number_of_failed_documents))
+
+      if not rejected_batch:
+        return
+
+      batch = rejected_batch
+
+    with self._lock:
+      self.number_of_failed_documents += len(batch)
+      self._error_message = u'Unable to index {0:d} documents.'.format(
+          len(batch))
+
+  def _IndexBatches(self):
+    """Indexes the batches on the batch queue until the end is signalled."""
+    connection = httplib.HTTPConnection(
+        self._host, self._port, timeout=self._timeout)
+
+    while True:
+      batch = self._batch_queue.get()
+      if batch is None:
+        break
+
+      self._IndexBatch(connection, batch)
+
+    connection.close()
+
+  def _PostBulkRequest(self, connection, batch):
+    """Sends a bulk request.
+
+    Args:
+      connection: the HTTP connection (instance of httplib.HTTPConnection).
+      batch: a list of strings containing the bulk action and document.
+
+    Returns:
+      A tuple containing the HTTP status code and the response data.
+    """
+    connection.request(
+        b'POST', self._request_path, body=b''.join(batch),
+        headers={b'Content-Type': b'application/x-ndjson'})
+    response = connection.getresponse()
+    return response.status, response.read()
+
+  def _QueueBatch(self):
+    """Queues the current batch of documents to be indexed."""
+    if not self._batch:
+      return
+
+    self._batch_queue.put(self._batch)
+    self._batch = []
+    self._batch_bytes = 0
+
+  def AddDocument(self, document):
+    """Adds a document to be indexed.
+
+    Args:
+      document: a dictionary containing the document.
+    """
+    entry = b'{{"index": {{}}}}\n{0:s}\n'.format(
+        json.dumps(document, default=self._EncodeJSONValue))
+
+    self._batch.append(entry)
+    self._batch_bytes += len(entry)
+
+    if (len(self._batch) >= self._maximum_batch_size or
+        self._batch_bytes >= self._maximum_batch_bytes):
+      self._QueueBatch()
+
+  def Close(self):
+    """Indexes the remaining documents and stops the indexing threads.
+
+    Raises:
+      RuntimeError: if one or more documents could not be indexed after
+                    the maximum number of retries.
+    """
+    self._QueueBatch()
+
+    for _ in self._threads:
+      self._batch_queue.put(None)
+
+    for thread in self._threads:
+      thread.join()
+
+    self._threads = []
+
+    if self._error_message:
+      raise RuntimeError(self._error_message)
+
+  def Open(self):
+    """Starts the indexing threads."""
+    for _ in range(0, self._number_of_requests):
+      thread = threading.Thread(
+          name=u'ElasticSearchBulkIndexer', target=self._IndexBatches)
+      thread.daemon = True
+      thread.start()
+      self._threads.append(thread)
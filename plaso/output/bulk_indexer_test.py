@@ -0,0 +1,131 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the ElasticSearch bulk indexer."""
+
+import BaseHTTPServer
+import json
+import threading
+import unittest
+
+from plaso.output import bulk_indexer
+
+
+class TestBulkRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+  """Class that implements a HTTP stand-in for the ElasticSearch bulk API.
+
+  The stand-in rejects the first bulk request as a whole and the first
+  document of the second bulk request.
+  """
+
+  protocol_version = 'HTTP/1.1'
+
+  def do_POST(self):  # pylint: disable=invalid-name
+    """Handles a POST request."""
+    content_length = int(self.headers.getheader('Content-Length', 0))
+    lines = self.rfile.read(content_length).splitlines()
+
+    with self.server.lock:
+      self.server.number_of_requests += 1
+      number_of_requests = self.server.number_of_requests
+      self.server.paths.add(self.path)
+
+    if number_of_requests == 1:
+      self._SendResponse(429, {u'error': u'rejected'})
+      return
+
+    items = []
+    for index, line in enumerate(lines[1::2]):
+      if number_of_requests == 2 and index == 0:
+        items.append({u'index': {u'status': 429}})
+      elif json.loads(line).get(u'invalid', False):
+        items.append({u'index': {u'status': 400}})
+      else:
+        items.append({u'index': {u'status': 201}})
+        with self.server.lock:
+          self.server.documents.append(json.loads(line))
+
+    self._SendResponse(200, {u'errors': False, u'items': items})
+
+  def _SendResponse(self, status, response):
+    """Sends a JSON response.
+
+    Args:
+      status: the HTTP status code.
+      response: the response dictionary.
+    """
+    response_data = json.dumps(response)
+    self.send_response(status)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', len(response_data))
+    self.end_headers()
+    self.wfile.write(response_data)
+
+  def log_message(self, *unused_args):  # pylint: disable=arguments-differ
+    """Suppresses the logging of requests."""
+    return
+
+
+class ElasticSearchBulkIndexerTest(unittest.TestCase):
+  """Tests for the ElasticSearch bulk indexer."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._server = BaseHTTPServer.HTTPServer(
+        ('127.0.0.1', 0), TestBulkRequestHandler)
+    self._server.documents = []
+    self._server.lock = threading.Lock()
+    self._server.number_of_requests = 0
+    self._server.paths = set()
+
+    self._server_thread = threading.Thread(target=self._server.serve_forever)
+    self._server_thread.daemon = True
+    self._server_thread.start()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    self._server.shutdown()
+    self._server.server_close()
+
+  def testAddDocument(self):
+    """Tests the AddDocument function."""
+    test_bulk_indexer = bulk_indexer.ElasticSearchBulkIndexer(
+        u'127.0.0.1', self._server.server_port, u'case', u'event',
+        maximum_batch_size=3, number_of_requests=1, retry_delay=0.01)
+    test_bulk_indexer.Open()
+
+    for index in range(0, 10):
+      test_bulk_indexer.AddDocument({
+          u'index': index, u'tags': set([u'tag']), u'invalid': index == 9})
+
+    test_bulk_indexer.Close()
+
+    self.assertEqual(self._server.paths, set([u'/case/event/_bulk']))
+
+    # 4 batches, the first is rejected as a whole and the second partially.
+    self.assertEqual(self._server.number_of_requests, 6)
+    self.assertEqual(test_bulk_indexer.number_of_retries, 2)
+
+    self.assertEqual(test_bulk_indexer.number_of_documents_indexed, 9)
+    self.assertEqual(test_bulk_indexer.number_of_failed_documents, 1)
+    self.assertGreater(test_bulk_indexer.number_of_bytes_indexed, 0)
+
+    indexes = sorted(document[u'index'] for document in self._server.documents)
+    self.assertEqual(indexes, range(0, 9))
+    self.assertEqual(self._server.documents[0][u'tags'], [u'tag'])
+
+  def testClose(self):
+    """Tests the Close function."""
+    test_bulk_indexer = bulk_indexer.ElasticSearchBulkIndexer(
+        u'127.0.0.1', self._server.server_port, u'case', u'event',
+        maximum_number_of_retries=0)
+    test_bulk_indexer.Open()
+    test_bulk_indexer.AddDocument({u'index': 0})
+
+    with self.assertRaises(RuntimeError):
+      test_bulk_indexer.Close()
+
+    self.assertEqual(test_bulk_indexer.number_of_failed_documents, 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -5,7 +5,6 @@ import logging
 import re
 
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -91,9 +90,9 @@ class DynamicOutputModule(interface.LinearOutputModule):
        A string containing the value for the date field.
     """
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event_object.timestamp, self._output_mediator.timezone,
-          raise_error=True)
+      year, month, day_of_month, _, _, _, _ = (
+          self._output_mediator.timestamp_converter.CopyToDateTimeValues(
+              event_object.timestamp, raise_error=True))
     except OverflowError as exception:
       logging.error((
           u'Unable to copy {0:d} into a human readable timestamp with error: '
@@ -102,8 +101,7 @@ class DynamicOutputModule(interface.LinearOutputModule):
               getattr(event_object, 'store_number', u''),
               getattr(event_object, 'store_index', u'')))
       return u'0000-00-00'
-    return u'{0:04d}-{1:02d}-{2:02d}'.format(
-        date_use.year, date_use.month, date_use.day)
+    return u'{0:04d}-{1:02d}-{2:02d}'.format(year, month, day_of_month)
 
   def _FormatDateTime(self, event_object):
     """Formats the date and time in ISO 8601 format.
@@ -115,9 +113,8 @@ class DynamicOutputModule(interface.LinearOutputModule):
        A string containing the value for the date field.
     """
     try:
-      return timelib.Timestamp.CopyToIsoFormat(
-          event_object.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
+      return self._output_mediator.timestamp_converter.CopyToIsoFormat(
+          event_object.timestamp, raise_error=True)
 
     except OverflowError as exception:
       logging.error((
@@ -279,9 +276,9 @@ class DynamicOutputModule(interface.LinearOutputModule):
        A string containing the value for the timestamp field.
     """
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event_object.timestamp, self._output_mediator.timezone,
-          raise_error=True)
+      _, _, _, hours, minutes, seconds, _ = (
+          self._output_mediator.timestamp_converter.CopyToDateTimeValues(
+              event_object.timestamp, raise_error=True))
     except OverflowError as exception:
       logging.error((
           u'Unable to copy {0:d} into a human readable timestamp with error: '
@@ -290,8 +287,7 @@ class DynamicOutputModule(interface.LinearOutputModule):
               getattr(event_object, 'store_number', u''),
               getattr(event_object, 'store_index', u'')))
       return u'00:00:00'
-    return u'{0:02d}:{1:02d}:{2:02d}'.format(
-        date_use.hour, date_use.minute, date_use.second)
+    return u'{0:02d}:{1:02d}:{2:02d}'.format(hours, minutes, seconds)
 
   def _FormatTimestampDescription(self, event_object):
     """Formats the timestamp description.
@@ -10,6 +10,7 @@ import pyelasticsearch
 
 from plaso.lib import errors
 from plaso.lib import timelib
+from plaso.output import bulk_indexer
 from plaso.output import interface
 from plaso.output import manager
 
@@ -53,7 +54,31 @@ class ElasticSearchOutputModule(interface.OutputModule):
               'database is listening on a different port this parameter '
               'can be defined.'),
           'action': 'store',
-          'default': 9200})]
+          'default': 9200}),
+      ('--elastic_batch_size', {
+          'dest': 'elastic_batch_size',
+          'type': int,
+          'help': (
+              'The maximum number of events sent in a single bulk request. '
+              'The default is 5000.'),
+          'action': 'store',
+          'default': 5000}),
+      ('--elastic_batch_bytes', {
+          'dest': 'elastic_batch_bytes',
+          'type': int,
+          'help': (
+              'The maximum number of bytes sent in a single bulk request. '
+              'The default is 10 MiB.'),
+          'action': 'store',
+          'default': 10 * 1024 * 1024}),
+      ('--elastic_bulk_requests', {
+          'dest': 'elastic_bulk_requests',
+          'type': int,
+          'help': (
+              'The number of bulk requests that are sent concurrently. '
+              'The default is 4.'),
+          'action': 'store',
+          'default': 4})]
 
   def __init__(self, output_mediator, **kwargs):
     """Initializes the output module object.
@@ -63,7 +88,6 @@ class ElasticSearchOutputModule(interface.OutputModule):
     """
     super(ElasticSearchOutputModule, self).__init__(output_mediator, **kwargs)
     self._counter = 0
-    self._data = []
 
     elastic_host = self._output_mediator.GetConfigurationValue(
         u'elastic_server', default_value=u'127.0.0.1')
@@ -89,6 +113,20 @@ class ElasticSearchOutputModule(interface.OutputModule):
     else:
       self._doc_type = u'event'
 
+    batch_size = self._output_mediator.GetConfigurationValue(
+        u'elastic_batch_size', default_value=5000)
+    batch_bytes = self._output_mediator.GetConfigurationValue(
+        u'elastic_batch_bytes', default_value=10 * 1024 * 1024)
+    number_of_requests = self._output_mediator.GetConfigurationValue(
+        u'elastic_bulk_requests', default_value=4)
+
+    # The events are indexed with pipelined bulk requests, so ElasticSearch
+    # is indexing while the next batch of events is being formatted.
+    self._bulk_indexer = bulk_indexer.ElasticSearchBulkIndexer(
+        elastic_host, elastic_port, self._index_name, self._doc_type,
+        maximum_batch_size=batch_size, maximum_batch_bytes=batch_bytes,
+        number_of_requests=number_of_requests)
+
   def _EventToDict(self, event_object):
     """Returns a dict built from an event object.
 
@@ -118,9 +156,9 @@ class ElasticSearchOutputModule(interface.OutputModule):
     # Adding attributes in that are calculated/derived.
     # We want to remove millisecond precision (causes some issues in
     # conversion).
-    ret_dict['datetime'] = timelib.Timestamp.CopyToIsoFormat(
-        timelib.Timestamp.RoundToSeconds(event_object.timestamp),
-        timezone=self._output_mediator.timezone)
+    ret_dict['datetime'] = (
+        self._output_mediator.timestamp_converter.CopyToIsoFormat(
+            timelib.Timestamp.RoundToSeconds(event_object.timestamp)))
 
     message, _ = self._output_mediator.GetFormattedMessages(event_object)
     if message is None:
@@ -150,9 +188,13 @@ class ElasticSearchOutputModule(interface.OutputModule):
 
   def Close(self):
     """Disconnects from the elastic search server."""
-    self._elastic_db.bulk_index(self._index_name, self._doc_type, self._data)
-    self._data = []
+    self._bulk_indexer.Close()
     sys.stdout.write('. [DONE]\n')
+    sys.stdout.write(
+        'Indexed {0:d} events ({1:d} bytes) with {2:d} retries.\n'.format(
+            self._bulk_indexer.number_of_documents_indexed,
+            self._bulk_indexer.number_of_bytes_indexed,
+            self._bulk_indexer.number_of_retries))
     sys.stdout.write('ElasticSearch index name: {0:s}\n'.format(
         self._index_name))
     sys.stdout.flush()
@@ -163,13 +205,10 @@ class ElasticSearchOutputModule(interface.OutputModule):
     Args:
       event_object: the event object (instance of EventObject).
     """
-    self._data.append(self._EventToDict(event_object))
+    self._bulk_indexer.AddDocument(self._EventToDict(event_object))
     self._counter += 1
 
-    # Check if we need to flush.
     if self._counter % 5000 == 0:
-      self._elastic_db.bulk_index(self._index_name, self._doc_type, self._data)
-      self._data = []
       sys.stdout.write('.')
       sys.stdout.flush()
 
@@ -206,6 +245,8 @@ class ElasticSearchOutputModule(interface.OutputModule):
     # pylint: disable=unexpected-keyword-arg
     self._elastic_db.health(wait_for_status='yellow')
 
+    self._bulk_indexer.Open()
+
     sys.stdout.write('Inserting data')
     sys.stdout.flush()
 
@@ -155,7 +155,8 @@ class EventBuffer(object):
 
   MERGE_ATTRIBUTES = [u'inode', u'filename', u'display_name']
 
-  def __init__(self, output_module, check_dedups=True):
+  def __init__(
+      self, output_module, check_dedups=True, write_header_and_footer=True):
     """Initializes an event buffer object.
 
     This class is used for buffering up events for duplicate removals
@@ -166,12 +167,21 @@ class EventBuffer(object):
       output_module: An output module object (instance of OutputModule).
       check_dedups: Optional boolean value indicating whether or not the buffer
                     should check and merge duplicate entries or not.
+      write_header_and_footer: Optional boolean value indicating whether or
+                               not the header and footer should be written.
+                               The default is True, False is used when the
+                               output is part of a larger output.
     """
-    self._buffer_dict = {}
+    # The events of the current timestamp in order of arrival and the indexes
+    # of the events in the buffer by their equality key.
+    self._buffer_keys = {}
+    self._buffer_list = []
     self._current_timestamp = 0
     self._output_module = output_module
     self._output_module.Open()
-    self._output_module.WriteHeader()
+    self._write_header_and_footer = write_header_and_footer
+    if self._write_header_and_footer:
+      self._output_module.WriteHeader()
 
     self.check_dedups = check_dedups
     self.duplicate_counter = 0
@@ -190,23 +200,37 @@ class EventBuffer(object):
       self._current_timestamp = event_object.timestamp
       self.Flush()
 
-    key = event_object.EqualityString()
-    if key in self._buffer_dict:
-      self.JoinEvents(event_object, self._buffer_dict.pop(key))
-    self._buffer_dict[key] = event_object
+    # Most timestamps only have a single event, hence the equality key is
+    # only determined when a second event with the same timestamp arrives.
+    if not self._buffer_list:
+      self._buffer_list.append(event_object)
+      return
+
+    if not self._buffer_keys:
+      self._buffer_keys[self._buffer_list[0].EqualityKey()] = 0
+
+    key = event_object.EqualityKey()
+    index = self._buffer_keys.get(key, None)
+    if index is None:
+      self._buffer_keys[key] = len(self._buffer_list)
+      self._buffer_list.append(event_object)
+    else:
+      self.JoinEvents(event_object, self._buffer_list[index])
+      self._buffer_list[index] = event_object
 
   def Flush(self):
     """Flushes the buffer by sending records to a formatter and prints."""
-    if not self._buffer_dict:
+    if not self._buffer_list:
       return
 
-    for event_object in self._buffer_dict.values():
+    for event_object in self._buffer_list:
       try:
         self._output_module.WriteEvent(event_object)
       except errors.WrongFormatter as exception:
         logging.error(u'Unable to write event: {:s}'.format(exception))
 
-    self._buffer_dict = {}
+    self._buffer_keys = {}
+    self._buffer_list = []
 
   def JoinEvents(self, event_a, event_b):
     """Join this EventObject with another one."""
@@ -238,7 +262,8 @@ class EventBuffer(object):
     self.Flush()
 
     if self._output_module:
-      self._output_module.WriteFooter()
+      if self._write_header_and_footer:
+        self._output_module.WriteFooter()
       self._output_module.Close()
 
   def __exit__(self, unused_type, unused_value, unused_traceback):
@@ -19,6 +19,10 @@ class TestEvent(object):
     except ValueError:
       self.timestamp = 0
     self.entry = entry
+
+  def EqualityKey(self):
+    return (self.timestamp, self.entry)
+
   def EqualityString(self):
     return u';'.join(map(str, [self.timestamp, self.entry]))
 
@@ -134,7 +138,7 @@ class EventBufferTest(test_lib.OutputModuleTestCase):
       expected_length = 0
 
     # pylint: disable=protected-access
-    self.assertEqual(len(event_buffer._buffer_dict), expected_length)
+    self.assertEqual(len(event_buffer._buffer_list), expected_length)
 
   def testFlush(self):
     """Test to ensure we empty our buffers and sends to output properly."""
@@ -163,6 +167,33 @@ class EventBufferTest(test_lib.OutputModuleTestCase):
     event_buffer.Append(TestEvent(123457, u'Now is different'))
     self._CheckBufferLength(event_buffer, 1)
 
+  def testAppendWithDedups(self):
+    """Test to ensure duplicate events are merged."""
+    output_mediator = self._CreateOutputMediator()
+    output_writer = cli_test_lib.TestOutputWriter()
+    output_module = TestOutputModule(
+        output_mediator, output_writer=output_writer)
+    event_buffer = interface.EventBuffer(output_module, True)
+
+    event_buffer.Append(TestEvent(123456, u'Now is now'))
+    self._CheckBufferLength(event_buffer, 1)
+
+    event_buffer.Append(TestEvent(123456, u'OMG I AM DIFFERENT'))
+    event_buffer.Append(TestEvent(123456, u'Now is now'))
+    event_buffer.Append(TestEvent(123456, u'Now is now'))
+    self._CheckBufferLength(event_buffer, 2)
+    self.assertEqual(event_buffer.duplicate_counter, 2)
+
+    # The events are kept in the order they were appended.
+    # pylint: disable=protected-access
+    entries = [
+        event_object.entry for event_object in event_buffer._buffer_list]
+    self.assertEqual(entries, [u'Now is now', u'OMG I AM DIFFERENT'])
+
+    event_buffer.Append(TestEvent(123457, u'Now is now'))
+    self._CheckBufferLength(event_buffer, 1)
+    self.assertEqual(event_buffer.duplicate_counter, 2)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -7,7 +7,6 @@ http://forensicswiki.org/wiki/L2T_CSV
 
 from plaso.lib import definitions
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -87,8 +86,9 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
           u'Unable to find event formatter for: {0:s}.'.format(
               getattr(event_object, u'data_type', u'UNKNOWN')))
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event_object.timestamp, self._output_mediator.timezone)
+    year, month, day_of_month, hours, minutes, seconds, _ = (
+        self._output_mediator.timestamp_converter.CopyToDateTimeValues(
+            event_object.timestamp))
 
     format_variables = self._output_mediator.GetFormatStringAttributeNames(
         event_object)
@@ -132,10 +132,8 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
       notes.append(u'-')
 
     row = (
-        u'{0:02d}/{1:02d}/{2:04d}'.format(
-            date_use.month, date_use.day, date_use.year),
-        u'{0:02d}:{1:02d}:{2:02d}'.format(
-            date_use.hour, date_use.minute, date_use.second),
+        u'{0:02d}/{1:02d}/{2:04d}'.format(month, day_of_month, year),
+        u'{0:02d}:{1:02d}:{2:02d}'.format(hours, minutes, seconds),
         self._output_mediator.timezone,
         self._output_mediator.GetMACBRepresentation(event_object),
         source_short,
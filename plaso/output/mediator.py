@@ -5,6 +5,7 @@ import logging
 
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import eventdata
+from plaso.lib import timelib
 
 import pytz
 
@@ -34,6 +35,7 @@ class OutputMediator(object):
     self._hostnames = None
     self._preprocess_objects = None
     self._storage_object = storage_object
+    self._timestamp_converter = None
     self._timezone = None
 
     self.fields_filter = fields_filter
@@ -89,6 +91,15 @@ class OutputMediator(object):
 
     return self._timezone
 
+  @property
+  def timestamp_converter(self):
+    """The timestamp converter (instance of TimestampConverter)."""
+    if not self._timestamp_converter:
+      self._timestamp_converter = timelib.TimestampConverter(
+          timezone=self.timezone)
+
+    return self._timestamp_converter
+
   # TODO: solve this differently in a future refactor.
   def GetConfigurationValue(self, identifier, default_value=None):
     """Retrieves a configuration value.
@@ -11,7 +11,6 @@ from plaso import formatters
 from plaso.formatters import interface as formatters_interface
 from plaso.lib import definitions
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -313,11 +312,9 @@ class MySQL4n6OutputModule(interface.OutputModule):
           u'Unable to find event formatter for: {0:s}.'.format(
               getattr(event_object, u'data_type', u'UNKNOWN')))
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event_object.timestamp, self._output_mediator.timezone)
-    if not date_use:
-      logging.error(u'Unable to process date for entry: {0:s}'.format(message))
-      return
+    year, month, day_of_month, hours, minutes, seconds, _ = (
+        self._output_mediator.timestamp_converter.CopyToDateTimeValues(
+            event_object.timestamp))
 
     format_variables = event_formatter.GetFormatStringAttributeNames()
     if format_variables is None:
@@ -342,8 +339,7 @@ class MySQL4n6OutputModule(interface.OutputModule):
         inode = event_object.pathspec.image_inode
 
     date_use_string = u'{0:d}-{1:d}-{2:d} {3:d}:{4:d}:{5:d}'.format(
-        date_use.year, date_use.month, date_use.day, date_use.hour,
-        date_use.minute, date_use.second)
+        year, month, day_of_month, hours, minutes, seconds)
 
     tags = []
     if hasattr(event_object, 'tag') and hasattr(event_object.tag, 'tags'):
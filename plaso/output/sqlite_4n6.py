@@ -3,7 +3,6 @@
 
 # TODO: Add a unit test for this output module.
 
-import logging
 import os
 import sys
 
@@ -13,7 +12,6 @@ from plaso import formatters
 from plaso.formatters import interface as formatters_interface
 from plaso.lib import definitions
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -225,11 +223,9 @@ class SQLite4n6OutputModule(interface.OutputModule):
           u'Unable to find event formatter for: {0:s}.'.format(
               getattr(event_object, u'data_type', u'UNKNOWN')))
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event_object.timestamp, self._output_mediator.timezone)
-    if not date_use:
-      logging.error(u'Unable to process date for entry: {0:s}'.format(message))
-      return
+    year, month, day_of_month, hours, minutes, seconds, _ = (
+        self._output_mediator.timestamp_converter.CopyToDateTimeValues(
+            event_object.timestamp))
     format_variables = self._output_mediator.GetFormatStringAttributeNames()
     if format_variables is None:
       raise errors.NoFormatterFound(
@@ -252,8 +248,7 @@ class SQLite4n6OutputModule(interface.OutputModule):
         inode = event_object.pathspec.image_inode
 
     date_use_string = u'{0:04d}-{1:02d}-{2:02d} {3:02d}:{4:02d}:{5:02d}'.format(
-        date_use.year, date_use.month, date_use.day, date_use.hour,
-        date_use.minute, date_use.second)
+        year, month, day_of_month, hours, minutes, seconds)
 
     tags = []
     if hasattr(event_object, 'tag'):
@@ -130,9 +130,9 @@ class TimesketchOutputModule(interface.OutputModule):
     # Adding attributes in that are calculated/derived.
     # We want to remove millisecond precision (causes some issues in
     # conversion).
-    event_values[u'datetime'] = timelib.Timestamp.CopyToIsoFormat(
-        timelib.Timestamp.RoundToSeconds(event_object.timestamp),
-        timezone=self._output_mediator.timezone)
+    event_values[u'datetime'] = (
+        self._output_mediator.timestamp_converter.CopyToIsoFormat(
+            timelib.Timestamp.RoundToSeconds(event_object.timestamp)))
 
     message, _ = self._output_mediator.GetFormattedMessages(event_object)
     if message is None:
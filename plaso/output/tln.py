@@ -29,8 +29,9 @@ class TLNBaseOutputModule(interface.LinearOutputModule):
      Returns:
        A string containing the value for the description field.
     """
-    date_time_string = timelib.Timestamp.CopyToIsoFormat(
-        event_object.timestamp, timezone=self._output_mediator.timezone)
+    date_time_string = (
+        self._output_mediator.timestamp_converter.CopyToIsoFormat(
+            event_object.timestamp))
     timestamp_description = getattr(event_object, u'timestamp_desc', u'UNKNOWN')
 
     message, _ = self._output_mediator.GetFormattedMessages(event_object)
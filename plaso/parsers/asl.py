@@ -4,10 +4,12 @@
 import construct
 import logging
 import os
+import struct
 
 from plaso.lib import errors
 from plaso.lib import event
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.lib import timelib
 from plaso.parsers import interface
 from plaso.parsers import manager
@@ -139,36 +141,27 @@ class AslParser(interface.SingleFileBaseParser):
 
   ASL_RECORD_STRUCT_SIZE = ASL_RECORD_STRUCT.sizeof()
 
+  _ASL_HEADER_DECODER = struct_decoder.StructDecoder(ASL_HEADER_STRUCT)
+
+  _ASL_RECORD_DECODER = struct_decoder.StructDecoder(ASL_RECORD_STRUCT)
+
   # 8-byte fields, they can be:
   # - String: [Nibble = 1000 (8)][Nibble = Length][7 Bytes = String].
   # - Integer: integer that has the byte position in the file that points
   #            to an ASL_RECORD_DYN_VALUE struct. If the value of the integer
   #            is equal to 0, it means that it has not data (skip).
 
-  # If the field is a String, we use this structure to decode each
-  # integer byte in the corresponding character (ASCII Char).
-  ASL_OCTET_STRING = construct.ExprAdapter(
-      construct.Octet('string'),
-      encoder=lambda obj, ctx: ord(obj),
-      decoder=lambda obj, ctx: chr(obj))
-
-  # Field string structure. If the first bit is 1, it means that it
+  # Field string flag. If the first bit is 1, it means that it
   # is a String (1000) = 8, then the next nibble has the number of
-  # characters. The last 7 bytes are the number of bytes.
-  ASL_STRING = construct.BitStruct(
-      'string',
-      construct.Flag('type'),
-      construct.Bits('filler', 3),
-      construct.If(
-          lambda ctx: ctx.type,
-          construct.Nibble('string_length')),
-      construct.If(
-          lambda ctx: ctx.type,
-          construct.Array(7, ASL_OCTET_STRING)))
+  # characters. The last 7 bytes contain the characters.
+  _ASL_STRING_FLAG = 0x80
+  _ASL_STRING_LENGTH_MASK = 0x0f
 
   # 8-byte pointer to a byte position in the file.
   ASL_POINTER = construct.UBInt64('pointer')
 
+  _ASL_POINTER = struct.Struct('>Q')
+
   # Dynamic data structure pointed by a pointer that contains a String:
   # [2 bytes padding][4 bytes length of String][String].
   ASL_RECORD_DYN_VALUE = construct.Struct(
@@ -191,8 +184,8 @@ class AslParser(interface.SingleFileBaseParser):
     file_object.seek(0, os.SEEK_SET)
 
     try:
-      header = self.ASL_HEADER_STRUCT.parse_stream(file_object)
-    except (IOError, construct.FieldError) as exception:
+      header = self._ASL_HEADER_DECODER.ReadRecord(file_object)
+    except (IOError, ValueError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse ASL Header with error: {0:s}.'.format(exception))
 
@@ -239,8 +232,8 @@ class AslParser(interface.SingleFileBaseParser):
       return None, None
 
     try:
-      record_header = self.ASL_RECORD_STRUCT.parse_stream(file_object)
-    except (IOError, construct.FieldError) as exception:
+      record_header = self._ASL_RECORD_DECODER.ReadRecord(file_object)
+    except (IOError, ValueError) as exception:
       logging.warning(
           u'Unable to parse ASL event with error: {0:s}'.format(exception))
       return None, None
@@ -283,26 +276,26 @@ class AslParser(interface.SingleFileBaseParser):
     while tam_fields > 0:
       try:
         raw_field = file_object.read(8)
-      except (IOError, construct.FieldError) as exception:
+      except IOError as exception:
         logging.warning(
-            u'Unable to parse ASL event with error: {0:d}'.format(exception))
+            u'Unable to parse ASL event with error: {0:s}'.format(exception))
         return None, None
-      try:
-        # Try to read as a String.
-        field = self.ASL_STRING.parse(raw_field)
-        values.append(''.join(field.string[0:field.string_length]))
+      if len(raw_field) != 8:
+        logging.warning(
+            u'Unable to parse ASL event with error: field data too small.')
+        return None, None
+
+      # Try to read as a String.
+      field_flags = ord(raw_field[0])
+      if field_flags & self._ASL_STRING_FLAG:
+        string_length = field_flags & self._ASL_STRING_LENGTH_MASK
+        values.append(raw_field[1:1 + string_length])
         # Go to parse the next extra field.
         tam_fields -= 8
         continue
-      except ValueError:
-        pass
+
       # If it is not a string, it must be a pointer.
-      try:
-        field = self.ASL_POINTER.parse(raw_field)
-      except ValueError as exception:
-        logging.warning(
-            u'Unable to parse ASL event with error: {0:s}'.format(exception))
-        return None, None
+      field, = self._ASL_POINTER.unpack(raw_field)
       if field != 0:
         # The next IF ELSE is only for performance issues, avoiding seek.
         # If the pointer points a lower position than where the actual entry
@@ -6,10 +6,12 @@ import construct
 import logging
 import os
 import socket
+import struct
 
 from plaso.lib import errors
 from plaso.lib import event
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.lib import timelib
 from plaso.unix import bsmtoken
 from plaso.parsers import interface
@@ -131,7 +133,7 @@ class BsmParser(interface.SingleFileBaseParser):
   #       I used the BSM_TYPE first to read the ID, and then, the structure.
   # Tokens always start with an ID value that identifies their token
   # type and subsequent structure.
-  BSM_TYPE = construct.UBInt8('token_id')
+  BSM_TYPE = struct.Struct('>B')
 
   # Data type structures.
   BSM_TOKEN_DATA_CHAR = construct.String('value', 1)
@@ -534,6 +536,30 @@ class BsmParser(interface.SingleFileBaseParser):
       129: ['BSM_TOKEN_AUT_SOCKINET128', BSM_TOKEN_AUT_SOCKINET128],
       130: ['BSM_TOKEN_SOCKET_UNIX', BSM_TOKEN_SOCKET_UNIX]}
 
+  # Token_ID -> decoder of the structure.
+  # Only the structures with a fixed layout have a decoder, the other
+  # structures are parsed with construct.
+  _TOKEN_DECODERS = {
+      19: struct_decoder.StructDecoder(BSM_TOKEN_TRAILER),
+      20: struct_decoder.StructDecoder(BSM_HEADER32),
+      21: struct_decoder.StructDecoder(BSM_HEADER64),
+      33: struct_decoder.StructDecoder(BSM_TOKEN_DATA),
+      34: struct_decoder.StructDecoder(BSM_TOKEN_IPC),
+      36: struct_decoder.StructDecoder(BSM_TOKEN_SUBJECT32),
+      38: struct_decoder.StructDecoder(BSM_TOKEN_PROCESS32),
+      39: struct_decoder.StructDecoder(BSM_TOKEN_RETURN32),
+      49: struct_decoder.StructDecoder(BSM_TOKEN_ATTR32),
+      50: struct_decoder.StructDecoder(BSM_TOKEN_IPC_PERM),
+      62: struct_decoder.StructDecoder(BSM_TOKEN_ATTR32),
+      82: struct_decoder.StructDecoder(BSM_TOKEN_EXIT),
+      114: struct_decoder.StructDecoder(BSM_TOKEN_RETURN64),
+      115: struct_decoder.StructDecoder(BSM_TOKEN_ATTR64),
+      117: struct_decoder.StructDecoder(BSM_TOKEN_SUBJECT64),
+      119: struct_decoder.StructDecoder(BSM_TOKEN_PROCESS64),
+      126: struct_decoder.StructDecoder(BSM_TOKEN_ADDR_EXT),
+      128: struct_decoder.StructDecoder(BSM_TOKEN_AUT_SOCKINET32),
+      129: struct_decoder.StructDecoder(BSM_TOKEN_AUT_SOCKINET128)}
+
   def __init__(self):
     """Initializes a parser object."""
     super(BsmParser, self).__init__()
@@ -541,6 +567,42 @@ class BsmParser(interface.SingleFileBaseParser):
     self.bsm_type_list_all = self.BSM_TYPE_LIST.copy()
     self.bsm_type_list_all.update(self.BSM_TYPE_LIST_NOT_TESTED)
 
+  def _ParseToken(self, token_id, structure, file_object):
+    """Parses a token at the current offset of a file-like object.
+
+    Args:
+      token_id: the identifier of the token type.
+      structure: the construct structure of the token.
+      file_object: a file-like object.
+
+    Returns:
+      The token, which is a named tuple if the structure has a fixed layout.
+
+    Raises:
+      ValueError: if a token with a fixed layout cannot be read.
+      construct.FieldError: if the token cannot be parsed.
+    """
+    token_decoder = self._TOKEN_DECODERS.get(token_id, None)
+    if token_decoder:
+      return token_decoder.ReadRecord(file_object)
+    return structure.parse_stream(file_object)
+
+  def _ReadTokenIdentifier(self, file_object):
+    """Reads a token identifier at the current offset of a file-like object.
+
+    Args:
+      file_object: a file-like object.
+
+    Returns:
+      An integer containing the identifier of the token type.
+
+    Raises:
+      IOError: if the token identifier cannot be read.
+      struct.error: if the end of the file-like object was reached.
+    """
+    token_id_data = file_object.read(self.BSM_TYPE.size)
+    return self.BSM_TYPE.unpack(token_id_data)[0]
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a BSM file-like object.
 
@@ -585,17 +647,13 @@ class BsmParser(interface.SingleFileBaseParser):
 
     # Token header, first token for each entry.
     try:
-      token_id = self.BSM_TYPE.parse_stream(file_object)
-    except (IOError, construct.FieldError):
+      token_id = self._ReadTokenIdentifier(file_object)
+    except (IOError, struct.error):
       return
 
     bsm_type, structure = self.BSM_TYPE_LIST.get(token_id, ['', ''])
-    if bsm_type == 'BSM_HEADER32':
-      token = structure.parse_stream(file_object)
-    elif bsm_type == 'BSM_HEADER64':
-      token = structure.parse_stream(file_object)
-    elif bsm_type == 'BSM_HEADER32_EX':
-      token = structure.parse_stream(file_object)
+    if bsm_type in ['BSM_HEADER32', 'BSM_HEADER64', 'BSM_HEADER32_EX']:
+      token = self._ParseToken(token_id, structure, file_object)
     else:
       logging.warning(
           u'Token ID Header {0} not expected at position 0x{1:X}.'
@@ -616,8 +674,8 @@ class BsmParser(interface.SingleFileBaseParser):
     while file_object.tell() < (offset + length):
       # Check if it is a known token.
       try:
-        token_id = self.BSM_TYPE.parse_stream(file_object)
-      except (IOError, construct.FieldError):
+        token_id = self._ReadTokenIdentifier(file_object)
+      except (IOError, struct.error):
         logging.warning(
             u'Unable to parse the Token ID at position: {0:d}'.format(
                 file_object.tell()))
@@ -627,7 +685,8 @@ class BsmParser(interface.SingleFileBaseParser):
         extra_tokens.extend(self.TryWithUntestedStructures(
             file_object, token_id, pending))
       else:
-        token = self.BSM_TYPE_LIST[token_id][1].parse_stream(file_object)
+        token = self._ParseToken(
+            token_id, self.BSM_TYPE_LIST[token_id][1], file_object)
         extra_tokens.append(self.FormatToken(token_id, token, file_object))
 
     if file_object.tell() > (offset + length):
@@ -694,30 +753,26 @@ class BsmParser(interface.SingleFileBaseParser):
 
     # First part of the entry is always a Header.
     try:
-      token_id = self.BSM_TYPE.parse_stream(file_object)
-    except (IOError, construct.FieldError):
+      token_id = self._ReadTokenIdentifier(file_object)
+    except (IOError, struct.error):
       return False
     if token_id not in self.BSM_TYPE_LIST:
       return False
 
     bsm_type, structure = self.BSM_TYPE_LIST.get(token_id, ['', ''])
     try:
-      if bsm_type == 'BSM_HEADER32':
-        header = structure.parse_stream(file_object)
-      elif bsm_type == 'BSM_HEADER64':
-        header = structure.parse_stream(file_object)
-      elif bsm_type == 'BSM_HEADER32_EX':
-        header = structure.parse_stream(file_object)
+      if bsm_type in ['BSM_HEADER32', 'BSM_HEADER64', 'BSM_HEADER32_EX']:
+        header = self._ParseToken(token_id, structure, file_object)
       else:
         return False
-    except (IOError, construct.FieldError):
+    except (IOError, ValueError, construct.FieldError):
       return False
     if header.bsm_header.version != self.AUDIT_HEADER_VERSION:
       return False
 
     try:
-      token_id = self.BSM_TYPE.parse_stream(file_object)
-    except (IOError, construct.FieldError):
+      token_id = self._ReadTokenIdentifier(file_object)
+    except (IOError, struct.error):
       return False
 
     # If is Mac OS X BSM file, next entry is a  text token indicating
@@ -765,23 +820,24 @@ class BsmParser(interface.SingleFileBaseParser):
     # Read all the "pending" bytes.
     try:
       if token_id in self.bsm_type_list_all:
-        token = self.bsm_type_list_all[token_id][1].parse_stream(file_object)
+        token = self._ParseToken(
+            token_id, self.bsm_type_list_all[token_id][1], file_object)
         extra_tokens.append(self.FormatToken(token_id, token, file_object))
         while file_object.tell() < (start_position + pending):
           # Check if it is a known token.
           try:
-            token_id = self.BSM_TYPE.parse_stream(file_object)
-          except (IOError, construct.FieldError):
+            token_id = self._ReadTokenIdentifier(file_object)
+          except (IOError, struct.error):
             logging.warning(
                 u'Unable to parse the Token ID at position: {0:d}'.format(
                     file_object.tell()))
             return
           if token_id not in self.bsm_type_list_all:
             break
-          token = self.bsm_type_list_all[token_id][1].parse_stream(
-              file_object)
+          token = self._ParseToken(
+              token_id, self.bsm_type_list_all[token_id][1], file_object)
           extra_tokens.append(self.FormatToken(token_id, token, file_object))
-    except (IOError, construct.FieldError):
+    except (IOError, ValueError, construct.FieldError):
       token_id = 255
 
     next_entry = (start_position + pending)
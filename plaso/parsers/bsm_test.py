@@ -176,6 +176,28 @@ class OpenBsmParserTest(test_lib.ParserTestCase):
 
     self.assertEqual(extra_tokens, expected_extra_tokens)
 
+  def testTokenDecoders(self):
+    """Tests that the token decoders are equivalent to the structures."""
+    # pylint: disable=protected-access
+    for token_id, token_decoder in self._parser._TOKEN_DECODERS.items():
+      _, structure = self._parser.bsm_type_list_all[token_id]
+      self.assertEqual(token_decoder.size, structure.sizeof())
+
+      data = b''.join(
+          chr(byte_value % 256) for byte_value in range(
+              token_id, token_id + token_decoder.size))
+      token = token_decoder.Decode(data)
+      expected_token = structure.parse(data)
+
+      for name in token._fields:
+        value = getattr(token, name)
+        expected_value = expected_token[name]
+        if hasattr(value, u'_fields'):
+          value = value._asdict()
+          expected_value = dict(
+              (key, expected_value[key]) for key in value.keys())
+        self.assertEqual(value, expected_value)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -11,6 +11,7 @@ from dfvfs.path import factory as path_spec_factory
 from plaso.events import time_events
 from plaso.lib import errors
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.parsers import interface
 from plaso.parsers import manager
 
@@ -100,6 +101,8 @@ class IndexFile(object):
       construct.ULInt64('creation_time'),
       construct.Padding(208))
 
+  _FILE_HEADER_DECODER = struct_decoder.StructDecoder(_FILE_HEADER)
+
   def __init__(self):
     """Initializes the index file object."""
     super(IndexFile, self).__init__()
@@ -117,25 +120,24 @@ class IndexFile(object):
     self._file_object.seek(0, os.SEEK_SET)
 
     try:
-      file_header = self._FILE_HEADER.parse_stream(self._file_object)
-    except construct.FieldError as exception:
+      file_header = self._FILE_HEADER_DECODER.ReadRecord(self._file_object)
+    except ValueError as exception:
       raise IOError(u'Unable to parse file header with error: {0:s}'.format(
           exception))
 
-    signature = file_header.get('signature')
+    signature = file_header.signature
 
     if signature != self.SIGNATURE:
       raise IOError(u'Unsupported index file signature')
 
     self.version = u'{0:d}.{1:d}'.format(
-        file_header.get('major_version'),
-        file_header.get('minor_version'))
+        file_header.major_version, file_header.minor_version)
 
     if self.version not in [u'2.0', u'2.1']:
       raise IOError(u'Unsupported index file version: {0:s}'.format(
           self.version))
 
-    self.creation_time = file_header.get('creation_time')
+    self.creation_time = file_header.creation_time
 
   def _ReadIndexTable(self):
     """Reads the index table."""
@@ -189,6 +191,8 @@ class DataBlockFile(object):
       construct.ULInt32('updating'),
       construct.Array(5, construct.ULInt32('user')))
 
+  _FILE_HEADER_DECODER = struct_decoder.StructDecoder(_FILE_HEADER)
+
   _CACHE_ENTRY = construct.Struct(
       'chrome_cache_entry',
       construct.ULInt32('hash'),
@@ -207,6 +211,8 @@ class DataBlockFile(object):
       construct.ULInt32('self_hash'),
       construct.Array(160, construct.UBInt8('key')))
 
+  _CACHE_ENTRY_DECODER = struct_decoder.StructDecoder(_CACHE_ENTRY)
+
   def __init__(self):
     """Initializes the data block file object."""
     super(DataBlockFile, self).__init__()
@@ -225,48 +231,48 @@ class DataBlockFile(object):
     self._file_object.seek(0, os.SEEK_SET)
 
     try:
-      file_header = self._FILE_HEADER.parse_stream(self._file_object)
-    except construct.FieldError as exception:
+      file_header = self._FILE_HEADER_DECODER.ReadRecord(self._file_object)
+    except ValueError as exception:
       raise IOError(u'Unable to parse file header with error: {0:s}'.format(
           exception))
 
-    signature = file_header.get('signature')
+    signature = file_header.signature
 
     if signature != self.SIGNATURE:
       raise IOError(u'Unsupported data block file signature')
 
     self.version = u'{0:d}.{1:d}'.format(
-        file_header.get('major_version'),
-        file_header.get('minor_version'))
+        file_header.major_version, file_header.minor_version)
 
     if self.version not in [u'2.0', u'2.1']:
       raise IOError(u'Unsupported data block file version: {0:s}'.format(
           self.version))
 
-    self.block_size = file_header.get('block_size')
-    self.number_of_entries = file_header.get('number_of_entries')
+    self.block_size = file_header.block_size
+    self.number_of_entries = file_header.number_of_entries
 
   def ReadCacheEntry(self, block_offset):
     """Reads a cache entry."""
     self._file_object.seek(block_offset, os.SEEK_SET)
 
     try:
-      cache_entry_struct = self._CACHE_ENTRY.parse_stream(self._file_object)
-    except construct.FieldError as exception:
+      cache_entry_struct = self._CACHE_ENTRY_DECODER.ReadRecord(
+          self._file_object)
+    except ValueError as exception:
       raise IOError(u'Unable to parse cache entry with error: {0:s}'.format(
           exception))
 
     cache_entry = CacheEntry()
 
-    cache_entry.hash = cache_entry_struct.get('hash')
+    cache_entry.hash = cache_entry_struct.hash
 
-    cache_entry.next = CacheAddress(cache_entry_struct.get('next_address'))
-    cache_entry.rankings_node = CacheAddress(cache_entry_struct.get(
-        'rankings_node_address'))
+    cache_entry.next = CacheAddress(cache_entry_struct.next_address)
+    cache_entry.rankings_node = CacheAddress(
+        cache_entry_struct.rankings_node_address)
 
-    cache_entry.creation_time = cache_entry_struct.get('creation_time')
+    cache_entry.creation_time = cache_entry_struct.creation_time
 
-    byte_array = cache_entry_struct.get('key')
+    byte_array = cache_entry_struct.key
     string = u''.join(map(chr, byte_array))
     cache_entry.key, _, _ = string.partition(u'\x00')
 
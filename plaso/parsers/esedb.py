@@ -43,6 +43,7 @@ class EseDbParser(interface.SingleFileBasePluginsParser):
     """Initializes a parser object."""
     super(EseDbParser, self).__init__()
     self._plugins = EseDbParser.GetPluginObjects()
+    self._plugin_dispatch_index = plugins.PluginDispatchIndex(self._plugins)
 
   @classmethod
   def GetFormatSpecification(cls):
@@ -70,9 +71,12 @@ class EseDbParser(interface.SingleFileBasePluginsParser):
           u'[{0:s}] unable to parse file {1:s} with error: {2:s}'.format(
               self.NAME, parser_mediator.GetDisplayName(), exception))
 
+    table_names = [esedb_table.name for esedb_table in esedb_file.tables]
+
     # Compare the list of available plugins.
     cache = EseDbCache()
-    for plugin_object in self._plugins:
+    for plugin_object in self._plugin_dispatch_index.GetPluginObjects(
+        table_names):
       try:
         plugin_object.UpdateChainAndProcess(
             parser_mediator, database=esedb_file, cache=cache)
@@ -216,6 +216,15 @@ class EseDbPlugin(plugins.BasePlugin):
 
     return table_names
 
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply.
+
+    Returns:
+      A set of the names of the required tables or None if no tables
+      are required.
+    """
+    return self._required_tables or None
+
   def GetEntries(self, parser_mediator, database=None, cache=None, **kwargs):
     """Extracts event objects from the database.
 
@@ -8,6 +8,7 @@ IIS/676400bc-8969-4aa7-851a-9319490a9bbb.mspx?mfr=true
 """
 
 import logging
+import re
 
 import pyparsing
 
@@ -124,6 +125,66 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
       ('comment', text_parser.PyparsingConstants.COMMENT_LINE_HASH),
       ('logline', LOG_LINE_6_0)]
 
+  # Regular expressions that match the same tokens as the structures above,
+  # which are used to parse the log lines without pyparsing.
+  _DATE_REGEX = r'\d{4}-\d{2}-\d{2}'
+  _TIME_REGEX = r'\d{2}:\d{2}:\d{2}'
+  _WORD_REGEX = r'[0-9A-Za-z-]+'
+  _INT_REGEX = r'[0-9]+|-'
+  _IP_REGEX = (
+      r'(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])'
+      r'(?:\.(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])){3}|'
+      r'[0-9A-Fa-f:]+|-')
+  _PORT_REGEX = r'[0-9]{1,6}|-'
+  _URI_REGEX = r'[0-9A-Za-z/.?&+;_=()\-:,%]+'
+
+  _LOG_LINE_REGEXES = {}
+
+  _LOG_LINE_REGEXES['date'] = ('date', _DATE_REGEX)
+  _LOG_LINE_REGEXES['time'] = ('time', _TIME_REGEX)
+  _LOG_LINE_REGEXES['s-sitename'] = ('s_sitename', _WORD_REGEX)
+  _LOG_LINE_REGEXES['s-ip'] = ('dest_ip', _IP_REGEX)
+  _LOG_LINE_REGEXES['cs-method'] = ('http_method', _WORD_REGEX)
+  _LOG_LINE_REGEXES['cs-uri-stem'] = ('requested_uri_stem', _URI_REGEX)
+  _LOG_LINE_REGEXES['cs-uri-query'] = ('cs_uri_query', _URI_REGEX)
+  _LOG_LINE_REGEXES['s-port'] = ('dest_port', _PORT_REGEX)
+  _LOG_LINE_REGEXES['cs-username'] = ('cs_username', _WORD_REGEX)
+  _LOG_LINE_REGEXES['c-ip'] = ('source_ip', _IP_REGEX)
+  _LOG_LINE_REGEXES['cs(User-Agent)'] = ('user_agent', _URI_REGEX)
+  _LOG_LINE_REGEXES['sc-status'] = ('http_status', _INT_REGEX)
+  _LOG_LINE_REGEXES['sc-substatus'] = ('sc_substatus', _INT_REGEX)
+  _LOG_LINE_REGEXES['sc-win32-status'] = ('sc_win32_status', _INT_REGEX)
+  _LOG_LINE_REGEXES['s-computername'] = ('s_computername', _URI_REGEX)
+  _LOG_LINE_REGEXES['sc-bytes'] = ('sent_bytes', _INT_REGEX)
+  _LOG_LINE_REGEXES['cs-bytes'] = ('received_bytes', _INT_REGEX)
+  _LOG_LINE_REGEXES['time-taken'] = ('time_taken', _INT_REGEX)
+  _LOG_LINE_REGEXES['cs-version'] = ('protocol_version', _WORD_REGEX)
+  _LOG_LINE_REGEXES['cs-host'] = ('cs_host', _WORD_REGEX)
+  _LOG_LINE_REGEXES['cs(Cookie)'] = ('cs_cookie', _URI_REGEX)
+  _LOG_LINE_REGEXES['cs(Referrer)'] = ('cs_referrer', _URI_REGEX)
+
+  # The fields of a log line are defined by the Fields comment, as such
+  # only the comment line structure is prefiltered.
+  LINE_STRUCTURE_PREFILTERS = {
+      'comment': re.compile(r'#')}
+
+  LINE_STRUCTURE_REGEXES = {
+      'logline': re.compile(r'[ \t]+'.join([
+          r'(?P<date>{0:s})'.format(_DATE_REGEX),
+          r'(?P<time>{0:s})'.format(_TIME_REGEX),
+          r'(?P<s_sitename>{0:s})'.format(_WORD_REGEX),
+          r'(?P<dest_ip>{0:s})'.format(_IP_REGEX),
+          r'(?P<http_method>{0:s})'.format(_WORD_REGEX),
+          r'(?P<cs_uri_stem>{0:s})'.format(_URI_REGEX),
+          r'(?P<cs_uri_query>{0:s})'.format(_URI_REGEX),
+          r'(?P<dest_port>{0:s})'.format(_PORT_REGEX),
+          r'(?P<cs_username>{0:s})'.format(_WORD_REGEX),
+          r'(?P<source_ip>{0:s})'.format(_IP_REGEX),
+          r'(?P<user_agent>{0:s})'.format(_URI_REGEX),
+          r'(?P<sc_status>{0:s})'.format(_INT_REGEX),
+          r'(?P<sc_substatus>{0:s})'.format(_INT_REGEX),
+          r'(?P<sc_win32_status>{0:s})$'.format(_INT_REGEX)]))}
+
   # Define a signature value for the log file.
   SIGNATURE = '#Software: Microsoft Internet Information Services'
 
@@ -192,6 +253,48 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
       # a structural fix.
       self._line_structures[1] = ('logline', log_line)
 
+      log_line_regex = self._GetLogLineRegex(comment[7:].split())
+      if log_line_regex:
+        self._line_structure_regexes['logline'] = log_line_regex
+      else:
+        self._line_structure_regexes.pop('logline', None)
+
+  def _GetLogLineRegex(self, fields):
+    """Builds the regular expression that parses a log line.
+
+    The fields are separated by whitespace and the regular expression of
+    each field does not match whitespace, hence the regular expression only
+    matches if every field is a single token that the corresponding pyparsing
+    structure would match completely.
+
+    Args:
+      fields: a list of the names of the fields of the log line.
+
+    Returns:
+      A compiled regular expression or None if the fields cannot be
+      represented by a regular expression.
+    """
+    if not fields:
+      return
+
+    field_regexes = []
+    results_names = set()
+    for field in fields:
+      results_name, regex = self._LOG_LINE_REGEXES.get(
+          field, (None, self._URI_REGEX))
+      if not results_name:
+        field_regexes.append(r'(?:{0:s})'.format(regex))
+        continue
+
+      # Named groups must be unique in a regular expression.
+      if results_name in results_names:
+        return
+
+      results_names.add(results_name)
+      field_regexes.append(r'(?P<{0:s}>{1:s})'.format(results_name, regex))
+
+    return re.compile(r'{0:s}$'.format(r'[ \t]+'.join(field_regexes)))
+
   def _ParseLogLine(self, structure):
     """Parse a single log line and return an EventObject."""
     date = structure.get('date', None)
@@ -203,8 +306,14 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
           u'{0:s}.').format(structure))
       return
 
-    year, month, day = date
-    hour, minute, second = time
+    if isinstance(date, basestring):
+      # The structure was parsed by a regular expression, which retains
+      # the date and time as strings.
+      year, month, day = [int(value, 10) for value in date.split(u'-')]
+      hour, minute, second = [int(value, 10) for value in time.split(u':')]
+    else:
+      year, month, day = date
+      hour, minute, second = time
 
     timestamp = timelib.Timestamp.FromTimeParts(
         year, month, day, hour, minute, second)
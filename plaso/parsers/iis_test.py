@@ -76,5 +76,28 @@ class WinIISUnitTest(test_lib.ParserTestCase):
 
     self._TestGetMessageStrings(event_object, expected_msg, expected_msg_short)
 
+  def testParseWithoutFastPath(self):
+    """Tests that the fast path produces the same events as pyparsing."""
+    test_file = self._GetTestFilePath([u'iis.log'])
+    event_queue_consumer = self._ParseFile(self._parser, test_file)
+    event_objects = self._GetEventObjectsFromQueue(event_queue_consumer)
+
+    parser_object = iis.WinIISParser()
+    parser_object.use_fast_path = False
+    event_queue_consumer = self._ParseFile(parser_object, test_file)
+    expected_event_objects = self._GetEventObjectsFromQueue(
+        event_queue_consumer)
+
+    self.assertEqual(len(event_objects), len(expected_event_objects))
+
+    for event_object, expected_event_object in zip(
+        event_objects, expected_event_objects):
+      event_values = event_object.GetValues()
+      expected_event_values = expected_event_object.GetValues()
+      del event_values[u'uuid']
+      del expected_event_values[u'uuid']
+      self.assertEqual(event_values, expected_event_values)
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -80,6 +80,10 @@ class MacWifiLogParser(text_parser.PyparsingSingleLineTextParser):
       ('logline', WIFI_LINE),
       ('header', WIFI_HEADER)]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'logline': re.compile(r'[^<]+<[^>]+>[^:]+:'),
+      'header': re.compile(r'[^*]+\*\*\*Starting Up\*\*\*')}
+
   def __init__(self):
     """Initializes a parser object."""
     super(MacWifiLogParser, self).__init__()
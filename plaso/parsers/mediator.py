@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 """The parser mediator object."""
 
+import copy
+import io
 import logging
 import os
+import uuid
 
 from dfvfs.lib import definitions as dfvfs_definitions
 
@@ -10,9 +13,37 @@ from plaso.lib import event
 from plaso.lib import utils
 
 
+class CachedFileObject(io.BytesIO):
+  """Class that implements a file-like object of cached file entry content.
+
+  The file-like object provides the get_offset and get_size methods of
+  a dfVFS file-like object.
+  """
+
+  def __init__(self, content):
+    """Initializes the file-like object.
+
+    Args:
+      content: a binary string containing the content.
+    """
+    super(CachedFileObject, self).__init__(content)
+    self._size = len(content)
+
+  def get_offset(self):
+    """Returns the current offset into the content."""
+    return self.tell()
+
+  def get_size(self):
+    """Returns the size of the content."""
+    return self._size
+
+
 class ParserMediator(object):
   """Class that implements the parser mediator."""
 
+  # The number of events produced between calls to the status callback.
+  _STATUS_CALLBACK_NUMBER_OF_EVENTS = 1000
+
   def __init__(
       self, event_queue_producer, parse_error_queue_producer, knowledge_base):
     """Initializes a parser mediator object.
@@ -28,14 +59,18 @@ class ParserMediator(object):
     """
     super(ParserMediator, self).__init__()
     self._abort = False
+    self._event_object_serializer = None
     self._event_queue_producer = event_queue_producer
     self._extra_event_attributes = {}
+    self._file_content = None
     self._file_entry = None
     self._filter_object = None
     self._knowledge_base = knowledge_base
     self._mount_path = None
     self._parse_error_queue_producer = parse_error_queue_producer
     self._parser_chain_components = []
+    self._recorded_events = None
+    self._status_callback = None
     self._text_prepend = None
 
     self.number_of_events = 0
@@ -181,7 +216,8 @@ class ParserMediator(object):
               can be used to ignore setting the offset.
 
     Returns:
-      A file-like object (instance of dfvfs.FileIO).
+      A file-like object (instance of dfvfs.FileIO or CachedFileObject if
+      the content of the file entry is cached).
 
     Raises:
       ValueError: If no file entry is set in the mediator.
@@ -189,7 +225,10 @@ class ParserMediator(object):
     if not self._file_entry:
       raise ValueError(u'Missing file entry')
 
-    file_object = self._file_entry.GetFileObject()
+    if self._file_content is not None:
+      file_object = CachedFileObject(self._file_content)
+    else:
+      file_object = self._file_entry.GetFileObject()
     if offset is not None:
       file_object.seek(offset, os.SEEK_SET)
     return file_object
@@ -276,23 +315,58 @@ class ParserMediator(object):
 
       setattr(event_object, attribute, value)
 
-  def ProduceEvent(self, event_object, query=None):
-    """Produces an event onto the queue.
+  def _ProduceEvent(self, event_object, parser_chain, query=None):
+    """Processes an event and produces it onto the queue.
 
     Args:
       event_object: the event object (instance of EventObject).
+      parser_chain: string containing the parsing chain.
       query: Optional query string. The default is None.
     """
     self.ProcessEvent(
-        event_object, parser_chain=self.GetParserChain(),
+        event_object, parser_chain=parser_chain,
         file_entry=self._file_entry, query=query)
 
     if self.MatchesFilter(event_object):
       return
 
+    if self._event_object_serializer:
+      event_object_data = self._event_object_serializer.WriteSerialized(
+          event_object)
+
+      # Check if the event object failed to serialize (none is returned).
+      if event_object_data is None:
+        return
+
+      event_object = event.SerializedEventObject(
+          event_object.timestamp, getattr(event_object, u'parser', None),
+          event_object.data_type, event_object_data,
+          plugin=getattr(event_object, u'plugin', None))
+
     self._event_queue_producer.ProduceItem(event_object)
     self.number_of_events += 1
 
+    if (self._status_callback and
+        not self.number_of_events % self._STATUS_CALLBACK_NUMBER_OF_EVENTS):
+      self._status_callback()
+
+  def ProduceEvent(self, event_object, query=None):
+    """Produces an event onto the queue.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+      query: Optional query string. The default is None.
+    """
+    parser_chain = self.GetParserChain()
+
+    if self._recorded_events is not None:
+      # The event is recorded before it is processed, since processing adds
+      # the attributes that are specific to the file entry.
+      self._recorded_events.append(
+          (copy.copy(event_object), parser_chain, query))
+
+    self._ProduceEvent(event_object, parser_chain, query=query)
+
   def ProduceEvents(self, event_objects, query=None):
     """Produces events onto the queue.
 
@@ -304,25 +378,54 @@ class ParserMediator(object):
     for event_object in event_objects:
       self.ProduceEvent(event_object, query=query)
 
-  def ProduceParseError(self, message):
-    """Produces a parse error.
+  def ProduceRecordedEvents(self, recorded_events):
+    """Produces previously recorded events for the current file entry.
 
     Args:
+      recorded_events: a list of recorded events and parse errors as returned
+                       by StopEventRecording.
+    """
+    for event_object, parser_chain, query_or_message in recorded_events:
+      if event_object is None:
+        self._ProduceParseError(parser_chain, query_or_message)
+        continue
+
+      event_object = copy.copy(event_object)
+      event_object.uuid = uuid.uuid4().get_hex()
+      self._ProduceEvent(event_object, parser_chain, query=query_or_message)
+
+  def _ProduceParseError(self, parser_chain, message):
+    """Produces a parse error onto the queue.
+
+    Args:
+      parser_chain: string containing the parsing chain.
       message: The message of the error.
     """
     self.number_of_parse_errors += 1
     # TODO: Remove call to logging when parser error queue is fully functional.
     logging.error(u'Error in {0:s} while parsing file {1:s}: {2:s}'.format(
-        self.GetParserChain(), self.GetDisplayName(), message))
+        parser_chain, self.GetDisplayName(), message))
 
     if self._parse_error_queue_producer:
       path_spec = self._file_entry.path_spec
-      parser_chain = self.GetParserChain()
       parse_error = event.ParseError(
           parser_chain, message, path_spec=path_spec)
       self._parse_error_queue_producer.ProduceItem(parse_error)
       self.number_of_parse_errors += 1
 
+  def ProduceParseError(self, message):
+    """Produces a parse error.
+
+    Args:
+      message: The message of the error.
+    """
+    parser_chain = self.GetParserChain()
+
+    if self._recorded_events is not None:
+      self._recorded_events.append((None, parser_chain, message))
+
+    self._ProduceParseError(parser_chain, message)
+
   def ResetCounters(self):
     """Resets the counters."""
     self.number_of_events = 0
@@ -330,15 +433,33 @@ class ParserMediator(object):
 
   def ResetFileEntry(self):
     """Resets the file entry and clears the parser chain."""
+    self._file_content = None
     self._file_entry = None
     self._parser_chain_components = []
 
-  def SetFileEntry(self, file_entry):
+  def SetEventObjectSerializer(self, event_object_serializer):
+    """Sets the event object serializer.
+
+    When set, the event objects are serialized before they are produced onto
+    the queue, which moves the serialization out of the storage writer.
+
+    Args:
+      event_object_serializer: the event object serializer (subclass of
+                               EventObjectSerializer) or None to produce
+                               the event objects unserialized.
+    """
+    self._event_object_serializer = event_object_serializer
+
+  def SetFileEntry(self, file_entry, file_content=None):
     """Sets the current file entry and clears the parser chain.
 
     Args:
       file_entry: the file entry (instance of dfvfs.FileEntry).
+      file_content: optional binary string containing the content of
+                    the file entry, which is provided to the parsers instead
+                    of reading the content again. The default is None.
     """
+    self._file_content = file_content
     self._file_entry = file_entry
     self._parser_chain_components = []
 
@@ -363,6 +484,18 @@ class ParserMediator(object):
 
     self._mount_path = mount_path
 
+  def SetStatusCallback(self, status_callback):
+    """Sets the status callback.
+
+    The status callback is called periodically while events are produced,
+    to report progress while a large file is parsed.
+
+    Args:
+      status_callback: function without arguments to call or None to not
+                       call a function.
+    """
+    self._status_callback = status_callback
+
   def SetTextPrepend(self, text_prepend):
     """Sets the text prepend.
 
@@ -371,6 +504,26 @@ class ParserMediator(object):
     """
     self._text_prepend = text_prepend
 
+  def StartEventRecording(self):
+    """Starts recording the produced events and parse errors.
+
+    The recorded events and parse errors can be produced again for another
+    file entry with the same content, using ProduceRecordedEvents.
+    """
+    self._recorded_events = []
+
+  def StopEventRecording(self):
+    """Stops recording the produced events and parse errors.
+
+    Returns:
+      A list of tuples containing an unprocessed copy of the event object
+      (instance of EventObject), the parser chain and the query. For a parse
+      error the event object is None and the query is the error message.
+    """
+    recorded_events = self._recorded_events
+    self._recorded_events = None
+    return recorded_events or []
+
   def SignalAbort(self):
     """Signals the parsers to abort."""
     self._abort = True
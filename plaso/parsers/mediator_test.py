@@ -9,6 +9,9 @@ from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.engine import single_process
+from plaso.engine import test_lib as engine_test_lib
+from plaso.lib import event
+from plaso.parsers import mediator
 from plaso.parsers import test_lib
 
 
@@ -47,6 +50,93 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     # TODO: add test with relative path.
 
+  def testGetFileObject(self):
+    """Tests the GetFileObject function."""
+    event_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    parsers_mediator = self._GetParserMediator(
+        event_queue, parse_error_queue, knowledge_base_values=None)
+
+    with self.assertRaises(ValueError):
+      _ = parsers_mediator.GetFileObject()
+
+    test_path = self._GetTestFilePath([u'syslog'])
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        definitions.TYPE_INDICATOR_OS, location=test_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(os_path_spec)
+
+    parsers_mediator.SetFileEntry(file_entry)
+    file_object = parsers_mediator.GetFileObject(offset=4)
+    try:
+      file_size = file_object.get_size()
+      self.assertEqual(file_object.get_offset(), 4)
+      file_content = file_object.read(16)
+    finally:
+      file_object.close()
+
+    parsers_mediator.SetFileEntry(
+        file_entry, file_content=b'Jan 22 07:52:33 myhostname')
+    file_object = parsers_mediator.GetFileObject(offset=4)
+    try:
+      self.assertIsInstance(file_object, mediator.CachedFileObject)
+      self.assertEqual(file_object.get_size(), 26)
+      self.assertEqual(file_object.get_offset(), 4)
+      self.assertEqual(file_object.read(16), file_content)
+    finally:
+      file_object.close()
+
+    self.assertGreater(file_size, 26)
+
+    parsers_mediator.ResetFileEntry()
+    with self.assertRaises(ValueError):
+      _ = parsers_mediator.GetFileObject()
+
+  def testProduceRecordedEvents(self):
+    """Tests the ProduceRecordedEvents function."""
+    event_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    parsers_mediator = self._GetParserMediator(
+        event_queue, parse_error_queue, knowledge_base_values=None)
+
+    test_path = self._GetTestFilePath([u'syslog'])
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        definitions.TYPE_INDICATOR_OS, location=test_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(os_path_spec)
+
+    event_object = event.EventObject()
+    event_object.timestamp = 0
+    event_object.data_type = u'test:event'
+
+    parsers_mediator.SetFileEntry(file_entry)
+    parsers_mediator.StartEventRecording()
+    parsers_mediator.ProduceEvent(event_object)
+    parsers_mediator.ProduceParseError(u'test error')
+    recorded_events = parsers_mediator.StopEventRecording()
+
+    self.assertEqual(len(recorded_events), 2)
+
+    # The recorded events and parse errors are produced again.
+    parsers_mediator.ProduceRecordedEvents(recorded_events)
+    parsers_mediator.ResetFileEntry()
+
+    event_queue_consumer = engine_test_lib.TestQueueConsumer(event_queue)
+    event_queue_consumer.ConsumeItems()
+    event_objects = event_queue_consumer.items
+
+    self.assertEqual(len(event_objects), 2)
+    self.assertEqual(event_objects[1].data_type, u'test:event')
+    self.assertNotEqual(event_objects[0].uuid, event_objects[1].uuid)
+
+    parse_error_queue_consumer = engine_test_lib.TestQueueConsumer(
+        parse_error_queue)
+    parse_error_queue_consumer.ConsumeItems()
+    parse_errors = parse_error_queue_consumer.items
+
+    self.assertEqual(len(parse_errors), 2)
+    self.assertEqual(parse_errors[1].description, u'test error')
+
   # TODO: add more tests.
 
 
@@ -9,6 +9,7 @@ from plaso.lib import errors
 from plaso.lib import specification
 from plaso.parsers import interface
 from plaso.parsers import manager
+from plaso.parsers import plugins
 
 
 if pyolecf.get_version() < '20131012':
@@ -35,6 +36,8 @@ class OleCfParser(interface.SingleFileBasePluginsParser):
         self._default_plugin = self._plugins.pop(list_index)
         break
 
+    self._plugin_dispatch_index = plugins.PluginDispatchIndex(self._plugins)
+
   @classmethod
   def GetFormatSpecification(cls):
     """Retrieves the format specification."""
@@ -79,7 +82,8 @@ class OleCfParser(interface.SingleFileBasePluginsParser):
     # the default plugin) and run it. Only if none of the plugins
     # works will we use the default plugin.
     parsed = False
-    for plugin_object in self._plugins:
+    for plugin_object in self._plugin_dispatch_index.GetPluginObjects(
+        item_names):
       try:
         plugin_object.UpdateChainAndProcess(
             parser_mediator, root_item=root_item, item_names=item_names)
@@ -16,6 +16,15 @@ class OlecfPlugin(plugins.BasePlugin):
   # List of tables that should be present in the database, for verification.
   REQUIRED_ITEMS = frozenset([])
 
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply.
+
+    Returns:
+      A set of the names of the required root items or None if no items
+      are required.
+    """
+    return self.REQUIRED_ITEMS or None
+
   def GetTimestamps(self, olecf_item):
     """Takes an OLECF object and returns extracted timestamps.
 
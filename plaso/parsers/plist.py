@@ -13,6 +13,7 @@ from plaso.lib import errors
 from plaso.lib import utils
 from plaso.parsers import interface
 from plaso.parsers import manager
+from plaso.parsers import plugins
 
 
 class PlistParser(interface.SingleFileBasePluginsParser):
@@ -38,6 +39,7 @@ class PlistParser(interface.SingleFileBasePluginsParser):
     """Initializes a parser object."""
     super(PlistParser, self).__init__()
     self._plugins = PlistParser.GetPluginObjects()
+    self._plugin_dispatch_index = plugins.PluginDispatchIndex(self._plugins)
 
   def GetTopLevel(self, file_object, file_name=''):
     """Returns the deserialized content of a plist as a dictionary object.
@@ -118,7 +120,9 @@ class PlistParser(interface.SingleFileBasePluginsParser):
           u'[{0:s}] unable to parse: {1:s} skipping.'.format(
               self.NAME, file_entry.name))
 
-    for plugin_object in self._plugins:
+    plugin_objects = self._plugin_dispatch_index.GetPluginObjects(
+        [file_entry.name.lower()])
+    for plugin_object in plugin_objects:
       try:
         plugin_object.UpdateChainAndProcess(
             parser_mediator, plist_name=file_entry.name,
@@ -19,6 +19,14 @@ class AppleAccountPlugin(interface.PlistPlugin):
   PLIST_PATH = u'com.apple.coreservices.appleidauthenticationinfo'
   PLIST_KEYS = frozenset(['AuthCertificates', 'AccessorVersions', 'Accounts'])
 
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply.
+
+    Returns:
+      None since the name of the plist file is matched by prefix.
+    """
+    return
+
   def Process(self, parser_mediator, plist_name, top_level, **kwargs):
     """Check if it is a valid Apple account plist file name.
 
@@ -58,6 +58,19 @@ class PlistPlugin(plugins.BasePlugin):
   # Ex. ['http://www.forensicswiki.org/wiki/Property_list_(plist)']
   URLS = []
 
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply.
+
+    Returns:
+      A set containing the lower case name of the plist file or None if
+      the plugin applies to plist files with any name.
+    """
+    plist_path = self.PLIST_PATH.lower()
+    if plist_path == u'any':
+      return
+
+    return frozenset([plist_path])
+
   @abc.abstractmethod
   def GetEntries(
       self, parser_mediator, top_level=None, match=None, **unused_kwargs):
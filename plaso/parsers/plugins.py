@@ -50,6 +50,19 @@ class BasePlugin(object):
     """Return the name of the plugin."""
     return self.NAME
 
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply.
+
+    The dispatch keys are used by the plugin dispatch index to determine
+    the candidate plugins without calling Process() of every plugin.
+
+    Returns:
+      A set of keys, such as names of database tables, that all must be
+      present in the data for the plugin to apply or None if the plugin
+      should be considered for all data.
+    """
+    return
+
   def Process(self, unused_parser_mediator, **kwargs):
     """Evaluates if this is the correct plugin and processes data accordingly.
 
@@ -87,6 +100,64 @@ class BasePlugin(object):
       parser_mediator.PopFromParserChain()
 
 
+class PluginDispatchIndex(object):
+  """Class that implements a plugin pre-dispatch index.
+
+  The index is built once from the dispatch keys of the plugins. Every plugin
+  is indexed under a single one of its dispatch keys, hence only plugins
+  indexed under a key that is present in the data are checked for their
+  other dispatch keys. The candidate plugins still determine themselves if
+  they apply when processing the data.
+  """
+
+  def __init__(self, plugin_objects):
+    """Initializes the plugin dispatch index object.
+
+    Args:
+      plugin_objects: a list of plugin objects (instances of BasePlugin).
+    """
+    super(PluginDispatchIndex, self).__init__()
+    self._plugins_per_key = {}
+    self._unindexed_plugins = []
+
+    for plugin_index, plugin_object in enumerate(plugin_objects):
+      dispatch_keys = plugin_object.GetDispatchKeys()
+      if not dispatch_keys:
+        self._unindexed_plugins.append((plugin_index, plugin_object, None))
+        continue
+
+      # Note that any of the dispatch keys can be used to index the plugin,
+      # sorting makes the index deterministic.
+      dispatch_keys = frozenset(dispatch_keys)
+      index_key = sorted(dispatch_keys)[0]
+      self._plugins_per_key.setdefault(index_key, []).append(
+          (plugin_index, plugin_object, dispatch_keys))
+
+  def GetPluginObjects(self, keys):
+    """Retrieves the candidate plugins for the keys present in the data.
+
+    Args:
+      keys: an iterable of the keys present in the data, such as the names
+            of the database tables.
+
+    Returns:
+      A list of plugin objects (instances of BasePlugin), in the order
+      the plugins were indexed.
+    """
+    keys = frozenset(keys)
+
+    candidate_plugins = list(self._unindexed_plugins)
+    for key in keys:
+      for plugin_index, plugin_object, dispatch_keys in (
+          self._plugins_per_key.get(key, [])):
+        if keys.issuperset(dispatch_keys):
+          candidate_plugins.append((plugin_index, plugin_object, None))
+
+    return [
+        plugin_object for _, plugin_object, _ in sorted(
+            candidate_plugins, key=lambda candidate: candidate[0])]
+
+
 class BasePluginCache(object):
   """A generic cache object for plugins.
 
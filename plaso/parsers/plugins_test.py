@@ -0,0 +1,68 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the plugins interface."""
+
+import unittest
+
+from plaso.parsers import plugins
+
+
+class TestPlugin(plugins.BasePlugin):
+  """Plugin with dispatch keys for testing."""
+
+  NAME = u'test_plugin'
+
+  def __init__(self, name, dispatch_keys):
+    """Initializes the test plugin object.
+
+    Args:
+      name: the name of the plugin.
+      dispatch_keys: a set of dispatch keys or None.
+    """
+    super(TestPlugin, self).__init__()
+    self._dispatch_keys = dispatch_keys
+    self.NAME = name
+
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply."""
+    return self._dispatch_keys
+
+
+class PluginDispatchIndexTest(unittest.TestCase):
+  """Tests for the plugin dispatch index."""
+
+  def testGetPluginObjects(self):
+    """Tests the GetPluginObjects function."""
+    plugin_objects = [
+        TestPlugin(u'chrome', frozenset([u'downloads', u'urls', u'visits'])),
+        TestPlugin(u'default', None),
+        TestPlugin(u'cookies', frozenset([u'cookies', u'meta'])),
+        TestPlugin(u'meta', frozenset([u'meta']))]
+
+    dispatch_index = plugins.PluginDispatchIndex(plugin_objects)
+
+    plugin_names = [
+        plugin_object.NAME for plugin_object in
+        dispatch_index.GetPluginObjects([u'cookies', u'meta'])]
+    self.assertEqual(plugin_names, [u'default', u'cookies', u'meta'])
+
+    plugin_names = [
+        plugin_object.NAME for plugin_object in
+        dispatch_index.GetPluginObjects([
+            u'meta', u'urls', u'visits', u'downloads', u'keywords'])]
+    self.assertEqual(plugin_names, [u'chrome', u'default', u'meta'])
+
+    # A plugin is only a candidate if all its dispatch keys are present.
+    plugin_names = [
+        plugin_object.NAME for plugin_object in
+        dispatch_index.GetPluginObjects([u'cookies', u'downloads'])]
+    self.assertEqual(plugin_names, [u'default'])
+
+    plugin_names = [
+        plugin_object.NAME for plugin_object in
+        dispatch_index.GetPluginObjects([])]
+    self.assertEqual(plugin_names, [u'default'])
+
+
+if __name__ == '__main__':
+  unittest.main()
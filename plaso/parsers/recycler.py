@@ -7,6 +7,7 @@ from plaso.events import time_events
 from plaso.lib import binary
 from plaso.lib import errors
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.parsers import interface
 from plaso.parsers import manager
 
@@ -26,23 +27,24 @@ class WinRecycleEvent(time_events.FiletimeEvent):
                       encoded).
       filename_utf: the filename in Unicode.
       record_information: the record information (instance of
-                          construct.Struct).
+                          collections.namedtuple).
       record_size: the size of the record.
       encoding: optional codepage used to encode the string with.
     """
-    timestamp = record_information.get(u'filetime', 0)
+    timestamp = getattr(record_information, u'filetime', 0)
 
     super(WinRecycleEvent, self).__init__(
         timestamp, eventdata.EventTimestamp.DELETED_TIME)
 
-    if u'index' in record_information:
-      self.index = record_information.get(u'index', 0)
+    # Note that a named tuple has an index method.
+    if u'index' in record_information._fields:
+      self.index = record_information.index
       self.offset = record_size * self.index
     else:
       self.offset = 0
 
-    self.drive_number = record_information.get(u'drive', None)
-    self.file_size = record_information.get(u'filesize', 0)
+    self.drive_number = getattr(record_information, u'drive', None)
+    self.file_size = getattr(record_information, u'filesize', 0)
 
     if filename_string and encoding:
       try:
@@ -76,6 +78,8 @@ class WinRecycleBinParser(interface.SingleFileBaseParser):
       construct.ULInt64(u'filesize'),
       construct.ULInt64(u'filetime'))
 
+  _RECORD_DECODER = struct_decoder.StructDecoder(RECORD_STRUCT)
+
   MAGIC_STRUCT = construct.ULInt64(u'magic')
 
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
@@ -105,7 +109,12 @@ class WinRecycleBinParser(interface.SingleFileBaseParser):
       raise errors.UnableToParseFile(
           u'Not an $Ixxx file, filename doesn\'t start with $I.')
 
-    record = self.RECORD_STRUCT.parse_stream(file_object)
+    try:
+      record = self._RECORD_DECODER.ReadRecord(file_object)
+    except (IOError, ValueError) as exception:
+      raise errors.UnableToParseFile(
+          u'Unable to parse $Ixxx record with error: {0:s}'.format(exception))
+
     filename_utf = binary.ReadUtf16Stream(file_object)
 
     event_object = WinRecycleEvent(u'', filename_utf, record, 0)
@@ -135,6 +144,8 @@ class WinRecyclerInfo2Parser(interface.SingleFileBaseParser):
       construct.ULInt64(u'filetime'),
       construct.ULInt32(u'filesize'))
 
+  _RECORD_DECODER = struct_decoder.StructDecoder(RECORD_STRUCT)
+
   STRING_STRUCT = construct.CString(u'legacy_filename')
 
   # Define a list of needed variables.
@@ -189,8 +200,8 @@ class WinRecyclerInfo2Parser(interface.SingleFileBaseParser):
       if len(data) != record_size:
         break
       filename_string = self.STRING_STRUCT.parse(data[4:])
-      record_information = self.RECORD_STRUCT.parse(
-          data[self.RECORD_INDEX_OFFSET:])
+      record_information = self._RECORD_DECODER.Decode(
+          data, offset=self.RECORD_INDEX_OFFSET)
       if read_unicode_names:
         filename_utf = binary.ReadUtf16(
             data[self.UNICODE_FILENAME_OFFSET:])
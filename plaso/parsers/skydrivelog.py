@@ -2,6 +2,7 @@
 """This file contains SkyDrive log file parser in plaso."""
 
 import logging
+import re
 
 import pyparsing
 
@@ -87,6 +88,10 @@ class SkyDriveLogParser(text_parser.PyparsingSingleLineTextParser):
       ('no_header_single_line', SDL_NO_HEADER_SINGLE_LINE),
   ]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'logline': re.compile(
+          r'\d{2}\s*-\s*\d{2}\s*-\s*\d{4}\s*\d{2}\s*:\s*\d{2}\s*:')}
+
   def __init__(self):
     """Initializes a parser object."""
     super(SkyDriveLogParser, self).__init__()
@@ -2,6 +2,7 @@
 """This file contains SkyDrive error log file parser in plaso."""
 
 import logging
+import re
 
 import pyparsing
 
@@ -105,6 +106,10 @@ class SkyDriveLogErrorParser(text_parser.PyparsingMultiLineTextParser):
       ('header', SDE_HEADER)
   ]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'logline': re.compile(r'\d{2}-\d{2}-\d{2},'),
+      'header': re.compile(r'######Logging started\.')}
+
   def __init__(self):
     """Initializes a parser object."""
     super(SkyDriveLogErrorParser, self).__init__()
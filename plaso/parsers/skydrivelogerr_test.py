@@ -69,6 +69,24 @@ class SkyDriveLogErrorUnitTest(test_lib.ParserTestCase):
     self._TestGetMessageStrings(
         event_objects[18], expected_string, expected_string_short)
 
+  def testParseWithoutFastPath(self):
+    """Tests the Parse function without the line structure prefilters."""
+    test_file = self._GetTestFilePath([u'skydriveerr.log'])
+    event_queue_consumer = self._ParseFile(self._parser, test_file)
+    event_objects = self._GetEventObjectsFromQueue(event_queue_consumer)
+
+    parser_object = skydrivelogerr.SkyDriveLogErrorParser()
+    parser_object.use_fast_path = False
+    event_queue_consumer = self._ParseFile(parser_object, test_file)
+    expected_event_objects = self._GetEventObjectsFromQueue(
+        event_queue_consumer)
+
+    self.assertEqual(len(event_objects), len(expected_event_objects))
+    for event_object, expected_event_object in zip(
+        event_objects, expected_event_objects):
+      self.assertEqual(event_object.timestamp, expected_event_object.timestamp)
+      self.assertEqual(event_object.detail, expected_event_object.detail)
+
   def testParseUnicode(self):
     """Tests the Parse function on Unicode data."""
     test_file = self._GetTestFilePath([u'skydriveerr-unicode.log'])
@@ -4,9 +4,12 @@
 import logging
 import os
 import tempfile
+import urllib
 
 import sqlite3
 
+from dfvfs.lib import definitions as dfvfs_definitions
+
 from plaso.lib import errors
 from plaso.parsers import interface
 from plaso.parsers import manager
@@ -78,6 +81,10 @@ class SQLiteDatabase(object):
 
   _READ_BUFFER_SIZE = 65536
 
+  # Value to indicate if the SQLite library interprets file names as URIs,
+  # which is None if not determined.
+  _uri_support = None
+
   def __init__(self, file_entry):
     """Initializes the database object.
 
@@ -115,6 +122,98 @@ class SQLiteDatabase(object):
 
     return self._tables
 
+  @classmethod
+  def _IsURISupported(cls):
+    """Determines if the SQLite library interprets file names as URIs.
+
+    Returns:
+      A boolean value indicating the SQLite library was built with URI
+      file names enabled.
+    """
+    if cls._uri_support is None:
+      database = sqlite3.connect(u':memory:')
+      try:
+        compile_options = [
+            row[0] for row in database.execute(u'PRAGMA compile_options')]
+      except sqlite3.DatabaseError:
+        compile_options = []
+      finally:
+        database.close()
+
+      cls._uri_support = u'USE_URI' in compile_options or (
+          u'USE_URI=1' in compile_options)
+
+    return cls._uri_support
+
+  def _Connect(self, database_path):
+    """Connects to the database and builds the list of table names.
+
+    Args:
+      database_path: the path or URI of the database.
+
+    Raises:
+      sqlite3.DatabaseError: if the database cannot be read.
+    """
+    self._database = sqlite3.connect(database_path)
+    try:
+      self._database.row_factory = sqlite3.Row
+      self._cursor = self._database.cursor()
+
+      # Make sure the database is never written to.
+      self._cursor.execute(u'PRAGMA query_only = ON')
+
+      # Verify the table by reading in all table names and compare it to
+      # the list of required tables.
+      sql_results = self._cursor.execute(
+          'SELECT name FROM sqlite_master WHERE type="table"')
+
+      self._tables = []
+      for row in sql_results:
+        self._tables.append(row[0])
+
+    except sqlite3.DatabaseError as exception:
+      self._database.close()
+      self._cursor = None
+      self._database = None
+      logging.debug(
+          u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
+              self._file_entry.name, exception))
+      raise
+
+  def _GetReadOnlyURI(self):
+    """Retrieves the URI to open the database in place read-only.
+
+    The database is only opened in place when it is stored directly on
+    the operating system file system and the SQLite library supports URI
+    file names. The URI opens the database read-only and as immutable, so
+    that SQLite does not lock the file, roll back a journal or create files
+    next to it. Like a copy of the database, a journal or write-ahead log
+    next to it is ignored.
+
+    A database stored inside a storage media image or VSS store cannot be
+    opened in place and is copied. An unchanged copy of such a database in
+    other VSS stores is not opened at all, since the extraction workers
+    reuse its parse results from the parse cache they share.
+
+    Returns:
+      A string containing the URI or None if the database cannot be opened
+      in place.
+    """
+    path_spec = self._file_entry.path_spec
+    if (path_spec.type_indicator != dfvfs_definitions.TYPE_INDICATOR_OS or
+        path_spec.HasParent()):
+      return
+
+    location = getattr(path_spec, u'location', None)
+    if not location or not self._IsURISupported():
+      return
+
+    if isinstance(location, unicode):
+      location = location.encode(u'utf-8')
+
+    return u'file:{0:s}?mode=ro&immutable=1'.format(
+        urllib.pathname2url(location))
+
   def Close(self):
     """Close the database connection and clean up the temporary file."""
     if not self._open:
@@ -122,13 +221,14 @@ class SQLiteDatabase(object):
 
     self._database.close()
 
-    try:
-      os.remove(self._temp_file_name)
-    except (OSError, IOError) as exception:
-      logging.warning((
-          u'Unable to remove temporary copy: {0:s} of SQLite database: {1:s} '
-          u'with error: {2:s}').format(
-              self._temp_file_name, self._file_entry.name, exception))
+    if self._temp_file_name:
+      try:
+        os.remove(self._temp_file_name)
+      except (OSError, IOError) as exception:
+        logging.warning((
+            u'Unable to remove temporary copy: {0:s} of SQLite database: '
+            u'{1:s} with error: {2:s}').format(
+                self._temp_file_name, self._file_entry.name, exception))
 
     self._tables = []
     self._database = None
@@ -138,73 +238,64 @@ class SQLiteDatabase(object):
   def Open(self):
     """Opens up a database connection and build a list of table names."""
     file_object = self._file_entry.GetFileObject()
+    try:
+      # TODO: Remove this when the classifier gets implemented
+      # and used. As of now, there is no check made against the file
+      # to verify its signature, thus all files are sent here, meaning
+      # that this method assumes everything is a SQLite file and starts
+      # copying the content of the file into memory, which is not good
+      # for very large files.
+      file_object.seek(0, os.SEEK_SET)
+
+      data = file_object.read(len(self.MAGIC))
+
+      if data != self.MAGIC:
+        raise IOError(
+            u'File {0:s} not a SQLite database. (invalid signature)'.format(
+                self._file_entry.name))
+
+      # A database on the operating system file system is opened in place,
+      # read-only, any other database is copied into a temporary file since
+      # sqlite3 can only open databases by path. Copies of unchanged
+      # databases in other VSS stores never get here since their parse
+      # results are reused from the parse cache of the extraction workers.
+      uri = self._GetReadOnlyURI()
+      if uri:
+        try:
+          self._Connect(uri)
+          self._open = True
+          return
 
-    # TODO: Remove this when the classifier gets implemented
-    # and used. As of now, there is no check made against the file
-    # to verify its signature, thus all files are sent here, meaning
-    # that this method assumes everything is a SQLite file and starts
-    # copying the content of the file into memory, which is not good
-    # for very large files.
-    file_object.seek(0, os.SEEK_SET)
-
-    data = file_object.read(len(self.MAGIC))
+        except sqlite3.DatabaseError:
+          logging.debug(
+              u'Unable to open SQLite database: {0:s} in place, copying '
+              u'it instead.'.format(self._file_entry.name))
+
+      # TODO: Change this into a proper implementation using APSW
+      # and virtual filesystems when that will be available.
+      # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
+      # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
+      # Until then, just copy the file into a tempfile and parse it.
+
+      # Note that data is filled here with the file header data and
+      # that with will explicitly close the temporary files and thus
+      # making sure it is available for sqlite3.connect().
+      with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        self._temp_file_name = temp_file.name
+        while data:
+          temp_file.write(data)
+          data = file_object.read(self._READ_BUFFER_SIZE)
 
-    if data != self.MAGIC:
-      file_object.close()
-      raise IOError(
-          u'File {0:s} not a SQLite database. (invalid signature)'.format(
-              self._file_entry.name))
-
-    # TODO: Current design copies the entire file into a buffer
-    # that is parsed by each SQLite parser. This is not very efficient,
-    # especially when many SQLite parsers are ran against a relatively
-    # large SQLite database. This temporary file that is created should
-    # be usable by all SQLite parsers so the file should only be read
-    # once in memory and then deleted when all SQLite parsers have completed.
-
-    # TODO: Change this into a proper implementation using APSW
-    # and virtual filesystems when that will be available.
-    # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
-    # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
-    # Until then, just copy the file into a tempfile and parse it.
-
-    # Note that data is filled here with the file header data and
-    # that with will explicitly close the temporary files and thus
-    # making sure it is available for sqlite3.connect().
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-      self._temp_file_name = temp_file.name
-      while data:
-        temp_file.write(data)
-        data = file_object.read(self._READ_BUFFER_SIZE)
-
-    self._database = sqlite3.connect(self._temp_file_name)
-    try:
-      self._database.row_factory = sqlite3.Row
-      self._cursor = self._database.cursor()
-    except sqlite3.DatabaseError as exception:
-      file_object.close()
-      logging.debug(
-          u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
-              self._file_entry.name, exception))
-      raise
+      try:
+        self._Connect(self._temp_file_name)
+      except sqlite3.DatabaseError:
+        os.remove(self._temp_file_name)
+        self._temp_file_name = ''
+        raise
 
-    # Verify the table by reading in all table names and compare it to
-    # the list of required tables.
-    try:
-      sql_results = self._cursor.execute(
-          'SELECT name FROM sqlite_master WHERE type="table"')
-    except sqlite3.DatabaseError as exception:
+    finally:
       file_object.close()
-      logging.debug(
-          u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
-              self._file_entry.name, exception))
-      raise
-
-    self._tables = []
-    for row in sql_results:
-      self._tables.append(row[0])
 
-    file_object.close()
     self._open = True
 
 
@@ -222,6 +313,7 @@ class SQLiteParser(interface.BasePluginsParser):
     super(SQLiteParser, self).__init__()
     self._local_zone = False
     self._plugins = SQLiteParser.GetPluginObjects()
+    self._plugin_dispatch_index = plugins.PluginDispatchIndex(self._plugins)
     self.db = None
 
   def Parse(self, parser_mediator, **kwargs):
@@ -248,7 +340,8 @@ class SQLiteParser(interface.BasePluginsParser):
 
       # Create a cache in which the resulting tables are cached.
       cache = SQLiteCache()
-      for plugin_object in self._plugins:
+      for plugin_object in self._plugin_dispatch_index.GetPluginObjects(
+          database.tables):
         try:
           plugin_object.UpdateChainAndProcess(
               parser_mediator, cache=cache, database=database)
@@ -54,6 +54,15 @@ class SQLitePlugin(plugins.BasePlugin):
       except sqlite3.DatabaseError as exception:
         logging.debug(u'SQLite error occurred: {0:s}'.format(exception))
 
+  def GetDispatchKeys(self):
+    """Retrieves the keys that are required for the plugin to apply.
+
+    Returns:
+      A set of the names of the required tables or None if no tables
+      are required.
+    """
+    return self.REQUIRED_TABLES or None
+
   def Process(self, parser_mediator, cache=None, database=None, **kwargs):
     """Determine if this is the right plugin for this database.
 
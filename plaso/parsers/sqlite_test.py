@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the SQLite database parser."""
 
+import os
 import unittest
 
 from plaso.parsers import sqlite
@@ -10,6 +11,50 @@ from plaso.parsers import test_lib
 from plaso.parsers import sqlite_plugins  # pylint: disable=unused-import
 
 
+class SQLiteDatabaseTest(test_lib.ParserTestCase):
+  """Tests for the SQLite database wrapper."""
+
+  def testOpenInPlace(self):
+    """Tests the Open function on a database that is not copied."""
+    # pylint: disable=protected-access
+    if not sqlite.SQLiteDatabase._IsURISupported():
+      return
+
+    # Opening a database in WAL mode in place does not create a shared
+    # memory file next to it.
+    test_path = self._GetTestFilePath([u'activity.sqlite'])
+    file_entry = self._GetTestFileEntryFromPath([u'activity.sqlite'])
+
+    with sqlite.SQLiteDatabase(file_entry) as database:
+      database.Open()
+      self.assertEqual(database._temp_file_name, u'')
+      self.assertNotEqual(database.tables, [])
+
+      self.assertFalse(os.path.exists(u'{0:s}-shm'.format(test_path)))
+      self.assertFalse(os.path.exists(u'{0:s}-wal'.format(test_path)))
+
+  def testOpenWithCopy(self):
+    """Tests the Open function on a database that is copied."""
+    file_entry = self._GetTestFileEntryFromPath([u'contacts2.db'])
+
+    # A database is copied if the SQLite library does not support URI file
+    # names.
+    # pylint: disable=protected-access
+    uri_support = sqlite.SQLiteDatabase._uri_support
+    sqlite.SQLiteDatabase._uri_support = False
+    try:
+      with sqlite.SQLiteDatabase(file_entry) as database:
+        database.Open()
+        temp_file_name = database._temp_file_name
+        self.assertNotEqual(temp_file_name, u'')
+        self.assertTrue(u'calls' in database.tables)
+
+    finally:
+      sqlite.SQLiteDatabase._uri_support = uri_support
+
+    self.assertFalse(os.path.exists(temp_file_name))
+
+
 class SQLiteParserTest(test_lib.ParserTestCase):
   """Tests for the SQLite database parser."""
 
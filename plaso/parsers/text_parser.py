@@ -30,7 +30,7 @@ import pytz
 
 
 class SlowLexicalTextParser(
-    interface.SingleFileBaseParser, lexer.SelfFeederMixIn):
+    interface.SingleFileBaseParser, lexer.BufferedSelfFeederMixIn):
   """Generic text based parser that uses lexer to assist with parsing.
 
   This text parser is based on a rather slow lexer, which makes the
@@ -64,7 +64,7 @@ class SlowLexicalTextParser(
                   timezone, like UTC.
     """
     # TODO: remove the multiple inheritance.
-    lexer.SelfFeederMixIn.__init__(self)
+    lexer.BufferedSelfFeederMixIn.__init__(self)
     interface.SingleFileBaseParser.__init__(self)
     self.line_ready = False
     self.attributes = {
@@ -139,7 +139,8 @@ class SlowLexicalTextParser(
         file_entry.path_spec.type_indicator, file_entry.name)
 
     self.file_entry = file_entry
-    # TODO: this is necessary since we inherit from lexer.SelfFeederMixIn.
+    # TODO: this is necessary since we inherit from
+    # lexer.BufferedSelfFeederMixIn.
     self.file_object = file_object
 
     # Start by checking, is this a text file or not? Before we proceed
@@ -162,7 +163,7 @@ class SlowLexicalTextParser(
 
       if self.state == 'INITIAL':
         self.entry_offset = getattr(self, 'next_entry_offset', 0)
-        self.next_entry_offset = file_object.tell() - len(self.buffer)
+        self.next_entry_offset = file_object.tell() - self.GetBufferSize()
 
       if not file_verified and self.error >= self.MAX_LINES * 2:
         logging.debug(
@@ -628,6 +629,23 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
   # The value is the actual pyparsing structure.
   LINE_STRUCTURES = []
 
+  # Optional regular expressions that are used to prefilter the lines before
+  # they are parsed by pyparsing, which is slow and signals a mismatch with
+  # an exception. This is defined as a dictionary of the key of the line
+  # structure and a compiled regular expression. The line structure is only
+  # tried if the regular expression matches the start of the line, hence the
+  # regular expression must match every line the line structure would parse.
+  # Line structures without a regular expression are always tried.
+  LINE_STRUCTURE_PREFILTERS = {}
+
+  # Optional regular expressions that fully parse common line shapes without
+  # pyparsing. This is defined as a dictionary of the key of the line structure
+  # and a compiled regular expression with named groups. If the regular
+  # expression matches the line, a dictionary of the named groups is passed to
+  # ParseRecord as the structure, otherwise the line is parsed by pyparsing.
+  # Hence ParseRecord must support both types of structure for the key.
+  LINE_STRUCTURE_REGEXES = {}
+
   # In order for the tool to not read too much data into a buffer to evaluate
   # whether or not the parser is the right one for this file or not we
   # specifically define a maximum amount of bytes a single line can occupy. This
@@ -649,9 +667,13 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
     super(PyparsingSingleLineTextParser, self).__init__()
     self.encoding = self.ENCODING
     self._current_offset = 0
-    # TODO: self._line_structures is a work-around and this needs
-    # a structural fix.
+    # TODO: self._line_structures and self._line_structure_regexes are
+    # a work-around and this needs a structural fix.
     self._line_structures = self.LINE_STRUCTURES
+    self._line_structure_regexes = dict(self.LINE_STRUCTURE_REGEXES)
+    # Indicates the line structure prefilters and regular expressions should
+    # be used, which can be disabled to compare the results with pyparsing.
+    self.use_fast_path = True
 
   def _ReadLine(
       self, parser_mediator, file_entry, text_file_object, max_len=0,
@@ -757,6 +779,19 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
       use_key = None
       # Try to parse the line using all the line structures.
       for key, structure in self.LINE_STRUCTURES:
+        if self.use_fast_path:
+          regex = self._line_structure_regexes.get(key, None)
+          if regex:
+            match = regex.match(line)
+            if match:
+              parsed_structure = match.groupdict()
+              use_key = key
+              break
+
+          prefilter = self.LINE_STRUCTURE_PREFILTERS.get(key, None)
+          if prefilter and not prefilter.match(line):
+            continue
+
         try:
           parsed_structure = structure.parseString(line)
         except pyparsing.ParseException:
@@ -989,6 +1024,20 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
 
       # Try to parse the line using all the line structures.
       for key, structure in self.LINE_STRUCTURES:
+        if self.use_fast_path:
+          regex = self._line_structure_regexes.get(key, None)
+          if regex:
+            match = regex.match(self._text_reader.lines)
+            if match:
+              tokens = match.groupdict()
+              start = 0
+              end = match.end()
+              break
+
+          prefilter = self.LINE_STRUCTURE_PREFILTERS.get(key, None)
+          if prefilter and not prefilter.match(self._text_reader.lines):
+            continue
+
         try:
           parsed_structure = next(
               structure.scanString(self._text_reader.lines, maxMatches=1), None)
@@ -5,10 +5,12 @@ import construct
 import logging
 import os
 import socket
+import struct
 
 from plaso.lib import errors
 from plaso.lib import event
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.lib import timelib
 from plaso.parsers import interface
 from plaso.parsers import manager
@@ -83,6 +85,10 @@ class UtmpParser(interface.SingleFileBaseParser):
 
   LINUX_UTMP_ENTRY_SIZE = LINUX_UTMP_ENTRY.sizeof()
 
+  _LINUX_UTMP_ENTRY_DECODER = struct_decoder.StructDecoder(LINUX_UTMP_ENTRY)
+
+  _IPV4_ADDRESS = struct.Struct(u'<I')
+
   STATUS_TYPE = {
       0: 'EMPTY',
       1: 'RUN_LVL',
@@ -113,8 +119,8 @@ class UtmpParser(interface.SingleFileBaseParser):
     """
     file_object.seek(0, os.SEEK_SET)
     try:
-      structure = self.LINUX_UTMP_ENTRY.parse_stream(file_object)
-    except (IOError, construct.FieldError) as exception:
+      structure = self._LINUX_UTMP_ENTRY_DECODER.ReadRecord(file_object)
+    except (IOError, ValueError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse UTMP Header with error: {0:s}'.format(exception))
 
@@ -154,11 +160,11 @@ class UtmpParser(interface.SingleFileBaseParser):
           u'Not an UTMP file, no timestamp set in the first record.')
 
     file_object.seek(0, os.SEEK_SET)
-    event_object = self._ReadUtmpEvent(file_object)
-    while event_object:
-      event_object.offset = file_object.tell()
+    for offset, entry in self._LINUX_UTMP_ENTRY_DECODER.ReadRecords(
+        file_object):
+      event_object = self._GetUtmpEvent(entry)
+      event_object.offset = offset + self.LINUX_UTMP_ENTRY_SIZE
       parser_mediator.ProduceEvent(event_object)
-      event_object = self._ReadUtmpEvent(file_object)
 
   def _VerifyTextField(self, text):
     """Check if a byte stream is a null terminated string.
@@ -174,27 +180,15 @@ class UtmpParser(interface.SingleFileBaseParser):
       return False
     return len(null_chars) == null_chars.count(b'\x00')
 
-  def _ReadUtmpEvent(self, file_object):
+  def _GetUtmpEvent(self, entry):
     """Returns an UtmpEvent from a single UTMP entry.
 
     Args:
-      file_object: a file-like object that points to an UTMP file.
+      entry: the UTMP entry (instance of collections.namedtuple).
 
     Returns:
-      An event object constructed from a single UTMP record or None if we
-      have reached the end of the file (or EOF).
+      An event object constructed from a single UTMP record.
     """
-    offset = file_object.tell()
-    data = file_object.read(self.LINUX_UTMP_ENTRY_SIZE)
-    if not data or len(data) != self.LINUX_UTMP_ENTRY_SIZE:
-      return
-    try:
-      entry = self.LINUX_UTMP_ENTRY.parse(data)
-    except (IOError, construct.FieldError):
-      logging.warning((
-          u'UTMP entry at 0x{:x} couldn\'t be parsed.').format(offset))
-      return self._ReadUtmpEvent(file_object)
-
     user = self._GetTextFromNullTerminatedString(entry.username)
     terminal = self._GetTextFromNullTerminatedString(entry.terminal)
     if terminal == '~':
@@ -207,10 +201,10 @@ class UtmpParser(interface.SingleFileBaseParser):
     if not entry.address_b:
       try:
         ip_address = socket.inet_ntoa(
-            construct.ULInt32('int').build(entry.address_a))
+            self._IPV4_ADDRESS.pack(entry.address_a))
         if ip_address == '0.0.0.0':
           ip_address = u'localhost'
-      except (IOError, construct.FieldError, socket.error):
+      except (socket.error, struct.error):
         ip_address = u'N/A'
     else:
       ip_address = u'{0:d}.{1:d}.{2:d}.{3:d}'.format(
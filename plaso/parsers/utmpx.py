@@ -4,13 +4,12 @@
 # TODO: Add support for other implementations than Mac OS X.
 #       The parser should be checked against IOS UTMPX file.
 
-import logging
-
 import construct
 
 from plaso.lib import errors
 from plaso.lib import event
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.lib import timelib
 from plaso.parsers import interface
 from plaso.parsers import manager
@@ -66,6 +65,8 @@ class UtmpxParser(interface.SingleFileBaseParser):
 
   MAC_UTMPX_ENTRY_SIZE = MAC_UTMPX_ENTRY.sizeof()
 
+  _MAC_UTMPX_ENTRY_DECODER = struct_decoder.StructDecoder(MAC_UTMPX_ENTRY)
+
   # 9, 10 and 11 are only for Darwin and IOS.
   MAC_STATUS_TYPE = {
       0: u'EMPTY',
@@ -81,27 +82,15 @@ class UtmpxParser(interface.SingleFileBaseParser):
       10: u'SIGNATURE',
       11: u'SHUTDOWN_TIME'}
 
-  def _ReadEntry(self, file_object):
-    """Reads an UTMPX entry.
+  def _GetEntryEvent(self, entry):
+    """Returns an event object from an UTMPX entry.
 
     Args:
-      file_object: a file-like object that points to an UTMPX file.
+      entry: the UTMPX entry (instance of collections.namedtuple).
 
     Returns:
       An event object constructed from the UTMPX entry.
     """
-    data = file_object.read(self.MAC_UTMPX_ENTRY_SIZE)
-    if len(data) != self.MAC_UTMPX_ENTRY_SIZE:
-      return
-
-    try:
-      entry = self.MAC_UTMPX_ENTRY.parse(data)
-    except (IOError, construct.FieldError) as exception:
-      logging.warning(
-          u'Unable to parse Mac OS X UTMPX entry with error: {0:s}'.format(
-              exception))
-      return
-
     user, _, _ = entry.user.partition(b'\x00')
     if not user:
       user = u'N/A'
@@ -131,8 +120,8 @@ class UtmpxParser(interface.SingleFileBaseParser):
     """
     # First entry is a SIGNAL entry of the file ("header").
     try:
-      header = self.MAC_UTMPX_ENTRY.parse_stream(file_object)
-    except (IOError, construct.FieldError):
+      header = self._MAC_UTMPX_ENTRY_DECODER.ReadRecord(file_object)
+    except (IOError, ValueError):
       return False
     user, _, _ = header.user.partition('\x00')
 
@@ -173,12 +162,11 @@ class UtmpxParser(interface.SingleFileBaseParser):
       raise errors.UnableToParseFile(
           u'The file is not an UTMPX file.')
 
-    event_object = self._ReadEntry(file_object)
-    while event_object:
-      event_object.offset = file_object.tell()
+    for offset, entry in self._MAC_UTMPX_ENTRY_DECODER.ReadRecords(
+        file_object):
+      event_object = self._GetEntryEvent(entry)
+      event_object.offset = offset + self.MAC_UTMPX_ENTRY_SIZE
       parser_mediator.ProduceEvent(event_object)
 
-      event_object = self._ReadEntry(file_object)
-
 
 manager.ParsersManager.RegisterParser(UtmpxParser)
@@ -7,6 +7,7 @@ from plaso.events import time_events
 from plaso.lib import binary
 from plaso.lib import errors
 from plaso.lib import eventdata
+from plaso.lib import struct_decoder
 from plaso.lib import timelib
 from plaso.parsers import interface
 from plaso.parsers import manager
@@ -97,6 +98,8 @@ class WinJobParser(interface.SingleFileBaseParser):
       construct.ULInt16('ran_millisecond'),
       )
 
+  _JOB_FIXED_DECODER = struct_decoder.StructDecoder(JOB_FIXED_STRUCT)
+
   # Using Construct's utf-16 encoding here will create strings with their
   # null terminators exposed. Instead, we'll read these variables raw and
   # convert them using Plaso's ReadUtf16() for proper formatting.
@@ -164,8 +167,8 @@ class WinJobParser(interface.SingleFileBaseParser):
       UnableToParseFile: when the file cannot be parsed.
     """
     try:
-      header = self.JOB_FIXED_STRUCT.parse_stream(file_object)
-    except (IOError, construct.FieldError) as exception:
+      header = self._JOB_FIXED_DECODER.ReadRecord(file_object)
+    except (IOError, ValueError) as exception:
       raise errors.UnableToParseFile(
           u'Unable to parse Windows Task Job file with error: {0:s}'.format(
               exception))
@@ -205,6 +205,42 @@ class WinRegistryParser(interface.BasePluginsParser):
       for recursed_key in self._RecurseKey(subkey):
         yield recursed_key
 
+  def _GetPluginsDispatchIndex(self, parser_mediator, plugins):
+    """Builds an index of the plugins by the key paths they support.
+
+    Key-based plugins only process the keys in their expanded list of key
+    paths, hence they only need to be called for these keys. All other
+    plugins, such as value-based plugins and the default plugin, are generic
+    and need to be called for every key.
+
+    Args:
+      parser_mediator: A parser mediator object (instance of ParserMediator).
+      plugins: a dictionary containing a list of plugin objects (instances of
+               RegistryPlugin) per weight.
+
+    Returns:
+      A tuple containing a dictionary of the key-based plugins per key path
+      per weight and a dictionary of a list of generic plugins per weight.
+    """
+    key_path_plugins = {}
+    generic_plugins = {}
+    for weight, weight_plugins in plugins.iteritems():
+      key_path_plugins[weight] = {}
+      generic_plugins[weight] = []
+
+      for plugin in weight_plugins:
+        # Cannot import the interface here otherwise this will create a cyclic
+        # dependency.
+        if not getattr(plugin, u'REG_KEYS', None):
+          generic_plugins[weight].append(plugin)
+          continue
+
+        plugin.ExpandKeys(parser_mediator)
+        for key_path in set(plugin.expanded_keys):
+          key_path_plugins[weight].setdefault(key_path, []).append(plugin)
+
+    return key_path_plugins, generic_plugins
+
   @classmethod
   def GetPluginList(cls):
     """Build a list of all available plugins.
@@ -289,24 +325,33 @@ class WinRegistryParser(interface.BasePluginsParser):
         u'Number of plugins for this Windows Registry file: {0:d}.'.format(
             number_of_plugins))
 
+    key_path_plugins, generic_plugins = self._GetPluginsDispatchIndex(
+        parser_mediator, plugins)
+
     # Recurse through keys in the file and apply the plugins in the order:
     # 1. file type specific key-based plugins.
     # 2. generic key-based plugins.
     # 3. file type specific value-based plugins.
     # 4. generic value-based plugins.
+    # Where key-based plugins are only applied to the keys they support.
     root_key = winreg_file.GetKeyByPath(u'\\')
 
+    weights = sorted(plugins.iterkeys())
     for key in self._RecurseKey(root_key):
-      for weight in plugins.iterkeys():
-        # TODO: determine if the plugin matches the key and continue
-        # to the next key.
-        for plugin in plugins[weight]:
+      for weight in weights:
+        for plugin in key_path_plugins[weight].get(key.path, []):
           if parser_mediator.abort:
             break
           plugin.UpdateChainAndProcess(
               parser_mediator, key=key, registry_type=self._registry_type,
               codepage=parser_mediator.codepage)
 
+        for plugin in generic_plugins[weight]:
+          if parser_mediator.abort:
+            break
+          plugin.UpdateChainAndProcess(
+              parser_mediator, key=key, registry_type=self._registry_type,
+              codepage=parser_mediator.codepage)
 
     winreg_file.Close()
 
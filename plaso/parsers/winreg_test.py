@@ -4,8 +4,11 @@
 
 import unittest
 
+from plaso.engine import single_process
 from plaso.parsers import test_lib
 from plaso.parsers import winreg
+# Register plugins.
+from plaso.parsers import winreg_plugins  # pylint: disable=unused-import
 
 
 class WinRegTest(test_lib.ParserTestCase):
@@ -34,6 +37,38 @@ class WinRegTest(test_lib.ParserTestCase):
     """Generate the correct parser chain for a given plugin."""
     return 'winreg/{0:s}'.format(plugin_name)
 
+  def testGetPluginsDispatchIndex(self):
+    """Tests the _GetPluginsDispatchIndex function."""
+    event_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+    parser_mediator = self._GetParserMediator(
+        event_queue, parse_error_queue,
+        knowledge_base_values={'current_control_set': u'ControlSet001'})
+
+    plugin_list = winreg.WinRegistryParser.GetPluginList()
+    plugins = {}
+    for weight in plugin_list.GetWeights():
+      plugins[weight] = [
+          plugin_class() for plugin_class in plugin_list.GetWeightPlugins(
+              weight, plugin_type='SYSTEM')]
+
+    # pylint: disable=protected-access
+    key_path_plugins, generic_plugins = self._parser._GetPluginsDispatchIndex(
+        parser_mediator, plugins)
+
+    key_path = u'\\ControlSet001\\Enum\\USBSTOR'
+    plugin_names = [plugin.NAME for plugin in key_path_plugins[1][key_path]]
+    self.assertEqual(plugin_names, ['winreg_usbstor'])
+
+    plugin_names = [plugin.NAME for plugin in generic_plugins[1]]
+    self.assertEqual(plugin_names, [])
+
+    plugin_names = [plugin.NAME for plugin in generic_plugins[2]]
+    self.assertTrue('winreg_services' in plugin_names)
+
+    plugin_names = [plugin.NAME for plugin in generic_plugins[3]]
+    self.assertEqual(plugin_names, ['winreg_default'])
+
   def testNtuserParsing(self):
     """Parse a NTUSER.dat file and check few items."""
     knowledge_base_values = {'current_control_set': u'ControlSet001'}
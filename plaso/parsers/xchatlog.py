@@ -52,6 +52,7 @@
 """
 
 import logging
+import re
 
 import pyparsing
 
@@ -127,6 +128,11 @@ class XChatLogParser(text_parser.PyparsingSingleLineTextParser):
       ('header_signature', HEADER_SIGNATURE),
   ]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'logline': re.compile(r'\S{3}\s+\d{1,2}\s*\d{2}\s*:'),
+      'header': re.compile(r'\*\*\*\*'),
+      'header_signature': re.compile(r'\*\*\*\*')}
+
   def __init__(self):
     """Initializes a XChatLog parser object."""
     super(XChatLogParser, self).__init__()
@@ -39,6 +39,7 @@ def GetScripts():
   script_filenames = frozenset([
       u'image_export.py',
       u'log2timeline.py',
+      u'pcompact.py',
       u'pinfo.py',
       u'plasm.py',
       u'preg.py',
@@ -44,7 +44,9 @@ class ImageExportTool(storage_media_tool.StorageMediaTool):
     self._destination_path = None
     self._filter_file = None
     self._front_end = image_export.ImageExportFrontend()
+    self._number_of_workers = 1
     self._remove_duplicates = True
+    self._use_content_store = False
     self.has_filters = False
     self.list_signature_identifiers = False
 
@@ -161,6 +163,22 @@ class ImageExportTool(storage_media_tool.StorageMediaTool):
             u'previously exported files and duplicates are skipped. Use '
             u'this option to include duplicate files in the export.'))
 
+    argument_parser.add_argument(
+        u'--content_store', u'--content-store', dest=u'content_store',
+        action=u'store_true', default=False, help=(
+            u'Store the data of every distinct file once, by its SHA-256 '
+            u'digest hash, in the .content directory of the export and link '
+            u'the exported files to it. A manifest of the digest hashes '
+            u'and paths of the exported files is written to '
+            u'.content/manifest.txt.'))
+
+    argument_parser.add_argument(
+        u'--workers', dest=u'workers', type=int, default=1, action=u'store',
+        help=(
+            u'The number of worker processes used to export the files. '
+            u'Multiple workers imply --content_store, which is used to detect '
+            u'duplicate files across the workers. The default is 1.'))
+
     self.AddStorageMediaImageOptions(argument_parser)
     self.AddVssProcessingOptions(argument_parser)
 
@@ -226,6 +244,13 @@ class ImageExportTool(storage_media_tool.StorageMediaTool):
         getattr(options, u'include_duplicates', False)):
       self._remove_duplicates = False
 
+    self._number_of_workers = getattr(options, u'workers', 1)
+    if self._number_of_workers < 1:
+      raise errors.BadConfigOption(
+          u'Invalid number of workers: {0:d}.'.format(self._number_of_workers))
+
+    self._use_content_store = getattr(options, u'content_store', False)
+
     # TODO: move data location code to a location shared with psort.
     data_location = getattr(options, u'data_location', None)
     if not data_location:
@@ -288,7 +313,9 @@ class ImageExportTool(storage_media_tool.StorageMediaTool):
     logging.info(u'Processing started.')
     self._front_end.ProcessSource(
         self._destination_path, filter_file=self._filter_file,
-        remove_duplicates=self._remove_duplicates)
+        remove_duplicates=self._remove_duplicates,
+        number_of_workers=self._number_of_workers,
+        use_content_store=self._use_content_store)
     logging.info(u'Processing completed.')
 
 
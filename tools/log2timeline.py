@@ -12,6 +12,7 @@ import textwrap
 from plaso.cli import extraction_tool
 from plaso.frontend import log2timeline
 from plaso.frontend import utils as frontend_utils
+from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.lib import pfilter
 
@@ -61,6 +62,9 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     self._foreman_verbose = False
     self._front_end = log2timeline.Log2TimelineFrontend()
     self._output = None
+    self._queue_type = definitions.QUEUE_TYPE_MULTI_PROCESSING
+    self._serialize_in_workers = False
+    self._worker_timeout = None
     self.list_timezones = False
     self.list_parsers_and_plugins = False
 
@@ -110,6 +114,20 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
     self._foreman_verbose = getattr(options, u'foreman_verbose', False)
 
+    self._serialize_in_workers = getattr(
+        options, u'serialize_in_workers', False)
+
+    self._queue_type = getattr(
+        options, u'queue_type', definitions.QUEUE_TYPE_MULTI_PROCESSING)
+
+    worker_timeout = getattr(options, u'worker_timeout', None)
+    if worker_timeout is not None:
+      if worker_timeout <= 0:
+        raise errors.BadConfigOption(
+            u'Invalid worker timeout: {0!s}.'.format(worker_timeout))
+
+      self._worker_timeout = worker_timeout * 60
+
     # TODO: workers.
 
   def AddOutputOptions(self, argument_group):
@@ -147,6 +165,22 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         action=u'store_true', default=False, help=(
             u'Indicate that the tool should run in a single process.'))
 
+    argument_group.add_argument(
+        u'--queue_type', u'--queue-type', dest=u'queue_type', type=unicode,
+        action=u'store', choices=sorted(definitions.QUEUE_TYPES),
+        default=definitions.QUEUE_TYPE_MULTI_PROCESSING, help=(
+            u'The type of queue used to transfer items between the processes. '
+            u'The "shared_memory" queue stores the items in a ring buffer in '
+            u'shared memory instead of sending them through a pipe.'))
+
+    argument_group.add_argument(
+        u'--serialize_in_workers', u'--serialize-in-workers',
+        dest=u'serialize_in_workers', action=u'store_true', default=False,
+        help=(
+            u'Indicate that the worker processes should serialize the event '
+            u'objects instead of the storage writer process. This only '
+            u'applies to the "proto" serializer format.'))
+
     argument_group.add_argument(
         u'--show_memory_usage', u'--show-memory-usage', action=u'store_true',
         default=False, dest=u'foreman_verbose', help=(
@@ -159,6 +193,12 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         help=(u'The number of worker threads [defaults to available system '
               u'CPUs minus three].'))
 
+    argument_group.add_argument(
+        u'--worker_timeout', u'--worker-timeout', dest=u'worker_timeout',
+        action=u'store', type=float, default=None, metavar=u'MINUTES', help=(
+            u'The number of minutes a worker can run without making progress '
+            u'before it is considered hung and is replaced [defaults to 30].'))
+
   def ListPluginInformation(self):
     """Lists all plugin and parser information."""
     plugin_list = self._front_end.GetPluginData()
@@ -409,6 +449,9 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         profiling_type=self._profiling_type)
     self._front_end.SetStorageFile(self._output)
     self._front_end.SetShowMemoryInformation(show_memory=self._foreman_verbose)
+    self._front_end.SetQueueType(self._queue_type)
+    self._front_end.SetSerializeInWorkers(self._serialize_in_workers)
+    self._front_end.SetWorkerTimeout(self._worker_timeout)
 
     self._front_end.ScanSource(
         self._source_path, partition_number=self._partition_number,
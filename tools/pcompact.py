@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compacts a plaso storage file into fully time sorted stores.
+
+Sample Usage:
+  pcompact.py -w /tmp/compacted.plaso /tmp/mystorage.plaso
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from plaso.cli import analysis_tool
+from plaso.lib import errors
+from plaso.lib import storage
+
+
+class PcompactTool(analysis_tool.AnalysisTool):
+  """Class that implements the pcompact CLI tool."""
+
+  _BYTES_IN_A_MIB = 1024 * 1024
+
+  NAME = u'pcompact'
+  DESCRIPTION = (
+      u'Rewrites a storage file into a small number of large stores that '
+      u'are fully sorted by time, which removes the need to merge the stores '
+      u'every time the storage file is read in sorted order.')
+
+  def __init__(self, input_reader=None, output_writer=None):
+    """Initializes the CLI tool object.
+
+    Args:
+      input_reader: the input reader (instance of InputReader).
+                    The default is None which indicates the use of the stdin
+                    input reader.
+      output_writer: the output writer (instance of OutputWriter).
+                     The default is None which indicates the use of the stdout
+                     output writer.
+    """
+    super(PcompactTool, self).__init__(
+        input_reader=input_reader, output_writer=output_writer)
+    self._buffer_size = 0
+    self._output_file_path = None
+
+  def CompactStorage(self):
+    """Compacts the storage file.
+
+    Returns:
+      A boolean value indicating the storage file was compacted.
+    """
+    try:
+      storage_file = storage.StorageFile(
+          self._storage_file_path, read_only=True)
+    except IOError as exception:
+      logging.error(
+          u'Unable to open storage file: {0:s} with error: {1:s}'.format(
+              self._storage_file_path, exception))
+      return False
+
+    with storage_file:
+      number_of_stores = len(list(storage_file.GetProtoNumbers()))
+      number_of_compacted_stores = storage_file.Compact(
+          self._output_file_path, buffer_size=self._buffer_size)
+
+    self._output_writer.Write(
+        u'Compacted {0:d} stores into {1:d} stores in: {2:s}\n'.format(
+            number_of_stores, number_of_compacted_stores,
+            self._output_file_path))
+    return True
+
+  def ParseArguments(self):
+    """Parses the command line arguments.
+
+    Returns:
+      A boolean value indicating the arguments were successfully parsed.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format=u'[%(levelname)s] %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description=self.DESCRIPTION)
+
+    self.AddBasicOptions(argument_parser)
+
+    argument_parser.add_argument(
+        u'-w', u'--write', metavar=u'OUTPUTFILE', dest=u'write', type=unicode,
+        default=None, help=u'The path of the compacted storage file.')
+
+    argument_parser.add_argument(
+        u'--buffer_size', u'--buffer-size', u'--bs', dest=u'buffer_size',
+        action=u'store', default=0,
+        help=u'The maximum size of a compacted store (defaults to 196MiB).')
+
+    self.AddStorageFileOptions(argument_parser)
+
+    try:
+      options = argument_parser.parse_args()
+    except UnicodeEncodeError:
+      # If we get here we are attempting to print help in a non-Unicode
+      # terminal.
+      self._output_writer.Write(u'')
+      self._output_writer.Write(argument_parser.format_help())
+      return False
+
+    try:
+      self.ParseOptions(options)
+    except errors.BadConfigOption as exception:
+      logging.error(u'{0:s}'.format(exception))
+
+      self._output_writer.Write(u'')
+      self._output_writer.Write(argument_parser.format_help())
+
+      return False
+
+    return True
+
+  def ParseOptions(self, options):
+    """Parses the options.
+
+    Args:
+      options: the command line arguments (instance of argparse.Namespace).
+
+    Raises:
+      BadConfigOption: if the options are invalid.
+    """
+    super(PcompactTool, self).ParseOptions(options)
+
+    self._output_file_path = getattr(options, u'write', None)
+    if not self._output_file_path:
+      raise errors.BadConfigOption(u'Missing output file option.')
+
+    if os.path.exists(self._output_file_path):
+      raise errors.BadConfigOption(
+          u'Output file: {0:s} already exists.'.format(self._output_file_path))
+
+    buffer_size = getattr(options, u'buffer_size', 0)
+    if buffer_size:
+      try:
+        if buffer_size[-1].lower() == u'm':
+          self._buffer_size = int(buffer_size[:-1], 10)
+          self._buffer_size *= self._BYTES_IN_A_MIB
+        else:
+          self._buffer_size = int(buffer_size, 10)
+      except ValueError:
+        raise errors.BadConfigOption(
+            u'Invalid buffer size: {0:s}.'.format(buffer_size))
+
+
+def Main():
+  """The main function."""
+  tool = PcompactTool()
+
+  if not tool.ParseArguments():
+    return False
+
+  return tool.CompactStorage()
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
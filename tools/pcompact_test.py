@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the pcompact CLI tool."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from plaso.cli import test_lib as cli_test_lib
+from plaso.frontend import frontend
+from plaso.lib import errors
+from plaso.lib import storage
+from tools import pcompact
+
+
+class PcompactToolTest(cli_test_lib.CLIToolTestCase):
+  """Tests for the pcompact CLI tool."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temp_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temp_directory, True)
+
+  def testCompactStorage(self):
+    """Tests the CompactStorage function."""
+    output_writer = cli_test_lib.TestOutputWriter(encoding=u'utf-8')
+    test_tool = pcompact.PcompactTool(output_writer=output_writer)
+
+    options = frontend.Options()
+    options.storage_file = self._GetTestFilePath([u'psort_test.out'])
+    options.write = os.path.join(self._temp_directory, u'compacted.plaso')
+
+    test_tool.ParseOptions(options)
+
+    self.assertTrue(test_tool.CompactStorage())
+
+    expected_output = b'Compacted 7 stores into 1 stores in: {0:s}\n'.format(
+        options.write.encode(u'utf-8'))
+
+    output = output_writer.ReadOutput()
+    self.assertEqual(output, expected_output)
+
+    with storage.StorageFile(options.write, read_only=True) as storage_file:
+      self.assertEqual(list(storage_file.GetProtoNumbers()), [1])
+
+      timestamps = [
+          event_object.timestamp
+          for event_object in storage_file.GetEntries(1)]
+      self.assertEqual(len(timestamps), 15)
+      self.assertEqual(timestamps, sorted(timestamps))
+
+      storage_information = storage_file.GetStorageInformation()
+      self.assertEqual(len(storage_information), 1)
+      self.assertEqual(storage_information[0].store_range, (1, 2))
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -117,6 +117,14 @@ def Main(arguments=None):
           u'the result set. The default value is 5]. See --slice or --slicer '
           u'for more details about this option.'))
 
+  tool_group.add_argument(
+      u'--workers', dest=u'workers', type=int, default=1, action=u'store',
+      help=(
+          u'The number of worker processes used to filter and format the '
+          u'events. The events are partitioned by time across the workers '
+          u'and their output is merged in time order. The default is 1, which '
+          u'processes the events in a single process.'))
+
   tool_group.add_argument(
       u'-v', u'--version', dest=u'version', action=u'version',
       version=u'log2timeline - psort version {0:s}'.format(plaso.GetVersion()),
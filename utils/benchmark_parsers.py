@@ -0,0 +1,226 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the throughput of the text parsers.
+
+Sample Usage:
+  PYTHONPATH=. python utils/benchmark_parsers.py
+  PYTHONPATH=. python utils/benchmark_parsers.py --parsers winiis \\
+      --pyparsing_only /tmp/u_ex150101.log
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.engine import knowledge_base
+from plaso.engine import queue
+from plaso.engine import single_process
+from plaso.lib import errors
+from plaso.parsers import iis
+from plaso.parsers import mac_wifi
+from plaso.parsers import mediator
+from plaso.parsers import selinux
+from plaso.parsers import skydrivelog
+from plaso.parsers import xchatlog
+
+
+class CountingEventObjectQueueConsumer(queue.EventObjectQueueConsumer):
+  """Class that implements an event object queue consumer that counts."""
+
+  def __init__(self, event_queue):
+    """Initializes the counting event object queue consumer.
+
+    Args:
+      event_queue: the event object queue (instance of Queue).
+    """
+    super(CountingEventObjectQueueConsumer, self).__init__(event_queue)
+    self.number_of_event_objects = 0
+
+  def _ConsumeEventObject(self, unused_event_object, **unused_kwargs):
+    """Consumes an event object callback for ConsumeEventObjects."""
+    self.number_of_event_objects += 1
+
+
+class ParserBenchmark(object):
+  """Class that benchmarks the throughput of parsers."""
+
+  # The parser classes and their test file, relative to the test data path.
+  PARSERS = {
+      u'macwifi': (mac_wifi.MacWifiLogParser, u'wifi.log'),
+      u'selinux': (selinux.SELinuxParser, u'selinux.log'),
+      u'skydrive_log': (skydrivelog.SkyDriveLogParser, u'skydrive.log'),
+      u'winiis': (iis.WinIISParser, u'iis.log'),
+      u'xchatlog': (xchatlog.XChatLogParser, u'xchat.log')}
+
+  _BYTES_IN_A_MIB = 1024 * 1024
+
+  def __init__(self, repetitions=5, use_fast_path=True):
+    """Initializes the parser benchmark object.
+
+    Args:
+      repetitions: optional number of times a file is parsed. The default
+                   is 5.
+      use_fast_path: optional boolean value to indicate the line structure
+                     prefilters and regular expressions should be used.
+                     The default is True.
+    """
+    super(ParserBenchmark, self).__init__()
+    self._repetitions = repetitions
+    self._use_fast_path = use_fast_path
+
+  def _ParseFile(self, parser_object, path):
+    """Parses a file once.
+
+    Args:
+      parser_object: the parser object (instance of BaseParser).
+      path: the path of the file.
+
+    Returns:
+      The number of event objects produced by the parser.
+    """
+    event_queue = single_process.SingleProcessQueue()
+    event_queue_consumer = CountingEventObjectQueueConsumer(event_queue)
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    parser_mediator = mediator.ParserMediator(
+        queue.ItemQueueProducer(event_queue),
+        queue.ItemQueueProducer(parse_error_queue),
+        knowledge_base.KnowledgeBase())
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+    parser_mediator.SetFileEntry(file_entry)
+    parser_mediator.AppendToParserChain(parser_object)
+
+    parser_object.Parse(parser_mediator)
+
+    event_queue_consumer.ConsumeEventObjects()
+    return event_queue_consumer.number_of_event_objects
+
+  def Benchmark(self, parser_name, path):
+    """Benchmarks a parser on a file.
+
+    Args:
+      parser_name: the name of the parser.
+      path: the path of the file.
+
+    Returns:
+      A tuple containing the number of event objects produced by a single
+      parse and the throughput in MiB per second or None if the file could
+      not be parsed.
+    """
+    parser_class, _ = self.PARSERS[parser_name]
+    file_size = os.path.getsize(path)
+
+    number_of_event_objects = 0
+    number_of_seconds = 0.0
+    for _ in range(0, self._repetitions):
+      # A new parser object is used for every repetition since the parsers
+      # maintain state while parsing.
+      parser_object = parser_class()
+      if hasattr(parser_object, u'use_fast_path'):
+        parser_object.use_fast_path = self._use_fast_path
+
+      start_time = time.time()
+      try:
+        number_of_event_objects = self._ParseFile(parser_object, path)
+      except errors.UnableToParseFile as exception:
+        logging.error(
+            u'[{0:s}] unable to parse: {1:s} with error: {2:s}'.format(
+                parser_name, path, exception))
+        return
+
+      number_of_seconds += time.time() - start_time
+
+    throughput = 0.0
+    if number_of_seconds:
+      throughput = (
+          float(file_size * self._repetitions) / self._BYTES_IN_A_MIB /
+          number_of_seconds)
+
+    return number_of_event_objects, throughput
+
+
+def Main():
+  """The main function."""
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput of text parsers.'))
+
+  argument_parser.add_argument(
+      u'--parsers', dest=u'parsers', type=unicode, action=u'store',
+      default=u','.join(sorted(ParserBenchmark.PARSERS.keys())),
+      help=u'Comma separated list of the names of the parsers to benchmark.')
+
+  argument_parser.add_argument(
+      u'--repetitions', dest=u'repetitions', type=int, action=u'store',
+      default=5, help=u'The number of times every file is parsed.')
+
+  argument_parser.add_argument(
+      u'--test_data', dest=u'test_data', type=unicode, action=u'store',
+      default=os.path.join(os.getcwd(), u'test_data'),
+      help=u'The path of the test data, used when no source is specified.')
+
+  argument_parser.add_argument(
+      u'--pyparsing_only', dest=u'pyparsing_only', action=u'store_true',
+      default=False, help=(
+          u'Parse without the line structure prefilters and regular '
+          u'expressions for comparison.'))
+
+  argument_parser.add_argument(
+      u'sources', nargs=u'*', type=unicode, action=u'store',
+      metavar=u'SOURCE', help=(
+          u'The files to benchmark, every file is parsed by every parser. '
+          u'The default is the test file of every parser.'))
+
+  options = argument_parser.parse_args()
+
+  logging.basicConfig(
+      level=logging.INFO, format=u'[%(levelname)s] %(message)s')
+
+  parser_names = []
+  for parser_name in options.parsers.split(u','):
+    parser_name = parser_name.strip()
+    if parser_name not in ParserBenchmark.PARSERS:
+      print u'Unsupported parser: {0:s}'.format(parser_name)
+      return False
+    parser_names.append(parser_name)
+
+  benchmark = ParserBenchmark(
+      repetitions=options.repetitions,
+      use_fast_path=not options.pyparsing_only)
+
+  print u'{0:<14s} {1:>10s} {2:>10s}  {3:s}'.format(
+      u'Parser', u'Events', u'MiB/s', u'Source')
+
+  result = True
+  for parser_name in parser_names:
+    sources = options.sources
+    if not sources:
+      _, test_file = ParserBenchmark.PARSERS[parser_name]
+      sources = [os.path.join(options.test_data, test_file)]
+
+    for source in sources:
+      benchmark_result = benchmark.Benchmark(parser_name, source)
+      if not benchmark_result:
+        result = False
+        continue
+
+      number_of_event_objects, throughput = benchmark_result
+      print u'{0:<14s} {1:>10d} {2:>10.2f}  {3:s}'.format(
+          parser_name, number_of_event_objects, throughput, source)
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)